@@ -26,6 +26,10 @@ def create_app(config_name=None):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
     
+    # 安裝 JSON 序列化實現（默認 orjson 可用時使用 orjson）
+    from app.utils.json_provider import get_json_provider_class
+    app.json = get_json_provider_class(app.config.get('JSON_PROVIDER', 'auto'))(app)
+    
     # 配置日誌安全過濾器
     if not app.debug:
         security_filter = SecurityFilter()
@@ -119,6 +123,7 @@ def create_app(config_name=None):
     from app.routes.image_upload import bp as image_upload_bp
     from app.routes.edit_record import bp as edit_record_bp
     from app.routes.resource import resource_bp
+    from app.routes.search import bp as search_bp
     # 舊的手工維護 Swagger 系統（1600+ 行代碼）
     # from app.routes.swagger_docs import bp as swagger_bp
     
@@ -137,10 +142,42 @@ def create_app(config_name=None):
     app.register_blueprint(image_upload_bp, url_prefix='/api')
     app.register_blueprint(edit_record_bp, url_prefix='/api')
     app.register_blueprint(resource_bp)
+    app.register_blueprint(search_bp, url_prefix='/api')
     app.register_blueprint(swagger_bp, url_prefix='/api')
     
+    # 註冊全文索引的建表及同步事件
+    from app.utils.fulltext import register_fulltext_events
+    register_fulltext_events()
+    
+    # 註冊站內搜索索引的增量更新事件
+    from app.utils.search_index import register_search_index_events, warm_search_index
+    register_search_index_events()
+    
+    # 註冊上傳圖片後台處理任務的提交事件
+    from app.utils.image_pipeline import register_image_pipeline_events
+    register_image_pipeline_events()
+    
+    # 註冊按引用計數刪除媒體文件的事件
+    from app.utils.media_store import register_media_store_events
+    register_media_store_events()
+    
+    # 註冊論文文件變更時提取 PDF 文本的事件
+    from app.utils.pdf_text import register_pdf_text_events
+    register_pdf_text_events()
+    
+    # 註冊事務提交後寫入審計日誌的事件（AUDIT_WRITE_BEHIND）
+    from app.utils.audit_journal import register_audit_journal_events, recover as recover_audit_journal
+    register_audit_journal_events()
+    
     # 創建表
     with app.app_context():
         db.create_all()
+        
+        # 重放上次未寫入數據庫的審計日誌
+        recover_audit_journal()
+        
+        # 工作進程啟動時建立站內搜索索引
+        if app.config.get('SEARCH_INDEX_WARM_ON_START'):
+            warm_search_index()
     
     return app
\ No newline at end of file
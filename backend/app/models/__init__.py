@@ -3,13 +3,18 @@ from .lab import Lab
 from .research_group import ResearchGroup
 from .member import Member
 from .paper import Paper, PaperAuthor
+from .paper_text import PaperText
 from .project import Project
 from .news import News
 from .edit_record import EditRecord
+from .edit_record_entity import EditRecordEntity
 from .uploaded_image import UploadedImage
+from .image_task import ImageTask
+from .media_object import MediaObject
+from .upload_session import UploadSession
 from .resource import Resource
 
 __all__ = [
     'Admin', 'Lab', 'ResearchGroup', 'Member', 
-    'Paper', 'PaperAuthor', 'Project', 'News', 'EditRecord', 'UploadedImage', 'Resource'
+    'Paper', 'PaperAuthor', 'PaperText', 'Project', 'News', 'EditRecord', 'EditRecordEntity', 'UploadedImage', 'ImageTask', 'MediaObject', 'UploadSession', 'Resource'
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
 from app import db
 from datetime import datetime, timezone
-import json
+from app.utils import audit_payload
+from .edit_record_entity import EditRecordEntity
 
 class EditRecord(db.Model):
     __tablename__ = 'edit_records'
@@ -10,7 +11,9 @@ class EditRecord(db.Model):
     edit_type = db.Column(db.String(50), nullable=False, index=True)  # 添加索引用於操作類型篩選 CREATE, UPDATE, DELETE
     edit_module = db.Column(db.Integer, nullable=False, index=True)  # 添加索引用於模塊篩選 0:管理員 1:實驗室 2:課題組 3:成員 4:論文 5:新聞 6:項目 7:媒體文件 8:圖片上傳
     edit_content = db.Column(db.Text)
+    edit_summary = db.Column(db.String(255))  # 內容摘要，列表接口直接返回，無需解碼 edit_content
     edit_date = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), index=True)  # 明確使用 UTC 時區
+    journal_id = db.Column(db.String(32), unique=True, index=True)  # 寫後緩衝日誌中記錄的唯一標識，重放時據此去重（直接插入的記錄為空）
     
     # 複合索引
     __table_args__ = (
@@ -21,14 +24,30 @@ class EditRecord(db.Model):
     
     # 關係
     admin = db.relationship('Admin', backref='edit_records')
+    entities = db.relationship('EditRecordEntity', cascade='all, delete-orphan', passive_deletes=True)
     
     def set_content(self, content_dict):
-        self.edit_content = json.dumps(content_dict, ensure_ascii=False)
+        # 存儲為緊湊編碼（見 app.utils.audit_payload）
+        self.edit_content = audit_payload.encode(content_dict)
+        self.edit_summary = audit_payload.summarize(content_dict)
+        self._decoded = (self.edit_content, content_dict)
+    
+    def set_entities(self, entity_ids):
+        # 操作對象的引用隨記錄一起插入，edit_date 須與記錄相同
+        if self.edit_date is None:
+            self.edit_date = datetime.now(timezone.utc)
+        self.entities = [
+            EditRecordEntity(entity_id=entity_id, edit_module=self.edit_module, edit_date=self.edit_date)
+            for entity_id in entity_ids
+        ]
     
     def get_content(self):
-        if self.edit_content:
-            return json.loads(self.edit_content)
-        return {}
+        # 首次訪問時解碼，edit_content 未變時複用
+        cached = getattr(self, '_decoded', None)
+        if cached is None or cached[0] is not self.edit_content:
+            cached = (self.edit_content, audit_payload.decode(self.edit_content))
+            self._decoded = cached
+        return cached[1]
     
     def to_dict(self):
         return {
@@ -37,6 +56,7 @@ class EditRecord(db.Model):
             'edit_type': self.edit_type,
             'edit_module': self.edit_module,
             'edit_content': self.get_content(),
+            'edit_summary': self.edit_summary,
             'edit_date': self.edit_date.replace(tzinfo=timezone.utc).isoformat(),  # 明確標示 UTC 時區
             'admin': self.admin.to_dict() if self.admin else None
         }
\ No newline at end of file
@@ -0,0 +1,14 @@
+from app import db
+
+class EditRecordEntity(db.Model):
+    """審計記錄涉及的操作對象（批量操作有多個），用於按對象查詢操作歷史"""
+    __tablename__ = 'edit_record_entities'
+    
+    edit_id = db.Column(db.Integer, db.ForeignKey('edit_records.edit_id', ondelete='CASCADE'), primary_key=True)
+    entity_id = db.Column(db.Integer, primary_key=True)
+    edit_module = db.Column(db.Integer, nullable=False)  # 與 edit_records.edit_module 相同
+    edit_date = db.Column(db.DateTime, nullable=False)  # 與 edit_records.edit_date 相同，冗餘存儲以便索引排序
+    
+    __table_args__ = (
+        db.Index('ix_edit_record_entity_history', 'edit_module', 'entity_id', 'edit_date'),  # 用於查詢某個對象的操作歷史
+    )
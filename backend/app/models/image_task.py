@@ -0,0 +1,30 @@
+from app import db
+from datetime import datetime
+
+class ImageTask(db.Model):
+    """上傳圖片的後台處理狀態（縮放、重新編碼），按存儲路徑關聯 UploadedImage 及各實體的圖片字段"""
+    __tablename__ = 'image_tasks'
+
+    STATUS_PENDING = 'pending'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+
+    image_task_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    file_path = db.Column(db.String(500), nullable=False, unique=True)  # 存儲路徑（/media/...）
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING, index=True)
+    error = db.Column(db.Text, nullable=True)  # 處理失敗原因
+    width = db.Column(db.Integer, nullable=True)  # 處理後的尺寸
+    height = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            'file_path': self.file_path,
+            'status': self.status,
+            'error': self.error,
+            'width': self.width,
+            'height': self.height,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
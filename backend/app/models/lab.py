@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from app.utils.image_derivatives import add_srcset
 
 class Lab(db.Model):
     __tablename__ = 'lab'
@@ -22,8 +23,8 @@ class Lab(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # 添加索引用於排序
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        return {
+    def to_dict(self, srcset=False):
+        result = {
             'lab_id': self.lab_id,
             'lab_logo_path': self.lab_logo_path,
             'carousel_img_1': self.carousel_img_1,
@@ -39,4 +40,8 @@ class Lab(db.Model):
             'lab_email': self.lab_email,
             'lab_phone': self.lab_phone,
             'enable': self.enable
-        }
\ No newline at end of file
+        }
+        if srcset:
+            add_srcset(result, ('lab_logo_path', 'carousel_img_1', 'carousel_img_2',
+                                'carousel_img_3', 'carousel_img_4'))
+        return result
\ No newline at end of file
@@ -0,0 +1,31 @@
+from app import db
+from datetime import datetime
+
+class MediaObject(db.Model):
+    """按 SHA-256 內容尋址存儲的上傳文件，記錄重複上傳次數用於統計去重效果"""
+    __tablename__ = 'media_objects'
+
+    object_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    sha256 = db.Column(db.String(64), nullable=False, index=True)  # 上傳內容的 SHA-256
+    file_path = db.Column(db.String(500), nullable=False, unique=True)  # 存儲路徑（/media/<類型>/<前兩位>/<sha256>.<擴展名>）
+    file_type = db.Column(db.String(50), nullable=False)
+    size = db.Column(db.Integer, nullable=False)  # 上傳內容大小（字節）
+    upload_count = db.Column(db.Integer, nullable=False, default=1)  # 上傳次數，大於 1 即命中去重
+    store_ms = db.Column(db.Integer, nullable=False, default=0)  # 首次寫入（及同步處理）耗時，重複上傳時省去
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_uploaded_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    released_at = db.Column(db.DateTime, nullable=True)  # 最後一個引用移除、文件被刪除的時間
+
+    def to_dict(self):
+        return {
+            'object_id': self.object_id,
+            'sha256': self.sha256,
+            'file_path': self.file_path,
+            'file_type': self.file_type,
+            'size': self.size,
+            'upload_count': self.upload_count,
+            'store_ms': self.store_ms,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'last_uploaded_at': self.last_uploaded_at.isoformat() if self.last_uploaded_at else None,
+            'released_at': self.released_at.isoformat() if self.released_at else None
+        }
@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from app.utils.image_derivatives import add_srcset
 
 class Member(db.Model):
     __tablename__ = 'members'
@@ -37,7 +38,7 @@ class Member(db.Model):
     research_group = db.relationship('ResearchGroup', foreign_keys=[research_group_id], backref='members')
     lab = db.relationship('Lab', backref='members')
     
-    def to_dict(self):
+    def to_dict(self, srcset=False):
         result = {
             'mem_id': self.mem_id,
             'mem_avatar_path': self.mem_avatar_path,
@@ -67,4 +68,6 @@ class Member(db.Model):
                 'research_group_name_en': self.research_group.research_group_name_en
             }
         
+        if srcset:
+            add_srcset(result, ('mem_avatar_path',))
         return result
\ No newline at end of file
@@ -1,5 +1,6 @@
 from app import db
 from datetime import datetime
+from app.utils.image_derivatives import add_srcset
 
 class Paper(db.Model):
     __tablename__ = 'papers'
@@ -37,8 +38,8 @@ class Paper(db.Model):
     lab = db.relationship('Lab', backref='papers')
     authors = db.relationship('PaperAuthor', backref='paper', cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
+    def to_dict(self, srcset=False):
+        result = {
             'paper_id': self.paper_id,
             'research_group_id': self.research_group_id,
             'lab_id': self.lab_id,
@@ -58,6 +59,9 @@ class Paper(db.Model):
             'enable': self.enable,
             'authors': [author.to_dict() for author in self.authors]  # 實驗室作者
         }
+        if srcset:
+            add_srcset(result, ('preview_img',))
+        return result
 
 class PaperAuthor(db.Model):
     __tablename__ = 'paper_authors'
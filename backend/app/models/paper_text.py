@@ -0,0 +1,35 @@
+from app import db
+from sqlalchemy.dialects.mysql import MEDIUMTEXT
+
+class PaperText(db.Model):
+    """論文 PDF 中提取的文本，用於全文檢索；文件內容（SHA-256）不變時不重新提取"""
+    __tablename__ = 'paper_texts'
+
+    STATUS_PENDING = 'pending'
+    STATUS_READY = 'ready'
+    STATUS_FAILED = 'failed'
+
+    paper_id = db.Column(db.Integer, db.ForeignKey('papers.paper_id', ondelete='CASCADE'), primary_key=True)
+    file_path = db.Column(db.String(500), nullable=False)  # 提取時的論文文件路徑
+    file_sha256 = db.Column(db.String(64), nullable=True)  # 已提取文本對應的文件內容哈希
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING)
+    paper_text = db.Column(db.Text().with_variant(MEDIUMTEXT(), 'mysql'), nullable=True)
+    page_count = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.Text, nullable=True)  # 提取失敗原因
+    extracted_at = db.Column(db.DateTime, nullable=True)
+
+    paper = db.relationship(
+        'Paper', backref=db.backref('text_record', uselist=False, cascade='all, delete-orphan')
+    )
+
+    def to_dict(self):
+        return {
+            'paper_id': self.paper_id,
+            'file_path': self.file_path,
+            'file_sha256': self.file_sha256,
+            'status': self.status,
+            'page_count': self.page_count,
+            'text_length': len(self.paper_text or ''),
+            'error': self.error,
+            'extracted_at': self.extracted_at.isoformat() if self.extracted_at else None
+        }
@@ -2,6 +2,7 @@
 
 from app import db
 from datetime import datetime
+from app.utils.image_derivatives import add_srcset
 
 
 class Resource(db.Model):
@@ -23,9 +24,9 @@ class Resource(db.Model):
     created_time = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_time = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    def to_dict(self):
-        """將資源對象轉換為字典"""
-        return {
+    def to_dict(self, srcset=False):
+        """將資源對象轉換為字典，srcset=True 時附帶 resource_image_srcset"""
+        result = {
             'resource_id': self.resource_id,
             'resource_name_zh': self.resource_name_zh,
             'resource_name_en': self.resource_name_en,
@@ -42,6 +43,9 @@ class Resource(db.Model):
             'created_time': self.created_time.isoformat() if self.created_time else None,
             'updated_time': self.updated_time.isoformat() if self.updated_time else None
         }
+        if srcset:
+            add_srcset(result, ('resource_image',))
+        return result
 
     def __repr__(self):
         return f'<Resource {self.resource_id}: {self.resource_name_zh}>'
\ No newline at end of file
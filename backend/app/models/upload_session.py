@@ -0,0 +1,35 @@
+from app import db
+from datetime import datetime
+
+class UploadSession(db.Model):
+    """分塊斷點續傳的上傳，完成後按 upload_id 關聯到論文等實體"""
+    __tablename__ = 'upload_sessions'
+
+    STATUS_UPLOADING = 'uploading'
+    STATUS_COMPLETED = 'completed'
+
+    upload_id = db.Column(db.String(32), primary_key=True)  # uuid4 十六進制
+    upload_type = db.Column(db.String(50), nullable=False)  # 上傳用途，如 paper
+    filename = db.Column(db.String(255), nullable=False)
+    total_size = db.Column(db.Integer, nullable=False)  # 客戶端聲明的文件大小（字節）
+    received_size = db.Column(db.Integer, nullable=False, default=0)  # 已寫入磁盤的字節數，即下一分塊的 offset
+    status = db.Column(db.String(20), nullable=False, default=STATUS_UPLOADING)
+    sha256 = db.Column(db.String(64), nullable=True)
+    file_path = db.Column(db.String(500), nullable=True)  # 完成後的存儲路徑，關聯到實體時刪除本記錄
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # 每收到一個分塊順延
+
+    def to_dict(self):
+        return {
+            'upload_id': self.upload_id,
+            'type': self.upload_type,
+            'filename': self.filename,
+            'size': self.total_size,
+            'offset': self.received_size,
+            'status': self.status,
+            'sha256': self.sha256,
+            'file_path': self.file_path,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None
+        }
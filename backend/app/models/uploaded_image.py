@@ -31,6 +31,17 @@ class UploadedImage(db.Model):
         db.Index('ix_uploaded_images_unused', 'is_used', 'created_at'),  # 用於清理未使用的圖片
     )
     
+    # 後台處理狀態（上傳時同步處理的圖片沒有記錄）
+    processing_task = db.relationship(
+        'ImageTask',
+        primaryjoin='foreign(ImageTask.file_path) == UploadedImage.file_path',
+        uselist=False, viewonly=True, lazy='joined'
+    )
+    
+    @property
+    def processing_status(self):
+        return self.processing_task.status if self.processing_task else 'ready'
+    
     def to_dict(self):
         return {
             'image_id': self.image_id,
@@ -43,6 +54,7 @@ class UploadedImage(db.Model):
             'entity_id': self.entity_id,
             'field_name': self.field_name,
             'is_used': self.is_used,
+            'processing_status': self.processing_status,
             'used_at': self.used_at.isoformat() if self.used_at else None,
             'uploaded_by': self.uploaded_by,
             'created_at': self.created_at.isoformat() if self.created_at else None,
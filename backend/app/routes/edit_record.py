@@ -1,57 +1,87 @@
 from flask import Blueprint, request, jsonify
-from app.models import EditRecord
+from datetime import datetime
 from app.auth import admin_required, super_admin_required
-from app.utils.helpers import get_pagination_params, paginate_query, success_response, error_response
+from app.utils.helpers import get_pagination_params, success_response, error_response
 from app.utils.validators import validate_date
+from app.services.audit_service import AuditService
+from app.services.base_service import ServiceException, ValidationError
 
 bp = Blueprint('edit_record', __name__)
+audit_service = AuditService()
 
 @bp.route('/edit-records', methods=['GET'])
 @admin_required
 def get_edit_records():
+    """操作記錄列表（摘要投影，不含 edit_content）"""
     page, per_page = get_pagination_params()
-    
-    query = EditRecord.query
+    filters = {}
     
     # 按管理員篩選
     admin_id = request.args.get('admin_id', type=int)
     if admin_id:
-        query = query.filter(EditRecord.admin_id == admin_id)
+        filters['admin_id'] = admin_id
     
     # 按模組篩選
     edit_module = request.args.get('edit_module', type=int)
     if edit_module is not None:
-        query = query.filter(EditRecord.edit_module == edit_module)
+        filters['edit_module'] = edit_module
     
     # 按操作類型篩選
     edit_type = request.args.get('edit_type')
     if edit_type:
-        query = query.filter(EditRecord.edit_type == edit_type.upper())
+        filters['edit_type'] = edit_type.upper()
     
     # 按日期範圍篩選
     start_date = request.args.get('start_date')
     if start_date:
         valid, date_obj = validate_date(start_date)
         if valid and date_obj:
-            query = query.filter(EditRecord.edit_date >= date_obj)
+            filters['start_date'] = date_obj
     
     end_date = request.args.get('end_date')
     if end_date:
         valid, date_obj = validate_date(end_date)
         if valid and date_obj:
-            from datetime import datetime, timedelta
             # 包含當天結束時間
-            end_datetime = datetime.combine(date_obj, datetime.max.time())
-            query = query.filter(EditRecord.edit_date <= end_datetime)
-    
-    # 按時間倒序排序
-    query = query.order_by(EditRecord.edit_date.desc())
+            filters['end_date'] = datetime.combine(date_obj, datetime.max.time())
     
-    result = paginate_query(query, page, per_page)
+    try:
+        result = audit_service.get_audit_records(filters, page, per_page)
+    except ValidationError as e:
+        return jsonify(error_response(2000, str(e))), 400
     return jsonify(success_response(result))
 
 @bp.route('/edit-records/<int:edit_id>', methods=['GET'])
 @admin_required
 def get_edit_record(edit_id):
-    record = EditRecord.query.get_or_404(edit_id)
-    return jsonify(success_response(record.to_dict()))
\ No newline at end of file
+    """操作記錄詳情（含完整內容）"""
+    try:
+        return jsonify(success_response(audit_service.get_audit_record(edit_id)))
+    except ServiceException as e:
+        error_data = audit_service.format_error_response(e)
+        status_code = 404 if 'NotFoundError' in str(type(e)) else 400
+        return jsonify(error_response(error_data['code'], error_data['message'])), status_code
+
+@admin_required
+def get_entity_history(entity, entity_id):
+    """對象的操作歷史（含字段級差異），include_archived=true 時包含已歸檔的記錄"""
+    page, per_page = get_pagination_params()
+    include_archived = request.args.get('include_archived', 'false').lower() == 'true'
+    try:
+        result = audit_service.get_entity_history(entity, entity_id, page, per_page, include_archived)
+    except ServiceException as e:
+        error_data = audit_service.format_error_response(e)
+        return jsonify(error_response(error_data['code'], error_data['message'])), 400
+    return jsonify(success_response(result))
+
+# 每個對象一條靜態規則，與同路徑的 Swagger 文檔資源按註冊順序匹配到此處
+for _entity in AuditService.HISTORY_ENTITIES:
+    bp.add_url_rule(f'/{_entity}/<int:entity_id>/history', view_func=get_entity_history,
+                    methods=['GET'], defaults={'entity': _entity})
+
+@bp.route('/edit-records/journal', methods=['GET'])
+@admin_required
+def get_journal_metrics():
+    """審計記錄寫後緩衝的刷新延遲及積壓"""
+    from app.utils.audit_journal import metrics
+    return jsonify(success_response(metrics()))
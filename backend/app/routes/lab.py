@@ -3,6 +3,7 @@ from app.services import LabService
 from app.services.base_service import ServiceException
 from app.auth import admin_required
 from app.utils.helpers import success_response, error_response
+from app.utils.http_cache import http_cache
 from app.utils.messages import msg
 
 bp = Blueprint('lab', __name__)
@@ -11,6 +12,7 @@ bp = Blueprint('lab', __name__)
 lab_service = LabService()
 
 @bp.route('/lab', methods=['GET'])
+@http_cache('lab')
 def get_lab():
     """
     獲取實驗室信息
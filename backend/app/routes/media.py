@@ -1,12 +1,13 @@
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify
 from app.auth import admin_required
 from app.utils.helpers import success_response, error_response
 from app.utils.messages import msg
-from app.services import MediaService
-from app.services.base_service import ServiceException
+from app.services import MediaService, UploadService
+from app.services.base_service import ServiceException, NotFoundError, ValidationError, BusinessLogicError
 
 bp = Blueprint('media', __name__)
 media_service = MediaService()
+upload_service = UploadService()
 
 @bp.route('/media/upload', methods=['POST'])
 @admin_required
@@ -25,17 +26,99 @@ def upload_file():
         error_data = media_service.format_error_response(e)
         return jsonify(error_response(error_data['code'], error_data['message'])), 400
 
+def _upload_error(e):
+    """分塊上傳接口的錯誤響應：偏移不一致返回 409 及當前 offset"""
+    error_data = upload_service.format_error_response(e)
+    if isinstance(e, NotFoundError):
+        status_code = 404
+    elif isinstance(e, BusinessLogicError):
+        status_code = 409
+    else:
+        status_code = 400
+    return jsonify(error_response(error_data['code'], error_data['message'])), status_code
+
+@bp.route('/media/uploads', methods=['POST'])
+@admin_required
+def create_upload():
+    """創建分塊斷點續傳上傳"""
+    try:
+        data = request.get_json(silent=True) or {}
+        result = upload_service.create_upload(data.get('filename'), data.get('size'), data.get('type', 'paper'))
+        return jsonify(success_response(result)), 201
+    except ServiceException as e:
+        return _upload_error(e)
+
+@bp.route('/media/uploads/<upload_id>', methods=['GET'])
+@admin_required
+def get_upload(upload_id):
+    """獲取上傳狀態，斷線後按返回的 offset 繼續上傳"""
+    try:
+        return jsonify(success_response(upload_service.get_upload(upload_id)))
+    except ServiceException as e:
+        return _upload_error(e)
+
+@bp.route('/media/uploads/<upload_id>', methods=['PUT'])
+@admin_required
+def upload_chunk(upload_id):
+    """上傳分塊：請求體為分塊內容，Upload-Offset 請求頭為分塊在文件中的起始位置"""
+    try:
+        result = upload_service.upload_chunk(upload_id, request.stream, request.headers.get('Upload-Offset'))
+        return jsonify(success_response(result))
+    except ServiceException as e:
+        return _upload_error(e)
+
+@bp.route('/media/uploads/<upload_id>/complete', methods=['POST'])
+@admin_required
+def complete_upload(upload_id):
+    """完成上傳，返回存儲路徑"""
+    try:
+        result = upload_service.complete_upload(upload_id)
+        return jsonify(success_response(result, msg.get_success_message('FILE_UPLOAD_SUCCESS')))
+    except ServiceException as e:
+        return _upload_error(e)
+
+@bp.route('/media/uploads/<upload_id>', methods=['DELETE'])
+@admin_required
+def abort_upload(upload_id):
+    """取消上傳"""
+    try:
+        upload_service.abort_upload(upload_id)
+        return jsonify(success_response())
+    except ServiceException as e:
+        return _upload_error(e)
+
 @bp.route('/media/serve/<path:file_path>')
 def serve_file(file_path):
-    """提供文件服務"""
+    """提供文件服務（支持 Range 及條件請求，圖片可帶 w / h / fit / fmt 獲取衍生圖）"""
     try:
-        file_info = media_service.serve_file(file_path)
-        return send_from_directory(file_info['directory'], file_info['filename'])
+        return media_service.serve_file(file_path, request.args)
     except ServiceException as e:
         error_data = media_service.format_error_response(e)
-        status_code = 404 if 'NotFoundError' in str(type(e)) else 500
+        status_code = 404 if isinstance(e, NotFoundError) else 400 if isinstance(e, ValidationError) else 500
         return jsonify(error_response(error_data['code'], error_data['message'])), status_code
 
+@bp.route('/media/status/<path:file_path>')
+@admin_required
+def get_processing_status(file_path):
+    """獲取上傳圖片的後台處理狀態"""
+    try:
+        result = media_service.get_processing_status(file_path)
+        return jsonify(success_response(result))
+    except ServiceException as e:
+        error_data = media_service.format_error_response(e)
+        status_code = 404 if isinstance(e, NotFoundError) else 400
+        return jsonify(error_response(error_data['code'], error_data['message'])), status_code
+
+@bp.route('/media/stats')
+@admin_required
+def get_storage_stats():
+    """媒體存儲的去重統計"""
+    try:
+        return jsonify(success_response(media_service.get_storage_stats()))
+    except ServiceException as e:
+        error_data = media_service.format_error_response(e)
+        return jsonify(error_response(error_data['code'], error_data['message'])), 400
+
 @bp.route('/media/info/<path:file_path>')
 def get_media_info(file_path):
     """獲取媒體文件信息"""
@@ -3,6 +3,7 @@ from app.services import MemberService
 from app.services.base_service import ServiceException
 from app.auth import admin_required
 from app.utils.helpers import success_response, error_response
+from app.utils.http_cache import http_cache
 from app.utils.messages import msg
 
 bp = Blueprint('member', __name__)
@@ -11,6 +12,7 @@ bp = Blueprint('member', __name__)
 member_service = MemberService()
 
 @bp.route('/members', methods=['GET'])
+@http_cache('member', 'research_group')
 def get_members():
     """
     獲取成員列表
@@ -26,6 +28,7 @@ def get_members():
     - page: 頁碼
     - per_page: 每頁數量
     - all: 是否獲取所有數據
+    - fields: 返回字段（逗號分隔，* 為全部；公開請求默認省略長描述字段）
     """
     try:
         filters = {
@@ -34,7 +37,7 @@ def get_members():
             'research_group_id': request.args.get('research_group_id', type=int),
             'lab_id': request.args.get('lab_id', type=int),
             'show_all': request.args.get('show_all', 'false').lower() == 'true',
-            'sort_by': request.args.get('sort_by', 'created_at'),
+            'sort_by': request.args.get('sort_by'),
             'order': request.args.get('order', 'desc')
         }
         
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.auth import admin_required
 from app.utils.helpers import success_response, error_response
+from app.utils.http_cache import http_cache
 from app.utils.messages import msg
 from app.services import NewsService
 from app.services.base_service import ServiceException
@@ -9,6 +10,7 @@ bp = Blueprint('news', __name__)
 news_service = NewsService()
 
 @bp.route('/news', methods=['GET'])
+@http_cache('news')
 def get_news():
     """獲取新聞列表"""
     try:
@@ -18,7 +20,7 @@ def get_news():
             'start_date': request.args.get('start_date'),
             'end_date': request.args.get('end_date'),
             'show_all': request.args.get('show_all', 'false').lower() == 'true',
-            'sort_by': request.args.get('sort_by', 'news_date'),
+            'sort_by': request.args.get('sort_by'),
             'order': request.args.get('order', 'desc')
         }
         # 移除空值，但保留 sort_by 和 order
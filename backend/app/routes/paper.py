@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app
 from app.auth import admin_required
 from app.utils.helpers import success_response, error_response
+from app.utils.http_cache import http_cache
 from app.services import PaperService
 from app.services.base_service import ServiceException
 from app.utils.messages import msg
@@ -10,6 +11,7 @@ bp = Blueprint('paper', __name__)
 paper_service = PaperService()
 
 @bp.route('/papers', methods=['GET'])
+@http_cache('paper', 'member')
 def get_papers():
     """獲取論文列表"""
     try:
@@ -20,7 +22,7 @@ def get_papers():
             'start_date': request.args.get('start_date'),
             'end_date': request.args.get('end_date'),
             'show_all': request.args.get('show_all', 'false').lower() == 'true',
-            'sort_by': request.args.get('sort_by', 'paper_date'),
+            'sort_by': request.args.get('sort_by'),
             'order': request.args.get('order', 'desc')
         }
         # 移除空值
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.auth import admin_required
 from app.utils.helpers import success_response, error_response
+from app.utils.http_cache import http_cache
 from app.utils.messages import msg
 from app.services import ResearchGroupService
 from app.services.base_service import ServiceException
@@ -9,13 +10,15 @@ bp = Blueprint('research_group', __name__)
 research_group_service = ResearchGroupService()
 
 @bp.route('/research-groups', methods=['GET'])
+@http_cache('research_group', 'member', 'paper')
 def get_research_groups():
     """獲取課題組列表"""
     try:
         filters = {
             'q': request.args.get('q', '').strip(),
             'lab_id': request.args.get('lab_id', type=int),
-            'show_all': request.args.get('show_all', 'false').lower() == 'true'
+            'show_all': request.args.get('show_all', 'false').lower() == 'true',
+            'include_counts': request.args.get('include_counts', 'false').lower() == 'true'
         }
         # 移除空值
         filters = {k: v for k, v in filters.items() if v is not None and v != ''}
@@ -30,7 +33,8 @@ def get_research_groups():
 def get_research_group(group_id):
     """獲取課題組詳情"""
     try:
-        group = research_group_service.get_research_group_detail(group_id)
+        include_counts = request.args.get('include_counts', 'false').lower() == 'true'
+        group = research_group_service.get_research_group_detail(group_id, include_counts)
         return jsonify(success_response(group))
     except ServiceException as e:
         error_data = research_group_service.format_error_response(e)
@@ -21,7 +21,7 @@ def get_resources():
         q = request.args.get('q', '')
         resource_type = request.args.get('resource_type')
         availability_status = request.args.get('availability_status')
-        sort_by = request.args.get('sort_by', 'created_time')
+        sort_by = request.args.get('sort_by')
         order = request.args.get('order', 'desc')
 
         # 類型轉換
@@ -121,7 +121,7 @@ def get_admin_resources():
         q = request.args.get('q', '')
         resource_type = request.args.get('resource_type')
         availability_status = request.args.get('availability_status')
-        sort_by = request.args.get('sort_by', 'created_time')
+        sort_by = request.args.get('sort_by')
         order = request.args.get('order', 'desc')
 
         # 類型轉換
@@ -1,5 +1,8 @@
-from flask import Blueprint, redirect, render_template_string
+from flask import Blueprint, redirect, render_template_string, jsonify
+from app.auth import admin_required
+from app.utils.helpers import success_response
 from app.utils.messages import msg
+from app.utils.response_cache import get_response_cache
 
 bp = Blueprint('root', __name__)
 
@@ -24,6 +27,14 @@ def api_health():
         "message": msg.get_success_message('HEALTH_CHECK')
     }
 
+@bp.route('/api/cache/stats')
+@admin_required
+def cache_stats():
+    """響應緩存命中統計（當前工作進程）"""
+    cache = get_response_cache()
+    stats = cache.stats() if cache is not None else None
+    return jsonify(success_response({'enabled': cache is not None, 'response_cache': stats}))
+
 @bp.route('/api-info')
 def api_info():
     """API信息頁面"""
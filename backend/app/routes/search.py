@@ -0,0 +1,21 @@
+from flask import Blueprint, request, jsonify
+from app.utils.helpers import success_response, error_response
+from app.services import SearchService
+from app.services.base_service import ServiceException
+
+bp = Blueprint('search', __name__)
+search_service = SearchService()
+
+@bp.route('/search', methods=['GET'])
+def search():
+    """站內統一搜索（成員、論文、新聞、項目、課題組、資源）"""
+    try:
+        result = search_service.search(
+            q=request.args.get('q', '').strip(),
+            types=request.args.get('types'),
+            limit=request.args.get('limit', type=int)
+        )
+        return jsonify(success_response(result))
+    except ServiceException as e:
+        error_data = search_service.format_error_response(e)
+        return jsonify(error_response(error_data['code'], error_data['message'])), 400
@@ -223,6 +223,7 @@ ns_media = api.namespace('媒体管理', description='文件上传管理', path=
 ns_edit_record = api.namespace('操作审计', description='编辑记录查询', path='/edit-records')
 ns_resource = api.namespace('资源管理', description='实验室资源管理', path='/resources')
 ns_image_upload = api.namespace('图片上传', description='Markdown图片上传管理', path='/images')
+ns_search = api.namespace('站内搜索', description='跨模块统一搜索', path='/search')
 ns_system = api.namespace('系统接口', description='健康检查等系统接口', path='/')
 
 # ==================== 认证管理接口 ====================
@@ -430,9 +431,10 @@ class ResearchGroupList(Resource):
     @ns_research_group.param('page', '页码', type='int', default=1)
     @ns_research_group.param('per_page', '每页数量', type='int', default=10)
     @ns_research_group.param('all', '获取全部数据', type='string', enum=['true', 'false'])
-    @ns_research_group.param('q', '搜索关键词（课题组名称、描述）', type='string')
+    @ns_research_group.param('q', '全文检索关键词（课题组名称、描述），结果按相关度排序并返回 highlight 高亮片段', type='string')
     @ns_research_group.param('lab_id', '实验室ID过滤', type='int')
     @ns_research_group.param('show_all', '显示所有状态', type='string', enum=['true', 'false'])
+    @ns_research_group.param('include_counts', '附加成员数和论文数', type='string', enum=['true', 'false'])
     @ns_research_group.marshal_with(pagination_response)
     def get(self):
         """获取课题组列表（支持分页和搜索）"""
@@ -450,6 +452,7 @@ class ResearchGroupList(Resource):
 @ns_research_group.route('/<int:group_id>')
 class ResearchGroup(Resource):
     @ns_research_group.doc('获取课题组详情')
+    @ns_research_group.param('include_counts', '附加成员数和论文数', type='string', enum=['true', 'false'])
     @ns_research_group.marshal_with(base_response)
     @ns_research_group.response(404, '课题组不存在')
     def get(self, group_id):
@@ -484,11 +487,14 @@ class MemberList(Resource):
     @ns_member.param('page', '页码', type='int', default=1)
     @ns_member.param('per_page', '每页数量', type='int', default=10)
     @ns_member.param('all', '获取全部数据', type='string', enum=['true', 'false'])
-    @ns_member.param('q', '搜索关键词（成员姓名、描述）', type='string')
+    @ns_member.param('cursor', '游标分页：首页传空值，之后传上次返回的 next_cursor/prev_cursor', type='string')
+    @ns_member.param('with_total', '游标分页时是否返回总数', type='string', enum=['true', 'false'])
+    @ns_member.param('q', '全文检索关键词（成员姓名、描述），结果按相关度排序并返回 highlight 高亮片段', type='string')
     @ns_member.param('lab_id', '实验室ID过滤', type='int')
     @ns_member.param('research_group_id', '课题组ID过滤', type='int')
     @ns_member.param('member_type', '成员类型过滤', type='string', enum=['teacher', 'student'])
     @ns_member.param('show_all', '显示所有状态', type='string', enum=['true', 'false'])
+    @ns_member.param('fields', '返回字段（逗号分隔，* 为全部；未登录请求默认省略长描述字段）', type='string')
     @ns_member.marshal_with(pagination_response)
     def get(self):
         """获取成员列表（支持多维度过滤和搜索）"""
@@ -573,6 +579,24 @@ class MemberBatch(Resource):
         """批量更新成员信息"""
         pass
 
+@ns_member.route('/<int:member_id>/history')
+class MemberHistory(Resource):
+    @ns_member.doc('获取成员操作历史', security='Bearer')
+    @ns_member.param('page', '页码', type='int', default=1)
+    @ns_member.param('per_page', '每页数量', type='int', default=10)
+    @ns_member.param('cursor', '游标分页：首页传空值，之后传上次返回的 next_cursor/prev_cursor', type='string')
+    @ns_member.param('include_archived', '是否包含已归档的记录', type='string', enum=['true', 'false'])
+    @ns_member.marshal_with(pagination_response)
+    @ns_member.response(401, '未认证')
+    def get(self, member_id):
+        """
+        获取成员的操作历史（含字段级差异 changes: [{field, old, new}]）
+        
+        按审计记录的操作对象索引查询；admins、labs、research-groups、papers、news、projects、resources
+        同样提供 /api/<对象>/<id>/history 接口
+        """
+        pass
+
 # ==================== 论文管理接口 ====================
 
 @ns_paper.route('/')
@@ -581,11 +605,14 @@ class PaperList(Resource):
     @ns_paper.param('page', '页码', type='int', default=1)
     @ns_paper.param('per_page', '每页数量', type='int', default=10)
     @ns_paper.param('all', '获取全部数据', type='string', enum=['true', 'false'])
-    @ns_paper.param('q', '搜索关键词（论文标题、作者、期刊）', type='string')
+    @ns_paper.param('cursor', '游标分页：首页传空值，之后传上次返回的 next_cursor/prev_cursor', type='string')
+    @ns_paper.param('with_total', '游标分页时是否返回总数', type='string', enum=['true', 'false'])
+    @ns_paper.param('q', '全文检索关键词（论文标题、期刊、PDF 正文），结果按相关度排序并返回 highlight 高亮片段', type='string')
     @ns_paper.param('lab_id', '实验室ID过滤', type='int')
     @ns_paper.param('research_group_id', '课题组ID过滤', type='int')
     @ns_paper.param('paper_year', '发表年份过滤', type='string')
     @ns_paper.param('show_all', '显示所有状态', type='string', enum=['true', 'false'])
+    @ns_paper.param('fields', '返回字段（逗号分隔，* 为全部；未登录请求默认省略长描述字段）', type='string')
     @ns_paper.marshal_with(pagination_response)
     def get(self):
         """获取论文列表（支持多维度过滤和搜索）"""
@@ -655,9 +682,10 @@ class NewsList(Resource):
     @ns_news.param('page', '页码', type='int', default=1)
     @ns_news.param('per_page', '每页数量', type='int', default=10)
     @ns_news.param('all', '获取全部数据', type='string', enum=['true', 'false'])
-    @ns_news.param('q', '搜索关键词（新闻标题、内容）', type='string')
+    @ns_news.param('q', '全文检索关键词（新闻标题、内容），结果按相关度排序并返回 highlight 高亮片段', type='string')
     @ns_news.param('news_date', '新闻日期过滤 (YYYY-MM-DD)', type='string')
     @ns_news.param('show_all', '显示所有状态', type='string', enum=['true', 'false'])
+    @ns_news.param('fields', '返回字段（逗号分隔，* 为全部；未登录请求默认省略长描述字段）', type='string')
     @ns_news.marshal_with(pagination_response)
     def get(self):
         """获取新闻列表（按日期倒序）"""
@@ -708,9 +736,10 @@ class ProjectList(Resource):
     @ns_project.param('page', '页码', type='int', default=1)
     @ns_project.param('per_page', '每页数量', type='int', default=10)
     @ns_project.param('all', '获取全部数据', type='string', enum=['true', 'false'])
-    @ns_project.param('q', '搜索关键词（项目名称、描述）', type='string')
+    @ns_project.param('q', '全文检索关键词（项目名称、描述），结果按相关度排序并返回 highlight 高亮片段', type='string')
     @ns_project.param('is_end', '项目状态', type='int', enum=[0, 1])
     @ns_project.param('show_all', '显示所有状态', type='string', enum=['true', 'false'])
+    @ns_project.param('fields', '返回字段（逗号分隔，* 为全部；未登录请求默认省略长描述字段）', type='string')
     @ns_project.marshal_with(pagination_response)
     def get(self):
         """获取项目列表（支持状态过滤和搜索）"""
@@ -778,6 +807,10 @@ class MediaUpload(Resource):
         - 图片: jpg, jpeg, png, gif (最大 5MB)
         - 文档: pdf (最大 50MB)
         
+        上传内容按 SHA-256 存储为 /media/<类型>/<前两位>/<sha256>.<扩展名>，同类型重复内容返回已有路径；
+        图片在后台进程池中缩放和重新编码，processing_status 为 pending 时可通过 /api/media/status 查询；
+        带 wait=1 时等待处理完成再返回
+        
         **响应示例**:
         ```json
         {
@@ -787,7 +820,8 @@ class MediaUpload(Resource):
             "file_path": "/media/other/filename.jpg",
             "file_url": "http://localhost:8000/api/media/serve/other/filename.jpg",
             "file_name": "filename.jpg",
-            "file_size": 1024000
+            "file_size": 1024000,
+            "processing_status": "pending"
           }
         }
         ```
@@ -798,9 +832,92 @@ class MediaUpload(Resource):
 class MediaServe(Resource):
     @ns_media.doc('获取文件')
     @ns_media.param('file_path', '文件路径', _in='path')
+    @ns_media.param('Range', '分段请求，如 bytes=0-1023', _in='header')
+    @ns_media.param('If-None-Match', '条件请求 ETag', _in='header')
+    @ns_media.param('w', '图片最大宽度：64/128/256/480/768/1280/1920', _in='query', type=int)
+    @ns_media.param('h', '图片最大高度，取值同 w', _in='query', type=int)
+    @ns_media.param('fit', 'contain（默认，等比缩放）或 cover（居中裁剪，需同时指定 w 和 h）', _in='query')
+    @ns_media.param('fmt', '输出格式：webp / jpeg，默认与原图相同', _in='query')
+    @ns_media.response(206, '分段内容')
+    @ns_media.response(304, '未修改')
+    @ns_media.response(400, '图片尺寸参数无效')
+    @ns_media.response(404, '文件不存在')
+    @ns_media.response(416, '请求范围无效')
+    def get(self, file_path):
+        """获取上传的文件（图片、PDF等）；图片可按 w/h/fit/fmt 返回缩放后的衍生图；uuid 命名的文件返回 immutable 长期缓存头"""
+        pass
+
+@ns_media.route('/status/<path:file_path>')
+class MediaProcessingStatus(Resource):
+    @ns_media.doc('获取图片处理状态', security='Bearer')
+    @ns_media.param('file_path', '文件路径（不含 /media/ 前缀）', _in='path')
+    @ns_media.marshal_with(base_response)
+    @ns_media.response(401, '未认证')
     @ns_media.response(404, '文件不存在')
     def get(self, file_path):
-        """获取上传的文件（图片、PDF等）"""
+        """获取上传图片的后台处理状态：pending / ready / failed，及处理后的宽高"""
+        pass
+
+upload_create_model = api.model('UploadCreate', {
+    'filename': fields.String(required=True, description='文件名', example='paper.pdf'),
+    'size': fields.Integer(required=True, description='文件大小（字节）', example=31457280),
+    'type': fields.String(description='上传用途', example='paper', default='paper')
+})
+
+@ns_media.route('/uploads')
+class MediaUploads(Resource):
+    @ns_media.doc('创建分块上传', security='Bearer')
+    @ns_media.expect(upload_create_model)
+    @ns_media.marshal_with(base_response, code=201)
+    @ns_media.response(400, '文件类型或大小无效')
+    @ns_media.response(401, '未认证')
+    def post(self):
+        """创建分块断点续传上传，返回 upload_id、offset 及建议的 chunk_size；完成后以 paper_file_upload_id 关联到论文"""
+        pass
+
+@ns_media.route('/uploads/<upload_id>')
+class MediaUpload(Resource):
+    @ns_media.doc('获取上传状态', security='Bearer')
+    @ns_media.marshal_with(base_response)
+    @ns_media.response(404, '上传不存在或已过期')
+    def get(self, upload_id):
+        """获取上传状态，断线后从返回的 offset 继续上传"""
+        pass
+    
+    @ns_media.doc('上传分块', security='Bearer')
+    @ns_media.param('Upload-Offset', '分块在文件中的起始位置，须等于当前 offset', _in='header', required=True)
+    @ns_media.marshal_with(base_response)
+    @ns_media.response(400, '超过声明的文件大小或连接中断（已写入部分保留）')
+    @ns_media.response(404, '上传不存在或已过期')
+    @ns_media.response(409, '分块偏移不一致')
+    def put(self, upload_id):
+        """上传分块：请求体为分块内容（application/octet-stream），边接收边写入磁盘"""
+        pass
+    
+    @ns_media.doc('取消上传', security='Bearer')
+    @ns_media.marshal_with(base_response)
+    @ns_media.response(404, '上传不存在或已过期')
+    def delete(self, upload_id):
+        """取消上传并删除已接收的部分"""
+        pass
+
+@ns_media.route('/uploads/<upload_id>/complete')
+class MediaUploadComplete(Resource):
+    @ns_media.doc('完成分块上传', security='Bearer')
+    @ns_media.marshal_with(base_response)
+    @ns_media.response(400, '上传未完成')
+    @ns_media.response(404, '上传不存在或已过期')
+    def post(self, upload_id):
+        """所有分块接收后存入内容寻址存储，返回 file_path 和 sha256"""
+        pass
+
+@ns_media.route('/stats')
+class MediaStorageStats(Resource):
+    @ns_media.doc('获取存储统计', security='Bearer')
+    @ns_media.marshal_with(base_response)
+    @ns_media.response(401, '未认证')
+    def get(self):
+        """按 SHA-256 去重存储的统计：当前文件数和大小、上传次数、命中去重次数、省去的存储量和写入耗时"""
         pass
 
 @ns_media.route('/info/<path:file_path>')
@@ -829,6 +946,8 @@ class EditRecordList(Resource):
     @ns_edit_record.param('page', '页码', type='int', default=1)
     @ns_edit_record.param('per_page', '每页数量', type='int', default=10)
     @ns_edit_record.param('all', '获取全部数据', type='string', enum=['true', 'false'])
+    @ns_edit_record.param('cursor', '游标分页：首页传空值，之后传上次返回的 next_cursor/prev_cursor', type='string')
+    @ns_edit_record.param('with_total', '游标分页时是否返回总数', type='string', enum=['true', 'false'])
     @ns_edit_record.param('admin_id', '操作管理员ID过滤', type='int')
     @ns_edit_record.param('operation_type', '操作类型过滤', type='string', enum=['CREATE', 'UPDATE', 'DELETE'])
     @ns_edit_record.param('table_name', '表名过滤', type='string')
@@ -841,10 +960,12 @@ class EditRecordList(Resource):
         """
         获取操作审计记录
         
-        记录所有管理员的 CRUD 操作，包括：
-        - 操作时间、操作人、操作类型
-        - 涉及的表和记录ID
-        - 操作前后的数据对比
+        记录所有管理员的 CRUD 操作，列表返回摘要投影：
+        - 操作时间、操作人（admin_name）、操作类型、模块
+        - edit_summary：写入时生成的内容摘要（对象名称、ID、变更字段）
+        
+        列表不含 edit_content，完整的操作前后数据对比通过详情接口获取；
+        超过保留期已归档的记录排在数据库中的记录之后，分页和筛选对两者一致
         """
         pass
 
@@ -856,7 +977,19 @@ class EditRecord(Resource):
     @ns_edit_record.response(403, '权限不足')
     @ns_edit_record.response(404, '记录不存在')
     def get(self, record_id):
-        """获取指定编辑记录的详细信息"""
+        """获取指定编辑记录的详细信息（含解码后的完整 edit_content）"""
+        pass
+
+@ns_edit_record.route('/journal')
+class EditRecordJournal(Resource):
+    @ns_edit_record.doc('获取审计写后缓冲状态', security='Bearer')
+    @ns_edit_record.marshal_with(base_response)
+    @ns_edit_record.response(401, '未认证')
+    def get(self):
+        """
+        AUDIT_WRITE_BEHIND 开启时审计记录先写入本地日志，由后台线程批量写入数据库；
+        返回本进程的积压记录数（backlog_records）、最早未写入记录的等待时间（flush_lag_seconds）及累计计数
+        """
         pass
 
 # ==================== 资源管理接口 ====================
@@ -867,10 +1000,10 @@ class ResourceList(Resource):
     @ns_resource.param('page', '页码', type='int', default=1)
     @ns_resource.param('per_page', '每页数量', type='int', default=20)
     @ns_resource.param('all', '获取全部数据', type='string', enum=['true', 'false'])
-    @ns_resource.param('q', '搜索关键词（资源名称、描述）', type='string')
+    @ns_resource.param('q', '全文检索关键词（资源名称、描述），结果按相关度排序并返回 highlight 高亮片段', type='string')
     @ns_resource.param('resource_type', '资源类型过滤', type='int')
     @ns_resource.param('availability_status', '可用状态过滤', type='int')
-    @ns_resource.param('sort_by', '排序字段', type='string', default='created_time')
+    @ns_resource.param('sort_by', '排序字段（created_time/resource_name_zh；搜索时默认 relevance）', type='string')
     @ns_resource.param('order', '排序顺序', type='string', enum=['asc', 'desc'], default='desc')
     @ns_resource.marshal_with(pagination_response)
     def get(self):
@@ -892,7 +1025,7 @@ class AdminResourceList(Resource):
     @ns_resource.param('page', '页码', type='int', default=1)
     @ns_resource.param('per_page', '每页数量', type='int', default=20)
     @ns_resource.param('all', '获取全部数据', type='string', enum=['true', 'false'])
-    @ns_resource.param('q', '搜索关键词', type='string')
+    @ns_resource.param('q', '全文检索关键词，结果按相关度排序并返回 highlight 高亮片段', type='string')
     @ns_resource.param('resource_type', '资源类型过滤', type='int')
     @ns_resource.param('availability_status', '可用状态过滤', type='int')
     @ns_resource.marshal_with(pagination_response)
@@ -1026,6 +1159,45 @@ class ImageCleanup(Resource):
         """清理系统中未被使用的图片文件"""
         pass
 
+# ==================== 站内搜索接口 ====================
+
+@ns_search.route('')
+class SiteSearch(Resource):
+    @ns_search.doc('站内统一搜索')
+    @ns_search.param('q', '搜索关键词（空白分隔的检索词须全部命中；中文按二元组、英文按单词前缀匹配）', type='string', required=True)
+    @ns_search.param('types', '结果类型，逗号分隔（member,paper,news,project,research_group,resource），默认全部', type='string')
+    @ns_search.param('limit', '返回结果数（最多 50）', type='int', default=20)
+    @ns_search.marshal_with(base_response)
+    @ns_search.response(400, '关键词为空或类型无效')
+    def get(self):
+        """
+        一次请求检索成员、论文、新闻、项目、课题组和资源，按相关度排序
+        
+        **响应示例**:
+        ```json
+        {
+          "code": 0,
+          "message": "OK",
+          "data": {
+            "q": "深度学习",
+            "items": [
+              {
+                "type": "paper",
+                "id": 12,
+                "title_zh": "基于深度学习的图像分割",
+                "title_en": "Deep Learning Based Image Segmentation",
+                "score": 3.2156,
+                "highlight": {"title_zh": "基于<mark>深度学习</mark>的图像分割"}
+              }
+            ],
+            "total": 3,
+            "counts": {"paper": 2, "news": 1}
+          }
+        }
+        ```
+        """
+        pass
+
 # ==================== 系统接口 ====================
 
 @ns_system.route('/health')
@@ -1052,6 +1224,37 @@ class SystemHealth(Resource):
         """
         pass
 
+@ns_system.route('/api/cache/stats')
+class SystemCacheStats(Resource):
+    @ns_system.doc('响应缓存统计', security='Bearer')
+    @ns_system.marshal_with(base_response)
+    @ns_system.response(401, '未认证')
+    def get(self):
+        """
+        获取公开接口响应缓存的命中统计（当前工作进程）
+        
+        **响应示例**:
+        ```json
+        {
+          "code": 0,
+          "message": "OK",
+          "data": {
+            "enabled": true,
+            "response_cache": {
+              "backend": "SharedLocalBackend",
+              "pid": 12,
+              "hits": 120,
+              "misses": 8,
+              "hit_rate": 0.9375,
+              "entries": 8,
+              "ttl": 300
+            }
+          }
+        }
+        ```
+        """
+        pass
+
 @ns_system.route('/api-info')
 class SystemApiInfo(Resource):
     @ns_system.doc('API信息页面')
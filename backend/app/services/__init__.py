@@ -18,7 +18,9 @@ from .research_group_service import ResearchGroupService
 from .paper_service import PaperService
 from .admin_service import AdminService
 from .media_service import MediaService
+from .upload_service import UploadService
 from .image_upload_service import ImageUploadService
+from .search_service import SearchService
 
 __all__ = [
     'BaseService',
@@ -32,5 +34,7 @@ __all__ = [
     'PaperService',
     'AdminService',
     'MediaService',
-    'ImageUploadService'
+    'UploadService',
+    'ImageUploadService',
+    'SearchService'
 ]
\ No newline at end of file
@@ -35,7 +35,7 @@ class AdminService(BaseService):
         
         # 分頁
         page, per_page = get_pagination_params()
-        return paginate_query(query, page, per_page)
+        return paginate_query(query, page, per_page, count_module=self.get_module_name())
     
     def create_admin(self, admin_data: Dict[str, Any]) -> Dict[str, Any]:
         """創建管理員"""
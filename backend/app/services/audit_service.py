@@ -1,9 +1,12 @@
-from typing import Dict, Any, Optional
+import math
+from itertools import islice
+from typing import Callable, Dict, Any, List, Optional
 from flask import g
 from datetime import datetime, timezone
 from app import db
-from app.models import EditRecord
-from .base_service import BaseService
+from app.models import EditRecord, EditRecordEntity
+from .base_service import BaseService, NotFoundError, ValidationError
+from app.utils import audit_archive, audit_journal, audit_payload
 from app.utils.messages import msg
 
 
@@ -35,6 +38,18 @@ class AuditService(BaseService):
         'resource': 9
     }
     
+    # 操作歷史接口的對象類型（URL 中的名稱）對應的模組名稱
+    HISTORY_ENTITIES = {
+        'admins': 'admin',
+        'labs': 'lab',
+        'research-groups': 'research_group',
+        'members': 'member',
+        'papers': 'paper',
+        'news': 'news',
+        'projects': 'project',
+        'resources': 'resource'
+    }
+    
     # 操作類型枚舉
     OPERATION_TYPES = [
         'CREATE', 'UPDATE', 'DELETE',
@@ -66,7 +81,8 @@ class AuditService(BaseService):
                      module_name: str,
                      operation: str, 
                      content: Dict[str, Any] = None,
-                     admin_id: Optional[int] = None) -> EditRecord:
+                     admin_id: Optional[int] = None,
+                     entity_ids: Optional[List[int]] = None) -> EditRecord:
         """
         記錄操作日誌
         
@@ -75,6 +91,7 @@ class AuditService(BaseService):
             operation: 操作類型
             content: 操作內容
             admin_id: 管理員ID
+            entity_ids: 操作對象ID，默認從操作內容中提取（見 audit_payload.entity_ids）
             
         Returns:
             EditRecord: 創建的審計記錄
@@ -106,7 +123,18 @@ class AuditService(BaseService):
         
         if content:
             record.set_content(content)
+        if entity_ids is None:
+            entity_ids = audit_payload.entity_ids(module_id, content)
+        
+        # 寫後緩衝：事務提交後寫入本地日誌，由後台線程批量插入（返回的記錄不在會話中）
+        if audit_journal.enabled():
+            audit_journal.enqueue(db.session, audit_journal.make_row(
+                admin_id, operation, module_id, record.edit_content, record.edit_summary, entity_ids
+            ))
+            return record
         
+        if entity_ids:
+            record.set_entities(entity_ids)
         db.session.add(record)
         return record
     
@@ -203,6 +231,10 @@ class AuditService(BaseService):
         """
         獲取審計記錄列表
         
+        返回摘要投影（不含 edit_content）：管理員名稱由一條 JOIN 取得，摘要在寫入時預先生成，
+        一頁記錄只需計數和分頁兩條查詢且無需解碼內容；完整內容由 get_audit_record 返回。
+        edit_records 之後接續歸檔中的記錄（見 app.utils.audit_archive），頁碼和游標分頁均跨越兩者
+        
         Args:
             filters: 篩選條件
             page: 頁碼
@@ -212,6 +244,8 @@ class AuditService(BaseService):
             Dict: 分頁後的審計記錄
         """
         from app.utils.helpers import paginate_query
+        from app.utils.projection import serialize_row
+        from app.models import Admin
         
         query = EditRecord.query
         
@@ -238,4 +272,190 @@ class AuditService(BaseService):
         # 按時間倒序排序
         query = query.order_by(EditRecord.edit_date.desc())
         
-        return paginate_query(query, page, per_page)
\ No newline at end of file
+        columns = {
+            'edit_id': EditRecord.edit_id,
+            'admin_id': EditRecord.admin_id,
+            'admin_name': Admin.admin_name,
+            'edit_type': EditRecord.edit_type,
+            'edit_module': EditRecord.edit_module,
+            'edit_date': EditRecord.edit_date,
+            'edit_summary': EditRecord.edit_summary
+        }
+        keys = list(columns)
+        query = query.outerjoin(Admin, Admin.admin_id == EditRecord.admin_id).with_entities(
+            *[column.label(key) for key, column in columns.items()]
+        )
+        
+        def _serializer(rows):
+            items = [serialize_row(row, keys) for row in rows]
+            for item in items:
+                # 與 EditRecord.to_dict 一致，明確標示 UTC 時區
+                item['edit_date'] += '+00:00'
+            return items
+        
+        # 游標分頁按 (edit_date, edit_id) 定位，對應 ix_edit_record_module_date 索引
+        keyset = [(EditRecord.edit_date, True), (EditRecord.edit_id, True)]
+        result = paginate_query(query, page, per_page, serializer=_serializer, keyset=keyset)
+        
+        archived_total = audit_archive.count(filters)
+        if not archived_total:
+            return result
+        return self._merge_archived(result, filters, page, per_page, keyset, archived_total, audit_archive.to_item)
+    
+    def _merge_archived(self, result: Dict[str, Any], filters: Optional[Dict[str, Any]], page: Optional[int],
+                        per_page: Optional[int], keyset: list, archived_total: int,
+                        to_item: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """在表中記錄的分頁結果後接續歸檔記錄，to_item 把歸檔記錄轉為結果項"""
+        if 'next_cursor' in result:
+            return self._merge_archived_cursor(result, filters, per_page, keyset, archived_total, to_item)
+        return self._merge_archived_page(result, filters, page, per_page, archived_total, to_item)
+    
+    def _merge_archived_page(self, result: Dict[str, Any], filters: Optional[Dict[str, Any]],
+                             page: Optional[int], per_page: Optional[int], archived_total: int,
+                             to_item: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """頁碼分頁：表中的記錄排在前，當前頁不足時用歸檔記錄補齊"""
+        if page is None and per_page is None:
+            result['items'].extend(to_item(row) for row in audit_archive.scan(filters))
+            result['total'] = len(result['items'])
+            return result
+        
+        hot_total = result['total']
+        total = hot_total + archived_total
+        missing = per_page - len(result['items'])
+        if missing > 0:
+            skip = max(0, (page - 1) * per_page - hot_total)
+            result['items'].extend(to_item(row) for row in audit_archive.fetch(filters, skip, missing))
+        result.update({
+            'total': total,
+            'pages': math.ceil(total / per_page) if per_page else 0,
+            'has_next': page * per_page < total
+        })
+        return result
+    
+    def _merge_archived_cursor(self, result: Dict[str, Any], filters: Optional[Dict[str, Any]],
+                               per_page: int, keyset: list, archived_total: int,
+                               to_item: Callable[[Dict[str, Any]], Dict[str, Any]]) -> Dict[str, Any]:
+        """游標分頁：表中與歸檔中位於游標之後的記錄按 (edit_date, edit_id) 歸併"""
+        from flask import request
+        from app.utils.helpers import decode_cursor, encode_cursor
+        
+        direction, values = decode_cursor(request.args.get('cursor', ''), keyset)
+        backward = direction == 'prev'
+        after = tuple(values) if values is not None else None
+        hot_more = result['has_prev'] if backward else result['has_next']
+        
+        archived = [to_item(row) for row in
+                    islice(audit_archive.scan(filters, after, descending=not backward), per_page + 1)]
+        merged = sorted(result['items'] + archived, key=self._item_key, reverse=True)
+        more = hot_more or len(merged) > per_page
+        items = merged[-per_page:] if backward else merged[:per_page]
+        
+        has_next = True if backward else more
+        has_prev = more if backward else values is not None
+        result.update({
+            'items': items,
+            'has_prev': has_prev and bool(items),
+            'has_next': has_next and bool(items),
+            'prev_cursor': encode_cursor('prev', self._item_key(items[0])) if has_prev and items else None,
+            'next_cursor': encode_cursor('next', self._item_key(items[-1])) if has_next and items else None
+        })
+        if 'total' in result:
+            result['total'] += archived_total
+        return result
+    
+    def get_entity_history(self,
+                           entity: str,
+                           entity_id: int,
+                           page: Optional[int] = 1,
+                           per_page: Optional[int] = 10,
+                           include_archived: bool = False) -> Dict[str, Any]:
+        """
+        獲取某個對象的操作歷史（含字段級差異）
+        
+        按 edit_record_entities 的 (edit_module, entity_id, edit_date) 索引定位記錄，
+        一頁記錄只需計數和分頁兩條查詢，只解碼當前頁的內容
+        
+        Args:
+            entity: 對象類型（HISTORY_ENTITIES 中的鍵，如 members）
+            entity_id: 對象ID
+            page: 頁碼
+            per_page: 每頁數量
+            include_archived: 是否包含已歸檔的記錄（需讀取含該模組記錄的歸檔分區）
+            
+        Returns:
+            Dict: 分頁後的操作歷史，每項的 changes 為 [{'field', 'old', 'new'}]
+            
+        Raises:
+            ValidationError: 未知的對象類型
+        """
+        from app.utils.helpers import paginate_query
+        from app.models import Admin
+        
+        if entity not in self.HISTORY_ENTITIES:
+            raise ValidationError(msg.get_error_message('UNKNOWN_MODULE', module_name=entity))
+        module_id = self.MODULE_MAPPING[self.HISTORY_ENTITIES[entity]]
+        
+        columns = [EditRecord.edit_id, EditRecord.admin_id, Admin.admin_name, EditRecord.edit_type,
+                   EditRecord.edit_module, EditRecord.edit_date, EditRecord.edit_summary, EditRecord.edit_content]
+        query = EditRecordEntity.query.join(
+            EditRecord, EditRecord.edit_id == EditRecordEntity.edit_id
+        ).outerjoin(
+            Admin, Admin.admin_id == EditRecord.admin_id
+        ).filter(
+            EditRecordEntity.edit_module == module_id,
+            EditRecordEntity.entity_id == entity_id
+        ).order_by(
+            EditRecordEntity.edit_date.desc(), EditRecordEntity.edit_id.desc()
+        ).with_entities(*columns)
+        
+        def _serializer(rows):
+            return [self._history_item(dict(row._mapping)) for row in rows]
+        
+        keyset = [(EditRecordEntity.edit_date, True), (EditRecordEntity.edit_id, True)]
+        result = paginate_query(query, page, per_page, serializer=_serializer, keyset=keyset)
+        if not include_archived:
+            return result
+        
+        filters = {'edit_module': module_id, 'entity_id': entity_id}
+        archived_total = audit_archive.count(filters)
+        if not archived_total:
+            return result
+        return self._merge_archived(result, filters, page, per_page, keyset, archived_total, self._history_item)
+    
+    @staticmethod
+    def _history_item(row: Dict[str, Any]) -> Dict[str, Any]:
+        """操作歷史項：摘要投影加上解碼內容得到的字段級差異"""
+        item = audit_archive.to_item(row)
+        item['changes'] = audit_payload.field_changes(row['edit_type'], audit_payload.decode(row.get('edit_content')))
+        return item
+    
+    @staticmethod
+    def _item_key(item: Dict[str, Any]) -> tuple:
+        """列表項的游標鍵 (edit_date, edit_id)，edit_date 為無時區的 UTC 時間"""
+        return datetime.fromisoformat(item['edit_date']).replace(tzinfo=None), item['edit_id']
+    
+    def get_audit_record(self, edit_id: int) -> Dict[str, Any]:
+        """
+        獲取單條審計記錄（含解碼後的完整內容），表中沒有時查找歸檔
+        
+        Raises:
+            NotFoundError: 記錄不存在
+        """
+        from app.models import Admin
+        
+        record = self.db.session.get(EditRecord, edit_id)
+        if record is not None:
+            return record.to_dict()
+        
+        row = audit_archive.get(edit_id)
+        if row is None:
+            raise NotFoundError(msg.get_error_message('EDIT_RECORD_NOT_FOUND'))
+        admin = self.db.session.get(Admin, row['admin_id']) if row['admin_id'] is not None else None
+        item = audit_archive.to_item(row)
+        item.pop('admin_name')
+        item.update({
+            'edit_content': audit_payload.decode(row.get('edit_content')),
+            'admin': admin.to_dict() if admin else None,
+            'archived': True
+        })
+        return item
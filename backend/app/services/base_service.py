@@ -4,6 +4,9 @@ from flask import g
 from app import db
 from app.models import EditRecord
 from app.utils.messages import msg
+from app.utils import audit_payload
+from app.utils.count_cache import invalidate_counts
+from app.utils.response_cache import invalidate_responses
 
 
 class ServiceException(Exception):
@@ -99,17 +102,27 @@ class BaseService(ABC):
             # 執行業務操作
             result = operation_func()
             
+            # 操作內容中沒有對象ID時（如創建），從返回的對象中提取
+            entity_ids = None
+            if isinstance(result, dict) and not audit_payload.entity_ids(self.get_module_id(), content):
+                entity_ids = audit_payload.entity_ids(self.get_module_id(), result) or None
+            
             # 創建審計記錄
             self.audit_service.log_operation(
                 module_name=self.get_module_name(),
                 operation=operation_type,
                 content=content or {},
-                admin_id=admin_id
+                admin_id=admin_id,
+                entity_ids=entity_ids
             )
             
             # 提交事務
             self.db.session.commit()
             
+            # 使本模組的緩存分頁總數和公開響應緩存失效
+            invalidate_counts(self.get_module_name())
+            invalidate_responses(self.get_module_name())
+            
             return result
             
         except Exception as e:
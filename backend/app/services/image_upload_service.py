@@ -1,12 +1,34 @@
-import os
 import re
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from flask import current_app
+from sqlalchemy import delete, select, update
 from app.models import UploadedImage
+from app.utils.file_handler import delete_file
+from app.utils.media_store import mark_released, referenced_paths, unlink_stored
 from app.utils.messages import msg
 from .base_service import BaseService, ValidationError, NotFoundError
 
+# 清理未使用圖片時每批處理的記錄數、刪除文件的線程數
+CLEANUP_BATCH_SIZE = 500
+CLEANUP_WORKERS = 8
+# 清理結果中列出的文件名數上限，計數不受限制
+CLEANUP_REPORT_LIMIT = 1000
+
+
+def description_columns():
+    """可插入描述圖片的字段：{實體類型: (模型, 字段名)}"""
+    from app.models import Lab, Member, Paper, Project, ResearchGroup, Resource
+    return {
+        'lab': (Lab, ('lab_desc_zh', 'lab_desc_en')),
+        'member': (Member, ('mem_desc_zh', 'mem_desc_en')),
+        'paper': (Paper, ('paper_desc_zh', 'paper_desc_en')),
+        'project': (Project, ('project_desc_zh', 'project_desc_en')),
+        'research_group': (ResearchGroup, ('research_group_desc_zh', 'research_group_desc_en')),
+        'resource': (Resource, ('resource_description_zh', 'resource_description_en')),
+    }
+
 
 class ImageUploadService(BaseService):
     """
@@ -59,6 +81,11 @@ class ImageUploadService(BaseService):
                     clean_path = file_path
                 file_url = f"/api/media/serve/{clean_path}"
                 
+                # 相同內容已上傳過：沿用已有記錄
+                existing = UploadedImage.query.filter_by(file_path=file_path).first()
+                if existing:
+                    return existing.to_dict()
+                
                 # 獲取文件信息
                 file_size = self._get_file_size(file)
                 mime_type = self._get_mime_type(file.filename)
@@ -104,79 +131,183 @@ class ImageUploadService(BaseService):
     
     def mark_images_as_used(self, content: str, entity_type: str, entity_id: int, field_name: str) -> None:
         """
-        標記markdown內容中使用的圖片為已使用狀態
+        同步描述字段引用的圖片的使用狀態
+        
+        一條 IN 查詢取出內容中引用的圖片和此前關聯到該字段的圖片，比較後批量更新：
+        新引用的標記為已使用並關聯到該字段，不再引用的標記為未使用（由 cleanup_unused_images 清理），
+        狀態未變的不寫入。不再引用但仍插入在其他描述字段（如同一實體的另一語言）中的圖片保持已使用，
+        改為關聯到該字段。不提交事務，隨調用方的事務一起提交或回滾
         
         Args:
-            content: markdown內容
+            content: markdown內容（為空時該字段此前引用的圖片全部標記為未使用）
             entity_type: 實體類型
             entity_id: 實體ID  
             field_name: 字段名稱
         """
-        if not content:
-            return
-        
-        # 提取markdown中的圖片URL
-        image_urls = self._extract_image_urls_from_markdown(content)
-        
-        for url in image_urls:
-            # 從URL中提取文件路徑
+        file_paths = set()
+        for url in self._extract_image_urls_from_markdown(content or ''):
             file_path = self._extract_file_path_from_url(url)
             if file_path:
-                # 查找對應的上傳記錄
-                uploaded_image = UploadedImage.query.filter_by(file_path=file_path).first()
-                if uploaded_image:
-                    # 更新使用狀態
-                    uploaded_image.is_used = True
-                    uploaded_image.used_at = datetime.utcnow()
-                    uploaded_image.entity_type = entity_type
-                    uploaded_image.entity_id = entity_id
-                    uploaded_image.field_name = field_name
+                file_paths.add(file_path)
+        
+        attachment = (entity_type, entity_id, field_name)
+        attached = self.db.and_(
+            UploadedImage.entity_type == entity_type,
+            UploadedImage.entity_id == entity_id,
+            UploadedImage.field_name == field_name,
+            UploadedImage.is_used == True
+        )
+        condition = self.db.or_(attached, UploadedImage.file_path.in_(file_paths)) if file_paths else attached
+        rows = self.db.session.execute(
+            select(UploadedImage.image_id, UploadedImage.file_path, UploadedImage.is_used,
+                   UploadedImage.entity_type, UploadedImage.entity_id, UploadedImage.field_name)
+            .where(condition)
+        ).all()
+        
+        used_ids, unused_ids = [], []
+        for row in rows:
+            if row.file_path in file_paths:
+                if not row.is_used or (row.entity_type, row.entity_id, row.field_name) != attachment:
+                    used_ids.append(row.image_id)
+            else:
+                unused_ids.append(row.image_id)
+        
+        now = datetime.utcnow()
+        if unused_ids:
+            unused = set(unused_ids)
+            removed = {row.image_id: row.file_path for row in rows if row.image_id in unused}
+            elsewhere = self._description_references(set(removed.values()), attachment)
+            for image_id, file_path in removed.items():
+                if file_path not in elsewhere:
+                    continue
+                unused_ids.remove(image_id)
+                other_type, other_id, other_field = elsewhere[file_path]
+                self.db.session.execute(
+                    update(UploadedImage).where(UploadedImage.image_id == image_id).values(
+                        entity_type=other_type, entity_id=other_id, field_name=other_field, updated_at=now
+                    ).execution_options(synchronize_session=False)
+                )
+        if used_ids:
+            self.db.session.execute(
+                update(UploadedImage).where(UploadedImage.image_id.in_(used_ids)).values(
+                    is_used=True, used_at=now, entity_type=entity_type, entity_id=entity_id,
+                    field_name=field_name, updated_at=now
+                ).execution_options(synchronize_session=False)
+            )
+        if unused_ids:
+            self.db.session.execute(
+                update(UploadedImage).where(UploadedImage.image_id.in_(unused_ids)).values(
+                    is_used=False, used_at=None, updated_at=now
+                ).execution_options(synchronize_session=False)
+            )
+    
+    def _description_references(self, file_paths: Set[str], exclude: Tuple) -> Dict[str, Tuple]:
+        """
+        仍插入在描述字段中的圖片：{存儲路徑: 首個引用它的 (實體類型, 實體ID, 字段名)}
         
-        self.db.session.commit()
+        每個實體表一條查詢，按相對路徑匹配（/api/media/serve/ 和 /media/ 兩種URL都包含相對路徑），
+        不計 exclude 指定的字段（正在保存的字段）；包括軟刪除的記錄
+        """
+        relative = {file_path: file_path[len('/media/'):] for file_path in file_paths if file_path.startswith('/media/')}
+        references = {}
+        if not relative:
+            return references
+        for entity_type, (model, fields) in description_columns().items():
+            columns = [getattr(model, field) for field in fields]
+            rows = self.db.session.execute(
+                select(model.__mapper__.primary_key[0], *columns).where(self.db.or_(*(
+                    column.contains(path, autoescape=True) for column in columns for path in relative.values()
+                )))
+            ).all()
+            for row in rows:
+                for field, text in zip(fields, row[1:]):
+                    reference = (entity_type, row[0], field)
+                    if not text or reference == exclude:
+                        continue
+                    for file_path, path in relative.items():
+                        if path in text:
+                            references.setdefault(file_path, reference)
+        return references
     
-    def cleanup_unused_images(self, older_than_hours: int = 24) -> Dict[str, Any]:
+    def cleanup_unused_images(self, older_than_hours: int = 24, batch_size: int = CLEANUP_BATCH_SIZE,
+                              workers: int = CLEANUP_WORKERS) -> Dict[str, Any]:
         """
         清理未使用的圖片
         
+        按 ix_uploaded_images_unused 的順序分批處理：每批一條 DELETE 刪除記錄並單獨提交，
+        提交後在線程池中刪除不再被其他字段引用的文件。中斷後重新執行會從剩餘的記錄繼續，
+        提交後未來得及刪除的文件由 scripts/maintenance/media_gc.py 清理。
+        不依賴請求上下文，可由 scripts/maintenance/cleanup_unused_images.py 定時執行
+        
         Args:
             older_than_hours: 清理多少小時前的未使用圖片
+            batch_size: 每批處理的記錄數
+            workers: 刪除文件的線程數
         """
         # 驗證權限
         self.validate_permissions('DELETE')
         
         cutoff_time = datetime.utcnow() - timedelta(hours=older_than_hours)
-        
-        # 查找未使用的圖片
-        unused_images = UploadedImage.query.filter(
+        unused = (
             UploadedImage.is_used == False,
             UploadedImage.created_at < cutoff_time
-        ).all()
+        )
         
+        app = current_app._get_current_object()
         deleted_count = 0
         deleted_files = []
+        removed_files = 0
+        failed_files = []
         
-        for image in unused_images:
-            try:
-                # 刪除物理文件
-                upload_folder = current_app.config['UPLOAD_FOLDER']
-                full_path = os.path.join(upload_folder, image.file_path.lstrip('/media/'))
+        def _unlink(file_path: str) -> Optional[bool]:
+            """刪除文件，返回是否已刪除（近期命中去重而保留時為 False），失敗時返回 None"""
+            with app.app_context():
+                try:
+                    return unlink_stored(file_path)
+                except OSError as e:
+                    app.logger.error(f'刪除未使用圖片失敗: {file_path}, 錯誤: {str(e)}')
+                    return None
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            while True:
+                rows = self.db.session.execute(
+                    select(UploadedImage.image_id, UploadedImage.file_path, UploadedImage.filename)
+                    .where(*unused)
+                    .order_by(UploadedImage.created_at, UploadedImage.image_id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
                 
-                if os.path.exists(full_path):
-                    os.remove(full_path)
+                # 查詢後被標記為已使用的記錄不刪除
+                result = self.db.session.execute(
+                    delete(UploadedImage)
+                    .where(UploadedImage.image_id.in_([row.image_id for row in rows]), *unused)
+                    .execution_options(synchronize_session=False)
+                )
+                # 相同內容的文件可能仍被其他字段引用
+                file_paths = {row.file_path for row in rows}
+                unreferenced = file_paths - referenced_paths(self.db.session, file_paths)
+                mark_released(self.db.session, unreferenced)
+                self.db.session.commit()
                 
-                # 刪除數據庫記錄
-                self.db.session.delete(image)
-                deleted_files.append(image.filename)
-                deleted_count += 1
+                deleted_count += result.rowcount
+                deleted_files.extend(row.filename for row in rows[:CLEANUP_REPORT_LIMIT - len(deleted_files)])
+                unreferenced = list(unreferenced)
+                for file_path, removed in zip(unreferenced, executor.map(_unlink, unreferenced)):
+                    if removed is None:
+                        failed_files.append(file_path)
+                    elif removed:
+                        removed_files += 1
                 
-            except Exception as e:
-                current_app.logger.error(f'刪除未使用圖片失敗: {image.filename}, 錯誤: {str(e)}')
-        
-        self.db.session.commit()
+                if len(rows) < batch_size:
+                    break
         
         return {
             'deleted_count': deleted_count,
             'deleted_files': deleted_files,
+            'removed_files': removed_files,
+            'failed_files': failed_files[:CLEANUP_REPORT_LIMIT],
             'cutoff_time': cutoff_time.isoformat()
         }
     
@@ -216,15 +347,9 @@ class ImageUploadService(BaseService):
         
         def _delete_operation():
             try:
-                # 刪除物理文件
-                upload_folder = current_app.config['UPLOAD_FOLDER']
-                full_path = os.path.join(upload_folder, uploaded_image.file_path.lstrip('/media/'))
-                
-                if os.path.exists(full_path):
-                    os.remove(full_path)
-                
-                # 刪除數據庫記錄
+                # 刪除數據庫記錄，物理文件在沒有其他引用時於提交後刪除
                 self.db.session.delete(uploaded_image)
+                delete_file(uploaded_image.file_path)
                 
                 return {'deleted_image_id': image_id}
                 
@@ -259,8 +384,10 @@ class ImageUploadService(BaseService):
     
     def _extract_file_path_from_url(self, url: str) -> Optional[str]:
         """從URL中提取文件路徑"""
-        if url.startswith('/api/media/serve'):
-            return url.replace('/api/media/serve', '')
+        # 去掉衍生圖參數（?w=...）
+        url = url.split('?', 1)[0].split('#', 1)[0]
+        if url.startswith('/api/media/serve/'):
+            return '/media/' + url[len('/api/media/serve/'):]
         elif url.startswith('/media/'):
             return url
         return None
@@ -36,7 +36,7 @@ class LabService(BaseService):
         if not lab:
             return self._get_default_lab_info()
         
-        return lab.to_dict()
+        return lab.to_dict(srcset=True)
     
     def _get_default_lab_info(self) -> Dict[str, Any]:
         """獲取默認實驗室信息"""
@@ -273,7 +273,7 @@ class LabService(BaseService):
                     update_data[field] = value
                     
                     # 處理描述字段的圖片管理
-                    if field in ['lab_desc_zh', 'lab_desc_en'] and value:
+                    if field in ['lab_desc_zh', 'lab_desc_en']:
                         image_upload_service = ImageUploadService()
                         image_upload_service.mark_images_as_used(
                             content=value,
@@ -1,11 +1,22 @@
+import mimetypes
 import os
-from typing import Dict, Any, Optional
-from flask import current_app
+import re
+from typing import Dict, Any, Mapping, Optional
+from urllib.parse import quote
+from flask import current_app, send_file
+from PIL import Image
 from werkzeug.utils import secure_filename
 from app.utils.file_handler import save_file, get_file_info, allowed_file
+from app.utils.image_derivatives import DerivativeSpec, parse_derivative_params, is_derivable, get_derivative
+from app.utils.image_pipeline import pending_path, processing_status_of
+from app.models import ImageTask, MediaObject
+from sqlalchemy import func, select
 from app.utils.messages import msg
 from .base_service import BaseService, ValidationError, NotFoundError
 
+# save_file 生成的文件名（內容的 SHA-256，或舊版本的 uuid4 十六進制），同一 URL 的內容不會改變
+IMMUTABLE_NAME_RE = re.compile(r'^(?:[0-9a-f]{64}|[0-9a-f]{32})\.[a-z0-9]+$')
+
 
 class MediaService(BaseService):
     """
@@ -56,7 +67,8 @@ class MediaService(BaseService):
                     'url': file_url,
                     'filename': secure_filename(file.filename),
                     'type': file_type,
-                    'category': file_category
+                    'category': file_category,
+                    'processing_status': processing_status_of(file_path)
                 }
                 
             except ValueError as e:
@@ -78,18 +90,95 @@ class MediaService(BaseService):
         
         return result
     
-    def serve_file(self, file_path: str) -> Dict[str, Any]:
-        """獲取文件服務信息"""
+    def serve_file(self, file_path: str, args: Optional[Mapping[str, Any]] = None):
+        """
+        返回文件響應
+
+        支持 Range 分段請求（PDF 閱讀器按需加載）和 If-None-Match / If-Modified-Since 條件請求。
+        save_file 以 uuid 命名的文件內容不會改變，標記為 immutable 並長期緩存；
+        其他文件每次用 ETag 重新驗證。
+
+        args 帶 w / h / fit / fmt 時發送圖片的衍生圖（見 app.utils.image_derivatives），
+        首次請求時生成並緩存在磁盤上，緩存策略與原圖相同。
+        後台處理尚未完成的圖片發送 _pending 下的原始文件，忽略尺寸參數且不長期緩存。
+
+        MEDIA_OFFLOAD 為 x-accel / x-sendfile 時只校驗路徑並返回對應響應頭，
+        由前端代理發送文件內容（含 Range 和條件請求），不佔用工作進程
+        """
+        resolved = self.resolve_file(file_path)
+        full_path = resolved['full_path']
+        # 後台處理完成前發送的原始文件會被替換，不能長期緩存
+        immutable = not resolved['pending'] and bool(IMMUTABLE_NAME_RE.match(os.path.basename(full_path)))
+        max_age = current_app.config.get('MEDIA_CACHE_MAX_AGE', 31536000) if immutable else 0
+
+        spec = self._parse_variant(file_path, args or {})
+        if spec is not None and not resolved['pending']:
+            full_path = self._get_derivative(full_path, spec)
+        # 代理轉發實際發送的文件（_pending 下的原始文件或衍生圖）
+        file_path = os.path.relpath(full_path, current_app.config['UPLOAD_FOLDER']).replace(os.sep, '/')
+
+        offload = current_app.config.get('MEDIA_OFFLOAD', 'none')
+        if offload == 'none':
+            response = send_file(full_path, conditional=True, etag=True, max_age=max_age)
+        else:
+            response = self._offload_response(file_path, full_path, offload)
+            response.cache_control.max_age = max_age
+        response.cache_control.public = True
+        if immutable:
+            response.cache_control.immutable = True
+        else:
+            response.cache_control.no_cache = True
+        return response
+    
+    def _parse_variant(self, file_path: str, args: Mapping[str, Any]) -> Optional[DerivativeSpec]:
+        """解析衍生圖參數，只有可縮放的圖片接受尺寸參數"""
+        try:
+            spec = parse_derivative_params(args, current_app.config.get('MEDIA_DERIVATIVE_SIZES', ()))
+        except ValueError as e:
+            raise ValidationError(msg.get_error_message('IMAGE_VARIANT_INVALID', error=str(e)))
+        if spec is not None and not is_derivable(file_path):
+            raise ValidationError(msg.get_error_message('IMAGE_VARIANT_INVALID', error='not a resizable image'))
+        return spec
+    
+    def _get_derivative(self, full_path: str, spec: DerivativeSpec) -> str:
+        """獲取（必要時生成）衍生圖"""
+        try:
+            return get_derivative(full_path, spec)
+        except (OSError, Image.DecompressionBombError) as e:
+            current_app.logger.error(f'衍生圖生成失敗: {full_path} {spec}: {str(e)}')
+            raise ValidationError(msg.format_file_error('IMAGE_PROCESS_FAILED', error=str(e)))
+    
+    def _offload_response(self, file_path: str, full_path: str, offload: str):
+        """構造交給前端代理發送文件的空響應"""
+        mimetype = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+        response = current_app.response_class(mimetype=mimetype)
+
+        if offload == 'x-accel':
+            # nginx internal location，指向 UPLOAD_FOLDER
+            prefix = current_app.config.get('MEDIA_ACCEL_PREFIX', '/protected-media/').rstrip('/')
+            response.headers['X-Accel-Redirect'] = f'{prefix}/{quote(file_path)}'
+        elif offload == 'x-sendfile':
+            response.headers['X-Sendfile'] = os.path.abspath(full_path)
+        else:
+            raise ValueError(f"Unknown MEDIA_OFFLOAD: {offload}")
+        return response
+    
+    def resolve_file(self, file_path: str) -> Dict[str, Any]:
+        """校驗文件路徑並返回其在上傳目錄中的位置"""
         # 安全檢查：確保路徑不包含危險字符
         if '..' in file_path or file_path.startswith('/'):
             raise ValidationError(msg.get_error_message('FILE_PATH_INVALID'))
         
         upload_folder = current_app.config['UPLOAD_FOLDER']
         full_path = os.path.join(upload_folder, file_path)
+        pending = False
         
-        # 檢查文件是否存在
+        # 檢查文件是否存在（後台處理完成前使用 _pending 下的原始文件）
         if not os.path.exists(full_path):
-            raise NotFoundError(msg.get_error_message('FILE_NOT_FOUND'))
+            full_path = pending_path(full_path)
+            pending = True
+            if not os.path.exists(full_path):
+                raise NotFoundError(msg.get_error_message('FILE_NOT_FOUND'))
         
         # 檢查是否為文件
         if not os.path.isfile(full_path):
@@ -102,7 +191,53 @@ class MediaService(BaseService):
         return {
             'directory': directory,
             'filename': filename,
-            'full_path': full_path
+            'full_path': full_path,
+            'pending': pending
+        }
+    
+    def get_processing_status(self, file_path: str) -> Dict[str, Any]:
+        """
+        獲取上傳圖片的後台處理狀態
+
+        Returns:
+            Dict: path, status（pending / ready / failed）, error, width, height
+        """
+        stored_path = f"/media/{file_path}"
+        task = ImageTask.query.filter_by(file_path=stored_path).first()
+        if task:
+            return {'path': stored_path, 'status': task.status, 'error': task.error,
+                    'width': task.width, 'height': task.height}
+        
+        # 沒有記錄的文件是同步處理或非圖片文件
+        self.resolve_file(file_path)
+        return {'path': stored_path, 'status': ImageTask.STATUS_READY, 'error': None, 'width': None, 'height': None}
+    
+    def get_storage_stats(self) -> Dict[str, Any]:
+        """
+        內容尋址存儲的去重統計
+
+        Returns:
+            Dict: objects / stored_bytes（當前存儲的文件）、uploads（上傳次數）、
+                dedup_hits（命中去重的上傳次數）、bytes_saved / store_seconds_saved（去重省去的存儲和寫入耗時）
+        """
+        duplicates = MediaObject.upload_count - 1
+        live = MediaObject.released_at.is_(None)
+        row = self.db.session.execute(select(
+            func.count().filter(live),
+            func.coalesce(func.sum(MediaObject.size).filter(live), 0),
+            func.coalesce(func.sum(MediaObject.upload_count), 0),
+            func.coalesce(func.sum(duplicates), 0),
+            func.coalesce(func.sum(MediaObject.size * duplicates), 0),
+            func.coalesce(func.sum(MediaObject.store_ms * duplicates), 0),
+        )).one()
+        objects, stored_bytes, uploads, dedup_hits, bytes_saved, store_ms_saved = row
+        return {
+            'objects': objects,
+            'stored_bytes': int(stored_bytes),
+            'uploads': int(uploads),
+            'dedup_hits': int(dedup_hits),
+            'bytes_saved': int(bytes_saved),
+            'store_seconds_saved': round(int(store_ms_saved) / 1000, 3)
         }
     
     def get_media_info(self, file_path: str) -> Dict[str, Any]:
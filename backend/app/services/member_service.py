@@ -1,8 +1,13 @@
+from datetime import datetime
 from typing import Optional, Dict, Any, List
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 from app.models import Member, ResearchGroup, Paper
 from app.utils.validators import validate_email, validate_string_length
 from app.utils.file_handler import save_file, delete_file
 from app.utils.helpers import get_pagination_params, paginate_query
+from app.utils.projection import get_list_fields, list_columns, paginate_projection
+from app.utils.fulltext import apply_fulltext
 from app.utils.messages import msg
 from .base_service import BaseService, ValidationError, NotFoundError, BusinessLogicError
 from .image_upload_service import ImageUploadService
@@ -25,6 +30,19 @@ class MemberService(BaseService):
     def get_module_name(self) -> str:
         return 'member'
     
+    # 列表可返回的字段（與 Member.to_dict 一致），research_group 為關聯字段
+    LIST_FIELDS = (
+        'mem_id', 'mem_avatar_path', 'mem_name_zh', 'mem_name_en',
+        'mem_desc_zh', 'mem_desc_en', 'mem_email', 'mem_type',
+        'job_type', 'student_type', 'student_grade',
+        'graduation_year', 'alumni_identity',
+        'destination_zh', 'destination_en',
+        'research_group_id', 'lab_id', 'enable', 'research_group'
+    )
+    
+    # 列表默認省略的長文本字段
+    LIST_LONG_FIELDS = ('mem_desc_zh', 'mem_desc_en')
+    
     def get_members_list(self, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         獲取成員列表
@@ -41,15 +59,31 @@ class MemberService(BaseService):
         if not filters or not filters.get('show_all', False):
             query = query.filter_by(enable=1)
         
+        # 搜索關鍵字（全文索引），搜索時默認按相關度排序
+        filters = dict(filters or {})
+        search = None
+        if filters.get('q'):
+            query, search = apply_fulltext(query, Member, filters['q'])
+        filters['sort_by'] = filters.get('sort_by') or ('relevance' if search else 'created_at')
+        
         # 應用篩選條件
-        query = self._apply_member_filters(query, filters or {})
+        query = self._apply_member_filters(query, filters)
         
         # 應用排序
-        query = self._apply_member_sorting(query, filters or {})
+        query = self._apply_member_sorting(query, filters, search)
+        keyset = self._get_member_keyset(filters)
         
         # 分頁
         page, per_page = get_pagination_params()
-        return paginate_query(query, page, per_page)
+        fields = get_list_fields(self.LIST_FIELDS, self.LIST_LONG_FIELDS, required=('mem_id',))
+        if fields is None:
+            # 預加載關聯，避免 to_dict() 逐行懶加載課題組
+            query = self._apply_member_eager_loading(query)
+            return paginate_query(query, page, per_page, keyset=keyset,
+                                  serializer=search.wrap_serializer() if search else None,
+                                  count_module=self.get_module_name())
+        
+        return self._paginate_member_rows(query, fields, page, per_page, keyset, search)
     
     def get_member_detail(self, mem_id: int) -> Dict[str, Any]:
         """
@@ -68,7 +102,7 @@ class MemberService(BaseService):
         if not member:
             raise NotFoundError(msg.get_error_message('MEMBER_NOT_FOUND'))
         
-        return member.to_dict()
+        return member.to_dict(srcset=True)
     
     def create_member(self, form_data: Dict[str, Any], files_data: Dict[str, Any] = None, current_admin=None) -> Dict[str, Any]:
         """
@@ -365,17 +399,47 @@ class MemberService(BaseService):
         
         return result
     
-    def _apply_member_filters(self, query, filters: Dict[str, Any]):
-        """應用成員篩選條件"""
-        # 搜索關鍵字
-        if 'q' in filters and filters['q']:
-            search_term = f"%{filters['q']}%"
-            query = query.filter(
-                (Member.mem_name_zh.like(search_term)) |
-                (Member.mem_name_en.like(search_term)) |
-                (Member.mem_email.like(search_term))
+    def _paginate_member_rows(self, query, fields: List[str], page: Optional[int], per_page: Optional[int],
+                              keyset: Optional[List] = None, search=None) -> Dict[str, Any]:
+        """按列投影分頁查詢成員，課題組名稱通過 LEFT JOIN 在同一條語句中取回"""
+        columns = list_columns(Member, [field for field in fields if field != 'research_group'])
+        
+        include_group = 'research_group' in fields
+        if include_group:
+            query = query.outerjoin(
+                ResearchGroup, Member.research_group_id == ResearchGroup.research_group_id
             )
-        
+            columns['_group_id'] = ResearchGroup.research_group_id
+            columns['_group_name_zh'] = ResearchGroup.research_group_name_zh
+            columns['_group_name_en'] = ResearchGroup.research_group_name_en
+        
+        def _attach_group(items):
+            for item in items:
+                group_id = item.pop('_group_id')
+                name_zh = item.pop('_group_name_zh')
+                name_en = item.pop('_group_name_en')
+                if group_id is not None:
+                    item['research_group'] = {
+                        'research_group_id': group_id,
+                        'research_group_name_zh': name_zh,
+                        'research_group_name_en': name_en
+                    }
+        
+        attach = _attach_group if include_group else None
+        return paginate_projection(
+            query, columns, page, per_page,
+            attach=search.wrap_attach(attach) if search else attach,
+            keyset=keyset,
+            count_module=self.get_module_name()
+        )
+    
+    def _apply_member_eager_loading(self, query):
+        """應用成員列表的關聯預加載策略"""
+        # research_group 為多對一關聯，使用 JOIN 在同一條語句中取回
+        return query.options(joinedload(Member.research_group))
+    
+    def _apply_member_filters(self, query, filters: Dict[str, Any]):
+        """應用成員篩選條件（搜索關鍵字由全文索引處理）"""
         # 成員類型篩選
         if 'type' in filters and filters['type'] is not None:
             query = query.filter(Member.mem_type == filters['type'])
@@ -390,11 +454,14 @@ class MemberService(BaseService):
         
         return query
     
-    def _apply_member_sorting(self, query, filters: Dict[str, Any]):
+    def _apply_member_sorting(self, query, filters: Dict[str, Any], search=None):
         """應用成員排序"""
         sort_by = filters.get('sort_by', 'created_at')
         order = filters.get('order', 'desc')
         
+        if search and sort_by == 'relevance':
+            return search.order_by_relevance(query)
+        
         # 獲取排序字段
         sort_column = getattr(Member, sort_by, Member.created_at)
         
@@ -405,6 +472,20 @@ class MemberService(BaseService):
         
         return query
     
+    def _get_member_keyset(self, filters: Dict[str, Any]) -> Optional[List]:
+        """
+        按創建時間排序時返回游標分頁的排序鍵
+        
+        created_at 可為空，空值與 NULL 的比較不成立會使游標條件跳過這些成員，
+        因此排序和游標條件都按最早時間處理空值（與數據庫中空值排在最前的順序一致）
+        """
+        if filters.get('sort_by', 'created_at') != 'created_at':
+            return None
+        
+        descending = filters.get('order', 'desc').lower() == 'desc'
+        created_at = func.coalesce(Member.created_at, datetime(1970, 1, 1))
+        return [(created_at, descending), (Member.mem_id, descending)]
+    
     def _validate_member_data(self, form_data: Dict[str, Any], is_create: bool = True) -> None:
         """校驗成員數據"""
         if is_create:
@@ -590,7 +671,7 @@ class MemberService(BaseService):
                     update_data[field] = {'old': old_value, 'new': new_value}
                     
                     # 處理描述字段的圖片管理
-                    if field in ['mem_desc_zh', 'mem_desc_en'] and new_value:
+                    if field in ['mem_desc_zh', 'mem_desc_en']:
                         image_upload_service = ImageUploadService()
                         image_upload_service.mark_images_as_used(
                             content=new_value,
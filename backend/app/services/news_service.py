@@ -4,6 +4,8 @@ import logging
 from app.models import News
 from app.utils.validators import validate_string_length, validate_date
 from app.utils.helpers import get_pagination_params, paginate_query
+from app.utils.projection import get_list_fields, list_columns, paginate_projection
+from app.utils.fulltext import apply_fulltext
 from app.utils.messages import msg
 from .base_service import BaseService, ValidationError, NotFoundError
 
@@ -21,6 +23,15 @@ class NewsService(BaseService):
     def get_module_name(self) -> str:
         return 'news'
     
+    # 列表可返回的字段（與 News.to_dict 一致）
+    LIST_FIELDS = (
+        'news_id', 'news_type', 'news_title_zh', 'news_title_en',
+        'news_content_zh', 'news_content_en', 'news_date', 'enable'
+    )
+    
+    # 列表默認省略的長文本字段
+    LIST_LONG_FIELDS = ('news_content_zh', 'news_content_en')
+    
     def get_news_list(self, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """獲取新聞列表"""
         query = News.query
@@ -30,16 +41,11 @@ class NewsService(BaseService):
             query = query.filter_by(enable=1)
         
         # 應用篩選條件
+        search = None
         if filters:
-            # 搜索關鍵字
+            # 搜索關鍵字（全文索引）
             if filters.get('q'):
-                search_term = f"%{filters['q']}%"
-                query = query.filter(
-                    (News.news_title_zh.like(search_term)) |
-                    (News.news_title_en.like(search_term)) |
-                    (News.news_content_zh.like(search_term)) |
-                    (News.news_content_en.like(search_term))
-                )
+                query, search = apply_fulltext(query, News, filters['q'])
             
             # 新聞類型篩選
             if filters.get('news_type') is not None:
@@ -55,12 +61,14 @@ class NewsService(BaseService):
                 if valid and date_obj:
                     query = query.filter(News.news_date <= date_obj)
         
-        # 應用排序
-        sort_by = filters.get('sort_by', 'news_date') if filters else 'news_date'
-        order = filters.get('order', 'desc') if filters else 'desc'
+        # 應用排序，搜索時默認按相關度
+        sort_by = (filters.get('sort_by') if filters else None) or ('relevance' if search else 'news_date')
+        order = (filters.get('order') if filters else None) or 'desc'
         
         # 根據排序字段和順序進行排序
-        if sort_by == 'news_date':
+        if search and sort_by == 'relevance':
+            query = search.order_by_relevance(query)
+        elif sort_by == 'news_date':
             if order == 'asc':
                 query = query.order_by(News.news_date.asc())
             else:
@@ -71,7 +79,16 @@ class NewsService(BaseService):
         
         # 分頁
         page, per_page = get_pagination_params()
-        return paginate_query(query, page, per_page)
+        fields = get_list_fields(self.LIST_FIELDS, self.LIST_LONG_FIELDS, required=('news_id',))
+        if fields is None:
+            return paginate_query(query, page, per_page,
+                                  serializer=search.wrap_serializer() if search else None,
+                                  count_module=self.get_module_name())
+        
+        columns = list_columns(News, fields)
+        return paginate_projection(query, columns, page, per_page,
+                                   attach=search.wrap_attach() if search else None,
+                                   count_module=self.get_module_name())
     
     def get_news_detail(self, news_id: int) -> Dict[str, Any]:
         """獲取新聞詳情"""
@@ -1,13 +1,17 @@
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from flask import request
+from sqlalchemy.orm import joinedload, selectinload
 from app.models import Paper, PaperAuthor, Member, ResearchGroup, Lab
 from app.utils.validators import validate_string_length, validate_date
 from app.utils.helpers import get_pagination_params, paginate_query
+from app.utils.projection import get_list_fields, list_columns, paginate_projection
+from app.utils.fulltext import apply_fulltext
 from app.utils.file_handler import save_file, delete_file
 from app.utils.messages import msg
 from .base_service import BaseService, ValidationError, NotFoundError
 from .image_upload_service import ImageUploadService
+from .upload_service import UploadService
 import json
 
 
@@ -22,6 +26,18 @@ class PaperService(BaseService):
     def get_module_name(self) -> str:
         return 'paper'
     
+    # 列表可返回的字段（與 Paper.to_dict 一致），authors 為關聯字段
+    LIST_FIELDS = (
+        'paper_id', 'research_group_id', 'lab_id', 'paper_date',
+        'paper_title_zh', 'paper_title_en', 'paper_desc_zh', 'paper_desc_en',
+        'paper_type', 'paper_venue', 'paper_accept',
+        'paper_file_path', 'paper_url', 'preview_img',
+        'all_authors_zh', 'all_authors_en', 'enable', 'authors'
+    )
+    
+    # 列表默認省略的長文本字段
+    LIST_LONG_FIELDS = ('paper_desc_zh', 'paper_desc_en')
+    
     def get_papers_list(self, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """獲取論文列表"""
         query = Paper.query
@@ -31,15 +47,11 @@ class PaperService(BaseService):
             query = query.filter_by(enable=1)
         
         # 應用篩選條件
+        search = None
         if filters:
-            # 搜索關鍵字
+            # 搜索關鍵字（全文索引）
             if filters.get('q'):
-                search_term = f"%{filters['q']}%"
-                query = query.filter(
-                    (Paper.paper_title_zh.like(search_term)) |
-                    (Paper.paper_title_en.like(search_term)) |
-                    (Paper.paper_venue.like(search_term))
-                )
+                query, search = apply_fulltext(query, Paper, filters['q'])
             
             # 論文類型篩選
             if filters.get('paper_type') is not None:
@@ -59,19 +71,82 @@ class PaperService(BaseService):
                 if valid and date_obj:
                     query = query.filter(Paper.paper_date <= date_obj)
         
-        # 排序
-        sort_by = filters.get('sort_by', 'paper_date') if filters else 'paper_date'
+        # 排序，搜索時默認按相關度
+        sort_by = (filters.get('sort_by') if filters else None) or ('relevance' if search else 'paper_date')
         order = filters.get('order', 'desc') if filters else 'desc'
         
         sort_column = getattr(Paper, sort_by, Paper.paper_date)
-        if order.lower() == 'desc':
+        if search and sort_by == 'relevance':
+            query = search.order_by_relevance(query)
+        elif order.lower() == 'desc':
             query = query.order_by(sort_column.desc())
         else:
             query = query.order_by(sort_column.asc())
         
+        # 按日期排序時支持游標分頁（對應 ix_paper_enable_date 索引）
+        keyset = None
+        if sort_column is Paper.paper_date and sort_by != 'relevance':
+            descending = order.lower() == 'desc'
+            keyset = [(Paper.paper_date, descending), (Paper.paper_id, descending)]
+        
         # 分頁
         page, per_page = get_pagination_params()
-        return paginate_query(query, page, per_page)
+        fields = get_list_fields(self.LIST_FIELDS, self.LIST_LONG_FIELDS, required=('paper_id',))
+        if fields is None:
+            # 預加載作者及作者成員，避免 to_dict() 逐行懶加載
+            query = self._apply_paper_eager_loading(query)
+            return paginate_query(query, page, per_page, keyset=keyset,
+                                  serializer=search.wrap_serializer() if search else None,
+                                  count_module=self.get_module_name())
+        
+        columns = list_columns(Paper, [field for field in fields if field != 'authors'])
+        attach = self._attach_paper_authors if 'authors' in fields else None
+        return paginate_projection(
+            query, columns, page, per_page,
+            attach=search.wrap_attach(attach) if search else attach,
+            keyset=keyset,
+            count_module=self.get_module_name()
+        )
+    
+    def _attach_paper_authors(self, items: List[Dict[str, Any]]) -> None:
+        """用一條查詢為整頁論文附加實驗室作者（含成員基本信息）"""
+        paper_ids = [item['paper_id'] for item in items]
+        rows = self.db.session.query(
+            PaperAuthor.paper_id, PaperAuthor.mem_id,
+            PaperAuthor.author_order, PaperAuthor.is_corresponding,
+            Member.mem_id, Member.mem_name_zh, Member.mem_name_en
+        ).outerjoin(
+            Member, PaperAuthor.mem_id == Member.mem_id
+        ).filter(
+            PaperAuthor.paper_id.in_(paper_ids)
+        ).order_by(PaperAuthor.paper_id, PaperAuthor.author_order).all()
+        
+        authors_by_paper = {paper_id: [] for paper_id in paper_ids}
+        for paper_id, mem_id, author_order, is_corresponding, member_id, name_zh, name_en in rows:
+            author = {
+                'paper_id': paper_id,
+                'mem_id': mem_id,
+                'author_order': author_order,
+                'is_corresponding': is_corresponding
+            }
+            if member_id is not None:
+                author['member'] = {
+                    'mem_id': member_id,
+                    'mem_name_zh': name_zh,
+                    'mem_name_en': name_en
+                }
+            authors_by_paper[paper_id].append(author)
+        
+        for item in items:
+            item['authors'] = authors_by_paper[item['paper_id']]
+    
+    def _apply_paper_eager_loading(self, query):
+        """應用論文列表的關聯預加載策略"""
+        # authors 為一對多集合，使用 SELECT ... IN 批量加載，避免 JOIN 放大分頁行數；
+        # 作者對應的 member 為多對一關聯，在同一條批量語句中 JOIN 取回
+        return query.options(
+            selectinload(Paper.authors).joinedload(PaperAuthor.member)
+        )
     
     def get_paper_detail(self, paper_id: int) -> Dict[str, Any]:
         """獲取論文詳情"""
@@ -79,7 +154,7 @@ class PaperService(BaseService):
         if not paper:
             raise NotFoundError(msg.get_error_message('PAPER_NOT_FOUND'))
         
-        return paper.to_dict()
+        return paper.to_dict(srcset=True)
     
     def create_paper(self, form_data: Dict[str, Any], files_data: Dict[str, Any] = None, authors_data: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """創建論文"""
@@ -92,7 +167,10 @@ class PaperService(BaseService):
         def _create_operation():
             # 處理文件上傳
             file_path = None
-            if files_data and 'paper_file' in files_data:
+            if form_data.get('paper_file_upload_id'):
+                # 通過 /api/media/uploads 分塊上傳完成的文件
+                file_path = UploadService().claim_upload(form_data['paper_file_upload_id'], 'paper')
+            elif files_data and 'paper_file' in files_data:
                 file = files_data['paper_file']
                 if file and file.filename:
                     file_path = save_file(file, 'document', max_size=50*1024*1024)
@@ -190,7 +268,7 @@ class PaperService(BaseService):
                         update_data[field] = {'old': old_value, 'new': new_value}
                         
                         # 處理描述字段的圖片管理
-                        if field in ['paper_desc_zh', 'paper_desc_en'] and new_value:
+                        if field in ['paper_desc_zh', 'paper_desc_en']:
                             image_upload_service = ImageUploadService()
                             image_upload_service.mark_images_as_used(
                                 content=new_value,
@@ -229,6 +307,8 @@ class PaperService(BaseService):
             if 'authors' in paper_data and isinstance(paper_data['authors'], list):
                 self._update_paper_authors(paper_id, paper_data['authors'])
                 update_data['authors'] = paper_data['authors']
+                # 作者關聯表沒有 updated_at，由論文行記錄變更時間（用於 HTTP 緩存校驗）
+                paper.updated_at = datetime.utcnow()
             
             # 重新加載論文信息以獲取更新後的作者
             self.db.session.flush()
@@ -276,6 +356,16 @@ class PaperService(BaseService):
                 update_result['preview_img_deleted'] = True
                 update_result['old_preview_img'] = old_preview_img
         
+        # 關聯分塊上傳完成的論文文件
+        if form_data and form_data.get('paper_file_upload_id'):
+            old_file_path = paper.paper_file_path
+            new_file_path = UploadService().claim_upload(form_data['paper_file_upload_id'], 'paper')
+            paper.paper_file_path = new_file_path
+            if old_file_path and old_file_path != new_file_path:
+                delete_file(old_file_path)
+            update_result['paper_file_updated'] = True
+            update_result['new_file_path'] = new_file_path
+        
         if files_data:
             # 處理新論文文件上傳
             if 'paper_file' in files_data:
@@ -3,6 +3,8 @@ from datetime import datetime
 from app.models import Project
 from app.utils.validators import validate_string_length, validate_date
 from app.utils.helpers import get_pagination_params, paginate_query
+from app.utils.projection import get_list_fields, list_columns, paginate_projection
+from app.utils.fulltext import apply_fulltext
 from app.utils.messages import msg
 from .base_service import BaseService, ValidationError, NotFoundError
 from .image_upload_service import ImageUploadService
@@ -19,6 +21,15 @@ class ProjectService(BaseService):
     def get_module_name(self) -> str:
         return 'project'
     
+    # 列表可返回的字段（與 Project.to_dict 一致）
+    LIST_FIELDS = (
+        'project_id', 'project_url', 'project_name_zh', 'project_name_en',
+        'project_desc_zh', 'project_desc_en', 'project_date_start', 'is_end', 'enable'
+    )
+    
+    # 列表默認省略的長文本字段
+    LIST_LONG_FIELDS = ('project_desc_zh', 'project_desc_en')
+    
     def get_projects_list(self, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """獲取項目列表"""
         query = Project.query
@@ -28,16 +39,11 @@ class ProjectService(BaseService):
             query = query.filter_by(enable=1)
         
         # 應用篩選條件
+        search = None
         if filters:
-            # 搜索關鍵字
+            # 搜索關鍵字（全文索引）
             if filters.get('q'):
-                search_term = f"%{filters['q']}%"
-                query = query.filter(
-                    (Project.project_name_zh.like(search_term)) |
-                    (Project.project_name_en.like(search_term)) |
-                    (Project.project_desc_zh.like(search_term)) |
-                    (Project.project_desc_en.like(search_term))
-                )
+                query, search = apply_fulltext(query, Project, filters['q'])
             
             # 項目狀態篩選
             if filters.get('is_end') is not None:
@@ -53,19 +59,30 @@ class ProjectService(BaseService):
                 if valid and date_obj:
                     query = query.filter(Project.project_date_start <= date_obj)
         
-        # 排序
-        sort_by = filters.get('sort_by', 'project_date_start') if filters else 'project_date_start'
+        # 排序，搜索時默認按相關度
+        sort_by = (filters.get('sort_by') if filters else None) or ('relevance' if search else 'project_date_start')
         order = filters.get('order', 'desc') if filters else 'desc'
         
         sort_column = getattr(Project, sort_by, Project.project_date_start)
-        if order.lower() == 'desc':
+        if search and sort_by == 'relevance':
+            query = search.order_by_relevance(query)
+        elif order.lower() == 'desc':
             query = query.order_by(sort_column.desc())
         else:
             query = query.order_by(sort_column.asc())
         
         # 分頁
         page, per_page = get_pagination_params()
-        return paginate_query(query, page, per_page)
+        fields = get_list_fields(self.LIST_FIELDS, self.LIST_LONG_FIELDS, required=('project_id',))
+        if fields is None:
+            return paginate_query(query, page, per_page,
+                                  serializer=search.wrap_serializer() if search else None,
+                                  count_module=self.get_module_name())
+        
+        columns = list_columns(Project, fields)
+        return paginate_projection(query, columns, page, per_page,
+                                   attach=search.wrap_attach() if search else None,
+                                   count_module=self.get_module_name())
     
     def get_project_detail(self, project_id: int) -> Dict[str, Any]:
         """獲取項目詳情"""
@@ -159,7 +176,7 @@ class ProjectService(BaseService):
                         update_data[field] = {'old': str(old_value), 'new': str(new_value)}
                         
                         # 處理描述字段的圖片管理
-                        if field in ['project_desc_zh', 'project_desc_en'] and new_value:
+                        if field in ['project_desc_zh', 'project_desc_en']:
                             image_upload_service = ImageUploadService()
                             image_upload_service.mark_images_as_used(
                                 content=new_value,
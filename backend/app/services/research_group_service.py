@@ -1,7 +1,10 @@
-from typing import Optional, Dict, Any
-from app.models import ResearchGroup, Lab, Member
+from typing import Optional, Dict, Any, List
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from app.models import ResearchGroup, Lab, Member, Paper
 from app.utils.validators import validate_string_length
 from app.utils.helpers import get_pagination_params, paginate_query
+from app.utils.fulltext import apply_fulltext
 from app.utils.messages import msg
 from .base_service import BaseService, ValidationError, NotFoundError, BusinessLogicError
 from .image_upload_service import ImageUploadService
@@ -27,48 +30,95 @@ class ResearchGroupService(BaseService):
             query = query.filter_by(enable=1)
         
         # 應用篩選條件
+        search = None
         if filters:
-            # 搜索關鍵字
+            # 搜索關鍵字（全文索引）
             if filters.get('q'):
-                search_term = f"%{filters['q']}%"
-                query = query.filter(
-                    (ResearchGroup.research_group_name_zh.like(search_term)) |
-                    (ResearchGroup.research_group_name_en.like(search_term)) |
-                    (ResearchGroup.research_group_desc_zh.like(search_term)) |
-                    (ResearchGroup.research_group_desc_en.like(search_term))
-                )
+                query, search = apply_fulltext(query, ResearchGroup, filters['q'])
             
             # 實驗室篩選
             if filters.get('lab_id'):
                 query = query.filter(ResearchGroup.lab_id == filters['lab_id'])
         
-        # 按創建時間倒序排序
-        query = query.order_by(ResearchGroup.created_at.desc())
+        # 搜索時按相關度排序，否則按創建時間倒序排序
+        if search:
+            query = search.order_by_relevance(query)
+        else:
+            query = query.order_by(ResearchGroup.created_at.desc())
         
-        # 分頁
+        # 分頁，組長和統計數據按整頁批量加載
+        include_counts = bool(filters and filters.get('include_counts'))
+        serializer = lambda groups: self._serialize_groups(groups, include_counts)
         page, per_page = get_pagination_params()
-        result = paginate_query(query, page, per_page)
-        
-        # 為每個課題組添加組長信息
-        for item in result['items']:
-            if item.get('mem_id'):
-                leader = Member.query.filter_by(mem_id=item['mem_id'], enable=1).first()
-                item['leader'] = leader.to_dict() if leader else None
-        
-        return result
+        return paginate_query(
+            query, page, per_page,
+            serializer=search.wrap_serializer(serializer) if search else serializer,
+            count_module=self.get_module_name()
+        )
     
-    def get_research_group_detail(self, group_id: int) -> Dict[str, Any]:
+    def get_research_group_detail(self, group_id: int, include_counts: bool = False) -> Dict[str, Any]:
         """獲取課題組詳情"""
         group = ResearchGroup.query.filter_by(research_group_id=group_id, enable=1).first()
         if not group:
             raise NotFoundError(msg.get_error_message('RESEARCH_GROUP_NOT_FOUND'))
         
-        result = group.to_dict()
+        return self._serialize_groups([group], include_counts)[0]
+    
+    def _serialize_groups(self, groups: List[ResearchGroup], include_counts: bool = False) -> List[Dict[str, Any]]:
+        """
+        序列化課題組並附加組長信息和統計數據
+        
+        組長、成員數和論文數各用一條批量查詢取得，查詢數量與課題組數量無關
         
-        # 添加組長信息
-        if result.get('mem_id'):
-            leader = Member.query.filter_by(mem_id=result['mem_id'], enable=1).first()
-            result['leader'] = leader.to_dict() if leader else None
+        Args:
+            groups: 課題組對象列表
+            include_counts: 是否附加 member_count 和 paper_count
+            
+        Returns:
+            List[Dict]: 課題組字典列表
+        """
+        if not groups:
+            return []
+        
+        # 預先加載整頁組長，to_dict() 中的 leader 懶加載將直接命中會話標識映射
+        leader_ids = {group.mem_id for group in groups if group.mem_id}
+        leaders = {}
+        if leader_ids:
+            leaders = {
+                member.mem_id: member
+                for member in Member.query.options(joinedload(Member.research_group))
+                .filter(Member.mem_id.in_(leader_ids)).all()
+            }
+        
+        member_counts = {}
+        paper_counts = {}
+        if include_counts:
+            group_ids = [group.research_group_id for group in groups]
+            member_counts = dict(
+                self.db.session.query(Member.research_group_id, func.count(Member.mem_id))
+                .filter(Member.research_group_id.in_(group_ids), Member.enable == 1)
+                .group_by(Member.research_group_id).all()
+            )
+            paper_counts = dict(
+                self.db.session.query(Paper.research_group_id, func.count(Paper.paper_id))
+                .filter(Paper.research_group_id.in_(group_ids), Paper.enable == 1)
+                .group_by(Paper.research_group_id).all()
+            )
+        
+        result = []
+        for group in groups:
+            item = group.to_dict()
+            
+            # 添加組長信息（僅有效成員）
+            if group.mem_id:
+                leader = leaders.get(group.mem_id)
+                item['leader'] = leader.to_dict() if leader and leader.enable == 1 else None
+            
+            if include_counts:
+                item['member_count'] = member_counts.get(group.research_group_id, 0)
+                item['paper_count'] = paper_counts.get(group.research_group_id, 0)
+            
+            result.append(item)
         
         return result
     
@@ -158,7 +208,7 @@ class ResearchGroupService(BaseService):
                         update_data[field] = {'old': old_value, 'new': new_value}
                         
                         # 處理描述字段的圖片管理
-                        if field in ['research_group_desc_zh', 'research_group_desc_en'] and new_value:
+                        if field in ['research_group_desc_zh', 'research_group_desc_en']:
                             image_upload_service = ImageUploadService()
                             image_upload_service.mark_images_as_used(
                                 content=new_value,
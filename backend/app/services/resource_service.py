@@ -5,6 +5,7 @@ from app.models.resource import Resource
 from app.services.base_service import BaseService
 from app.utils.messages import get_message
 from app.utils.file_handler import save_file, delete_file
+from app.utils.fulltext import apply_fulltext
 from typing import Dict, List, Optional, Any
 import logging
 
@@ -74,7 +75,7 @@ class ResourceService(BaseService):
             return {
                 'code': 0,
                 'message': get_message('SUCCESS'),
-                'data': resource.to_dict()
+                'data': resource.to_dict(srcset=True)
             }
             
         except Exception as e:
@@ -90,17 +91,10 @@ class ResourceService(BaseService):
         try:
             query = Resource.query
             
-            # 搜索過濾
+            # 搜索過濾（全文索引）
+            search = None
             if kwargs.get('q'):
-                search_term = f"%{kwargs['q']}%"
-                query = query.filter(
-                    db.or_(
-                        Resource.resource_name_zh.like(search_term),
-                        Resource.resource_name_en.like(search_term),
-                        Resource.resource_description_zh.like(search_term),
-                        Resource.resource_description_en.like(search_term)
-                    )
-                )
+                query, search = apply_fulltext(query, Resource, kwargs['q'])
             
             # 資源類型過濾
             if kwargs.get('resource_type') is not None:
@@ -110,11 +104,13 @@ class ResourceService(BaseService):
             if kwargs.get('availability_status') is not None:
                 query = query.filter(Resource.availability_status == kwargs['availability_status'])
             
-            # 排序
-            sort_by = kwargs.get('sort_by', 'created_time')
+            # 排序，搜索時默認按相關度
+            sort_by = kwargs.get('sort_by') or ('relevance' if search else 'created_time')
             order = kwargs.get('order', 'desc')
             
-            if hasattr(Resource, sort_by):
+            if search and sort_by == 'relevance':
+                query = search.order_by_relevance(query)
+            elif hasattr(Resource, sort_by):
                 sort_column = getattr(Resource, sort_by)
                 if order == 'asc':
                     query = query.order_by(sort_column.asc())
@@ -151,6 +147,9 @@ class ResourceService(BaseService):
                     }
                 }
             
+            if search:
+                search.attach_highlights(result['data']['items'])
+            
             return result
             
         except Exception as e:
@@ -0,0 +1,75 @@
+from typing import Dict, Any, Optional
+from app.utils.fulltext import parse_terms, make_snippet
+from app.utils.messages import msg
+from app.utils.search_index import INDEX_SPECS, get_search_index
+from .base_service import BaseService, ValidationError
+
+
+class SearchService(BaseService):
+    """
+    站內統一搜索服務層
+
+    一次請求檢索成員、論文、新聞、項目、課題組和資源，
+    結果來自進程內倒排索引，按相關度排序並標明類型
+    """
+
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 50
+
+    def get_module_id(self) -> int:
+        return 0  # 只讀服務，不產生審計記錄
+
+    def get_module_name(self) -> str:
+        return 'search'
+
+    def search(self, q: str, types: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        跨模組搜索
+
+        Args:
+            q: 搜索關鍵字，以空白分隔的檢索詞須全部命中
+            types: 逗號分隔的結果類型（member,paper,news,project,research_group,resource），默認全部
+            limit: 返回的結果數，默認 20，最多 50
+
+        Returns:
+            Dict: items 為按相關度降序的結果，counts 為各類型的命中數
+
+        Raises:
+            ValidationError: 關鍵字為空或類型無效
+        """
+        terms = parse_terms(q or '')
+        if not terms:
+            raise ValidationError(msg.get_error_message('SEARCH_QUERY_REQUIRED'))
+
+        modules = None
+        if types:
+            modules = [name.strip() for name in types.split(',') if name.strip()]
+            invalid = [name for name in modules if name not in INDEX_SPECS]
+            if invalid:
+                raise ValidationError(msg.get_error_message('INVALID_SEARCH_TYPES', types=', '.join(invalid)))
+
+        limit = min(max(limit or self.DEFAULT_LIMIT, 1), self.MAX_LIMIT)
+        hits, counts = get_search_index().search(terms, modules, limit)
+
+        items = []
+        for hit in hits:
+            highlight = {}
+            for field, value in (('title_zh', hit.title_zh), ('title_en', hit.title_en)):
+                snippet = make_snippet(value, terms)
+                if snippet is not None:
+                    highlight[field] = snippet
+            items.append({
+                'type': hit.module,
+                'id': hit.entity_id,
+                'title_zh': hit.title_zh,
+                'title_en': hit.title_en,
+                'score': hit.score,
+                'highlight': highlight
+            })
+
+        return {
+            'q': q,
+            'items': items,
+            'total': sum(counts.get(name, 0) for name in modules) if modules else sum(counts.values()),
+            'counts': counts
+        }
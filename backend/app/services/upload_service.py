@@ -0,0 +1,210 @@
+import time
+import uuid
+from typing import Dict, Any
+from datetime import datetime, timedelta
+from flask import current_app
+from werkzeug.exceptions import ClientDisconnected
+from werkzeug.utils import secure_filename
+from app.models import UploadSession
+from app.utils import resumable_upload
+from app.utils.file_handler import allowed_file, store_file, delete_file
+from app.utils.messages import msg
+from .base_service import BaseService, ValidationError, NotFoundError, BusinessLogicError
+
+
+class UploadService(BaseService):
+    """
+    分塊斷點續傳上傳服務層
+
+    流程：create_upload 聲明文件名和大小 → upload_chunk 按 offset 順序寫入分塊 → complete_upload
+    存入內容尋址存儲 → 論文等實體通過 claim_upload 按 upload_id 關聯文件。
+    連接中斷時通過 get_upload 查詢已接收的 offset 後繼續上傳。
+    """
+
+    # 上傳用途 -> (存儲類型, 最大大小)
+    UPLOAD_TYPES = {
+        'paper': ('document', 50 * 1024 * 1024),
+    }
+
+    def get_module_id(self) -> int:
+        return 7
+
+    def get_module_name(self) -> str:
+        return 'media'
+
+    def create_upload(self, filename: str, size, upload_type: str = 'paper') -> Dict[str, Any]:
+        """創建上傳"""
+        # 驗證權限
+        self.validate_permissions('CREATE')
+
+        if upload_type not in self.UPLOAD_TYPES:
+            raise ValidationError(msg.get_error_message('UNSUPPORTED_FILE_TYPE'))
+        file_type, max_size = self.UPLOAD_TYPES[upload_type]
+
+        filename = secure_filename(filename or '')
+        if not allowed_file(filename, file_type):
+            raise ValidationError(msg.get_error_message('UNSUPPORTED_FILE_TYPE'))
+
+        try:
+            size = int(size)
+        except (TypeError, ValueError):
+            raise ValidationError(msg.get_error_message('UPLOAD_SIZE_INVALID'))
+        if size <= 0:
+            raise ValidationError(msg.get_error_message('UPLOAD_SIZE_INVALID'))
+        if size > max_size:
+            raise ValidationError(msg.get_error_message('FILE_SIZE_EXCEEDED', max_size=max_size))
+
+        self.purge_expired()
+
+        upload = UploadSession(
+            upload_id=uuid.uuid4().hex,
+            upload_type=upload_type,
+            filename=filename,
+            total_size=size,
+            received_size=0,
+            status=UploadSession.STATUS_UPLOADING,
+            expires_at=self._expires_at()
+        )
+        resumable_upload.create_part(upload.upload_id)
+        self.db.session.add(upload)
+        self.db.session.commit()
+        return self._upload_dict(upload)
+
+    def get_upload(self, upload_id: str) -> Dict[str, Any]:
+        """獲取上傳狀態（offset 為下一分塊的起始位置）"""
+        self.validate_permissions('CREATE')
+        return self._upload_dict(self._get_active(upload_id))
+
+    def upload_chunk(self, upload_id: str, stream, offset) -> Dict[str, Any]:
+        """
+        從 offset 處寫入一個分塊
+
+        分塊邊讀邊寫入磁盤；超過聲明大小或連接中斷時，已寫入的部分仍然保留並記錄 offset
+        """
+        self.validate_permissions('CREATE')
+
+        # 鎖定上傳記錄，同一上傳的分塊依次寫入
+        upload = self._get_active(upload_id, for_update=True)
+        try:
+            offset = int(offset)
+        except (TypeError, ValueError):
+            offset = None
+        if upload.status != UploadSession.STATUS_UPLOADING or offset != upload.received_size:
+            self.db.session.rollback()
+            raise BusinessLogicError(msg.get_error_message('UPLOAD_OFFSET_MISMATCH', offset=upload.received_size))
+
+        try:
+            upload.received_size = resumable_upload.write_chunk(upload_id, stream, offset, upload.total_size)
+        except (ValueError, ClientDisconnected) as e:
+            upload.received_size = resumable_upload.received_size(upload_id)
+            self._touch(upload)
+            self.db.session.commit()
+            raise ValidationError(str(e))
+        except Exception:
+            self.db.session.rollback()
+            raise
+
+        self._touch(upload)
+        self.db.session.commit()
+        return self._upload_dict(upload)
+
+    def complete_upload(self, upload_id: str) -> Dict[str, Any]:
+        """所有分塊寫入後存入內容尋址存儲，返回存儲路徑"""
+        self.validate_permissions('CREATE')
+
+        upload = self._get_active(upload_id, for_update=True)
+        if upload.status == UploadSession.STATUS_COMPLETED:
+            self.db.session.rollback()
+            return self._upload_dict(upload)
+        if upload.received_size != upload.total_size:
+            self.db.session.rollback()
+            raise ValidationError(msg.get_error_message(
+                'UPLOAD_INCOMPLETE', offset=upload.received_size, size=upload.total_size
+            ))
+
+        file_type, _ = self.UPLOAD_TYPES[upload.upload_type]
+
+        def _complete_operation():
+            started = time.perf_counter()
+            digest = resumable_upload.finish(upload_id, upload.total_size)
+            ext = upload.filename.rsplit('.', 1)[1].lower()
+            upload.file_path = store_file(
+                resumable_upload.part_path(upload_id), file_type, ext, digest, upload.total_size, started=started
+            )
+            upload.sha256 = digest
+            upload.status = UploadSession.STATUS_COMPLETED
+            self._touch(upload)
+            return self._upload_dict(upload)
+
+        return self.execute_with_audit(
+            operation_func=_complete_operation,
+            operation_type='CREATE',
+            content={
+                'upload_id': upload_id,
+                'filename': upload.filename,
+                'size': upload.total_size,
+                'type': upload.upload_type
+            }
+        )
+
+    def abort_upload(self, upload_id: str) -> None:
+        """取消上傳並刪除已接收的部分"""
+        self.validate_permissions('DELETE')
+
+        upload = self._get_active(upload_id, for_update=True)
+        self._discard(upload)
+        self.db.session.commit()
+
+    def claim_upload(self, upload_id: str, upload_type: str) -> str:
+        """
+        在調用方的事務中取出已完成上傳的存儲路徑並刪除上傳記錄
+
+        Returns:
+            str: 存儲路徑，由調用方寫入實體字段
+        """
+        upload = self._get_active(upload_id, for_update=True)
+        if upload.upload_type != upload_type:
+            raise ValidationError(msg.get_error_message('UPLOAD_TYPE_MISMATCH'))
+        if upload.status != UploadSession.STATUS_COMPLETED:
+            raise ValidationError(msg.get_error_message('UPLOAD_NOT_COMPLETED'))
+
+        file_path = upload.file_path
+        self.db.session.delete(upload)
+        return file_path
+
+    def purge_expired(self) -> int:
+        """刪除過期的上傳（未完成的分塊，及完成後未關聯到實體的文件）"""
+        expired = UploadSession.query.filter(UploadSession.expires_at < datetime.utcnow()).all()
+        for upload in expired:
+            self._discard(upload)
+        if expired:
+            self.db.session.commit()
+        return len(expired)
+
+    def _get_active(self, upload_id: str, for_update: bool = False) -> UploadSession:
+        query = UploadSession.query.filter_by(upload_id=upload_id)
+        if for_update:
+            query = query.with_for_update()
+        upload = query.first()
+        if not upload or upload.expires_at < datetime.utcnow():
+            raise NotFoundError(msg.get_error_message('UPLOAD_NOT_FOUND'))
+        return upload
+
+    def _discard(self, upload: UploadSession) -> None:
+        resumable_upload.discard(upload.upload_id)
+        file_path = upload.file_path
+        self.db.session.delete(upload)
+        if file_path:
+            delete_file(file_path)
+
+    def _touch(self, upload: UploadSession) -> None:
+        upload.updated_at = datetime.utcnow()
+        upload.expires_at = self._expires_at()
+
+    def _expires_at(self) -> datetime:
+        return datetime.utcnow() + timedelta(hours=current_app.config['MEDIA_UPLOAD_EXPIRE_HOURS'])
+
+    def _upload_dict(self, upload: UploadSession) -> Dict[str, Any]:
+        result = upload.to_dict()
+        result['chunk_size'] = current_app.config['MEDIA_UPLOAD_CHUNK_SIZE']
+        return result
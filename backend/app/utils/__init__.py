@@ -1,9 +1,11 @@
 from .file_handler import allowed_file, save_file, delete_file, get_file_info
 from .helpers import get_pagination_params, paginate_query, success_response, error_response
+from .projection import get_list_fields, list_columns, paginate_projection
 from .validators import validate_email, validate_admin_name, validate_date, validate_enum, validate_string_length
 
 __all__ = [
     'allowed_file', 'save_file', 'delete_file', 'get_file_info',
     'get_pagination_params', 'paginate_query', 'success_response', 'error_response',
+    'get_list_fields', 'list_columns', 'paginate_projection',
     'validate_email', 'validate_admin_name', 'validate_date', 'validate_enum', 'validate_string_length'
 ]
\ No newline at end of file
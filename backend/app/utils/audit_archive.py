@@ -0,0 +1,403 @@
+"""
+審計記錄的冷數據歸檔
+
+edit_records 只保留最近 AUDIT_RETENTION_DAYS 天的記錄，更早的記錄由 archive() 按 UTC 日期分區移到
+AUDIT_ARCHIVE_DIR/<年>/<月>/ 下：
+
+- <日期>.jsonl.gz：當天的記錄，每行一條（含編碼後的 edit_content、操作對象ID及歸檔時的管理員名稱）；
+  每次歸檔追加一個 gzip 成員，讀取時按索引中的長度讀取，崩潰時寫了一半的成員在下次追加前截斷
+- <日期>.idx.json：旁路索引，記錄段長度、edit_id 區間、按（模組、管理員、操作類型）分組的條數，
+  整天落在查詢範圍內時只讀索引即可計數和跳過整段
+
+歸檔按 (edit_date, edit_id) 分批：先追加段文件並原子替換索引，再從 edit_records 刪除；
+刪除前中斷時，索引中已有的 edit_id 下次不重複追加。截止時間按天對齊，一天的記錄只屬於一個分區。
+
+AuditService 的列表和詳情透明地合併 edit_records 與歸檔（見 count / fetch / scan / get）；
+歸檔記錄按時間早於表中的記錄處理。
+"""
+
+import bisect
+import gzip
+import json
+import os
+import time
+from collections import Counter, OrderedDict, defaultdict
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from flask import current_app
+from sqlalchemy import delete, select
+from .file_handler import fsync_dir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - 取決於部署環境
+    fcntl = None
+
+SEGMENT_SUFFIX = '.jsonl.gz'
+INDEX_SUFFIX = '.idx.json'
+LOCK_FILE = '.archive.lock'
+
+DEFAULT_BATCH_SIZE = 1000
+# 進程內緩存的已解壓段數
+SEGMENT_CACHE_SIZE = 8
+
+Key = Tuple[datetime, int]
+
+_index_cache: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+_segment_cache: 'OrderedDict[Tuple[str, int], List[Dict[str, Any]]]' = OrderedDict()
+
+
+def _directory() -> str:
+    return current_app.config['AUDIT_ARCHIVE_DIR']
+
+
+def _paths(directory: str, day: date) -> Tuple[str, str]:
+    base = os.path.join(directory, f'{day:%Y}', f'{day:%m}', day.isoformat())
+    return base + SEGMENT_SUFFIX, base + INDEX_SUFFIX
+
+
+def _new_index(day: date) -> Dict[str, Any]:
+    return {'date': day.isoformat(), 'bytes': 0, 'count': 0, 'ids': [], 'groups': [],
+            'first': None, 'last': None}
+
+
+def _read_index(index_path: str) -> Optional[Dict[str, Any]]:
+    """讀取旁路索引，文件未替換時使用緩存"""
+    try:
+        stat = os.stat(index_path)
+    except FileNotFoundError:
+        return None
+    version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _index_cache.get(index_path)
+    if cached and cached[0] == version:
+        return cached[1]
+    with open(index_path, encoding='utf-8') as file:
+        index = json.load(file)
+    index['path'] = index_path
+    _index_cache[index_path] = (version, index)
+    return index
+
+
+def load_indexes(directory: Optional[str] = None) -> List[Dict[str, Any]]:
+    """全部分區的索引，按日期從新到舊"""
+    directory = directory or _directory()
+    indexes = []
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            if filename.endswith(INDEX_SUFFIX):
+                index = _read_index(os.path.join(root, filename))
+                if index and index['count']:
+                    indexes.append(index)
+    indexes.sort(key=lambda index: index['date'], reverse=True)
+    return indexes
+
+
+def _contains(ranges: List[List[int]], edit_id: int) -> bool:
+    position = bisect.bisect_right(ranges, [edit_id, float('inf')]) - 1
+    return position >= 0 and ranges[position][0] <= edit_id <= ranges[position][1]
+
+
+def _merge_ids(ranges: List[List[int]], ids: List[int]) -> List[List[int]]:
+    """把 edit_id 併入區間列表（相鄰的 ID 合併為一個區間）"""
+    merged: List[List[int]] = []
+    for start, end in sorted([list(r) for r in ranges] + [[i, i] for i in ids]):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _write_index(index_path: str, index: Dict[str, Any]) -> None:
+    temp_path = index_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump({k: v for k, v in index.items() if k != 'path'}, file, ensure_ascii=False)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, index_path)
+    fsync_dir(os.path.dirname(index_path))
+
+
+def _append(directory: str, day: date, rows: List[Dict[str, Any]]) -> int:
+    """把一天的記錄追加到分區，返回實際追加的條數（已歸檔的 edit_id 跳過）"""
+    segment_path, index_path = _paths(directory, day)
+    os.makedirs(os.path.dirname(segment_path), exist_ok=True)
+    index = _read_index(index_path) or _new_index(day)
+    rows = [row for row in rows if not _contains(index['ids'], row['edit_id'])]
+    if not rows:
+        return 0
+
+    payload = gzip.compress(''.join(
+        json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n' for row in rows
+    ).encode('utf-8'))
+    with open(segment_path, 'ab') as file:
+        # 丟棄上次中斷時寫了一半的 gzip 成員
+        file.truncate(index['bytes'])
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+
+    groups = Counter({tuple(group[:3]): group[3] for group in index['groups']})
+    groups.update((row['edit_module'], row['admin_id'], row['edit_type']) for row in rows)
+    dates = [row['edit_date'] for row in rows] + [d for d in (index['first'], index['last']) if d]
+    index = {
+        **index,
+        'bytes': index['bytes'] + len(payload),
+        'count': index['count'] + len(rows),
+        'ids': _merge_ids(index['ids'], [row['edit_id'] for row in rows]),
+        'groups': [[*key, count] for key, count in sorted(groups.items(), key=lambda item: str(item[0]))],
+        'first': min(dates),
+        'last': max(dates)
+    }
+    _write_index(index_path, index)
+    return len(rows)
+
+
+def _read_segment(index: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """解壓一個分區的記錄（edit_date 還原為 datetime），按 (edit_date, edit_id) 升序"""
+    segment_path = index['path'][:-len(INDEX_SUFFIX)] + SEGMENT_SUFFIX
+    cache_key = (segment_path, index['bytes'])
+    rows = _segment_cache.get(cache_key)
+    if rows is not None:
+        _segment_cache.move_to_end(cache_key)
+        return rows
+
+    with open(segment_path, 'rb') as file:
+        data = gzip.decompress(file.read(index['bytes']))
+    rows = []
+    for line in data.decode('utf-8').splitlines():
+        row = json.loads(line)
+        row['edit_date'] = datetime.fromisoformat(row['edit_date'])
+        rows.append(row)
+    rows.sort(key=row_key)
+
+    _segment_cache[cache_key] = rows
+    while len(_segment_cache) > SEGMENT_CACHE_SIZE:
+        _segment_cache.popitem(last=False)
+    return rows
+
+
+def row_key(row: Dict[str, Any]) -> Key:
+    return row['edit_date'], row['edit_id']
+
+
+def _bounds(filters: Dict[str, Any]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """日期篩選轉為 datetime（date 的起始為當天 0 點，結束為當天最後時刻）"""
+    start, end = filters.get('start_date'), filters.get('end_date')
+    if isinstance(start, date) and not isinstance(start, datetime):
+        start = datetime.combine(start, dt_time.min)
+    if isinstance(end, date) and not isinstance(end, datetime):
+        end = datetime.combine(end, dt_time.max)
+    return start, end
+
+
+def _group_matches(group: List[Any], filters: Dict[str, Any]) -> bool:
+    module, admin_id, edit_type = group[:3]
+    return ('edit_module' not in filters or module == filters['edit_module']) \
+        and ('admin_id' not in filters or admin_id == filters['admin_id']) \
+        and ('edit_type' not in filters or edit_type == filters['edit_type'])
+
+
+def _row_matches(row: Dict[str, Any], filters: Dict[str, Any], start, end) -> bool:
+    return _group_matches([row['edit_module'], row['admin_id'], row['edit_type']], filters) \
+        and (start is None or row['edit_date'] >= start) \
+        and (end is None or row['edit_date'] <= end) \
+        and ('entity_id' not in filters or filters['entity_id'] in row.get('entity_ids', ()))
+
+
+def _index_count(index: Dict[str, Any], filters: Dict[str, Any], start, end) -> Optional[int]:
+    """
+    只用索引計算分區中匹配的條數
+
+    Returns:
+        Optional[int]: 分區與日期範圍不相交時為 0；分區部分落在範圍內（需讀取分區）時為 None
+    """
+    day = date.fromisoformat(index['date'])
+    day_start = datetime.combine(day, dt_time.min)
+    day_end = datetime.combine(day, dt_time.max)
+    if (start is not None and day_end < start) or (end is not None and day_start > end):
+        return 0
+    matched = sum(group[3] for group in index['groups'] if _group_matches(group, filters))
+    if matched == 0:
+        return 0
+    # 按操作對象篩選時索引只能排除不含該模組的分區
+    if (start is not None and day_start < start) or (end is not None and day_end > end) or 'entity_id' in filters:
+        return None
+    return matched
+
+
+def _matching_rows(index: Dict[str, Any], filters: Dict[str, Any], start, end) -> List[Dict[str, Any]]:
+    return [row for row in _read_segment(index) if _row_matches(row, filters, start, end)]
+
+
+def count(filters: Optional[Dict[str, Any]] = None) -> int:
+    """歸檔中匹配篩選條件的記錄數，整天落在範圍內的分區只讀索引"""
+    filters = filters or {}
+    start, end = _bounds(filters)
+    total = 0
+    for index in load_indexes():
+        matched = _index_count(index, filters, start, end)
+        total += len(_matching_rows(index, filters, start, end)) if matched is None else matched
+    return total
+
+
+def fetch(filters: Optional[Dict[str, Any]], skip: int, limit: int) -> List[Dict[str, Any]]:
+    """按 (edit_date, edit_id) 倒序跳過 skip 條後取 limit 條，用索引計數跳過整個分區"""
+    filters = filters or {}
+    start, end = _bounds(filters)
+    result: List[Dict[str, Any]] = []
+    for index in load_indexes():
+        matched = _index_count(index, filters, start, end)
+        if matched is not None and skip >= matched:
+            skip -= matched
+            continue
+        rows = _matching_rows(index, filters, start, end)
+        rows.reverse()
+        result.extend(rows[skip:skip + limit - len(result)])
+        skip = max(0, skip - len(rows))
+        if len(result) >= limit:
+            break
+    return result
+
+
+def scan(filters: Optional[Dict[str, Any]] = None, after: Optional[Key] = None,
+         descending: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    按 (edit_date, edit_id) 順序逐條返回匹配的記錄
+
+    Args:
+        after: 游標位置，只返回排序上位於其後的記錄（倒序時更早，升序時更晚）
+        descending: 是否倒序
+    """
+    filters = filters or {}
+    start, end = _bounds(filters)
+    indexes = load_indexes()
+    if not descending:
+        indexes.reverse()
+    for index in indexes:
+        if after is not None:
+            day = date.fromisoformat(index['date'])
+            if (descending and day > after[0].date()) or (not descending and day < after[0].date()):
+                continue
+        if _index_count(index, filters, start, end) == 0:
+            continue
+        rows = _matching_rows(index, filters, start, end)
+        if descending:
+            rows = rows[::-1]
+        for row in rows:
+            if after is None or (row_key(row) < after if descending else row_key(row) > after):
+                yield row
+
+
+def get(edit_id: int) -> Optional[Dict[str, Any]]:
+    """按 edit_id 查找歸檔記錄，只讀取索引區間包含該 ID 的分區"""
+    for index in load_indexes():
+        if _contains(index['ids'], edit_id):
+            for row in _read_segment(index):
+                if row['edit_id'] == edit_id:
+                    return row
+    return None
+
+
+def to_item(row: Dict[str, Any]) -> Dict[str, Any]:
+    """歸檔記錄轉為列表項（與 AuditService.get_audit_records 的投影相同）"""
+    return {
+        'edit_id': row['edit_id'],
+        'admin_id': row['admin_id'],
+        'admin_name': row.get('admin_name'),
+        'edit_type': row['edit_type'],
+        'edit_module': row['edit_module'],
+        'edit_date': row['edit_date'].isoformat() + '+00:00',
+        'edit_summary': row.get('edit_summary')
+    }
+
+
+def archive(retention_days: Optional[int] = None, batch_size: Optional[int] = None,
+            dry_run: bool = False) -> Dict[str, Any]:
+    """
+    把早於保留期的記錄移到歸檔分區
+
+    Args:
+        retention_days: 保留天數，默認 AUDIT_RETENTION_DAYS；不大於 0 時不歸檔
+        batch_size: 每批處理的記錄數，默認 AUDIT_ARCHIVE_BATCH_SIZE
+        dry_run: 只統計待歸檔的記錄
+
+    Returns:
+        Dict: 歸檔報告
+    """
+    from app import db
+    from app.models import Admin, EditRecord, EditRecordEntity
+
+    if retention_days is None:
+        retention_days = current_app.config['AUDIT_RETENTION_DAYS']
+    batch_size = batch_size or current_app.config.get('AUDIT_ARCHIVE_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    report = {'retention_days': retention_days, 'cutoff': None, 'dry_run': dry_run,
+              'archived': 0, 'skipped': 0, 'partitions': 0, 'batches': 0}
+    if retention_days <= 0:
+        return report
+
+    started = time.perf_counter()
+    cutoff = datetime.combine(datetime.utcnow().date() - timedelta(days=retention_days), dt_time.min)
+    report['cutoff'] = cutoff.isoformat()
+    if dry_run:
+        report['archived'] = db.session.execute(
+            select(db.func.count()).select_from(EditRecord).where(EditRecord.edit_date < cutoff)
+        ).scalar()
+        return report
+
+    directory = _directory()
+    os.makedirs(directory, exist_ok=True)
+    partitions = set()
+    with open(os.path.join(directory, LOCK_FILE), 'a') as lock:
+        # 同一時間只允許一個歸檔任務
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        columns = [EditRecord.edit_id, EditRecord.admin_id, Admin.admin_name, EditRecord.edit_type,
+                   EditRecord.edit_module, EditRecord.edit_date, EditRecord.edit_summary, EditRecord.edit_content]
+        while True:
+            rows = db.session.execute(
+                select(*columns).outerjoin(Admin, Admin.admin_id == EditRecord.admin_id)
+                .where(EditRecord.edit_date < cutoff)
+                .order_by(EditRecord.edit_date, EditRecord.edit_id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            edit_ids = [row.edit_id for row in rows]
+            entities = defaultdict(list)
+            for edit_id, entity_id in db.session.execute(
+                select(EditRecordEntity.edit_id, EditRecordEntity.entity_id)
+                .where(EditRecordEntity.edit_id.in_(edit_ids))
+            ):
+                entities[edit_id].append(entity_id)
+            by_day = defaultdict(list)
+            for row in rows:
+                values = dict(row._mapping)
+                values['edit_date'] = values['edit_date'].isoformat()
+                values['entity_ids'] = sorted(entities.get(row.edit_id, []))
+                by_day[row.edit_date.date()].append(values)
+            for day, day_rows in by_day.items():
+                appended = _append(directory, day, day_rows)
+                report['archived'] += appended
+                report['skipped'] += len(day_rows) - appended
+                partitions.add(day)
+            db.session.execute(delete(EditRecordEntity).where(EditRecordEntity.edit_id.in_(edit_ids)))
+            db.session.execute(delete(EditRecord).where(EditRecord.edit_id.in_(edit_ids)))
+            db.session.commit()
+            report['batches'] += 1
+
+    report['partitions'] = len(partitions)
+    report['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def stats() -> Dict[str, Any]:
+    """歸檔的分區數、記錄數及壓縮後大小"""
+    indexes = load_indexes()
+    return {
+        'partitions': len(indexes),
+        'records': sum(index['count'] for index in indexes),
+        'bytes': sum(index['bytes'] for index in indexes),
+        'oldest': indexes[-1]['first'] if indexes else None,
+        'newest': indexes[0]['last'] if indexes else None
+    }
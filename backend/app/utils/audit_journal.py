@@ -0,0 +1,496 @@
+"""
+審計記錄的寫後緩衝（write-behind）
+
+AUDIT_WRITE_BEHIND 開啟時 AuditService.log_operation 不在業務事務中插入 EditRecord，而是：
+
+1. 把記錄登記在會話上，事務提交後追加到本進程的日誌段（AUDIT_JOURNAL_DIR/segment-<pid>-<序號>.jsonl），
+   併發提交的請求共用一次 fsync；回滾的事務不寫入
+2. 後台線程每 AUDIT_FLUSH_INTERVAL 秒封存當前日誌段，按 AUDIT_FLUSH_BATCH_SIZE 批量插入 edit_records，
+   同時寫入操作對象引用（edit_record_entities），寫入完成後刪除日誌段；數據庫不可用時保留日誌段下次重試
+3. 日誌段在寫入完成前一直持有文件鎖；啟動時及每次刷新時重放沒有被持有的日誌段（進程崩潰遺留），
+   已存在的記錄（journal_id 相同）不重複插入，崩潰時寫了一半的最後一行忽略
+
+每條記錄帶隨機的 journal_id 並隨記錄存入 edit_records，去重不依賴 edit_date
+（MySQL 的 DATETIME 只保存到秒，與日誌中微秒精度的時間不相等）。
+
+無法插入的記錄（如缺少 admin_id）寫入 rejected.jsonl 並記錄日誌，不阻塞其他記錄。
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+from .file_handler import fsync_dir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - 取決於部署環境
+    fcntl = None
+
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.jsonl'
+REJECTED_FILE = 'rejected.jsonl'
+
+_PENDING_KEY = 'audit_journal_pending'
+
+# 沒有 journal_id 的舊日誌行按時間去重時的容差（數據庫的時間可能被舍入到秒）
+_LEGACY_DATE_TOLERANCE = timedelta(seconds=1)
+
+_write_lock = threading.Lock()
+_sync_lock = threading.Lock()
+_flush_lock = threading.Lock()
+
+_active: Optional['_Segment'] = None
+_sealed: List['_Segment'] = []
+_sequence = 0
+
+_flusher: Optional[threading.Thread] = None
+_flusher_pid: Optional[int] = None
+_wakeup = threading.Event()
+
+_metrics = {
+    'journaled': 0,
+    'flushed': 0,
+    'recovered': 0,
+    'duplicates': 0,
+    'rejected': 0,
+    'fsyncs': 0,
+    'flush_errors': 0,
+    'last_flush_at': None,
+    'last_flush_seconds': None,
+    'last_flush_records': 0,
+    'last_error': None,
+}
+
+
+class _Segment:
+    """本進程的日誌段，寫入 edit_records 前一直持有文件鎖"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, 'a', encoding='utf-8')
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        self.records = 0
+        self.synced = 0             # 已 fsync 的行數
+        self.flushed = 0            # 已寫入 edit_records 的行數
+        self.oldest: Optional[float] = None
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def enabled() -> bool:
+    return has_app_context() and bool(current_app.config.get('AUDIT_WRITE_BEHIND'))
+
+
+def journal_dir() -> str:
+    return current_app.config['AUDIT_JOURNAL_DIR']
+
+
+def enqueue(session, row: Dict[str, Any]) -> None:
+    """登記審計記錄，隨會話的事務提交寫入日誌（session 為 db.session）"""
+    # 業務操作沒有訪問數據庫時也開始事務，使隨後的 rollback 能丟棄登記的記錄
+    session = session()
+    if not session.in_transaction():
+        session.begin()
+    session.info.setdefault(_PENDING_KEY, []).append(row)
+
+
+def make_row(admin_id: Optional[int], edit_type: str, edit_module: int, edit_content: Optional[str],
+             edit_summary: Optional[str] = None, entity_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+    """日誌中的一條審計記錄，edit_date 為 UTC 時間（無時區，與 edit_records 中的存儲一致）"""
+    return {
+        'admin_id': admin_id,
+        'edit_type': edit_type,
+        'edit_module': edit_module,
+        'edit_content': edit_content,
+        'edit_summary': edit_summary,
+        'entity_ids': entity_ids or [],
+        'edit_date': datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+        'journal_id': uuid.uuid4().hex
+    }
+
+
+def _open_segment(directory: str) -> '_Segment':
+    global _sequence
+    os.makedirs(directory, exist_ok=True)
+    _sequence += 1
+    segment = _Segment(os.path.join(
+        directory, f'{SEGMENT_PREFIX}{os.getpid()}-{int(time.time() * 1000)}-{_sequence}{SEGMENT_SUFFIX}'
+    ))
+    fsync_dir(directory)
+    return segment
+
+
+def append(rows: List[Dict[str, Any]]) -> None:
+    """
+    追加審計記錄到日誌並等待 fsync
+
+    併發調用在 _sync_lock 上排隊，前一個調用的 fsync 已覆蓋本次寫入時直接返回
+    """
+    global _active
+    _reset_after_fork()
+    directory = journal_dir()
+    with _write_lock:
+        if _active is None:
+            _active = _open_segment(directory)
+        segment = _active
+        for row in rows:
+            segment.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        segment.file.flush()
+        segment.records += len(rows)
+        if segment.oldest is None:
+            segment.oldest = time.time()
+        _metrics['journaled'] += len(rows)
+        target = segment.records
+
+    with _sync_lock:
+        if segment.synced < target:
+            written = segment.records
+            try:
+                os.fsync(segment.file.fileno())
+            except ValueError:
+                # 日誌段已寫入數據庫並關閉
+                pass
+            segment.synced = written
+            _metrics['fsyncs'] += 1
+
+    _ensure_flusher(current_app._get_current_object())
+
+
+def _seal() -> None:
+    """封存當前日誌段，之後的記錄寫入新的日誌段"""
+    global _active
+    with _write_lock:
+        if _active is not None and _active.records:
+            _sealed.append(_active)
+            _active = None
+
+
+def _read_rows(directory: str, path: str, skip: int = 0) -> List[Dict[str, Any]]:
+    rows = []
+    with open(path, encoding='utf-8') as file:
+        for number, line in enumerate(file):
+            if number < skip:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError as e:
+                # 崩潰時寫了一半的最後一行直接忽略
+                if line.endswith('\n'):
+                    _reject(directory, {'line': line.rstrip('\n')}, e)
+    return rows
+
+
+def _to_values(row: Dict[str, Any]) -> Dict[str, Any]:
+    values = dict(row)
+    values.pop('entity_ids', None)
+    values['edit_date'] = datetime.fromisoformat(row['edit_date'])
+    values.setdefault('journal_id', None)
+    return values
+
+
+def _reject(directory: str, row: Dict[str, Any], error: Exception) -> None:
+    current_app.logger.error(f'審計記錄寫入失敗，已移至 {REJECTED_FILE}: {str(error)}')
+    with open(os.path.join(directory, REJECTED_FILE), 'a', encoding='utf-8') as file:
+        file.write(json.dumps({**row, 'error': str(error)}, ensure_ascii=False) + '\n')
+    _metrics['rejected'] += 1
+
+
+def _already_inserted(session, values: List[Dict[str, Any]]) -> List[bool]:
+    """
+    重放時各記錄是否已在 edit_records 中
+
+    按 journal_id 判斷；升級前寫入的日誌行沒有 journal_id，按管理員、類型、模組相同且時間相差不到一秒判斷
+    """
+    from app.models import EditRecord
+
+    journal_ids = [value['journal_id'] for value in values if value['journal_id']]
+    existing = set(session.scalars(
+        select(EditRecord.journal_id).where(EditRecord.journal_id.in_(journal_ids))
+    )) if journal_ids else set()
+
+    stored = defaultdict(list)
+    legacy_dates = [value['edit_date'] for value in values if not value['journal_id']]
+    if legacy_dates:
+        for admin_id, edit_type, edit_module, edit_date in session.execute(
+            select(EditRecord.admin_id, EditRecord.edit_type, EditRecord.edit_module, EditRecord.edit_date)
+            .where(EditRecord.edit_date.between(min(legacy_dates) - _LEGACY_DATE_TOLERANCE,
+                                                max(legacy_dates) + _LEGACY_DATE_TOLERANCE))
+        ):
+            stored[(admin_id, edit_type, edit_module)].append(edit_date)
+
+    return [
+        value['journal_id'] in existing if value['journal_id'] else any(
+            abs(edit_date - value['edit_date']) < _LEGACY_DATE_TOLERANCE
+            for edit_date in stored[(value['admin_id'], value['edit_type'], value['edit_module'])]
+        )
+        for value in values
+    ]
+
+
+def _insert_entities(session, rows: List[Dict[str, Any]], values: List[Dict[str, Any]]) -> None:
+    """
+    為剛插入的記錄寫入操作對象引用，edit_id 按 journal_id 查回
+
+    沒有 journal_id 的舊日誌行按管理員、類型、模組相同且時間相差不到一秒查找；找不到記錄時只記錄日誌
+    """
+    from app.models import EditRecord, EditRecordEntity
+
+    pending = [(row['entity_ids'], value) for row, value in zip(rows, values) if row.get('entity_ids')]
+    if not pending:
+        return
+    journal_ids = [value['journal_id'] for _, value in pending if value['journal_id']]
+    edit_ids = dict(session.execute(
+        select(EditRecord.journal_id, EditRecord.edit_id).where(EditRecord.journal_id.in_(journal_ids))
+    ).all()) if journal_ids else {}
+
+    legacy = defaultdict(list)
+    legacy_dates = [value['edit_date'] for _, value in pending if not value['journal_id']]
+    if legacy_dates:
+        for edit_id, admin_id, edit_type, edit_module, edit_date in session.execute(
+            select(EditRecord.edit_id, EditRecord.admin_id, EditRecord.edit_type, EditRecord.edit_module,
+                   EditRecord.edit_date)
+            .where(EditRecord.journal_id.is_(None))
+            .where(EditRecord.edit_date.between(min(legacy_dates) - _LEGACY_DATE_TOLERANCE,
+                                                max(legacy_dates) + _LEGACY_DATE_TOLERANCE))
+            .order_by(EditRecord.edit_id.desc())
+        ):
+            legacy[(admin_id, edit_type, edit_module)].append((edit_date, edit_id))
+
+    entities = []
+    for entity_ids, value in pending:
+        if value['journal_id']:
+            edit_id = edit_ids.get(value['journal_id'])
+        else:
+            edit_id = next((edit_id for edit_date, edit_id in
+                            legacy[(value['admin_id'], value['edit_type'], value['edit_module'])]
+                            if abs(edit_date - value['edit_date']) < _LEGACY_DATE_TOLERANCE), None)
+        if edit_id is None:
+            current_app.logger.warning(f'審計記錄的操作對象引用未寫入，找不到對應的記錄: {value["journal_id"] or value["edit_date"]}')
+            continue
+        entities.extend({'edit_id': edit_id, 'entity_id': entity_id, 'edit_module': value['edit_module'],
+                         'edit_date': value['edit_date']} for entity_id in entity_ids)
+    if entities:
+        session.execute(insert(EditRecordEntity.__table__), entities)
+
+
+def _insert_batch(directory: str, rows: List[Dict[str, Any]], dedupe: bool) -> int:
+    """插入一批記錄並提交，返回插入數；數據庫不可用等錯誤向上拋出"""
+    from app import db
+    from app.models import EditRecord
+
+    session = db.session
+    values = [_to_values(row) for row in rows]
+    if dedupe:
+        inserted = _already_inserted(session, values)
+        kept = [(row, value) for row, value, done in zip(rows, values, inserted) if not done]
+        _metrics['duplicates'] += len(values) - len(kept)
+        rows, values = [row for row, _ in kept], [value for _, value in kept]
+    if not values:
+        return 0
+    try:
+        session.execute(insert(EditRecord.__table__), values)
+        _insert_entities(session, rows, values)
+        session.commit()
+        return len(values)
+    except (IntegrityError, DataError):
+        session.rollback()
+
+    # 逐條插入，找出無法寫入的記錄
+    inserted = 0
+    for row, value in zip(rows, values):
+        try:
+            with session.begin_nested():
+                session.execute(insert(EditRecord.__table__), [value])
+                _insert_entities(session, [row], [value])
+            inserted += 1
+        except (IntegrityError, DataError) as e:
+            _reject(directory, row, e)
+    session.commit()
+    return inserted
+
+
+def _write_segment(directory: str, path: str, skip: int, dedupe: bool, on_batch=None) -> int:
+    batch_size = current_app.config.get('AUDIT_FLUSH_BATCH_SIZE', 500)
+    rows = _read_rows(directory, path, skip)
+    inserted = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        inserted += _insert_batch(directory, batch, dedupe)
+        if on_batch:
+            on_batch(len(batch))
+    return inserted
+
+
+def _recover_orphans(directory: str) -> int:
+    """重放沒有被任何進程持有的日誌段（沒有 fcntl 的平台只在啟動時重放）"""
+    own = {segment.path for segment in _sealed}
+    if _active is not None:
+        own.add(_active.path)
+    recovered = 0
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)) or path in own:
+            continue
+        try:
+            file = open(path, encoding='utf-8')
+        except FileNotFoundError:
+            continue
+        with file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    continue
+            # 取得鎖前已被持有者寫完並刪除
+            if not os.path.exists(path):
+                continue
+            recovered += _write_segment(directory, path, 0, dedupe=True)
+            os.remove(path)
+    _metrics['recovered'] += recovered
+    return recovered
+
+
+def flush(recover_orphans: bool = True) -> int:
+    """
+    把日誌中的記錄寫入 edit_records
+
+    在沒有其他未提交修改的應用上下文中調用（後台線程、啟動時、維護腳本）
+
+    Returns:
+        int: 寫入的記錄數
+    """
+    from app import db
+
+    directory = journal_dir()
+    if not os.path.isdir(directory):
+        return 0
+    with _flush_lock:
+        started = time.perf_counter()
+        _seal()
+        inserted = 0
+        try:
+            if recover_orphans:
+                inserted += _recover_orphans(directory)
+            while _sealed:
+                segment = _sealed[0]
+
+                def _advance(count, segment=segment):
+                    segment.flushed += count
+
+                inserted += _write_segment(directory, segment.path, segment.flushed, dedupe=False,
+                                           on_batch=_advance)
+                os.remove(segment.path)
+                segment.close()
+                with _write_lock:
+                    _sealed.pop(0)
+        except Exception as e:
+            db.session.rollback()
+            _metrics['flush_errors'] += 1
+            _metrics['last_error'] = str(e)
+            current_app.logger.error(f'審計日誌寫入數據庫失敗，稍後重試: {str(e)}')
+        _metrics['flushed'] += inserted
+        _metrics['last_flush_at'] = datetime.now(timezone.utc).isoformat()
+        _metrics['last_flush_seconds'] = round(time.perf_counter() - started, 3)
+        _metrics['last_flush_records'] = inserted
+    return inserted
+
+
+def recover() -> int:
+    """啟動時重放上次未寫入的日誌段"""
+    if not current_app.config.get('AUDIT_WRITE_BEHIND'):
+        return 0
+    return flush()
+
+
+def metrics() -> Dict[str, Any]:
+    """刷新延遲及積壓"""
+    with _write_lock:
+        segments = list(_sealed) + ([_active] if _active is not None else [])
+        backlog = sum(segment.records - segment.flushed for segment in segments)
+        oldest = min((segment.oldest for segment in segments if segment.oldest), default=None)
+    result = dict(_metrics)
+    result.update({
+        'enabled': bool(current_app.config.get('AUDIT_WRITE_BEHIND')),
+        'backlog_records': backlog,
+        'backlog_segments': len(segments),
+        'flush_lag_seconds': round(time.time() - oldest, 3) if oldest else 0,
+        'flusher_alive': _flusher is not None and _flusher.is_alive() and _flusher_pid == os.getpid(),
+    })
+    return result
+
+
+def _reset_after_fork() -> None:
+    """fork 出的工作進程不繼承父進程的日誌段和後台線程"""
+    global _active, _sealed, _flusher, _flusher_pid
+    if _flusher_pid is not None and _flusher_pid != os.getpid():
+        with _write_lock:
+            _active = None
+            _sealed = []
+        _flusher = None
+        _flusher_pid = None
+
+
+def _run_flusher(app, interval: float) -> None:
+    while True:
+        _wakeup.wait(interval)
+        _wakeup.clear()
+        try:
+            with app.app_context():
+                flush(recover_orphans=fcntl is not None)
+        except Exception as e:  # pragma: no cover - 保證後台線程不退出
+            app.logger.error(f'審計日誌後台刷新失敗: {str(e)}')
+
+
+def _ensure_flusher(app) -> None:
+    """啟動本進程的後台刷新線程（AUDIT_FLUSH_INTERVAL <= 0 時不啟動，由調用方執行 flush）"""
+    global _flusher, _flusher_pid
+    interval = app.config.get('AUDIT_FLUSH_INTERVAL', 1.0)
+    if interval <= 0 or (_flusher is not None and _flusher_pid == os.getpid()):
+        return
+    with _flush_lock:
+        if _flusher is not None and _flusher_pid == os.getpid():
+            return
+        _flusher = threading.Thread(target=_run_flusher, args=(app, interval), name='audit-journal', daemon=True)
+        _flusher_pid = os.getpid()
+        _flusher.start()
+
+
+def _append_committed(session) -> None:
+    rows = session.info.pop(_PENDING_KEY, None)
+    if not rows or not has_app_context():
+        return
+    try:
+        append(rows)
+    except OSError as e:
+        # 業務事務已提交，寫日誌失敗時只能記錄錯誤
+        current_app.logger.error(f'審計記錄寫入日誌失敗: {str(e)}; {json.dumps(rows, ensure_ascii=False)}')
+
+
+def _discard_pending(session, transaction) -> None:
+    """事務結束（提交後已取走，回滾時丟棄）"""
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+_events_registered = False
+
+
+def register_audit_journal_events() -> None:
+    """註冊事務提交後寫入審計日誌的會話事件（僅註冊一次）"""
+    global _events_registered
+    if _events_registered:
+        return
+    event.listen(Session, 'after_commit', _append_committed)
+    event.listen(Session, 'after_transaction_end', _discard_pending)
+    _events_registered = True
@@ -0,0 +1,276 @@
+"""
+審計記錄內容（edit_records.edit_content）的緊湊編碼
+
+更新操作的審計內容中每個字段的新舊值原本存儲兩次（changes 及 operation_details.before_update/after_update），
+長文本字段（描述等）的舊值與新值通常只有少量差異。編碼時：
+
+- operation_details 與 changes 可互相推導時不存儲，解碼時還原
+- 長文本字段的舊值存為相對新值的詞級差異（old_delta）
+- 編碼後超過 AUDIT_COMPRESS_MIN_BYTES 的內容 zlib 壓縮後以 base64 存儲（z: 前綴）
+
+未壓縮、未精簡的內容與原來的 JSON 完全相同；解碼兼容所有舊記錄。
+
+summarize 生成寫入 edit_records.edit_summary 的簡短摘要，列表接口直接返回，無需解碼內容；
+entity_ids 提取寫入 edit_record_entities 的操作對象ID，field_changes 生成操作歷史的字段級差異。
+"""
+
+import base64
+import json
+import re
+import zlib
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Union
+from flask import current_app, has_app_context
+
+COMPRESSED_PREFIX = 'z:'
+# 精簡標記：按位記錄省略了 operation_details（1）、含 old_delta（2）
+COMPACT_MARKER = '_c'
+_DETAILS_DROPPED = 1
+_DELTAS = 2
+
+DEFAULT_COMPRESS_MIN_BYTES = 1024
+DEFAULT_DIFF_MIN_CHARS = 256
+
+# 摘要最大長度（edit_records.edit_summary 為 String(255)）
+SUMMARY_MAX_CHARS = 200
+# 摘要中列出的變更字段數上限
+SUMMARY_MAX_FIELDS = 5
+# 作為摘要名稱的字段，按優先級匹配鍵名或鍵名後綴
+_NAME_KEYS = ('name', 'title', 'filename', 'original_filename', 'username')
+_NAME_SUFFIXES = ('_name_zh', '_title_zh', '_name', '_title', '_name_en', '_title_en')
+
+# 各模組審計內容中標識操作對象的鍵，另匹配 deleted_<鍵> 及批量操作的 <鍵>s 列表
+ENTITY_ID_KEYS = {
+    0: ('admin_id', 'target_admin_id'),
+    1: ('lab_id',),
+    2: ('group_id', 'research_group_id'),
+    3: ('member_id', 'mem_id'),
+    4: ('paper_id',),
+    5: ('news_id',),
+    6: ('project_id',),
+    9: ('resource_id',),
+}
+
+_TOKEN_RE = re.compile(r'\S+\s*|\s+')
+
+Delta = List[Union[int, str]]
+
+
+def _config(name: str, default: int) -> int:
+    return current_app.config.get(name, default) if has_app_context() else default
+
+
+def _tokens(text: str) -> List[str]:
+    """按詞（連同其後的空白）切分，拼接後與原文相同"""
+    return _TOKEN_RE.findall(text)
+
+
+def make_delta(base: str, target: str) -> Delta:
+    """
+    由 base 還原 target 的差異：正整數複製 base 的若干詞，負整數跳過 base 的若干詞，字符串原樣插入
+    """
+    base_tokens, target_tokens = _tokens(base), _tokens(target)
+    delta: Delta = []
+
+    def _push(op):
+        if delta and type(op) is type(delta[-1]) and (isinstance(op, str) or (op > 0) == (delta[-1] > 0)):
+            delta[-1] += op
+        else:
+            delta.append(op)
+
+    matcher = SequenceMatcher(None, base_tokens, target_tokens)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            _push(i2 - i1)
+            continue
+        if i2 > i1:
+            _push(i1 - i2)
+        if j2 > j1:
+            _push(''.join(target_tokens[j1:j2]))
+    return delta
+
+
+def apply_delta(base: str, delta: Delta) -> str:
+    base_tokens = _tokens(base)
+    position, parts = 0, []
+    for op in delta:
+        if isinstance(op, str):
+            parts.append(op)
+        elif op > 0:
+            parts.extend(base_tokens[position:position + op])
+            position += op
+        else:
+            position -= op
+    return ''.join(parts)
+
+
+def _derived_details(changes: Dict[str, Any]) -> Dict[str, Any]:
+    """與各服務中構造 operation_details 的方式相同"""
+    if not changes:
+        return {}
+    return {
+        'before_update': {k: v['old'] for k, v in changes.items() if isinstance(v, dict) and 'old' in v},
+        'after_update': {k: v['new'] for k, v in changes.items() if isinstance(v, dict) and 'new' in v}
+    }
+
+
+def compact(content: Dict[str, Any]) -> Dict[str, Any]:
+    """精簡審計內容，沒有可精簡的部分時原樣返回"""
+    changes = content.get('changes')
+    if not isinstance(changes, dict):
+        return content
+
+    result = dict(content)
+    marker = 0
+    if 'operation_details' in content and content['operation_details'] == _derived_details(changes):
+        del result['operation_details']
+        marker |= _DETAILS_DROPPED
+
+    diff_min = _config('AUDIT_DIFF_MIN_CHARS', DEFAULT_DIFF_MIN_CHARS)
+    compact_changes = {}
+    for field, change in changes.items():
+        if isinstance(change, dict) and set(change) == {'old', 'new'} \
+                and isinstance(change['old'], str) and isinstance(change['new'], str) \
+                and len(change['old']) >= diff_min:
+            delta = make_delta(change['new'], change['old'])
+            if len(json.dumps(delta, ensure_ascii=False)) < len(change['old']):
+                compact_changes[field] = {'new': change['new'], 'old_delta': delta}
+                marker |= _DELTAS
+                continue
+        compact_changes[field] = change
+    result['changes'] = compact_changes
+
+    if marker:
+        result[COMPACT_MARKER] = marker
+        return result
+    return content
+
+
+def expand(content: Dict[str, Any]) -> Dict[str, Any]:
+    """還原 compact 精簡的審計內容"""
+    if not isinstance(content, dict) or COMPACT_MARKER not in content:
+        return content
+    result = dict(content)
+    marker = result.pop(COMPACT_MARKER)
+    changes = {}
+    for field, change in result.get('changes', {}).items():
+        if isinstance(change, dict) and 'old_delta' in change:
+            change = {'old': apply_delta(change['new'], change['old_delta']), 'new': change['new']}
+        changes[field] = change
+    result['changes'] = changes
+    if marker & _DETAILS_DROPPED:
+        result['operation_details'] = _derived_details(changes)
+    return result
+
+
+def encode(content: Dict[str, Any]) -> str:
+    """審計內容編碼為 edit_content 中存儲的字符串"""
+    text = json.dumps(compact(content), ensure_ascii=False)
+    if len(text.encode('utf-8')) < _config('AUDIT_COMPRESS_MIN_BYTES', DEFAULT_COMPRESS_MIN_BYTES):
+        return text
+    packed = COMPRESSED_PREFIX + base64.b64encode(zlib.compress(text.encode('utf-8'), 6)).decode('ascii')
+    return packed if len(packed) < len(text) else text
+
+
+def decode(stored: Optional[str]) -> Dict[str, Any]:
+    """解碼 edit_content（兼容舊記錄的 JSON）"""
+    if not stored:
+        return {}
+    if stored.startswith(COMPRESSED_PREFIX):
+        stored = zlib.decompress(base64.b64decode(stored[len(COMPRESSED_PREFIX):])).decode('utf-8')
+    return expand(json.loads(stored))
+
+
+
+def _summary_name(content: Dict[str, Any]) -> Optional[str]:
+    for key in _NAME_KEYS:
+        if isinstance(content.get(key), str) and content[key].strip():
+            return content[key].strip()
+    for suffix in _NAME_SUFFIXES:
+        for key, value in content.items():
+            if key.endswith(suffix) and isinstance(value, str) and value.strip():
+                return value.strip()
+    return None
+
+
+def _summary_id(content: Dict[str, Any]) -> Optional[int]:
+    for key, value in content.items():
+        if key.endswith('_id') and key != 'admin_id' and isinstance(value, int) and not isinstance(value, bool):
+            return value
+    return None
+
+
+def summarize(content: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    審計內容的簡短摘要：對象名稱、對象ID、變更字段、批量項目數
+
+    例如 "王小明 · #12 · changed: mem_email, mem_desc_zh"；沒有可摘要的內容時返回 None
+    """
+    if not isinstance(content, dict) or not content:
+        return None
+
+    parts = []
+    name = _summary_name(content)
+    if name:
+        parts.append(' '.join(name.split()))
+    entity_id = _summary_id(content)
+    if entity_id is not None:
+        parts.append(f'#{entity_id}')
+    fields = content.get('changed_fields')
+    if isinstance(fields, list) and fields:
+        listed = ', '.join(str(field) for field in fields[:SUMMARY_MAX_FIELDS])
+        if len(fields) > SUMMARY_MAX_FIELDS:
+            listed += f' +{len(fields) - SUMMARY_MAX_FIELDS}'
+        parts.append(f'changed: {listed}')
+    items_count = content.get('total_items', content.get('items_count'))
+    if isinstance(items_count, int) and not isinstance(items_count, bool):
+        parts.append(f'items: {items_count}')
+
+    if not parts:
+        return None
+    summary = ' · '.join(parts)
+    if len(summary) > SUMMARY_MAX_CHARS:
+        summary = summary[:SUMMARY_MAX_CHARS - 1] + '…'
+    return summary
+
+
+def _is_id(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def entity_ids(edit_module: int, content: Optional[Dict[str, Any]]) -> List[int]:
+    """審計內容涉及的操作對象ID（按 ENTITY_ID_KEYS），沒有時返回空列表"""
+    keys = ENTITY_ID_KEYS.get(edit_module)
+    if not keys or not isinstance(content, dict):
+        return []
+    ids = set()
+    for key in keys:
+        ids.update(value for value in (content.get(key), content.get(f'deleted_{key}')) if _is_id(value))
+        values = content.get(f'{key}s')
+        if isinstance(values, list):
+            ids.update(value for value in values if _is_id(value))
+    return sorted(ids)
+
+
+def field_changes(edit_type: str, content: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    操作的字段級差異 [{'field', 'old', 'new'}]
+
+    更新操作取 changes 中的新舊值，創建操作為提交的字段（舊值為 None），
+    批量更新為 update_fields；其他操作沒有字段差異
+    """
+    if not isinstance(content, dict):
+        return []
+    changes = content.get('changes')
+    if isinstance(changes, dict):
+        return [
+            {'field': field, 'old': change.get('old'), 'new': change.get('new')}
+            if isinstance(change, dict) and ('old' in change or 'new' in change)
+            else {'field': field, 'old': None, 'new': change}
+            for field, change in changes.items()
+        ]
+    if edit_type == 'CREATE':
+        return [{'field': field, 'old': None, 'new': value} for field, value in content.items()]
+    if isinstance(content.get('update_fields'), dict):
+        return [{'field': field, 'old': None, 'new': value} for field, value in content['update_fields'].items()]
+    return []
@@ -0,0 +1,113 @@
+"""
+分頁總數緩存
+
+按「模組 + 規範化篩選簽名」緩存 COUNT 結果，表未變化時分頁查詢無需重複統計。
+經 BaseService.execute_with_audit 的寫操作提交後按模組失效；
+未經該路徑的寫入（如多進程部署中其他進程的寫入）由 TTL 兜底。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+from flask import current_app, has_app_context
+
+
+class CountCache:
+    """
+    進程內的 COUNT 結果緩存
+
+    每個模組維護一個代數（generation），失效時遞增；
+    統計期間若模組被失效，則丟棄本次結果，避免寫入過期總數。
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple[str, Hashable], Tuple[int, float, int]]' = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @staticmethod
+    def make_signature(query) -> Tuple[str, str]:
+        """
+        生成查詢的規範化簽名：去除排序後的 SQL 文本及綁定參數
+
+        排序不影響總數，去除後不同排序方式可共用同一條緩存
+        """
+        compiled = query.order_by(None).statement.compile()
+        params = sorted((key, repr(value)) for key, value in compiled.params.items())
+        return str(compiled), repr(params)
+
+    def get_or_count(self, module: str, query) -> Tuple[int, bool]:
+        """
+        返回查詢總數
+
+        Returns:
+            Tuple[int, bool]: (總數, 是否來自緩存)
+        """
+        if not self.enabled:
+            return query.order_by(None).count(), False
+
+        key = (module, self.make_signature(query))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generations.get(module, 0)
+            if entry is not None:
+                total, expires_at, entry_generation = entry
+                if entry_generation == generation and expires_at > now:
+                    self._entries.move_to_end(key)
+                    return total, True
+                del self._entries[key]
+
+        total = query.order_by(None).count()
+
+        with self._lock:
+            if self._generations.get(module, 0) == generation:
+                self._entries[key] = (total, now + self.ttl, generation)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return total, False
+
+    def invalidate(self, *modules: str) -> None:
+        """使指定模組的全部緩存總數失效"""
+        with self._lock:
+            for module in modules:
+                self._generations[module] = self._generations.get(module, 0) + 1
+            stale = [key for key in self._entries if key[0] in modules]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def get_count_cache() -> Optional[CountCache]:
+    """獲取當前應用的總數緩存，無應用上下文時返回 None"""
+    if not has_app_context():
+        return None
+
+    app = current_app._get_current_object()
+    cache = app.extensions.get('count_cache')
+    if cache is None:
+        cache = app.extensions.setdefault('count_cache', CountCache(
+            ttl=app.config.get('COUNT_CACHE_TTL', 60),
+            max_entries=app.config.get('COUNT_CACHE_MAX_ENTRIES', 1024)
+        ))
+    return cache
+
+
+def invalidate_counts(*modules: str) -> None:
+    """寫操作提交後調用，使相關模組的緩存總數失效"""
+    cache = get_count_cache()
+    if cache is not None:
+        cache.invalidate(*modules)
@@ -1,10 +1,13 @@
 import os
-import uuid
+import time
 from datetime import datetime
 from flask import current_app
-from PIL import Image
 import mimetypes
 from .messages import msg
+from . import media_store
+
+# 上傳後需要縮放和重新編碼的文件類型
+IMAGE_FILE_TYPES = ('image', 'member_avatar', 'description_image')
 
 def allowed_file(filename, file_type='image'):
     if not filename or '.' not in filename:
@@ -23,7 +26,14 @@ def allowed_file(filename, file_type='image'):
     
     return False
 
-def save_file(file, file_type='other', max_size=None):
+def save_file(file, file_type='other', max_size=None, wait=None):
+    """
+    保存上傳文件並返回存儲路徑（/media/<類型>/<前兩位>/<sha256>.<擴展名>）
+
+    內容在寫入磁盤時計算 SHA-256，同一類型下已存在相同內容時直接返回已有路徑（見 app.utils.media_store）。
+    圖片只在請求內校驗文件頭，縮放和重新編碼由 app.utils.image_pipeline 在後台進程池中完成；
+    wait=True（或請求帶 wait=1）時等待處理結果
+    """
     if not file or file.filename == '':
         return None
     
@@ -31,69 +41,76 @@ def save_file(file, file_type='other', max_size=None):
     if not allowed_file(file.filename, file_type):
         raise ValueError(msg.get_error_message('UNSUPPORTED_FILE_TYPE'))
     
-    # 檢查文件大小 - 使用 content_length 避免讀取整個文件
-    if max_size:
-        # 優先使用 content_length
-        if hasattr(file, 'content_length') and file.content_length:
-            if file.content_length > max_size:
-                raise ValueError(msg.get_error_message('FILE_SIZE_EXCEEDED', max_size=max_size))
-        else:
-            # 回退到原方法，但先保存當前位置
-            current_pos = file.tell()
-            file.seek(0, 2)  # 移動到文件末尾
-            file_size = file.tell()
-            file.seek(current_pos)  # 恢復原位置
-            
-            if file_size > max_size:
-                raise ValueError(msg.get_error_message('FILE_SIZE_EXCEEDED', max_size=max_size))
+    # 檢查文件大小 - 使用 content_length 提前拒絕，寫入時再按實際大小檢查
+    if max_size and getattr(file, 'content_length', None) and file.content_length > max_size:
+        raise ValueError(msg.get_error_message('FILE_SIZE_EXCEEDED', max_size=max_size))
     
     # 確保文件指針在開始位置
     file.seek(0)
     
-    # 生成文件名
-    ext = file.filename.rsplit('.', 1)[1].lower()
-    filename = f"{uuid.uuid4().hex}.{ext}"
+    is_image = file_type in IMAGE_FILE_TYPES
+    if is_image:
+        from app.utils.image_pipeline import probe_image
+        try:
+            probe_image(file)
+        except Exception as e:
+            raise ValueError(msg.get_error_message('IMAGE_PROCESS_FAILED', error=str(e)))
+    
+    # 流式寫入臨時文件並計算內容哈希
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    type_folder = os.path.join(upload_folder, file_type)
+    os.makedirs(type_folder, exist_ok=True)
+    started = time.perf_counter()
+    digest, size, temp_path = media_store.stream_to_temp(file, type_folder, max_size)
     
-    # 創建目錄結構
+    ext = file.filename.rsplit('.', 1)[1].lower()
+    return store_file(temp_path, file_type, ext, digest, size, started=started, wait=wait)
+
+def store_file(temp_path, file_type, ext, digest, size, started=None, wait=None):
+    """
+    將已計算 SHA-256 的完整文件移入內容尋址存儲並返回存儲路徑，圖片類型交給後台處理
+
+    Args:
+        temp_path: UPLOAD_FOLDER 下的臨時文件，存儲後移走或刪除
+        started: 開始寫入的 time.perf_counter()，用於統計去重省去的耗時
+    """
+    if started is None:
+        started = time.perf_counter()
     upload_folder = current_app.config['UPLOAD_FOLDER']
-    year_month = datetime.now().strftime('%Y%m')
-    folder_path = os.path.join(upload_folder, file_type, year_month)
-    os.makedirs(folder_path, exist_ok=True)
+    relative_path = media_store.content_path(file_type, digest, ext)
+    stored_path = f"/media/{relative_path}"
+    full_path = os.path.join(upload_folder, relative_path)
+    
+    from app import db
     
-    # 保存文件
-    file_path = os.path.join(folder_path, filename)
-    file.save(file_path)
+    # 相同內容已存儲：不再寫入和處理（hold 失敗表示文件剛被釋放刪除，重新寫入）
+    if media_store.find_stored(db.session, full_path, stored_path) and media_store.hold(full_path):
+        os.remove(temp_path)
+        media_store.record_upload(db.session, stored_path, digest, file_type, size)
+        return stored_path
     
-    # 對圖片進行處理
-    if file_type in ['image', 'member_avatar', 'description_image']:
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    if file_type in IMAGE_FILE_TYPES:
+        from app.utils.image_pipeline import handle_upload
         try:
-            with Image.open(file_path) as img:
-                # 限制最大尺寸
-                max_thumbnail_size = (1920, 1920)
-                img.thumbnail(max_thumbnail_size, Image.Resampling.LANCZOS)
-                img.save(file_path, optimize=True, quality=85)
+            handle_upload(temp_path, full_path, stored_path, wait)
         except Exception as e:
-            os.remove(file_path)
             raise ValueError(msg.get_error_message('IMAGE_PROCESS_FAILED', error=str(e)))
+    else:
+        os.replace(temp_path, full_path)
     
-    # 返回相對路徑
-    relative_path = os.path.join(file_type, year_month, filename).replace('\\', '/')
-    return f"/media/{relative_path}"
+    store_ms = int((time.perf_counter() - started) * 1000)
+    media_store.record_upload(db.session, stored_path, digest, file_type, size, store_ms)
+    return stored_path
 
 def delete_file(file_path):
+    """
+    釋放文件：在當前事務提交時確認沒有其他引用後才刪除（見 app.utils.media_store）
+    """
     if not file_path:
         return
     
-    try:
-        # 將相對路徑轉為絕對路徑
-        if file_path.startswith('/media/'):
-            file_path = file_path[7:]  # 移除 /media/ 前綴
-        
-        full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], file_path)
-        if os.path.exists(full_path):
-            os.remove(full_path)
-    except Exception as e:
-        current_app.logger.error(msg.get_error_message('FILE_DELETE_FAILED', error=str(e)))
+    media_store.release(file_path)
 
 def get_file_info(file_path):
     if not file_path or not file_path.startswith('/media/'):
@@ -114,4 +131,16 @@ def get_file_info(file_path):
         'mime_type': mime_type,
         'created_at': datetime.fromtimestamp(stat.st_ctime),
         'modified_at': datetime.fromtimestamp(stat.st_mtime)
-    }
\ No newline at end of file
+    }
+
+def fsync_dir(directory):
+    """
+    把目錄項（新建、重命名的文件）刷到磁盤，不支持打開目錄的平台直接返回
+    """
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,393 @@
+"""
+全文檢索
+
+替代列表接口中前導通配符的 LIKE '%q%' 掃描：
+- MySQL：各表建立 FULLTEXT 索引（ngram 解析器，支持中文），以 MATCH ... AGAINST 布爾模式篩選和計算相關度
+- SQLite（測試、本地開發）：每個表對應一個 FTS5 虛擬表，存放經分詞（中日韓字符二元組 + 英文單詞）
+  後的文本，由 ORM 事件同步，bm25() 計算相關度
+- 其他數據庫回退到 LIKE
+
+命中片段的高亮在應用層生成，兩種數據庫輸出一致
+
+論文另外檢索 PDF 提取的文本（paper_texts，見 app.utils.pdf_text）：以子查詢與標題等列的命中取並集，
+相關度按權重相加
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from markupsafe import escape
+from sqlalchemy import column, event, func, inspect, literal_column, select, table, text
+from sqlalchemy.dialects.mysql import match
+from app import db
+from app.models import Member, Paper, PaperText, ResearchGroup, News, Project, Resource
+
+# 中日韓字符連續片段或字母數字單詞
+_CJK = '぀-ヿ㐀-䶿一-鿿가-힯豈-﫿'
+_TOKEN_RE = re.compile(f'[{_CJK}]+|[^\\W_{_CJK}]+')
+_CJK_RE = re.compile(f'^[{_CJK}]+$')
+
+# 高亮片段的長度（字符）
+SNIPPET_WIDTH = 80
+
+
+class SearchSpec:
+    """一個可檢索模型的配置"""
+
+    def __init__(self, module: str, model, columns: Sequence[str], weight: float = 1.0,
+                 attached: Sequence['SearchSpec'] = ()):
+        """
+        Args:
+            weight: 作為附加文本檢索時相關度的權重
+            attached: 主鍵與本模型主鍵相同的附加文本表，命中其一即返回
+        """
+        self.module = module
+        self.model = model
+        self.columns = tuple(columns)
+        self.weight = weight
+        self.attached = tuple(attached)
+        self.table = model.__table__.name
+        self.pk = model.__mapper__.primary_key[0]
+        self.index_name = f'ft_{self.table}_search'
+        self.fts_table = f'{self.table}_fts'
+
+
+# 論文 PDF 正文較長，命中時相關度低於標題
+PAPER_TEXT_SPEC = SearchSpec('paper_text', PaperText, ('paper_text',), weight=0.5)
+
+# 與原 LIKE 搜索的列保持一致
+SEARCH_SPECS = {spec.model: spec for spec in (
+    SearchSpec('member', Member, ('mem_name_zh', 'mem_name_en', 'mem_email')),
+    SearchSpec('paper', Paper, ('paper_title_zh', 'paper_title_en', 'paper_venue'), attached=(PAPER_TEXT_SPEC,)),
+    PAPER_TEXT_SPEC,
+    SearchSpec('research_group', ResearchGroup, (
+        'research_group_name_zh', 'research_group_name_en',
+        'research_group_desc_zh', 'research_group_desc_en'
+    )),
+    SearchSpec('news', News, ('news_title_zh', 'news_title_en', 'news_content_zh', 'news_content_en')),
+    SearchSpec('project', Project, ('project_name_zh', 'project_name_en', 'project_desc_zh', 'project_desc_en')),
+    SearchSpec('resource', Resource, (
+        'resource_name_zh', 'resource_name_en',
+        'resource_description_zh', 'resource_description_en'
+    )),
+)}
+
+
+def analyze(value: Optional[str]) -> List[str]:
+    """
+    分詞：中日韓字符切分為重疊的二元組（單字保留），其他文本按單詞切分並轉為小寫
+
+    與 MySQL ngram 解析器（ngram_token_size=2）的中文切分方式一致
+    """
+    tokens = []
+    for run in _TOKEN_RE.findall(value or ''):
+        if _CJK_RE.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run.lower())
+    return tokens
+
+
+def parse_terms(q: str) -> List[str]:
+    """將搜索字符串按空白切分為檢索詞，去除運算符等非文字字符"""
+    terms = []
+    for raw in q.split():
+        term = ' '.join(_TOKEN_RE.findall(raw))
+        if term:
+            terms.append(term)
+    return terms
+
+
+def _is_single_cjk(term: str) -> bool:
+    return len(term) == 1 and bool(_CJK_RE.match(term))
+
+
+def build_mysql_query(terms: Sequence[str]) -> str:
+    """構造 MySQL 布爾模式查詢：每個檢索詞為必須命中的短語，單個漢字使用前綴匹配"""
+    return ' '.join(f'+{term}*' if _is_single_cjk(term) else f'+"{term}"' for term in terms)
+
+
+def is_prefix_token(token: str) -> bool:
+    """檢索詞末尾的英文單詞或單個漢字可能未輸入完整，按前綴匹配"""
+    return not _CJK_RE.match(token) or len(token) == 1
+
+
+def build_fts5_query(terms: Sequence[str]) -> str:
+    """構造 FTS5 查詢：每個檢索詞為二元組短語，末尾為英文單詞或單字時使用前綴匹配"""
+    phrases = []
+    for term in terms:
+        tokens = analyze(term)
+        prefix = is_prefix_token(tokens[-1])
+        phrases.append('"{}"{}'.format(' '.join(tokens), '*' if prefix else ''))
+    return ' '.join(phrases)
+
+
+def make_snippet(value: Optional[str], terms: Sequence[str], width: int = SNIPPET_WIDTH) -> Optional[str]:
+    """
+    生成高亮片段：截取首個命中位置附近的文本，命中詞以 <mark> 包裹，其餘內容做 HTML 轉義
+
+    Returns:
+        Optional[str]: 片段；文本中沒有命中詞時返回 None
+    """
+    if not value:
+        return None
+
+    words = sorted({word for term in terms for word in term.split()}, key=len, reverse=True)
+    pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+    first = pattern.search(value)
+    if first is None:
+        return None
+
+    start = max(0, first.start() - width // 4)
+    end = min(len(value), start + width)
+    fragment = value[start:end]
+
+    parts, last = [], 0
+    for hit in pattern.finditer(fragment):
+        parts.append(str(escape(fragment[last:hit.start()])))
+        parts.append(f'<mark>{escape(hit.group())}</mark>')
+        last = hit.end()
+    parts.append(str(escape(fragment[last:])))
+
+    return ('…' if start > 0 else '') + ''.join(parts) + ('…' if end < len(value) else '')
+
+
+class FullTextSearch:
+    """一次檢索：篩選後的查詢、相關度表達式及高亮"""
+
+    def __init__(self, spec: SearchSpec, terms: List[str], score):
+        self.spec = spec
+        self.terms = terms
+        self.score = score
+
+    def order_by_relevance(self, query):
+        """按相關度倒序，相同時按主鍵倒序"""
+        return query.order_by(None).order_by(self.score.desc(), self.spec.pk.desc())
+
+    def attach_highlights(self, items: List[Dict[str, Any]]) -> None:
+        """
+        為整頁結果附加 highlight 字段（列名到高亮片段的映射）
+
+        列表默認不返回長文本列，因此用一條查詢按主鍵取回當前頁的檢索列
+        """
+        pk_name = self.spec.pk.key
+        ids = [item[pk_name] for item in items if item.get(pk_name) is not None]
+        if not ids:
+            return
+
+        highlights = {pk: {} for pk in ids}
+        for spec in (self.spec,) + self.spec.attached:
+            columns = [getattr(spec.model, name) for name in spec.columns]
+            for row in db.session.query(spec.pk, *columns).filter(spec.pk.in_(ids)):
+                for name, value in zip(spec.columns, row[1:]):
+                    snippet = make_snippet(value, self.terms)
+                    if snippet:
+                        highlights[row[0]][name] = snippet
+
+        for item in items:
+            item['highlight'] = highlights.get(item.get(pk_name), {})
+
+    def wrap_serializer(self, serializer: Optional[Callable] = None) -> Callable:
+        """包裝 paginate_query 的序列化函數，在序列化後附加高亮"""
+        def _serializer(rows):
+            items = serializer(rows) if serializer else [row.to_dict() for row in rows]
+            self.attach_highlights(items)
+            return items
+        return _serializer
+
+    def wrap_attach(self, attach: Optional[Callable] = None) -> Callable:
+        """包裝 paginate_projection 的 attach 回調"""
+        def _attach(items):
+            if attach:
+                attach(items)
+            self.attach_highlights(items)
+        return _attach
+
+
+def apply_fulltext(query, model, q: str):
+    """
+    為查詢添加全文檢索條件
+
+    Args:
+        query: 模型查詢
+        model: 已在 SEARCH_SPECS 中註冊的模型
+        q: 搜索字符串
+
+    Returns:
+        tuple: (query, FullTextSearch)；搜索字符串不含可檢索內容時返回 (query, None)
+    """
+    spec = SEARCH_SPECS[model]
+    terms = parse_terms(q or '')
+    if not terms:
+        return query, None
+
+    dialect = db.session.get_bind().dialect.name
+    if spec.attached:
+        return _apply_with_attached(query, spec, terms, dialect)
+
+    columns = [getattr(model, name) for name in spec.columns]
+
+    if dialect == 'mysql':
+        score = match(*columns, against=build_mysql_query(terms)).in_boolean_mode()
+        query = query.filter(score > 0)
+    elif dialect == 'sqlite':
+        fts = literal_column(spec.fts_table)
+        fts_table = table(spec.fts_table, column('rowid'))
+        query = query.join(fts_table, fts_table.c.rowid == spec.pk).filter(
+            fts.op('MATCH')(build_fts5_query(terms))
+        )
+        # bm25() 越小越相關，取負值使各數據庫均按 score 倒序
+        score = -func.bm25(fts)
+    else:
+        conditions = [
+            db.or_(*[searchable.like(f'%{word}%') for searchable in columns])
+            for term in terms for word in term.split()
+        ]
+        query = query.filter(db.and_(*conditions))
+        score = literal_column('0')
+
+    return query, FullTextSearch(spec, terms, score)
+
+
+def _spec_match(spec: SearchSpec, outer: SearchSpec, terms: List[str], dialect: str):
+    """
+    單個表的命中條件及相關度；附加文本表為按主鍵關聯的子查詢
+
+    Returns:
+        tuple: (命中條件, 相關度表達式；未命中時為 NULL)
+    """
+    columns = [getattr(spec.model, name) for name in spec.columns]
+    if dialect == 'sqlite':
+        fts = literal_column(spec.fts_table)
+        fts_table = table(spec.fts_table, column('rowid'))
+        condition = fts.op('MATCH')(build_fts5_query(terms))
+        score = select(-func.bm25(fts)).select_from(fts_table).where(fts_table.c.rowid == outer.pk, condition)
+        return outer.pk.in_(select(fts_table.c.rowid).where(condition)), score.scalar_subquery()
+
+    if dialect == 'mysql':
+        score = match(*columns, against=build_mysql_query(terms)).in_boolean_mode()
+        condition = score > 0
+    else:
+        condition = db.and_(*[
+            db.or_(*[searchable.like(f'%{word}%') for searchable in columns])
+            for term in terms for word in term.split()
+        ])
+        score = literal_column('0')
+    if spec is outer:
+        return condition, score
+    return (
+        outer.pk.in_(select(spec.pk).where(condition)),
+        select(score).where(spec.pk == outer.pk).scalar_subquery()
+    )
+
+
+def _apply_with_attached(query, spec: SearchSpec, terms: List[str], dialect: str):
+    """主表與附加文本表任一命中即返回，相關度按權重相加"""
+    conditions, score = [], None
+    for searched in (spec,) + spec.attached:
+        condition, searched_score = _spec_match(searched, spec, terms, dialect)
+        conditions.append(condition)
+        weighted = func.coalesce(searched_score, 0) * searched.weight
+        score = weighted if score is None else score + weighted
+    return query.filter(db.or_(*conditions)), FullTextSearch(spec, terms, score)
+
+
+# ==================== 索引維護 ====================
+
+def _sqlite_fts_exists(connection, spec: SearchSpec) -> bool:
+    return connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': spec.fts_table}
+    ).first() is not None
+
+
+def _sqlite_fts_row(spec: SearchSpec, values: Sequence[Optional[str]]) -> Dict[str, str]:
+    return {f'c{i}': ' '.join(analyze(value)) for i, value in enumerate(values)}
+
+
+def _sqlite_upsert(connection, spec: SearchSpec, rowid: int, values: Sequence[Optional[str]]) -> None:
+    names = ', '.join(f'c{i}' for i in range(len(spec.columns)))
+    params = ', '.join(f':c{i}' for i in range(len(spec.columns)))
+    connection.execute(
+        text(f'INSERT OR REPLACE INTO {spec.fts_table} (rowid, {names}) VALUES (:rowid, {params})'),
+        {'rowid': rowid, **_sqlite_fts_row(spec, values)}
+    )
+
+
+def rebuild_sqlite_index(connection, spec: SearchSpec) -> None:
+    """創建（如不存在）並重建 SQLite FTS5 索引"""
+    names = ', '.join(f'c{i}' for i in range(len(spec.columns)))
+    connection.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {spec.fts_table} USING fts5({names}, tokenize='unicode61')"
+    ))
+    connection.execute(text(f'DELETE FROM {spec.fts_table}'))
+
+    columns = ', '.join(spec.columns)
+    rows = connection.execute(text(f'SELECT {spec.pk.name}, {columns} FROM {spec.table}')).fetchall()
+    for row in rows:
+        _sqlite_upsert(connection, spec, row[0], row[1:])
+
+
+def drop_sqlite_index(connection, spec: SearchSpec) -> None:
+    connection.execute(text(f'DROP TABLE IF EXISTS {spec.fts_table}'))
+
+
+def create_mysql_index(connection, spec: SearchSpec) -> None:
+    """添加 MySQL FULLTEXT（ngram）索引，已存在時跳過"""
+    existing = {index['name'] for index in inspect(connection).get_indexes(spec.table)}
+    if spec.index_name not in existing:
+        connection.execute(text(
+            f"ALTER TABLE {spec.table} ADD FULLTEXT INDEX {spec.index_name} "
+            f"({', '.join(spec.columns)}) WITH PARSER ngram"
+        ))
+
+
+def drop_mysql_index(connection, spec: SearchSpec) -> None:
+    existing = {index['name'] for index in inspect(connection).get_indexes(spec.table)}
+    if spec.index_name in existing:
+        connection.execute(text(f'ALTER TABLE {spec.table} DROP INDEX {spec.index_name}'))
+
+
+def _after_create(metadata, connection, tables=(), **kwargs) -> None:
+    """db.create_all() 新建表後創建對應的全文索引；已有數據庫由遷移添加"""
+    created = {table.name for table in tables}
+    for spec in SEARCH_SPECS.values():
+        if connection.dialect.name == 'mysql' and spec.table in created:
+            create_mysql_index(connection, spec)
+        elif connection.dialect.name == 'sqlite' and (spec.table in created or not _sqlite_fts_exists(connection, spec)):
+            rebuild_sqlite_index(connection, spec)
+
+
+def _sync_sqlite(spec: SearchSpec, deleted: bool = False):
+    """ORM 寫入後同步 SQLite FTS5 索引（MySQL FULLTEXT 由數據庫自動維護）"""
+    def listener(mapper, connection, target):
+        if connection.dialect.name != 'sqlite' or not _sqlite_fts_exists(connection, spec):
+            return
+        rowid = getattr(target, spec.pk.key)
+        if deleted:
+            connection.execute(text(f'DELETE FROM {spec.fts_table} WHERE rowid = :rowid'), {'rowid': rowid})
+            return
+        state = inspect(target)
+        if not any(state.attrs[name].history.has_changes() for name in spec.columns):
+            return
+        _sqlite_upsert(connection, spec, rowid, [getattr(target, name) for name in spec.columns])
+    return listener
+
+
+_registered = False
+
+
+def register_fulltext_events() -> None:
+    """註冊建表及 ORM 同步事件，由 create_app 調用"""
+    global _registered
+    if _registered:
+        return
+    _registered = True
+
+    event.listen(db.metadata, 'after_create', _after_create)
+    for spec in SEARCH_SPECS.values():
+        event.listen(spec.model, 'after_insert', _sync_sqlite(spec))
+        event.listen(spec.model, 'after_update', _sync_sqlite(spec))
+        event.listen(spec.model, 'after_delete', _sync_sqlite(spec, deleted=True))
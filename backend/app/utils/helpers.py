@@ -1,4 +1,9 @@
-from flask import request
+import base64
+import json
+from datetime import date, datetime
+from flask import request, has_request_context
+from sqlalchemy import and_, or_
+from .count_cache import get_count_cache
 
 def get_pagination_params():
     # 檢查是否要獲取所有數據
@@ -16,25 +21,57 @@ def get_pagination_params():
     
     return page, per_page
 
-def paginate_query(query, page, per_page):
+def _count_total(query, count_module):
+    """統計總數；指定模組時走總數緩存，返回 (總數, 是否來自緩存)"""
+    cache = get_count_cache() if count_module else None
+    if cache is None:
+        return query.order_by(None).count(), False
+    return cache.get_or_count(count_module, query)
+
+def paginate_query(query, page, per_page, serializer=None, keyset=None, count_module=None):
+    # serializer 接收當前頁的模型對象列表並返回字典列表，便於服務層批量附加關聯數據
+    # count_module 為總數緩存所屬模組，該模組經 execute_with_audit 寫入後失效
+    if serializer is None:
+        serializer = lambda rows: [row.to_dict() for row in rows]
+    
+    # keyset 為 [(列, 是否倒序), ...]，請求攜帶 cursor 參數時改用游標分頁
+    if keyset and per_page is not None and has_request_context() and 'cursor' in request.args:
+        return paginate_keyset(
+            query, keyset, request.args.get('cursor', ''), per_page, serializer,
+            with_total=request.args.get('with_total', 'false').lower() == 'true',
+            count_module=count_module
+        )
+    
     # 如果 page 和 per_page 都是 None，返回所有數據
     if page is None and per_page is None:
         items = query.all()
         return {
-            'items': [item.to_dict() for item in items],
+            'items': serializer(items),
             'total': len(items),
+            'total_cached': False,
             'all': True
         }
     
-    items = query.paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False
-    )
+    total_cached = False
+    if count_module:
+        items = query.paginate(
+            page=page,
+            per_page=per_page,
+            error_out=False,
+            count=False
+        )
+        items.total, total_cached = _count_total(query, count_module)
+    else:
+        items = query.paginate(
+            page=page,
+            per_page=per_page,
+            error_out=False
+        )
     
     return {
-        'items': [item.to_dict() for item in items.items],
+        'items': serializer(items.items),
         'total': items.total,
+        'total_cached': total_cached,
         'pages': items.pages,
         'page': page,
         'per_page': per_page,
@@ -42,6 +79,116 @@ def paginate_query(query, page, per_page):
         'has_next': items.has_next
     }
 
+def encode_cursor(direction, values):
+    """將游標方向和排序鍵值編碼為不透明字符串"""
+    payload = [direction, [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token, keyset):
+    """
+    解碼游標，按排序列類型還原鍵值
+    
+    Returns:
+        tuple: (direction, values)，空游標返回 ('next', None)
+        
+    Raises:
+        ValidationError: 游標格式無效
+    """
+    if not token:
+        return 'next', None
+    
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, values = json.loads(raw)
+        if direction not in ('next', 'prev') or len(values) != len(keyset):
+            raise ValueError(token)
+        
+        decoded = []
+        for (column, _), value in zip(keyset, values):
+            python_type = column.type.python_type
+            if value is not None and python_type in (date, datetime):
+                value = python_type.fromisoformat(value)
+            decoded.append(value)
+        return direction, decoded
+    except (ValueError, TypeError, NotImplementedError):
+        from app.services.base_service import ValidationError
+        from app.utils.messages import msg
+        raise ValidationError(msg.get_error_message('INVALID_CURSOR'))
+
+def _keyset_condition(keyset, values, backward):
+    """構造「位於游標之後」的條件：(a, b) 之後即 a 越界，或 a 相等且 b 越界"""
+    clauses = []
+    for i, (column, desc) in enumerate(keyset):
+        comparator = column.__lt__ if desc != backward else column.__gt__
+        equals = [keyset[j][0] == values[j] for j in range(i)]
+        clauses.append(and_(*equals, comparator(values[i])))
+    
+    # 首列的非嚴格範圍條件便於數據庫直接使用複合索引做範圍掃描
+    first_column, first_desc = keyset[0]
+    first_bound = first_column <= values[0] if first_desc != backward else first_column >= values[0]
+    return and_(first_bound, or_(*clauses))
+
+def paginate_keyset(query, keyset, cursor, per_page, serializer, with_total=False, count_module=None):
+    """
+    游標（keyset）分頁
+    
+    按排序鍵而非 OFFSET 定位，翻頁開銷與頁深無關；默認不執行 COUNT 查詢
+    
+    Args:
+        query: 已應用篩選的查詢
+        keyset: [(列, 是否倒序), ...]，最後一列須唯一（通常為主鍵）
+        cursor: 上一次響應返回的 next_cursor / prev_cursor，空字符串表示第一頁
+        per_page: 每頁數量
+        serializer: 序列化函數
+        with_total: 是否額外返回總數
+        count_module: 總數緩存所屬模組
+        
+    Returns:
+        Dict: 分頁結果，包含 next_cursor / prev_cursor
+    """
+    direction, values = decode_cursor(cursor, keyset)
+    backward = direction == 'prev'
+    
+    base_width = len(query.column_descriptions)
+    single_entity = base_width == 1 and isinstance(query.column_descriptions[0]['expr'], type)
+    
+    # 附加排序鍵列，以便在任何投影下都能取得游標值
+    page_query = query.order_by(None).add_columns(
+        *[column.label(f'_cursor_{i}') for i, (column, _) in enumerate(keyset)]
+    ).order_by(*[
+        column.desc() if desc != backward else column.asc()
+        for column, desc in keyset
+    ])
+    if values is not None:
+        page_query = page_query.filter(_keyset_condition(keyset, values, backward))
+    
+    rows = page_query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backward:
+        rows.reverse()
+    
+    entities = [row[0] if single_entity else tuple(row[:base_width]) for row in rows]
+    cursor_values = [tuple(row[base_width:]) for row in rows]
+    
+    has_next = has_more if not backward else True
+    has_prev = values is not None if not backward else has_more
+    
+    result = {
+        'items': serializer(entities),
+        'per_page': per_page,
+        'has_prev': has_prev and bool(rows),
+        'has_next': has_next and bool(rows),
+        'prev_cursor': encode_cursor('prev', cursor_values[0]) if has_prev and rows else None,
+        'next_cursor': encode_cursor('next', cursor_values[-1]) if has_next and rows else None
+    }
+    
+    if with_total:
+        result['total'], result['total_cached'] = _count_total(query, count_module)
+    
+    return result
+
 def success_response(data=None, message='OK'):
     return {
         'code': 0,
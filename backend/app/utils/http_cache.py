@@ -0,0 +1,135 @@
+"""
+公開 GET 接口的 HTTP 緩存
+
+根據相關表的 MAX(updated_at)、行數以及規範化後的查詢字符串生成弱 ETag，
+命中 If-None-Match 時在查詢和序列化數據之前直接返回 304；
+同時輸出 Cache-Control / s-maxage 及按模組劃分的代理緩存鍵（Surrogate-Key），
+便於 gunicorn 前的反向代理緩存並按模組清除。
+啟用服務端響應緩存（見 response_cache）時，命中的請求不訪問數據庫
+"""
+
+import hashlib
+from functools import wraps
+from flask import current_app, request
+from sqlalchemy import func, select
+from app import db
+from app.models import Lab, ResearchGroup, Member, Paper, PaperAuthor, News, Project
+from .response_cache import CachedResponse, get_response_cache
+
+# 模組名稱（與 AuditService.MODULE_MAPPING 一致）到其數據表模型的映射
+MODULE_MODELS = {
+    'lab': (Lab,),
+    'research_group': (ResearchGroup,),
+    'member': (Member,),
+    'paper': (Paper, PaperAuthor),
+    'news': (News,),
+    'project': (Project,),
+}
+
+
+def get_table_state(modules):
+    """
+    用一條查詢獲取各模組數據表的 MAX(updated_at) 和行數
+
+    行數用於識別硬刪除；沒有 updated_at 的關聯表只統計行數
+    """
+    columns = []
+    for module in modules:
+        for model in MODULE_MODELS[module]:
+            if hasattr(model, 'updated_at'):
+                columns.append(select(func.max(model.updated_at)).scalar_subquery())
+            columns.append(select(func.count()).select_from(model).scalar_subquery())
+    return tuple(db.session.execute(select(*columns)).one())
+
+
+def normalized_query_string() -> str:
+    """按參數名和值排序的查詢字符串，參數順序不同的請求共用同一個 ETag"""
+    return '&'.join(f'{key}={value}' for key, value in sorted(request.args.items(multi=True)))
+
+
+def compute_etag(modules) -> str:
+    """根據請求路徑、查詢字符串和數據表狀態計算 ETag"""
+    digest = hashlib.sha1()
+    digest.update(request.path.encode('utf-8'))
+    digest.update(b'?' + normalized_query_string().encode('utf-8'))
+    digest.update(repr(get_table_state(modules)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def apply_cache_headers(response, modules, etag: str):
+    """為公開響應設置 ETag、Cache-Control 和代理緩存鍵"""
+    config = current_app.config
+    response.set_etag(etag, weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = config.get('HTTP_CACHE_MAX_AGE', 0)
+    response.cache_control.s_maxage = config.get('HTTP_CACHE_S_MAXAGE', 60)
+    # 管理員請求返回完整數據，共享緩存不能將公開響應用於帶令牌的請求
+    response.vary.add('Authorization')
+
+    header = config.get('SURROGATE_KEY_HEADER', 'Surrogate-Key')
+    if header:
+        response.headers[header] = ' '.join(modules)
+    return response
+
+
+def _response_cache_for_request():
+    """當前藍圖啟用響應緩存時返回緩存實例"""
+    if request.blueprint in current_app.config.get('RESPONSE_CACHE_DISABLED_BLUEPRINTS', ()):
+        return None
+    return get_response_cache()
+
+
+def http_cache(*modules):
+    """
+    公開 GET 接口的條件請求及響應緩存裝飾器
+
+    Args:
+        modules: 響應內容依賴的模組名稱，決定 ETag 的計算範圍、響應緩存的失效範圍和代理緩存鍵
+
+    響應緩存命中時直接返回緩存的響應體和 ETag，不訪問數據庫；
+    帶 Authorization 頭的請求（管理後台）不做處理
+    """
+    unknown = [module for module in modules if module not in MODULE_MODELS]
+    if unknown:
+        raise ValueError(f"Unknown cache modules: {', '.join(unknown)}")
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET' or 'Authorization' in request.headers:
+                return view(*args, **kwargs)
+
+            use_etag = current_app.config.get('HTTP_CACHE_ENABLED', True)
+            cache = _response_cache_for_request()
+            if not use_etag and cache is None:
+                return view(*args, **kwargs)
+
+            def finalize(response, etag):
+                return apply_cache_headers(response, modules, etag) if use_etag else response
+
+            key = None
+            if cache is not None:
+                key = cache.make_key(request.path, normalized_query_string(), modules)
+                cached = cache.get(key)
+                if cached is not None:
+                    if use_etag and request.if_none_match.contains_weak(cached.etag):
+                        return finalize(current_app.response_class(status=304), cached.etag)
+                    response = current_app.response_class(cached.body, mimetype=cached.mimetype)
+                    response.headers['X-Cache'] = 'HIT'
+                    return finalize(response, cached.etag)
+
+            etag = compute_etag(modules) if use_etag else ''
+            if use_etag and request.if_none_match.contains_weak(etag):
+                return finalize(current_app.response_class(status=304), etag)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            if cache is not None:
+                cache.set(key, CachedResponse(response.get_data(), etag, response.mimetype))
+                response.headers['X-Cache'] = 'MISS'
+            return finalize(response, etag)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,184 @@
+"""
+響應式圖片衍生圖
+
+/api/media/serve/<path>?w=&h=&fit=&fmt= 按需從原圖生成縮放後的圖片：
+- 寬高只能取 MEDIA_DERIVATIVE_SIZES 中的值，避免任意尺寸撐滿磁盤
+- 衍生圖保存在原圖目錄的 _derivatives/<原文件名>/ 下，先寫臨時文件再原子替換，
+  之後的請求直接發送磁盤上的文件；原圖更新（修改時間較新）時重新生成
+- 不放大原圖；fit=cover 按目標比例居中裁剪，fit=contain 等比縮放至框內
+"""
+
+import os
+import tempfile
+from typing import Any, Mapping, NamedTuple, Optional, Sequence
+from urllib.parse import urlencode
+from flask import current_app
+from PIL import Image, ImageOps
+
+# 可生成衍生圖的原圖擴展名（GIF 縮放會丟失動畫，不處理）
+SOURCE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'webp'}
+
+FIT_MODES = ('contain', 'cover')
+
+# 輸出格式 -> (PIL 格式, 擴展名)
+OUTPUT_FORMATS = {
+    'webp': ('WEBP', 'webp'),
+    'jpeg': ('JPEG', 'jpg'),
+    'png': ('PNG', 'png'),
+}
+
+DERIVATIVES_DIR = '_derivatives'
+
+
+class DerivativeSpec(NamedTuple):
+    """衍生圖參數，寬高為 0 表示不限制"""
+    width: int
+    height: int
+    fit: str
+    fmt: Optional[str]
+
+    def filename(self, source_ext: str) -> str:
+        ext = OUTPUT_FORMATS[self.fmt][1] if self.fmt else source_ext
+        return f'w{self.width}-h{self.height}-{self.fit}.{ext}'
+
+
+def parse_derivative_params(args: Mapping[str, Any], sizes: Sequence[int]) -> Optional[DerivativeSpec]:
+    """
+    解析查詢參數
+
+    Returns:
+        Optional[DerivativeSpec]: 未指定 w / h 時返回 None（發送原圖）
+
+    Raises:
+        ValueError: 參數不在允許範圍內
+    """
+    raw_width, raw_height = args.get('w'), args.get('h')
+    if not raw_width and not raw_height:
+        if args.get('fit') or args.get('fmt'):
+            raise ValueError('w or h is required')
+        return None
+
+    try:
+        width = int(raw_width) if raw_width else 0
+        height = int(raw_height) if raw_height else 0
+    except ValueError:
+        raise ValueError('w and h must be integers')
+    for value in (width, height):
+        if value and value not in sizes:
+            raise ValueError(f'size must be one of {", ".join(map(str, sizes))}')
+
+    fit = args.get('fit') or 'contain'
+    if fit not in FIT_MODES:
+        raise ValueError(f'fit must be one of {", ".join(FIT_MODES)}')
+    if fit == 'cover' and not (width and height):
+        raise ValueError('fit=cover requires both w and h')
+
+    fmt = args.get('fmt') or None
+    if fmt is not None and fmt not in OUTPUT_FORMATS:
+        raise ValueError(f'fmt must be one of {", ".join(OUTPUT_FORMATS)}')
+
+    return DerivativeSpec(width, height, fit, fmt)
+
+
+def is_derivable(filename: str) -> bool:
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in SOURCE_EXTENSIONS
+
+
+def derivative_path(source_path: str, spec: DerivativeSpec) -> str:
+    """衍生圖在磁盤上的路徑：<原圖目錄>/_derivatives/<原文件名>/<參數>.<格式>"""
+    directory, filename = os.path.split(source_path)
+    source_ext = filename.rsplit('.', 1)[1].lower()
+    return os.path.join(directory, DERIVATIVES_DIR, filename, spec.filename(source_ext))
+
+
+def _resize(image: Image.Image, spec: DerivativeSpec) -> Image.Image:
+    if spec.fit == 'cover':
+        # 原圖小於目標框時按比例縮小目標框，不放大
+        scale = min(1.0, image.width / spec.width, image.height / spec.height)
+        size = (max(1, round(spec.width * scale)), max(1, round(spec.height * scale)))
+        return ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+
+    box = (spec.width or image.width, spec.height or image.height)
+    image = image.copy()
+    image.thumbnail(box, Image.Resampling.LANCZOS)
+    return image
+
+
+def render_derivative(source_path: str, target_path: str, spec: DerivativeSpec, quality: int = 82) -> None:
+    """生成衍生圖並原子寫入 target_path，並發生成同一衍生圖時後寫入者覆蓋先寫入者"""
+    with Image.open(source_path) as source:
+        pil_format = OUTPUT_FORMATS[spec.fmt][0] if spec.fmt else source.format
+        image = _resize(ImageOps.exif_transpose(source), spec)
+
+    if pil_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    elif image.mode == 'P':
+        image = image.convert('RGBA')
+
+    directory = os.path.dirname(target_path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            image.save(temp_file, format=pil_format, quality=quality, optimize=True)
+        os.replace(temp_path, target_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def get_derivative(source_path: str, spec: DerivativeSpec) -> str:
+    """返回衍生圖路徑，不存在或早於原圖時生成"""
+    target_path = derivative_path(source_path, spec)
+    try:
+        if os.stat(target_path).st_mtime >= os.stat(source_path).st_mtime:
+            return target_path
+    except FileNotFoundError:
+        pass
+
+    render_derivative(source_path, target_path, spec, current_app.config.get('MEDIA_DERIVATIVE_QUALITY', 82))
+    return target_path
+
+
+def media_url(path: Optional[str]) -> Optional[str]:
+    """將存儲的 /media/... 路徑轉換為 /api/media/serve/... URL，外部鏈接返回 None"""
+    if not path or not path.startswith('/media/'):
+        return None
+    return '/api/media/serve/' + path[len('/media/'):]
+
+
+def build_srcset(path: Optional[str], widths: Optional[Sequence[int]] = None,
+                 fmt: Optional[str] = None) -> Optional[dict]:
+    """
+    為圖片路徑生成 srcset
+
+    Args:
+        path: 存儲的圖片路徑（/media/...）
+        widths: 寬度列表，默認 MEDIA_SRCSET_WIDTHS
+        fmt: 輸出格式，默認 MEDIA_SRCSET_FORMAT
+
+    Returns:
+        Optional[dict]: {'src': 原圖 URL, 'srcset': 'url?w=256&fmt=webp 256w, ...'}；不可縮放的路徑返回 None
+    """
+    url = media_url(path)
+    if url is None or not is_derivable(url):
+        return None
+
+    config = current_app.config
+    widths = widths or config.get('MEDIA_SRCSET_WIDTHS', (256, 480, 768, 1280))
+    fmt = fmt if fmt is not None else config.get('MEDIA_SRCSET_FORMAT', 'webp')
+    candidates = []
+    for width in widths:
+        params = {'w': width}
+        if fmt:
+            params['fmt'] = fmt
+        candidates.append(f'{url}?{urlencode(params)} {width}w')
+    return {'src': url, 'srcset': ', '.join(candidates)}
+
+
+def add_srcset(result: dict, fields: Sequence[str]) -> dict:
+    """為 to_dict 結果中的圖片字段添加 <字段>_srcset，供前端 <img srcset> 使用"""
+    for field in fields:
+        result[f'{field}_srcset'] = build_srcset(result.get(field))
+    return result
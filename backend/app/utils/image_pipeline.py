@@ -0,0 +1,289 @@
+"""
+上傳圖片的後台處理
+
+save_file 只校驗圖片頭並把原始文件移到 <目錄>/_pending/<文件名>，縮放和重新編碼
+交給本機的進程池執行（不受 GIL 限制，不佔用請求線程）。完成後處理結果原子替換到最終路徑，
+處理狀態記錄在 ImageTask 中：
+
+- 任務在寫入 ImageTask 的事務提交後才提交給進程池；回滾的上傳不會被處理，_pending 下的原始文件隨之刪除
+- 處理完成前 /api/media/serve 發送 _pending 下的原始文件（不長期緩存）
+- 請求帶 wait=1 或 IMAGE_PROCESS_WORKERS=0 時在請求內等待處理結果，失敗時上傳失敗
+"""
+
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait as wait_futures
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from typing import List, NamedTuple, Optional, Tuple
+from flask import current_app, has_app_context, has_request_context, request
+from PIL import Image
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+PENDING_DIR = '_pending'
+
+_JOBS_KEY = 'image_pipeline_jobs'
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_inflight: set = set()
+
+
+class ImageJob(NamedTuple):
+    """等待提交給進程池的處理任務"""
+    source_path: str   # _pending 下的原始文件
+    target_path: str   # 處理結果的最終路徑
+    file_path: str     # 存儲路徑（/media/...），ImageTask 的鍵
+    max_size: int
+    quality: int
+
+    @property
+    def args(self) -> tuple:
+        return self.source_path, self.target_path, self.max_size, self.quality
+
+
+def process_image(source_path: str, target_path: str, max_size: int, quality: int) -> Tuple[int, int]:
+    """
+    縮放並重新編碼圖片（在工作進程中執行）
+
+    結果先寫入目標目錄的臨時文件再原子替換，成功後刪除原始文件
+
+    Returns:
+        Tuple[int, int]: 處理後的寬高
+    """
+    directory = os.path.dirname(target_path)
+    with Image.open(source_path) as img:
+        img_format = img.format
+        img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                img.save(temp_file, format=img_format, optimize=True, quality=quality)
+            os.replace(temp_path, target_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        size = img.size
+    os.remove(source_path)
+    return size
+
+
+def pending_path(full_path: str) -> str:
+    """處理完成前原始文件的存放路徑"""
+    directory, filename = os.path.split(full_path)
+    return os.path.join(directory, PENDING_DIR, filename)
+
+
+def probe_image(file) -> None:
+    """只讀取文件頭確認是 Pillow 可識別的圖片，不解碼像素"""
+    file.seek(0)
+    try:
+        with Image.open(file) as img:
+            img.size
+    finally:
+        file.seek(0)
+
+
+def wait_requested() -> bool:
+    """請求是否要求等待處理結果（?wait=1 或表單字段 wait=1）"""
+    if not has_request_context():
+        return False
+    return request.values.get('wait', '').lower() in ('1', 'true', 'yes')
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """進程池（IMAGE_PROCESS_WORKERS=0 時返回 None，在請求內同步處理）"""
+    global _executor
+    workers = current_app.config.get('IMAGE_PROCESS_WORKERS', 2)
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            # spawn 避免 fork 多線程的工作進程時繼承鎖狀態
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+        return _executor
+
+
+def handle_upload(upload_path: str, full_path: str, file_path: str, wait: Optional[bool] = None) -> str:
+    """
+    安排處理已寫入磁盤的上傳圖片
+
+    Args:
+        upload_path: 上傳內容的臨時文件（已通過類型和大小校驗）
+        full_path: 處理結果的最終路徑
+        file_path: 存儲路徑（/media/...）
+        wait: 是否等待處理結果，默認按請求的 wait 參數
+
+    Returns:
+        str: 處理狀態（ready / pending）
+
+    Raises:
+        Exception: 同步處理失敗
+    """
+    from app.models import ImageTask
+
+    config = current_app.config
+    max_size, quality = config.get('IMAGE_MAX_SIZE', 1920), config.get('IMAGE_QUALITY', 85)
+    executor = get_executor()
+    if wait is None:
+        wait = wait_requested()
+
+    if wait or executor is None:
+        try:
+            if executor is None:
+                process_image(upload_path, full_path, max_size, quality)
+            else:
+                executor.submit(process_image, upload_path, full_path, max_size, quality).result()
+        except Exception:
+            for path in (upload_path, full_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+        return ImageTask.STATUS_READY
+
+    source_path = pending_path(full_path)
+    os.makedirs(os.path.dirname(source_path), exist_ok=True)
+    os.replace(upload_path, source_path)
+
+    session = _db_session()
+    task = ImageTask.query.filter_by(file_path=file_path).first()
+    if task is None:
+        session.add(ImageTask(file_path=file_path, status=ImageTask.STATUS_PENDING))
+    else:
+        # 文件被刪除後重新上傳
+        task.status, task.error, task.finished_at = ImageTask.STATUS_PENDING, None, None
+        task.created_at = datetime.utcnow()
+    session.info.setdefault(_JOBS_KEY, []).append(ImageJob(source_path, full_path, file_path, max_size, quality))
+    return ImageTask.STATUS_PENDING
+
+
+def processing_status_of(file_path: str) -> str:
+    """存儲路徑的處理狀態，沒有 ImageTask 記錄的文件視為已完成"""
+    from app.models import ImageTask
+
+    task = ImageTask.query.filter_by(file_path=file_path).first()
+    return task.status if task else ImageTask.STATUS_READY
+
+
+def _db_session():
+    from app import db
+    return db.session
+
+
+def _submit_jobs(session) -> None:
+    """事務提交後把本事務登記的任務提交給進程池"""
+    jobs: List[ImageJob] = session.info.pop(_JOBS_KEY, None)
+    if not jobs:
+        return
+    executor = get_executor()
+    app = current_app._get_current_object()
+    for job in jobs:
+        done = Future()
+        _inflight.add(done)
+        future = executor.submit(process_image, *job.args)
+        future.add_done_callback(lambda f, job=job, done=done: _record_result(app, job, f, done))
+
+
+def _discard_jobs(session) -> None:
+    """事務回滾時丟棄任務並刪除已移入 _pending 的原始文件（ImageTask 已隨事務回滾）"""
+    jobs: List[ImageJob] = session.info.pop(_JOBS_KEY, None)
+    for job in jobs or ():
+        try:
+            if os.path.exists(job.source_path):
+                os.remove(job.source_path)
+        except OSError as e:
+            if has_app_context():
+                current_app.logger.error(f'刪除回滾的上傳圖片失敗: {job.source_path}: {str(e)}')
+
+
+def _record_result(app, job: ImageJob, future: Future, done: Future) -> None:
+    """在進程池的回調線程中記錄處理結果"""
+    from app.models import ImageTask
+
+    try:
+        with app.app_context():
+            session = _db_session()
+            task = ImageTask.query.filter_by(file_path=job.file_path).first()
+            try:
+                width, height = future.result()
+            except Exception as e:
+                app.logger.error(f'圖片處理失敗: {job.file_path}: {str(e)}')
+                if os.path.exists(job.source_path):
+                    os.remove(job.source_path)
+                if task:
+                    task.status = ImageTask.STATUS_FAILED
+                    task.error = str(e)
+            else:
+                if task:
+                    task.status = ImageTask.STATUS_READY
+                    task.width, task.height = width, height
+            if task:
+                task.finished_at = datetime.utcnow()
+                session.commit()
+    except Exception as e:
+        app.logger.error(f'記錄圖片處理狀態失敗: {job.file_path}: {str(e)}')
+    finally:
+        _inflight.discard(done)
+        done.set_result(None)
+
+
+def drain(timeout: Optional[float] = None) -> bool:
+    """等待已提交的任務處理完並記錄狀態，返回是否全部完成"""
+    _, not_done = wait_futures(list(_inflight), timeout=timeout)
+    return not not_done
+
+
+def retry_pending(older_than_minutes: int = 10) -> int:
+    """
+    同步處理遺留的 pending 任務（工作進程在處理完成前退出時）
+
+    Args:
+        older_than_minutes: 只處理創建時間早於此時長的任務，避免與仍在處理的任務重複
+
+    Returns:
+        int: 處理的任務數
+    """
+    from app.models import ImageTask
+
+    config = current_app.config
+    session = _db_session()
+    cutoff = datetime.utcnow() - timedelta(minutes=older_than_minutes)
+    tasks = ImageTask.query.filter(
+        ImageTask.status == ImageTask.STATUS_PENDING,
+        ImageTask.created_at < cutoff
+    ).all()
+    upload_folder = config['UPLOAD_FOLDER']
+    for task in tasks:
+        full_path = os.path.join(upload_folder, task.file_path[len('/media/'):])
+        source_path = pending_path(full_path)
+        try:
+            if os.path.exists(source_path):
+                task.width, task.height = process_image(
+                    source_path, full_path, config.get('IMAGE_MAX_SIZE', 1920), config.get('IMAGE_QUALITY', 85)
+                )
+                task.status = ImageTask.STATUS_READY
+            else:
+                task.status = ImageTask.STATUS_FAILED
+                task.error = 'source file missing'
+        except Exception as e:
+            task.status = ImageTask.STATUS_FAILED
+            task.error = str(e)
+        task.finished_at = datetime.utcnow()
+    session.commit()
+    return len(tasks)
+
+
+_events_registered = False
+
+
+def register_image_pipeline_events() -> None:
+    """註冊事務提交後提交處理任務的會話事件（僅註冊一次）"""
+    global _events_registered
+    if _events_registered:
+        return
+    event.listen(Session, 'after_commit', _submit_jobs)
+    event.listen(Session, 'after_rollback', _discard_jobs)
+    _events_registered = True
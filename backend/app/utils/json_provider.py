@@ -0,0 +1,106 @@
+"""
+API 響應的 JSON 序列化
+
+可用時使用 orjson 原生編碼（日期、時間直接輸出為 ISO 8601），否則回退到標準庫 json。
+兩種實現輸出相同的 JSON 內容：鍵排序、不轉義非 ASCII 字符、日期為 ISO 格式、
+Decimal 輸出為字符串
+"""
+
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, time
+from typing import Any
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取決於部署環境
+    orjson = None
+
+
+def _default(o: Any) -> Any:
+    """處理編碼器不能直接序列化的類型"""
+    if isinstance(o, (date, datetime, time)):
+        return o.isoformat()
+
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class StdJSONProvider(DefaultJSONProvider):
+    """標準庫 json 實現，日期輸出為 ISO 格式並保留中文字符"""
+
+    default = staticmethod(_default)
+    ensure_ascii = False
+
+
+class OrjsonProvider(StdJSONProvider):
+    """
+    orjson 實現
+
+    不支持的 json.dumps 參數（如 cls）回退到標準庫實現
+    """
+
+    def _options(self, indent: Any = None) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        indent = kwargs.pop('indent', None)
+        kwargs.pop('separators', None)
+        if kwargs:
+            if indent is not None:
+                kwargs['indent'] = indent
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options(indent)).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # 直接輸出字節，省去 str 解碼再編碼的開銷
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default,
+                            option=self._options(pretty) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    'std': StdJSONProvider,
+    'orjson': OrjsonProvider,
+}
+
+
+def get_json_provider_class(name: str = 'auto'):
+    """
+    按名稱選擇 JSON 實現
+
+    Args:
+        name: 'auto'（orjson 可用時使用 orjson）、'orjson' 或 'std'
+
+    Returns:
+        type: JSONProvider 子類
+    """
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'std'
+    if name == 'orjson' and orjson is None:
+        raise ValueError("JSON_PROVIDER 'orjson' requires the orjson package")
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"Unknown JSON_PROVIDER: {name}")
+    return JSON_PROVIDERS[name]
@@ -0,0 +1,200 @@
+"""
+媒體文件與數據庫引用的對賬（垃圾回收）
+
+一次 os.scandir 遍歷 UPLOAD_FOLDER 得到磁盤文件集合，每個引用表一條查詢取出全部路徑字段
+（media_store.reference_columns）得到引用集合，兩者做集合差：
+
+- orphaned：磁盤上沒有被引用的文件（替換時刪除失敗、舊版本遺留等）
+- dangling：數據庫引用了但磁盤上不存在的文件
+- soft_deleted：只被軟刪除（enable=0）的記錄引用的文件，默認保留，purge_soft_deleted=True 時作為孤兒處理
+
+_derivatives（衍生圖，隨原圖刪除）、_pending（後台處理中的原圖）、_uploads（分塊上傳）、
+_quarantine 目錄及以 . 開頭的臨時文件不參與對賬；修改時間在 min_age_minutes 內的文件視為正在上傳，不處理。
+
+模式：dry-run 只報告；delete 刪除孤兒文件及其衍生圖；quarantine 把孤兒文件按原相對路徑移到
+_quarantine/<時間>/ 下，可手動恢復。
+"""
+
+import os
+import shutil
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+from flask import current_app
+from sqlalchemy import select
+from .image_derivatives import DERIVATIVES_DIR
+from .image_pipeline import PENDING_DIR
+from .media_store import mark_released, reference_columns, referenced_paths
+from .resumable_upload import UPLOADS_DIR
+
+QUARANTINE_DIR = '_quarantine'
+SKIP_DIRS = {DERIVATIVES_DIR, PENDING_DIR, UPLOADS_DIR, QUARANTINE_DIR}
+MODES = ('dry-run', 'delete', 'quarantine')
+
+# 報告中列出的路徑數上限，計數不受限制
+REPORT_LIMIT = 1000
+
+
+def scan_files(root: str, min_age_minutes: int = 60) -> Tuple[Dict[str, int], int]:
+    """
+    遍歷媒體目錄
+
+    Returns:
+        Tuple: ({相對路徑: 大小}, 因修改時間過近而跳過的文件數)
+    """
+    files: Dict[str, int] = {}
+    recent = 0
+    cutoff = time.time() - min_age_minutes * 60
+    stack = ['']
+    while stack:
+        relative_dir = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(root, relative_dir))
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                relative_path = f'{relative_dir}/{entry.name}' if relative_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(relative_path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    if stat.st_mtime > cutoff:
+                        recent += 1
+                    else:
+                        files[relative_path] = stat.st_size
+    return files, recent
+
+
+def _relative(file_path: Optional[str]) -> Optional[str]:
+    """引用值轉為媒體目錄下的相對路徑，不是 /media/ 下的路徑（外部鏈接等）返回 None"""
+    if not file_path or not file_path.startswith('/media/'):
+        return None
+    return file_path[len('/media/'):]
+
+
+def _columns_by_table():
+    tables = defaultdict(list)
+    for column in reference_columns():
+        tables[column.class_].append(column)
+    return tables
+
+
+def scan_references(session) -> Tuple[Dict[str, Tuple[str, str, Any]], Set[str]]:
+    """
+    每個引用表一條查詢收集路徑
+
+    Returns:
+        Tuple: ({相對路徑: 首個啟用記錄的 (表, 字段, 主鍵)}, 只被軟刪除記錄引用的相對路徑)
+    """
+    active: Dict[str, Tuple[str, str, Any]] = {}
+    soft_deleted: Set[str] = set()
+    for model, columns in _columns_by_table().items():
+        pk = model.__mapper__.primary_key[0]
+        enable = getattr(model, 'enable', None)
+        selected = [pk, *columns] + ([enable] if enable is not None else [])
+        for row in session.execute(select(*selected)):
+            disabled = enable is not None and not row[-1]
+            for column, value in zip(columns, row[1:1 + len(columns)]):
+                relative_path = _relative(value)
+                if relative_path is None:
+                    continue
+                if disabled:
+                    soft_deleted.add(relative_path)
+                elif relative_path not in active:
+                    active[relative_path] = (model.__tablename__, column.key, row[0])
+    return active, soft_deleted - active.keys()
+
+
+def _remove(root: str, relative_path: str, quarantine_root: Optional[str]) -> None:
+    full_path = os.path.join(root, relative_path)
+    if quarantine_root:
+        target = os.path.join(quarantine_root, relative_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(full_path, target)
+    else:
+        os.remove(full_path)
+    directory, filename = os.path.split(full_path)
+    shutil.rmtree(os.path.join(directory, DERIVATIVES_DIR, filename), ignore_errors=True)
+
+
+def collect_garbage(mode: str = 'dry-run', min_age_minutes: int = 60,
+                    purge_soft_deleted: bool = False) -> Dict[str, Any]:
+    """
+    對賬並按模式處理孤兒文件
+
+    Args:
+        mode: dry-run / delete / quarantine
+        min_age_minutes: 修改時間在此時長內的文件不處理
+        purge_soft_deleted: 只被軟刪除記錄引用的文件是否作為孤兒處理
+
+    Returns:
+        Dict: 對賬報告（路徑列表最多 REPORT_LIMIT 條）
+    """
+    from app import db
+
+    if mode not in MODES:
+        raise ValueError(f'mode must be one of {", ".join(MODES)}')
+
+    started = time.perf_counter()
+    root = current_app.config['UPLOAD_FOLDER']
+    files, recent = scan_files(root, min_age_minutes)
+    scanned = time.perf_counter()
+    active, soft_deleted = scan_references(db.session)
+
+    referenced = active.keys() | (set() if purge_soft_deleted else soft_deleted)
+    orphaned = sorted(files.keys() - referenced)
+    dangling = sorted(path for path in active.keys() - files.keys()
+                      if not os.path.exists(os.path.join(root, path)))
+
+    removed, failed = [], []
+    if mode != 'dry-run' and orphaned:
+        # 複查掃描後被重新引用的文件（如命中去重）
+        reused = referenced_paths(db.session, [f'/media/{path}' for path in orphaned],
+                                  include_disabled=not purge_soft_deleted)
+        quarantine_root = None
+        if mode == 'quarantine':
+            quarantine_root = os.path.join(root, QUARANTINE_DIR, datetime.utcnow().strftime('%Y%m%d%H%M%S'))
+        for relative_path in orphaned:
+            if f'/media/{relative_path}' in reused:
+                continue
+            try:
+                _remove(root, relative_path, quarantine_root)
+                removed.append(relative_path)
+            except OSError as e:
+                failed.append({'path': relative_path, 'error': str(e)})
+        mark_released(db.session, [f'/media/{path}' for path in removed])
+        db.session.commit()
+
+    return {
+        'mode': mode,
+        'scanned_files': len(files),
+        'scanned_bytes': sum(files.values()),
+        'skipped_recent': recent,
+        'referenced_paths': len(active),
+        'orphaned': {
+            'count': len(orphaned),
+            'bytes': sum(files[path] for path in orphaned),
+            'paths': orphaned[:REPORT_LIMIT]
+        },
+        'soft_deleted': {
+            'count': len(soft_deleted),
+            'purged': purge_soft_deleted,
+            'paths': sorted(soft_deleted)[:REPORT_LIMIT]
+        },
+        'dangling': {
+            'count': len(dangling),
+            'references': [
+                {'path': f'/media/{path}', 'table': active[path][0], 'column': active[path][1], 'id': active[path][2]}
+                for path in dangling[:REPORT_LIMIT]
+            ]
+        },
+        'removed': len(removed),
+        'failed': failed[:REPORT_LIMIT],
+        'scan_seconds': round(scanned - started, 3),
+        'elapsed_seconds': round(time.perf_counter() - started, 3)
+    }
@@ -0,0 +1,286 @@
+"""
+內容尋址的媒體存儲
+
+上傳文件在流式寫入磁盤的同時計算 SHA-256，存放在 /media/<類型>/<前兩位>/<sha256>.<擴展名>。
+同一類型下重複上傳相同內容時直接返回已有路徑，不再寫入和處理，MediaObject 記錄上傳次數用於統計去重效果。
+
+同一文件可被多處引用（reference_columns），delete_file 只登記釋放：事務提交前統計剩餘引用，
+提交後才刪除不再被引用的文件；回滾的事務不刪除任何文件。
+
+命中去重的上傳在其事務提交前還沒有引用，因此命中時更新文件的修改時間（hold），
+修改時間在 MEDIA_RELEASE_GRACE_SECONDS 內的文件釋放時不刪除，之後仍無引用時由 media_gc 清理。
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from typing import Iterable, Optional, Set, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, select, union_all
+from sqlalchemy.orm import Session
+from .image_derivatives import DERIVATIVES_DIR
+from .messages import msg
+
+CHUNK_SIZE = 1024 * 1024
+# 批量複查引用時每條 IN 查詢的路徑數
+REFERENCE_BATCH = 500
+
+_RELEASE_KEY = 'media_store_release'
+_UNLINK_KEY = 'media_store_unlink'
+
+
+def reference_columns():
+    """引用存儲路徑的數據庫字段"""
+    from app.models import Member, Lab, Paper, Resource, UploadedImage, UploadSession
+    return (
+        Member.mem_avatar_path,
+        Lab.lab_logo_path, Lab.carousel_img_1, Lab.carousel_img_2, Lab.carousel_img_3, Lab.carousel_img_4,
+        Paper.paper_file_path, Paper.preview_img,
+        Resource.resource_image, Resource.resource_file,
+        UploadedImage.file_path,
+        UploadSession.file_path,  # 已完成、尚未關聯到實體的分塊上傳
+    )
+
+
+def count_references(session, file_path: str) -> int:
+    """統計存儲路徑在各引用字段中的出現次數（包括軟刪除的記錄）"""
+    counts = union_all(*(
+        select(func.count()).select_from(column.class_).where(column == file_path)
+        for column in reference_columns()
+    )).subquery()
+    return session.execute(select(func.sum(counts.c[0]))).scalar() or 0
+
+
+def referenced_paths(session, file_paths: Iterable[str], include_disabled: bool = True) -> Set[str]:
+    """
+    批量檢查存儲路徑是否仍被引用，每個引用字段每 REFERENCE_BATCH 個路徑一條 IN 查詢
+
+    Args:
+        include_disabled: 是否包括軟刪除（enable=0）的記錄
+
+    Returns:
+        Set[str]: 仍被引用的路徑
+    """
+    file_paths = list(file_paths)
+    referenced = set()
+    for column in reference_columns():
+        enable = getattr(column.class_, 'enable', None)
+        for start in range(0, len(file_paths), REFERENCE_BATCH):
+            query = select(column).where(column.in_(file_paths[start:start + REFERENCE_BATCH]))
+            if enable is not None and not include_disabled:
+                query = query.where(enable != 0)
+            referenced.update(session.execute(query).scalars())
+    return referenced
+
+
+def mark_released(session, file_paths: Iterable[str]) -> None:
+    """記錄存儲路徑的文件已刪除"""
+    from app.models import MediaObject
+
+    file_paths = list(file_paths)
+    now = datetime.utcnow()
+    for start in range(0, len(file_paths), REFERENCE_BATCH):
+        session.execute(
+            MediaObject.__table__.update()
+            .where(MediaObject.file_path.in_(file_paths[start:start + REFERENCE_BATCH]),
+                   MediaObject.released_at.is_(None))
+            .values(released_at=now)
+        )
+
+
+def stream_to_temp(file, directory: str, max_size: Optional[int] = None) -> Tuple[str, int, str]:
+    """
+    將上傳內容分塊寫入 directory 下的臨時文件，同時計算 SHA-256 和大小
+
+    Returns:
+        Tuple[str, int, str]: (sha256, 大小, 臨時文件路徑)
+
+    Raises:
+        ValueError: 超過 max_size
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            while True:
+                chunk = file.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_size and size > max_size:
+                    raise ValueError(msg.get_error_message('FILE_SIZE_EXCEEDED', max_size=max_size))
+                digest.update(chunk)
+                temp_file.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return digest.hexdigest(), size, temp_path
+
+
+def content_path(file_type: str, digest: str, ext: str) -> str:
+    """內容尋址的相對路徑"""
+    return f'{file_type}/{digest[:2]}/{digest}.{ext}'
+
+
+def find_stored(session, full_path: str, file_path: str) -> bool:
+    """
+    內容是否已在磁盤上（包括後台處理中的原始文件）
+
+    _pending 下的原始文件只在有 pending 的 ImageTask 時算作已存儲；回滾或崩潰遺留的原始文件
+    沒有處理任務，不會被處理，由下一次相同內容的上傳覆蓋並重新安排處理
+    """
+    from app.models import ImageTask
+    from .image_pipeline import pending_path
+
+    if os.path.exists(full_path):
+        return True
+    if not os.path.exists(pending_path(full_path)):
+        return False
+    return session.execute(
+        select(ImageTask.image_task_id)
+        .where(ImageTask.file_path == file_path, ImageTask.status == ImageTask.STATUS_PENDING)
+    ).first() is not None
+
+
+def hold(full_path: str) -> bool:
+    """
+    命中去重時更新已存儲文件（或處理中的原始文件）的修改時間，使併發的釋放不刪除它
+
+    Returns:
+        bool: 文件是否仍在；已被刪除時調用方應重新寫入
+    """
+    from .image_pipeline import pending_path
+
+    for path in (full_path, pending_path(full_path)):
+        try:
+            os.utime(path)
+            return True
+        except FileNotFoundError:
+            continue
+    return False
+
+
+def _held(path: str) -> bool:
+    """文件的修改時間是否在 MEDIA_RELEASE_GRACE_SECONDS 內（近期寫入或命中去重）"""
+    try:
+        return time.time() - os.stat(path).st_mtime < current_app.config.get('MEDIA_RELEASE_GRACE_SECONDS', 600)
+    except FileNotFoundError:
+        return False
+
+
+def record_upload(session, file_path: str, digest: str, file_type: str, size: int,
+                  store_ms: Optional[int] = None) -> None:
+    """
+    記錄一次上傳
+
+    Args:
+        store_ms: 本次寫入耗時；None 表示命中去重，未寫入文件
+    """
+    from app.models import MediaObject
+
+    now = datetime.utcnow()
+    media_object = session.execute(
+        select(MediaObject).where(MediaObject.file_path == file_path)
+    ).scalar_one_or_none()
+    if media_object is None:
+        session.add(MediaObject(file_path=file_path, sha256=digest, file_type=file_type, size=size,
+                                upload_count=1, store_ms=store_ms or 0, created_at=now, last_uploaded_at=now))
+        return
+
+    media_object.upload_count += 1
+    media_object.last_uploaded_at = now
+    # 文件被刪除後重新上傳，或命中去重時釋放的文件因 hold 而保留
+    media_object.released_at = None
+    if store_ms is not None:
+        media_object.store_ms = store_ms
+
+
+def release(file_path: str) -> None:
+    """登記釋放存儲路徑，在當前事務提交時確認不再被引用後刪除文件"""
+    from app import db
+    db.session.info.setdefault(_RELEASE_KEY, set()).add(file_path)
+
+
+def unlink_stored(file_path: str) -> bool:
+    """
+    刪除存儲路徑對應的文件、後台處理中的原始文件和衍生圖
+
+    文件先改名再檢查修改時間：改名前命中去重的上傳已更新修改時間，文件改回原名保留；
+    改名後命中的上傳找不到文件，會重新寫入
+
+    Returns:
+        bool: 是否已刪除（近期寫入或命中去重而保留時為 False）
+    """
+    from .image_pipeline import pending_path
+
+    relative_path = file_path[len('/media/'):] if file_path.startswith('/media/') else file_path
+    full_path = os.path.join(current_app.config['UPLOAD_FOLDER'], relative_path)
+    directory, filename = os.path.split(full_path)
+    for path in (full_path, pending_path(full_path)):
+        released = os.path.join(os.path.dirname(path), f'.released-{filename}')
+        try:
+            os.replace(path, released)
+        except FileNotFoundError:
+            continue
+        if _held(released):
+            os.replace(released, path)
+            return False
+        os.remove(released)
+    shutil.rmtree(os.path.join(directory, DERIVATIVES_DIR, filename), ignore_errors=True)
+    return True
+
+
+def _check_releases(session) -> None:
+    """提交前統計登記釋放的路徑的剩餘引用"""
+    from app.models import MediaObject
+
+    candidates = session.info.pop(_RELEASE_KEY, None)
+    if not candidates:
+        return
+    session.flush()
+    folder = current_app.config['UPLOAD_FOLDER']
+    # 近期寫入或命中去重的文件可能即將被其他事務引用，不釋放
+    unreferenced = [path for path in candidates if count_references(session, path) == 0
+                    and not _held(os.path.join(folder, path[len('/media/'):]))]
+    if not unreferenced:
+        return
+    now = datetime.utcnow()
+    for media_object in session.execute(
+        select(MediaObject).where(MediaObject.file_path.in_(unreferenced))
+    ).scalars():
+        media_object.released_at = now
+    session.info.setdefault(_UNLINK_KEY, set()).update(unreferenced)
+
+
+def _unlink_released(session) -> None:
+    paths = session.info.pop(_UNLINK_KEY, None)
+    if not paths or not has_app_context():
+        return
+    for file_path in paths:
+        try:
+            unlink_stored(file_path)
+        except OSError as e:
+            current_app.logger.error(msg.get_error_message('FILE_DELETE_FAILED', error=str(e)))
+
+
+def _discard_releases(session) -> None:
+    session.info.pop(_RELEASE_KEY, None)
+    session.info.pop(_UNLINK_KEY, None)
+
+
+_events_registered = False
+
+
+def register_media_store_events() -> None:
+    """註冊按引用計數刪除文件的會話事件（僅註冊一次）"""
+    global _events_registered
+    if _events_registered:
+        return
+    event.listen(Session, 'before_commit', _check_releases)
+    event.listen(Session, 'after_commit', _unlink_released)
+    event.listen(Session, 'after_rollback', _discard_releases)
+    _events_registered = True
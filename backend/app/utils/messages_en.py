@@ -120,6 +120,7 @@ ERROR_MESSAGES = {
     'NEWS_TYPE_INVALID': 'Invalid news type',
     'NEWS_TYPE_FORMAT_ERROR': 'News type format error',
     'NEWS_DATE_FORMAT_ERROR': 'Date format error, should be YYYY-MM-DD',
+    'EDIT_RECORD_NOT_FOUND': 'Edit record not found',
     
     # Project related errors
     'PROJECT_NOT_FOUND': 'Project not found',
@@ -149,6 +150,13 @@ ERROR_MESSAGES = {
     'FILE_PATH_INVALID': 'Invalid file path',
     'FILE_NOT_FOUND': 'File not found',
     'PATH_NOT_FILE': 'Path is not a file',
+    'UPLOAD_NOT_FOUND': 'Upload not found or expired',
+    'UPLOAD_SIZE_INVALID': 'Invalid upload size',
+    'UPLOAD_OFFSET_MISMATCH': 'Chunk offset mismatch, {offset} bytes received',
+    'UPLOAD_INCOMPLETE': 'Upload incomplete, {offset} / {size} bytes received',
+    'UPLOAD_NOT_COMPLETED': 'Upload has not been completed',
+    'UPLOAD_TYPE_MISMATCH': 'Upload type mismatch',
+    'IMAGE_VARIANT_INVALID': 'Invalid image size parameters: {error}',
     'FILE_INFO_FAILED': 'Failed to get file information',
     'MEDIA_SERVICE_UNHEALTHY': 'Media service unhealthy: {error}',
     'NO_FILE_SELECTED': 'No file selected',
@@ -180,4 +188,7 @@ ERROR_MESSAGES = {
     'UNKNOWN_OPERATION': 'Unknown operation type: {operation}',
     'SYSTEM_ERROR': 'System error',
     'PARAMETER_ERROR': 'Parameter error',
+    'INVALID_CURSOR': 'Invalid or expired pagination cursor',
+    'SEARCH_QUERY_REQUIRED': 'Search query is required',
+    'INVALID_SEARCH_TYPES': 'Invalid search types: {types}',
 }
\ No newline at end of file
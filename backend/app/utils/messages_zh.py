@@ -118,6 +118,7 @@ ERROR_MESSAGES = {
     'NEWS_TYPE_INVALID': '新闻类型无效',
     'NEWS_TYPE_FORMAT_ERROR': '新闻类型格式错误',
     'NEWS_DATE_FORMAT_ERROR': '日期格式错误，应为 YYYY-MM-DD',
+    'EDIT_RECORD_NOT_FOUND': '操作记录不存在',
     
     # 项目相关错误
     'PROJECT_NOT_FOUND': '项目不存在',
@@ -158,6 +159,13 @@ ERROR_MESSAGES = {
     'FILE_PATH_INVALID': '文件路径无效',
     'FILE_NOT_FOUND': '文件不存在',
     'PATH_NOT_FILE': '路径不是文件',
+    'UPLOAD_NOT_FOUND': '上传不存在或已过期',
+    'UPLOAD_SIZE_INVALID': '上传文件大小无效',
+    'UPLOAD_OFFSET_MISMATCH': '分块偏移不一致，已接收 {offset} bytes',
+    'UPLOAD_INCOMPLETE': '上传未完成，已接收 {offset} / {size} bytes',
+    'UPLOAD_NOT_COMPLETED': '上传尚未完成',
+    'UPLOAD_TYPE_MISMATCH': '上传用途不匹配',
+    'IMAGE_VARIANT_INVALID': '图片尺寸参数无效: {error}',
     'FILE_INFO_FAILED': '获取文件信息失败',
     'MEDIA_SERVICE_UNHEALTHY': '媒体服务不健康: {error}',
     'NO_FILE_SELECTED': '没有选择文件',
@@ -178,4 +186,7 @@ ERROR_MESSAGES = {
     'UNKNOWN_OPERATION': '未知的操作类型: {operation}',
     'SYSTEM_ERROR': '系统错误',
     'PARAMETER_ERROR': '参数错误',
+    'INVALID_CURSOR': '分页游标无效或已过期',
+    'SEARCH_QUERY_REQUIRED': '搜索关键词不能为空',
+    'INVALID_SEARCH_TYPES': '无效的搜索类型: {types}',
 }
\ No newline at end of file
@@ -118,6 +118,7 @@ ERROR_MESSAGES = {
     'NEWS_TYPE_INVALID': '新聞類型無效',
     'NEWS_TYPE_FORMAT_ERROR': '新聞類型格式錯誤',
     'NEWS_DATE_FORMAT_ERROR': '日期格式錯誤，應為 YYYY-MM-DD',
+    'EDIT_RECORD_NOT_FOUND': '操作記錄不存在',
 
     # 項目相關錯誤
     'PROJECT_NOT_FOUND': '項目不存在',
@@ -158,6 +159,13 @@ ERROR_MESSAGES = {
     'FILE_PATH_INVALID': '文件路徑無效',
     'FILE_NOT_FOUND': '文件不存在',
     'PATH_NOT_FILE': '路徑不是文件',
+    'UPLOAD_NOT_FOUND': '上傳不存在或已過期',
+    'UPLOAD_SIZE_INVALID': '上傳文件大小無效',
+    'UPLOAD_OFFSET_MISMATCH': '分塊偏移不一致，已接收 {offset} bytes',
+    'UPLOAD_INCOMPLETE': '上傳未完成，已接收 {offset} / {size} bytes',
+    'UPLOAD_NOT_COMPLETED': '上傳尚未完成',
+    'UPLOAD_TYPE_MISMATCH': '上傳用途不匹配',
+    'IMAGE_VARIANT_INVALID': '圖片尺寸參數無效: {error}',
     'FILE_INFO_FAILED': '獲取文件資訊失敗',
     'MEDIA_SERVICE_UNHEALTHY': '媒體服務不健康: {error}',
     'NO_FILE_SELECTED': '沒有選擇文件',
@@ -178,4 +186,7 @@ ERROR_MESSAGES = {
     'UNKNOWN_OPERATION': '未知的操作類型: {operation}',
     'SYSTEM_ERROR': '系統錯誤',
     'PARAMETER_ERROR': '參數錯誤',
+    'INVALID_CURSOR': '分頁游標無效或已過期',
+    'SEARCH_QUERY_REQUIRED': '搜索關鍵字不能為空',
+    'INVALID_SEARCH_TYPES': '無效的搜索類型: {types}',
 }
\ No newline at end of file
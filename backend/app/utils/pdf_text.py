@@ -0,0 +1,270 @@
+"""
+論文 PDF 的文本提取
+
+寫入 paper_file_path 時在 before_flush 中登記 PaperText（見 app.models.paper_text）：
+- 內容尋址存儲的文件 SHA-256 與已提取的相同時不做任何處理
+- IMAGE_PROCESS_WORKERS=0 時在請求內提取；否則事務提交後交給 app.utils.image_pipeline 的進程池，
+  工作進程先計算文件哈希，與已提取的相同時跳過解析
+
+提取使用純 Python 的 pypdf（未安裝時記錄為 failed），文本由 app.utils.fulltext 與論文標題一起檢索。
+已有論文及工作進程退出時遺留的 pending 記錄由 scripts/maintenance/extract_paper_texts.py 處理
+"""
+
+import hashlib
+import os
+import re
+from concurrent.futures import Future, wait as wait_futures
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from .count_cache import invalidate_counts
+from .response_cache import invalidate_responses
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - 取決於部署環境
+    PdfReader = None
+
+CHUNK_SIZE = 1024 * 1024
+
+_PENDING_KEY = 'pdf_text_pending'
+_JOBS_KEY = 'pdf_text_jobs'
+
+_inflight: set = set()
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class TextJob(NamedTuple):
+    """等待提交給進程池的提取任務"""
+    paper_id: int
+    file_path: str                   # 論文文件路徑（/media/...）
+    full_path: str
+    previous_sha256: Optional[str]   # 已提取文本對應的文件哈希
+    max_chars: int
+
+    @property
+    def args(self) -> tuple:
+        return self.full_path, self.previous_sha256, self.max_chars
+
+
+def file_sha256(full_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(full_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def extract_pdf_text(full_path: str, previous_sha256: Optional[str] = None,
+                     max_chars: int = 200000) -> Tuple[str, Optional[str], Optional[int]]:
+    """
+    提取 PDF 文本（在工作進程中執行）
+
+    Returns:
+        Tuple: (文件 SHA-256, 文本, 頁數)；哈希與 previous_sha256 相同時文本和頁數為 None
+    """
+    digest = file_sha256(full_path)
+    if digest == previous_sha256:
+        return digest, None, None
+    if PdfReader is None:
+        raise RuntimeError('pypdf is not installed')
+
+    reader = PdfReader(full_path)
+    parts, length = [], 0
+    for page in reader.pages:
+        page_text = _WHITESPACE_RE.sub(' ', page.extract_text() or '').strip()
+        if page_text:
+            parts.append(page_text)
+            length += len(page_text) + 1
+        if length >= max_chars:
+            break
+    return digest, ' '.join(parts)[:max_chars], len(reader.pages)
+
+
+def full_path_of(file_path: str) -> str:
+    relative_path = file_path[len('/media/'):] if file_path.startswith('/media/') else file_path
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], relative_path)
+
+
+def apply_result(record, digest: str, text: Optional[str], page_count: Optional[int]) -> None:
+    """把提取結果寫入 PaperText"""
+    from app.models import PaperText
+
+    if text is not None:
+        record.paper_text = text
+        record.page_count = page_count
+    record.file_sha256 = digest
+    record.status = PaperText.STATUS_READY
+    record.error = None
+    record.extracted_at = datetime.utcnow()
+
+
+def apply_failure(record, error: Exception) -> None:
+    from app.models import PaperText
+
+    record.status = PaperText.STATUS_FAILED
+    record.error = str(error)
+    record.extracted_at = datetime.utcnow()
+
+
+def extract_now(record) -> None:
+    """在當前進程內提取並寫入 PaperText"""
+    try:
+        apply_result(record, *extract_pdf_text(
+            full_path_of(record.file_path), record.file_sha256, current_app.config['PAPER_TEXT_MAX_CHARS']
+        ))
+    except Exception as e:
+        current_app.logger.error(f'論文文本提取失敗: {record.file_path}: {str(e)}')
+        apply_failure(record, e)
+
+
+def _collect_changes(session, flush_context, instances) -> None:
+    """flush 前為 paper_file_path 有變更的論文登記 PaperText"""
+    from app.models import Paper, PaperText, MediaObject
+    from .image_pipeline import get_executor
+
+    if not has_app_context():
+        return
+    for paper in list(session.new) + list(session.dirty):
+        if not isinstance(paper, Paper) or not inspect(paper).attrs.paper_file_path.history.has_changes():
+            continue
+        with session.no_autoflush:
+            record = paper.text_record
+            file_path = paper.paper_file_path
+            if not file_path:
+                paper.text_record = None
+                continue
+
+            # 內容尋址存儲的文件可直接比較哈希，內容未變時不提取
+            digest = session.execute(
+                select(MediaObject.sha256).where(MediaObject.file_path == file_path)
+            ).scalar()
+            if record is not None and digest and record.file_sha256 == digest \
+                    and record.status == PaperText.STATUS_READY:
+                record.file_path = file_path
+                continue
+
+            if record is None:
+                record = PaperText()
+                paper.text_record = record
+            record.file_path = file_path
+            record.status = PaperText.STATUS_PENDING
+            record.error = None
+
+        if get_executor() is None:
+            extract_now(record)
+        else:
+            session.info.setdefault(_PENDING_KEY, []).append((paper, record))
+
+
+def _resolve_jobs(session, flush_context) -> None:
+    """flush 後論文已有主鍵，生成提取任務"""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    max_chars = current_app.config['PAPER_TEXT_MAX_CHARS']
+    jobs = session.info.setdefault(_JOBS_KEY, {})
+    for paper, record in pending:
+        jobs[paper.paper_id] = TextJob(
+            paper.paper_id, record.file_path, full_path_of(record.file_path), record.file_sha256, max_chars
+        )
+
+
+def _submit_jobs(session) -> None:
+    """事務提交後把提取任務提交給進程池"""
+    from .image_pipeline import get_executor
+
+    jobs = session.info.pop(_JOBS_KEY, None)
+    if not jobs:
+        return
+    executor = get_executor()
+    app = current_app._get_current_object()
+    for job in jobs.values():
+        done = Future()
+        _inflight.add(done)
+        future = executor.submit(extract_pdf_text, *job.args)
+        future.add_done_callback(lambda f, job=job, done=done: _record_result(app, job, f, done))
+
+
+def _discard_jobs(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_JOBS_KEY, None)
+
+
+def _record_result(app, job: TextJob, future: Future, done: Future) -> None:
+    """在進程池的回調線程中記錄提取結果"""
+    from app import db
+    from app.models import PaperText
+
+    try:
+        with app.app_context():
+            record = db.session.get(PaperText, job.paper_id)
+            # 提取期間論文文件已被替換或刪除時丟棄結果
+            if record is None or record.file_path != job.file_path:
+                return
+            try:
+                apply_result(record, *future.result())
+            except Exception as e:
+                app.logger.error(f'論文文本提取失敗: {job.file_path}: {str(e)}')
+                apply_failure(record, e)
+            db.session.commit()
+            # 論文列表的搜索結果隨之變化
+            invalidate_counts('paper')
+            invalidate_responses('paper')
+    except Exception as e:
+        app.logger.error(f'記錄論文文本提取結果失敗: {job.file_path}: {str(e)}')
+    finally:
+        _inflight.discard(done)
+        done.set_result(None)
+
+
+def drain(timeout: Optional[float] = None) -> bool:
+    """等待已提交的任務完成並記錄結果，返回是否全部完成"""
+    _, not_done = wait_futures(list(_inflight), timeout=timeout)
+    return not not_done
+
+
+def extract_missing(include_failed: bool = False) -> int:
+    """
+    在當前進程內為沒有提取結果的論文提取文本（已有論文、遺留的 pending 記錄）
+
+    Returns:
+        int: 處理的論文數
+    """
+    from app import db
+    from app.models import Paper, PaperText
+
+    statuses: List[str] = [PaperText.STATUS_PENDING]
+    if include_failed:
+        statuses.append(PaperText.STATUS_FAILED)
+    papers = Paper.query.outerjoin(PaperText).filter(
+        Paper.paper_file_path.isnot(None),
+        Paper.paper_file_path != '',
+        db.or_(PaperText.paper_id.is_(None), PaperText.status.in_(statuses))
+    ).all()
+    for paper in papers:
+        record = paper.text_record
+        if record is None:
+            record = PaperText(paper_id=paper.paper_id, file_path=paper.paper_file_path)
+            db.session.add(record)
+        record.file_path = paper.paper_file_path
+        extract_now(record)
+        db.session.commit()
+    return len(papers)
+
+
+_events_registered = False
+
+
+def register_pdf_text_events() -> None:
+    """註冊論文文件變更時提取文本的會話事件（僅註冊一次）"""
+    global _events_registered
+    if _events_registered:
+        return
+    event.listen(Session, 'before_flush', _collect_changes)
+    event.listen(Session, 'after_flush', _resolve_jobs)
+    event.listen(Session, 'after_commit', _submit_jobs)
+    event.listen(Session, 'after_rollback', _discard_jobs)
+    _events_registered = True
@@ -0,0 +1,128 @@
+"""
+列表接口的列投影讀取路徑
+
+只查詢視圖需要的列，以普通行的形式直接序列化為字典，
+不構建 ORM 對象，避免加載長文本列和標識映射的開銷
+"""
+
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from flask import request, has_request_context
+from sqlalchemy import func
+from .helpers import paginate_query
+
+# fields 參數的通配值，表示返回全部字段
+FIELDS_ALL = '*'
+
+# 長文本摘要字段的後綴及截取的字符數
+EXCERPT_SUFFIX = '_excerpt'
+EXCERPT_LENGTH = 300
+
+
+def is_admin_request() -> bool:
+    """
+    判斷當前請求是否攜帶有效的管理員令牌
+
+    僅用於選擇默認字段集，不作為權限校驗
+    """
+    if not has_request_context():
+        return False
+
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
+        return False
+
+    from app.services.auth_service import AuthService
+    return AuthService.verify_token(auth_header) is not None
+
+
+def get_list_fields(available: Sequence[str],
+                    long_fields: Sequence[str] = (),
+                    required: Sequence[str] = ()) -> Optional[List[str]]:
+    """
+    解析 fields 查詢參數，確定列表接口返回的字段
+
+    - 指定 fields=a,b,c 時只返回這些字段（未知字段忽略）；
+      長文本字段加 _excerpt 後綴返回截取前 EXCERPT_LENGTH 個字符的摘要
+    - fields=* 返回全部字段（不含摘要字段）
+    - 未指定時，公開請求默認省略長文本字段；管理員請求返回完整對象
+
+    Args:
+        available: 可返回的字段名（按輸出順序）
+        long_fields: 默認省略的長文本字段
+        required: 始終返回的字段（如主鍵）
+
+    Returns:
+        Optional[List[str]]: 字段名列表；None 表示使用完整的 ORM 序列化
+    """
+    raw = request.args.get('fields', '').strip() if has_request_context() else ''
+
+    if not raw:
+        if is_admin_request():
+            return None
+        selected = {field for field in available if field not in long_fields}
+    elif raw == FIELDS_ALL:
+        selected = set(available)
+    else:
+        selected = {field.strip() for field in raw.split(',') if field.strip()}
+
+    selected.update(required)
+    excerpts = [f'{field}{EXCERPT_SUFFIX}' for field in long_fields]
+    return [field for field in (*available, *excerpts) if field in selected]
+
+
+def list_columns(model, fields: Sequence[str]) -> Dict[str, Any]:
+    """字段名到列表達式的映射，摘要字段在數據庫中截取"""
+    columns = {}
+    for field in fields:
+        if field.endswith(EXCERPT_SUFFIX):
+            column = getattr(model, field[:-len(EXCERPT_SUFFIX)])
+            columns[field] = func.substr(column, 1, EXCERPT_LENGTH)
+        else:
+            columns[field] = getattr(model, field)
+    return columns
+
+
+def serialize_row(row, keys: Sequence[str]) -> Dict[str, Any]:
+    """將查詢結果行轉換為字典，日期時間統一輸出為 ISO 格式"""
+    result = {}
+    for key, value in zip(keys, row):
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        result[key] = value
+    return result
+
+
+def paginate_projection(query,
+                        columns: Dict[str, Any],
+                        page: Optional[int],
+                        per_page: Optional[int],
+                        attach: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                        keyset: Optional[List] = None,
+                        count_module: Optional[str] = None) -> Dict[str, Any]:
+    """
+    按列投影分頁查詢
+
+    Args:
+        query: 已應用篩選和排序的查詢
+        columns: 輸出鍵名到列表達式的映射
+        page: 頁碼，None 表示獲取全部
+        per_page: 每頁數量，None 表示獲取全部
+        attach: 可選回調，接收當前頁的字典列表並就地附加關聯數據
+        keyset: 可選的游標分頁排序鍵，見 paginate_query
+        count_module: 總數緩存所屬模組，見 paginate_query
+
+    Returns:
+        Dict: 與 paginate_query 相同結構的分頁結果
+    """
+    keys = list(columns)
+    projected = query.with_entities(*[column.label(key) for key, column in columns.items()])
+
+    def _serializer(rows):
+        items = [serialize_row(row, keys) for row in rows]
+        if attach and items:
+            attach(items)
+        return items
+
+    return paginate_query(projected, page, per_page, serializer=_serializer, keyset=keyset,
+                          count_module=count_module)
@@ -0,0 +1,238 @@
+"""
+公開 GET 接口的服務端響應緩存
+
+緩存鍵由請求路徑、規範化查詢字符串和所依賴模組的代數（generation）組成；
+BaseService.execute_with_audit 提交後遞增對應模組的代數，舊條目隨即不再命中，
+由 LRU / TTL 自然淘汰。
+
+後端：
+- memory：進程內 LRU + TTL，僅適用於單工作進程
+- shared：本機 SQLite 文件，同一主機上的多個 gunicorn 工作進程共享條目和代數
+- none：禁用
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence
+from flask import current_app, has_app_context
+
+
+class CachedResponse(NamedTuple):
+    """緩存的響應內容"""
+    body: bytes
+    etag: str
+    mimetype: str
+
+
+class MemoryBackend:
+    """進程內 LRU 緩存，條目超過 TTL 或容量時淘汰"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_generations(self, modules: Sequence[str]) -> tuple:
+        with self._lock:
+            return tuple(self._generations.get(module, 0) for module in modules)
+
+    def bump(self, modules: Iterable[str]) -> None:
+        with self._lock:
+            for module in modules:
+                self._generations[module] = self._generations.get(module, 0) + 1
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedLocalBackend:
+    """
+    基於本機 SQLite 文件的共享緩存
+
+    同一主機上的所有工作進程讀寫同一個文件，任一進程的失效對其他進程立即生效；
+    每個線程持有獨立連接
+    """
+
+    # 每寫入多少條目檢查一次容量，避免每次寫入都執行清理
+    PRUNE_INTERVAL = 64
+
+    def __init__(self, path: str, max_entries: int = 512):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS entries ('
+                         'key TEXT PRIMARY KEY, body BLOB, etag TEXT, mimetype TEXT, expires_at REAL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_entries_expires ON entries (expires_at)')
+            conn.execute('CREATE TABLE IF NOT EXISTS generations ('
+                         'module TEXT PRIMARY KEY, generation INTEGER NOT NULL)')
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        row = self._connect().execute(
+            'SELECT body, etag, mimetype FROM entries WHERE key = ? AND expires_at > ?',
+            (key, time.time())
+        ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def set(self, key: str, value: CachedResponse, ttl: float) -> None:
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO entries (key, body, etag, mimetype, expires_at) VALUES (?, ?, ?, ?, ?)',
+            (key, value.body, value.etag, value.mimetype, time.time() + ttl)
+        )
+        with self._writes_lock:
+            self._writes += 1
+            prune = self._writes % self.PRUNE_INTERVAL == 0
+        if prune:
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """刪除過期條目；仍超出容量時按過期時間淘汰最早的條目"""
+        conn.execute('DELETE FROM entries WHERE expires_at <= ?', (time.time(),))
+        conn.execute(
+            'DELETE FROM entries WHERE key IN ('
+            'SELECT key FROM entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def get_generations(self, modules: Sequence[str]) -> tuple:
+        placeholders = ','.join('?' * len(modules))
+        rows = dict(self._connect().execute(
+            f'SELECT module, generation FROM generations WHERE module IN ({placeholders})',
+            tuple(modules)
+        ).fetchall())
+        return tuple(rows.get(module, 0) for module in modules)
+
+    def bump(self, modules: Iterable[str]) -> None:
+        conn = self._connect()
+        for module in modules:
+            conn.execute(
+                'INSERT INTO generations (module, generation) VALUES (?, 1) '
+                'ON CONFLICT(module) DO UPDATE SET generation = generation + 1',
+                (module,)
+            )
+
+    def size(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def clear(self) -> None:
+        self._connect().execute('DELETE FROM entries')
+
+
+class ResponseCache:
+    """響應緩存，統計本進程的命中情況"""
+
+    def __init__(self, backend, ttl: float = 300):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, path: str, query_string: str, modules: Sequence[str]) -> str:
+        generations = self.backend.get_generations(modules)
+        versions = ','.join(f'{module}:{generation}' for module, generation in zip(modules, generations))
+        return f'{path}?{query_string}#{versions}'
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        self.backend.set(key, value, self.ttl)
+
+    def invalidate(self, *modules: str) -> None:
+        self.backend.bump(modules)
+
+    def stats(self) -> Dict[str, object]:
+        total = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'pid': os.getpid(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'entries': self.backend.size(),
+            'ttl': self.ttl
+        }
+
+
+def create_response_cache(config) -> Optional[ResponseCache]:
+    """按配置創建響應緩存，RESPONSE_CACHE_BACKEND 為 none 時返回 None"""
+    backend_name = config.get('RESPONSE_CACHE_BACKEND', 'memory')
+    max_entries = config.get('RESPONSE_CACHE_MAX_ENTRIES', 512)
+
+    if backend_name == 'none':
+        return None
+    if backend_name == 'memory':
+        backend = MemoryBackend(max_entries=max_entries)
+    elif backend_name == 'shared':
+        backend = SharedLocalBackend(config['RESPONSE_CACHE_PATH'], max_entries=max_entries)
+    else:
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {backend_name}")
+
+    return ResponseCache(backend, ttl=config.get('RESPONSE_CACHE_TTL', 300))
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """獲取當前應用的響應緩存，未啟用或無應用上下文時返回 None"""
+    if not has_app_context():
+        return None
+
+    app = current_app._get_current_object()
+    if 'response_cache' not in app.extensions:
+        app.extensions['response_cache'] = create_response_cache(app.config)
+    return app.extensions['response_cache']
+
+
+def invalidate_responses(*modules: str) -> None:
+    """寫操作提交後調用，使依賴相關模組的緩存響應失效"""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate(*modules)
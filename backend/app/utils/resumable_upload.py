@@ -0,0 +1,120 @@
+"""
+分塊斷點續傳上傳的磁盤部分
+
+分塊按順序寫入 UPLOAD_FOLDER/_uploads/<upload_id>.part，每塊從 offset 處寫起（先截斷 offset 之後的殘留），
+寫入時檢查總大小並累計 SHA-256；連接中斷時已寫入的部分保留，.part 文件大小即已接收的字節數。
+
+SHA-256 的中間狀態無法持久化，保存在進程內；續傳的分塊落在其他工作進程或進程重啟後，
+先從 .part 文件重新計算已接收部分。
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from flask import current_app
+from .messages import msg
+
+UPLOADS_DIR = '_uploads'
+CHUNK_SIZE = 1024 * 1024
+MAX_HASHERS = 256
+
+# upload_id -> (已計算的字節數, sha256 對象)
+_hashers: 'OrderedDict[str, tuple]' = OrderedDict()
+_lock = threading.Lock()
+
+
+def part_path(upload_id: str) -> str:
+    """上傳中文件的磁盤路徑"""
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], UPLOADS_DIR, f'{upload_id}.part')
+
+
+def received_size(upload_id: str) -> int:
+    """已寫入磁盤的字節數"""
+    try:
+        return os.path.getsize(part_path(upload_id))
+    except OSError:
+        return 0
+
+
+def _hasher_at(upload_id: str, offset: int):
+    """取出計算到 offset 的 sha256 對象，進程內沒有時從 .part 文件重新計算"""
+    with _lock:
+        cached = _hashers.pop(upload_id, None)
+    if cached and cached[0] == offset:
+        return cached[1]
+
+    hasher = hashlib.sha256()
+    remaining = offset
+    with open(part_path(upload_id), 'rb') as part:
+        while remaining:
+            chunk = part.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            remaining -= len(chunk)
+    return hasher
+
+
+def _keep_hasher(upload_id: str, offset: int, hasher) -> None:
+    with _lock:
+        _hashers[upload_id] = (offset, hasher)
+        _hashers.move_to_end(upload_id)
+        while len(_hashers) > MAX_HASHERS:
+            _hashers.popitem(last=False)
+
+
+def create_part(upload_id: str) -> None:
+    """創建空的上傳文件"""
+    path = part_path(upload_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    _keep_hasher(upload_id, 0, hashlib.sha256())
+
+
+def write_chunk(upload_id: str, stream, offset: int, total_size: int) -> int:
+    """
+    從 offset 處寫入一個分塊
+
+    Returns:
+        int: 寫入後的 offset
+
+    Raises:
+        ValueError: 超過聲明的文件大小（已寫入的部分保留）
+    """
+    hasher = _hasher_at(upload_id, offset)
+    written = offset
+    try:
+        with open(part_path(upload_id), 'r+b') as part:
+            part.seek(offset)
+            part.truncate()
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if written + len(chunk) > total_size:
+                    raise ValueError(msg.get_error_message('FILE_SIZE_EXCEEDED', max_size=total_size))
+                part.write(chunk)
+                hasher.update(chunk)
+                written += len(chunk)
+    finally:
+        _keep_hasher(upload_id, written, hasher)
+    return written
+
+
+def finish(upload_id: str, total_size: int) -> str:
+    """返回完整文件的 SHA-256"""
+    digest = _hasher_at(upload_id, total_size).hexdigest()
+    with _lock:
+        _hashers.pop(upload_id, None)
+    return digest
+
+
+def discard(upload_id: str) -> None:
+    """刪除上傳中的文件"""
+    with _lock:
+        _hashers.pop(upload_id, None)
+    try:
+        os.remove(part_path(upload_id))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,437 @@
+"""
+站內統一搜索的進程內倒排索引
+
+索引覆蓋成員、論文、新聞、項目、課題組和資源的公開數據：
+- 工作進程啟動時（或首次搜索時）從數據庫載入
+- 寫操作經 ORM 會話事件增量更新：flush 時記錄變更實體的文檔快照，事務提交後寫入索引，回滾則丟棄
+- 其他工作進程的寫入通過定期比對各表的 MAX(更新時間) 和行數發現，並重新載入對應模組
+
+分詞與全文檢索一致（fulltext.analyze：中日韓字符二元組 + 英文單詞），相關度使用 BM25，標題詞加權
+"""
+
+import heapq
+import logging
+import math
+import threading
+import time
+from bisect import bisect_left
+from itertools import chain, compress, repeat
+from operator import add, ge, mul
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Member, Paper, ResearchGroup, News, Project, Resource
+from .fulltext import analyze, is_prefix_token
+
+logger = logging.getLogger(__name__)
+
+# 標題列的詞頻權重（正文列為 1）
+TITLE_WEIGHT = 3.0
+
+# 前綴匹配最多展開的詞數，及英文前綴的最短長度（更短時按完整單詞匹配）
+MAX_PREFIX_EXPANSIONS = 64
+MIN_PREFIX_LENGTH = 2
+
+_PENDING_KEY = 'search_index_pending'
+
+
+class Document(NamedTuple):
+    """待索引的文檔：標題列在前，fields 為 (文本, 權重) 列表"""
+    module: str
+    entity_id: int
+    title_zh: Optional[str]
+    title_en: Optional[str]
+    fields: Sequence[Tuple[Optional[str], float]]
+
+
+class SearchHit(NamedTuple):
+    """一條搜索結果"""
+    module: str
+    entity_id: int
+    title_zh: Optional[str]
+    title_en: Optional[str]
+    score: float
+
+
+class IndexSpec:
+    """一個模組的索引配置"""
+
+    def __init__(self, module: str, model, title_columns: Sequence[str], body_columns: Sequence[str],
+                 updated_column: str = 'updated_at'):
+        self.module = module
+        self.model = model
+        self.title_columns = tuple(title_columns)
+        self.body_columns = tuple(body_columns)
+        self.pk = model.__mapper__.primary_key[0].name
+        self.updated = getattr(model, updated_column)
+        self.has_enable = hasattr(model, 'enable')
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (self.pk,) + self.title_columns + self.body_columns
+
+    def make_document(self, values: Sequence) -> Document:
+        """由 columns 順序的列值構造文檔"""
+        texts = values[1:]
+        weights = [TITLE_WEIGHT] * len(self.title_columns) + [1.0] * len(self.body_columns)
+        return Document(self.module, values[0], texts[0], texts[1], list(zip(texts, weights)))
+
+    def document_from(self, instance) -> Optional[Document]:
+        """由模型實例構造文檔；已停用（enable=0）的實體不出現在公開搜索中，返回 None"""
+        if self.has_enable and instance.enable == 0:
+            return None
+        return self.make_document([getattr(instance, name) for name in self.columns])
+
+    def load_query(self):
+        query = db.session.query(*(getattr(self.model, name) for name in self.columns))
+        if self.has_enable:
+            query = query.filter(self.model.enable == 1)
+        return query
+
+
+# 各模組標題列的前兩列分別作為結果的中英文標題
+INDEX_SPECS = {spec.module: spec for spec in (
+    IndexSpec('member', Member, ('mem_name_zh', 'mem_name_en'), ('mem_email', 'mem_desc_zh', 'mem_desc_en')),
+    IndexSpec('paper', Paper, ('paper_title_zh', 'paper_title_en'), (
+        'paper_venue', 'all_authors_zh', 'all_authors_en', 'paper_desc_zh', 'paper_desc_en'
+    )),
+    IndexSpec('news', News, ('news_title_zh', 'news_title_en'), ('news_content_zh', 'news_content_en')),
+    IndexSpec('project', Project, ('project_name_zh', 'project_name_en'), ('project_desc_zh', 'project_desc_en')),
+    IndexSpec('research_group', ResearchGroup, ('research_group_name_zh', 'research_group_name_en'), (
+        'research_group_desc_zh', 'research_group_desc_en'
+    )),
+    IndexSpec('resource', Resource, ('resource_name_zh', 'resource_name_en'), (
+        'resource_description_zh', 'resource_description_en'
+    ), updated_column='updated_time'),
+)}
+
+_SPECS_BY_MODEL = {spec.model: spec for spec in INDEX_SPECS.values()}
+
+
+class InvertedIndex:
+    """
+    倒排索引
+
+    詞 -> {內部文檔號: BM25 詞頻分量}。詞頻分量在寫入時按當時的平均文檔長度計算，
+    查詢時只需乘以 IDF 求和，交集與打分都在 C 層迭代完成。
+    檢索詞的所有分詞都須命中，末尾的英文單詞或單字按前綴匹配；讀寫共用一把鎖
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ids: Dict[Tuple[str, int], int] = {}
+        # 內部文檔號 -> (模組, 實體ID, 中文標題, 英文標題, 文檔長度, 詞列表)
+        self._docs: Dict[int, tuple] = {}
+        self._module_docs: Dict[str, set] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        # 有序詞表，用於前綴匹配；為 None 時在下次前綴匹配前重建
+        self._vocabulary: Optional[List[str]] = None
+        self._next_id = 0
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _frequencies(document: Document) -> Dict[str, float]:
+        frequencies: Dict[str, float] = {}
+        for text, weight in document.fields:
+            for token in analyze(text):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+        return frequencies
+
+    def add(self, document: Document) -> None:
+        """添加或替換文檔"""
+        frequencies = self._frequencies(document)
+        with self._lock:
+            self._insert(document, frequencies, self._average_length(sum(frequencies.values())))
+
+    def add_many(self, documents: Iterable[Document]) -> None:
+        """批量添加：先分詞並統計本批的平均長度，結束後再重建詞表"""
+        analyzed = [(document, self._frequencies(document)) for document in documents]
+        if not analyzed:
+            return
+        with self._lock:
+            total_length = self._total_length + sum(sum(f.values()) for _, f in analyzed)
+            average = total_length / (len(self._docs) + len(analyzed))
+            self._vocabulary = None
+            for document, frequencies in analyzed:
+                self._insert(document, frequencies, average)
+
+    def _average_length(self, length: float) -> float:
+        return self._total_length / len(self._docs) if self._docs else length or 1.0
+
+    def _insert(self, document: Document, frequencies: Dict[str, float], average: float) -> None:
+        key = (document.module, document.entity_id)
+        self._remove(key)
+        length = sum(frequencies.values())
+        doc_id = self._next_id
+        self._next_id += 1
+        self._ids[key] = doc_id
+        self._docs[doc_id] = (document.module, document.entity_id, document.title_zh, document.title_en,
+                              length, tuple(frequencies))
+        self._module_docs.setdefault(document.module, set()).add(doc_id)
+        self._total_length += length
+
+        norm = self.K1 * (1 - self.B + self.B * length / (average or 1.0))
+        for token, frequency in frequencies.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = {}
+                if self._vocabulary is not None:
+                    self._insert_vocabulary(token)
+            posting[doc_id] = frequency * (self.K1 + 1) / (frequency + norm)
+
+    def remove(self, module: str, entity_id: int) -> None:
+        with self._lock:
+            self._remove((module, entity_id))
+
+    def remove_module(self, module: str) -> None:
+        with self._lock:
+            for key in [key for key in self._ids if key[0] == module]:
+                self._remove(key)
+
+    def _remove(self, key: Tuple[str, int]) -> None:
+        doc_id = self._ids.pop(key, None)
+        if doc_id is None:
+            return
+        doc = self._docs.pop(doc_id)
+        self._module_docs[doc[0]].discard(doc_id)
+        self._total_length -= doc[4]
+        for token in doc[5]:
+            posting = self._postings[token]
+            del posting[doc_id]
+            if not posting:
+                # 詞表中的舊詞在前綴匹配時跳過
+                del self._postings[token]
+
+    def _insert_vocabulary(self, token: str) -> None:
+        # 刪除文檔時不清理詞表，重新出現的詞可能已在詞表中
+        position = bisect_left(self._vocabulary, token)
+        if position == len(self._vocabulary) or self._vocabulary[position] != token:
+            self._vocabulary.insert(position, token)
+
+    def _prefix_posting(self, prefix: str) -> Dict[int, float]:
+        """
+        合併以 prefix 開頭的詞的倒排列表
+
+        同一文檔命中多個展開詞時取較罕見的詞的分量
+        """
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        postings = []
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and len(postings) < MAX_PREFIX_EXPANSIONS:
+            token = vocabulary[position]
+            if not token.startswith(prefix):
+                break
+            posting = self._postings.get(token)
+            if posting:
+                postings.append(posting)
+            position += 1
+
+        if len(postings) == 1:
+            return postings[0]
+        merged: Dict[int, float] = {}
+        for posting in sorted(postings, key=len, reverse=True):
+            merged.update(posting)
+        return merged
+
+    def _required_postings(self, terms: Sequence[str]) -> List[Dict[int, float]]:
+        required = []
+        for term in terms:
+            tokens = analyze(term)
+            if not tokens:
+                continue
+            required.extend(self._postings.get(token, {}) for token in tokens[:-1])
+            last = tokens[-1]
+            if is_prefix_token(last) and (len(last) >= MIN_PREFIX_LENGTH or not last.isascii()):
+                required.append(self._prefix_posting(last))
+            else:
+                required.append(self._postings.get(last, {}))
+        return required
+
+    def search(self, terms: Sequence[str], modules: Optional[Iterable[str]] = None,
+               limit: int = 20) -> Tuple[List[SearchHit], Dict[str, int]]:
+        """
+        檢索
+
+        Args:
+            terms: 檢索詞（fulltext.parse_terms 的結果），全部須命中
+            modules: 只返回這些模組的結果，None 表示全部
+            limit: 返回的結果數
+
+        Returns:
+            tuple: (按相關度降序的結果, 各模組的命中數)；命中數不受 modules 篩選影響
+        """
+        with self._lock:
+            required = self._required_postings(terms)
+            if not required or not self._docs:
+                return [], {}
+
+            # 從最短的倒排列表開始求交集
+            required.sort(key=len)
+            candidates = set(required[0])
+            for posting in required[1:]:
+                if not candidates:
+                    break
+                candidates = set(filter(posting.__contains__, candidates))
+
+            counts = {}
+            for module, doc_ids in self._module_docs.items():
+                matched = len(candidates & doc_ids)
+                if matched:
+                    counts[module] = matched
+
+            if modules:
+                allowed = set().union(*(self._module_docs.get(module, ()) for module in modules))
+                candidates &= allowed
+            if not candidates:
+                return [], counts
+
+            total = len(self._docs)
+            doc_ids = list(candidates)
+            scores = None
+            for posting in required:
+                idf = math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+                contribution = map(mul, repeat(idf), map(posting.__getitem__, doc_ids))
+                scores = contribution if scores is None else map(add, scores, contribution)
+
+            # 先求第 limit 高的分數，只對不低於它的少量文檔排序；同分時較新寫入的文檔在前
+            scores = list(scores)
+            if len(scores) > limit:
+                cutoff = heapq.nlargest(limit, scores)[-1]
+                selected = list(map(ge, scores, repeat(cutoff)))
+                scores, doc_ids = list(compress(scores, selected)), list(compress(doc_ids, selected))
+            top = sorted(zip(scores, doc_ids), reverse=True)[:limit]
+            hits = [SearchHit(*self._docs[doc_id][:4], round(score, 4)) for score, doc_id in top]
+            return hits, counts
+
+
+class SiteSearchIndex:
+    """工作進程內的站內搜索索引：負責從數據庫載入、應用本進程的寫入及發現其他進程的寫入"""
+
+    def __init__(self, refresh_interval: Optional[float] = 30):
+        self.index = InvertedIndex()
+        self.refresh_interval = refresh_interval
+        self._state: Dict[str, tuple] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def build(self) -> None:
+        """從數據庫載入全部模組"""
+        started = time.perf_counter()
+        state = table_state()
+        for spec in INDEX_SPECS.values():
+            self._load(spec)
+        self._state = state
+        self._checked_at = time.monotonic()
+        logger.info('Search index built: %d documents in %.2fs', len(self.index), time.perf_counter() - started)
+
+    def _load(self, spec: IndexSpec) -> None:
+        documents = [spec.make_document(row) for row in spec.load_query()]
+        with self.index._lock:
+            self.index.remove_module(spec.module)
+            self.index.add_many(documents)
+
+    def refresh(self) -> None:
+        """超過刷新間隔時比對各表狀態，重新載入被其他工作進程修改的模組"""
+        if self.refresh_interval is None or time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.refresh_interval:
+                return
+            state = table_state()
+            for module, spec in INDEX_SPECS.items():
+                if state[module] != self._state.get(module):
+                    self._load(spec)
+            self._state = state
+            self._checked_at = time.monotonic()
+
+    def apply(self, changes: Dict[Tuple[str, int], Optional[Document]]) -> None:
+        """應用本進程已提交的變更，None 表示刪除或停用"""
+        for (module, entity_id), document in changes.items():
+            if document is None:
+                self.index.remove(module, entity_id)
+            else:
+                self.index.add(document)
+
+    def search(self, terms: Sequence[str], modules: Optional[Iterable[str]] = None, limit: int = 20):
+        self.refresh()
+        return self.index.search(terms, modules, limit)
+
+
+def table_state() -> Dict[str, tuple]:
+    """用一條查詢獲取各模組數據表的 MAX(更新時間) 和行數"""
+    columns = []
+    for spec in INDEX_SPECS.values():
+        columns.append(select(func.max(spec.updated)).scalar_subquery())
+        columns.append(select(func.count()).select_from(spec.model).scalar_subquery())
+    row = db.session.execute(select(*columns)).one()
+    return {module: tuple(row[i * 2:i * 2 + 2]) for i, module in enumerate(INDEX_SPECS)}
+
+
+def get_search_index() -> SiteSearchIndex:
+    """獲取當前應用的搜索索引，尚未建立時從數據庫載入"""
+    app = current_app._get_current_object()
+    site = app.extensions.get('search_index')
+    if site is None:
+        site = SiteSearchIndex(refresh_interval=app.config.get('SEARCH_INDEX_REFRESH_INTERVAL', 30))
+        site.build()
+        app.extensions['search_index'] = site
+    return site
+
+
+def warm_search_index() -> None:
+    """工作進程啟動時建立索引；失敗時（如數據表尚未遷移）留待首次搜索時再建立"""
+    try:
+        get_search_index()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning('Search index warm-up skipped: %s', e)
+
+
+def _collect_changes(session, flush_context) -> None:
+    """flush 後記錄變更實體的文檔快照，提交前不寫入索引"""
+    pending = None
+    for instance in chain(session.new, session.dirty, session.deleted):
+        spec = _SPECS_BY_MODEL.get(type(instance))
+        if spec is None:
+            continue
+        if pending is None:
+            pending = session.info.setdefault(_PENDING_KEY, {})
+        key = (spec.module, getattr(instance, spec.pk))
+        pending[key] = None if instance in session.deleted else spec.document_from(instance)
+
+
+def _apply_changes(session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or not has_app_context():
+        return
+    site = current_app.extensions.get('search_index')
+    if site is not None:
+        site.apply(pending)
+
+
+def _discard_changes(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+_events_registered = False
+
+
+def register_search_index_events() -> None:
+    """註冊索引增量更新的會話事件（僅註冊一次）"""
+    global _events_registered
+    if _events_registered:
+        return
+    event.listen(Session, 'after_flush', _collect_changes)
+    event.listen(Session, 'after_commit', _apply_changes)
+    event.listen(Session, 'after_rollback', _discard_changes)
+    _events_registered = True
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from datetime import timedelta
 
 class Config:
@@ -28,10 +29,84 @@ class Config:
     ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
     ALLOWED_DOCUMENT_EXTENSIONS = {'pdf'}
     
+    # /api/media/serve 中以 uuid 命名的文件內容不變，瀏覽器和代理可長期緩存（秒）
+    MEDIA_CACHE_MAX_AGE = int(os.environ.get('MEDIA_CACHE_MAX_AGE', 31536000))
+    # 媒體文件的發送方式：none（由 Python 流式發送）、x-accel（nginx X-Accel-Redirect）、
+    # x-sendfile（Apache / lighttpd X-Sendfile）；x-accel 模式下 MEDIA_ACCEL_PREFIX 為指向 UPLOAD_FOLDER 的 internal location
+    MEDIA_OFFLOAD = os.environ.get('MEDIA_OFFLOAD', 'none')
+    MEDIA_ACCEL_PREFIX = os.environ.get('MEDIA_ACCEL_PREFIX', '/protected-media/')
+    # /api/media/serve?w=&h= 允許的衍生圖尺寸（像素），衍生圖緩存在原圖目錄的 _derivatives/ 下
+    MEDIA_DERIVATIVE_SIZES = tuple(
+        int(size) for size in os.environ.get('MEDIA_DERIVATIVE_SIZES', '64,128,256,480,768,1280,1920').split(',')
+    )
+    MEDIA_DERIVATIVE_QUALITY = int(os.environ.get('MEDIA_DERIVATIVE_QUALITY', 82))
+    # 上傳圖片的縮放和重新編碼在本機進程池中執行（0 表示在請求內同步處理），
+    # 請求帶 wait=1 時等待處理結果
+    IMAGE_PROCESS_WORKERS = int(os.environ.get('IMAGE_PROCESS_WORKERS', 2))
+    IMAGE_MAX_SIZE = 1920
+    IMAGE_QUALITY = 85
+    # 論文 PDF 提取文本的最大長度（字符），與上傳圖片共用 IMAGE_PROCESS_WORKERS 進程池
+    PAPER_TEXT_MAX_CHARS = int(os.environ.get('PAPER_TEXT_MAX_CHARS', 200000))
+    # 分塊斷點續傳上傳（/api/media/uploads）建議的分塊大小，及最後一個分塊後保留未完成上傳的時長
+    MEDIA_UPLOAD_CHUNK_SIZE = int(os.environ.get('MEDIA_UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024))
+    MEDIA_UPLOAD_EXPIRE_HOURS = int(os.environ.get('MEDIA_UPLOAD_EXPIRE_HOURS', 24))
+    # 修改時間（寫入或命中去重）在此時長內的文件釋放時不刪除，避免刪除併發上傳剛命中去重、尚未提交引用的文件（秒）
+    MEDIA_RELEASE_GRACE_SECONDS = int(os.environ.get('MEDIA_RELEASE_GRACE_SECONDS', 600))
+    # to_dict(srcset=True) 生成的 srcset 寬度及格式
+    MEDIA_SRCSET_WIDTHS = (256, 480, 768, 1280)
+    MEDIA_SRCSET_FORMAT = 'webp'
+    
+    # 審計記錄寫後緩衝：寫操作提交後只追加到本地日誌（併發提交共用 fsync），由後台線程每
+    # AUDIT_FLUSH_INTERVAL 秒批量插入 edit_records；啟動時重放崩潰遺留的日誌。日誌目錄須在持久存儲上
+    AUDIT_WRITE_BEHIND = os.environ.get('AUDIT_WRITE_BEHIND', 'false').lower() == 'true'
+    AUDIT_JOURNAL_DIR = os.environ.get('AUDIT_JOURNAL_DIR') or \
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'instance', 'audit_journal')
+    AUDIT_FLUSH_INTERVAL = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 1.0))
+    AUDIT_FLUSH_BATCH_SIZE = int(os.environ.get('AUDIT_FLUSH_BATCH_SIZE', 500))
+    # 審計內容的緊湊存儲：不少於 AUDIT_DIFF_MIN_CHARS 的文本舊值存為相對新值的差異，
+    # 編碼後不少於 AUDIT_COMPRESS_MIN_BYTES 的內容壓縮存儲（見 app.utils.audit_payload）
+    AUDIT_DIFF_MIN_CHARS = int(os.environ.get('AUDIT_DIFF_MIN_CHARS', 256))
+    AUDIT_COMPRESS_MIN_BYTES = int(os.environ.get('AUDIT_COMPRESS_MIN_BYTES', 1024))
+    # 審計記錄歸檔：早於 AUDIT_RETENTION_DAYS 天的記錄由 scripts/maintenance/archive_edit_records.py
+    # 按日期分區移到 AUDIT_ARCHIVE_DIR（gzip 壓縮的 JSONL 及旁路索引），列表和詳情接口透明查詢；0 表示不歸檔
+    AUDIT_RETENTION_DAYS = int(os.environ.get('AUDIT_RETENTION_DAYS', 365))
+    AUDIT_ARCHIVE_DIR = os.environ.get('AUDIT_ARCHIVE_DIR') or \
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'instance', 'audit_archive')
+    AUDIT_ARCHIVE_BATCH_SIZE = int(os.environ.get('AUDIT_ARCHIVE_BATCH_SIZE', 1000))
+    
     # 分頁配置
     DEFAULT_PER_PAGE = 10
     MAX_PER_PAGE = 100
     
+    # 分頁總數緩存（秒），0 表示禁用；寫操作按模組失效，TTL 兜底其他進程的寫入
+    COUNT_CACHE_TTL = int(os.environ.get('COUNT_CACHE_TTL', 60))
+    COUNT_CACHE_MAX_ENTRIES = 1024
+    
+    # 公開 GET 接口的 HTTP 緩存：瀏覽器每次用 ETag 重新驗證，反向代理緩存 s-maxage 秒
+    HTTP_CACHE_ENABLED = os.environ.get('HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 0))
+    HTTP_CACHE_S_MAXAGE = int(os.environ.get('HTTP_CACHE_S_MAXAGE', 60))
+    SURROGATE_KEY_HEADER = os.environ.get('SURROGATE_KEY_HEADER', 'Surrogate-Key')
+    
+    # 公開 GET 接口的服務端響應緩存：memory（進程內）、shared（本機多進程共享）、none
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
+    RESPONSE_CACHE_MAX_ENTRIES = 512
+    RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH') or \
+        os.path.join(tempfile.gettempdir(), 'lab_web_response_cache.sqlite3')
+    # 關閉響應緩存的藍圖名稱，逗號分隔（如 news,paper）
+    RESPONSE_CACHE_DISABLED_BLUEPRINTS = {
+        name.strip() for name in os.environ.get('RESPONSE_CACHE_DISABLED_BLUEPRINTS', '').split(',') if name.strip()
+    }
+    
+    # 站內統一搜索（/api/search）的進程內索引：工作進程啟動時建立；
+    # 每隔 SEARCH_INDEX_REFRESH_INTERVAL 秒檢查其他工作進程的寫入
+    SEARCH_INDEX_WARM_ON_START = os.environ.get('SEARCH_INDEX_WARM_ON_START', 'true').lower() == 'true'
+    SEARCH_INDEX_REFRESH_INTERVAL = int(os.environ.get('SEARCH_INDEX_REFRESH_INTERVAL', 30))
+    
+    # JSON 序列化實現：auto（orjson 可用時使用）、orjson、std
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+    
     # 其他配置
     cors_origins_env = os.environ.get('CORS_ORIGINS', 
         'http://localhost:3000,http://127.0.0.1:3000,http://localhost:5000,http://127.0.0.1:5000,http://localhost:8000,http://127.0.0.1:8000,http://localhost:8080,http://127.0.0.1:8080'
@@ -54,10 +129,21 @@ class ProductionConfig(Config):
     # 生產環境強制HTTPS
     SSL_REDIRECT = True
     
+    # gunicorn 多工作進程，響應緩存須在進程間共享失效狀態
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'shared')
+    
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('SQLALCHEMY_DATABASE_URI') or 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    # 測試直接修改數據庫，默認不緩存響應
+    RESPONSE_CACHE_BACKEND = 'none'
+    # 測試在寫入數據後按需建立搜索索引
+    SEARCH_INDEX_WARM_ON_START = False
+    # 測試默認在請求內同步處理上傳圖片
+    IMAGE_PROCESS_WORKERS = 0
+    # 測試寫入文件後立即刪除，默認不保留近期寫入的文件
+    MEDIA_RELEASE_GRACE_SECONDS = 0
     JWT_SECRET_KEY = 'test-secret-key'
     SECRET_KEY = JWT_SECRET_KEY
 
@@ -0,0 +1,56 @@
+"""Add paper_texts table for PDF text search
+
+Revision ID: a7c9e5f2b3d4
+Revises: f6b8d4e1a2c3
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c9e5f2b3d4'
+down_revision = 'f6b8d4e1a2c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from sqlalchemy import inspect
+    from app.utils.fulltext import PAPER_TEXT_SPEC, create_mysql_index, rebuild_sqlite_index
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    # 已有論文的文本由 scripts/maintenance/extract_paper_texts.py 提取
+    if 'paper_texts' not in inspector.get_table_names():
+        op.create_table('paper_texts',
+            sa.Column('paper_id', sa.Integer(), nullable=False),
+            sa.Column('file_path', sa.String(length=500), nullable=False),
+            sa.Column('file_sha256', sa.String(length=64), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('paper_text', sa.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'), nullable=True),
+            sa.Column('page_count', sa.Integer(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('extracted_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['paper_id'], ['papers.paper_id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('paper_id')
+        )
+
+    # MySQL 添加 FULLTEXT（ngram 解析器）索引；SQLite 創建 FTS5 虛擬表
+    if connection.dialect.name == 'mysql':
+        create_mysql_index(connection, PAPER_TEXT_SPEC)
+    elif connection.dialect.name == 'sqlite':
+        rebuild_sqlite_index(connection, PAPER_TEXT_SPEC)
+
+
+def downgrade():
+    from app.utils.fulltext import PAPER_TEXT_SPEC, drop_sqlite_index
+
+    connection = op.get_bind()
+    if connection.dialect.name == 'sqlite':
+        drop_sqlite_index(connection, PAPER_TEXT_SPEC)
+
+    op.drop_table('paper_texts')
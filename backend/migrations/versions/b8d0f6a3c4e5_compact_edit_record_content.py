@@ -0,0 +1,72 @@
+"""Compact and compress existing edit_records.edit_content
+
+Revision ID: b8d0f6a3c4e5
+Revises: a7c9e5f2b3d4
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d0f6a3c4e5'
+down_revision = 'a7c9e5f2b3d4'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+edit_records = sa.table(
+    'edit_records',
+    sa.column('edit_id', sa.Integer),
+    sa.column('edit_content', sa.Text)
+)
+
+
+def _rewrite(convert):
+    """按 edit_id 分批重寫 edit_content，convert 返回 None 時不修改"""
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(edit_records.c.edit_id, edit_records.c.edit_content)
+            .where(edit_records.c.edit_id > last_id)
+            .order_by(edit_records.c.edit_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for edit_id, content in rows:
+            converted = convert(content) if content else None
+            if converted is not None and converted != content:
+                connection.execute(
+                    edit_records.update().where(edit_records.c.edit_id == edit_id).values(edit_content=converted)
+                )
+        last_id = rows[-1].edit_id
+
+
+def upgrade():
+    from app.utils.audit_payload import decode, encode
+
+    def _compact(content):
+        try:
+            encoded = encode(decode(content))
+        except ValueError:
+            # 不是 JSON 的舊內容保持原樣
+            return None
+        return encoded if len(encoded) < len(content) else None
+
+    _rewrite(_compact)
+
+
+def downgrade():
+    import json
+    from app.utils.audit_payload import COMPACT_MARKER, COMPRESSED_PREFIX, decode
+
+    def _expand(content):
+        if not content.startswith(COMPRESSED_PREFIX) and f'"{COMPACT_MARKER}":' not in content:
+            return None
+        return json.dumps(decode(content), ensure_ascii=False)
+
+    _rewrite(_expand)
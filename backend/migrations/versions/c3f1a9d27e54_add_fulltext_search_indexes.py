@@ -0,0 +1,48 @@
+"""Add full-text search indexes
+
+Revision ID: c3f1a9d27e54
+Revises: 42ea7a18a8b8
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f1a9d27e54'
+down_revision = '42ea7a18a8b8'
+branch_labels = None
+depends_on = None
+
+# 本遷移添加索引的模塊；之後新增的可檢索表（如 paper_texts）由其各自的遷移添加索引
+MODULES = ('member', 'paper', 'research_group', 'news', 'project', 'resource')
+
+
+def _specs():
+    from app.utils.fulltext import SEARCH_SPECS
+
+    specs = {spec.module: spec for spec in SEARCH_SPECS.values()}
+    return [specs[module] for module in MODULES]
+
+
+def upgrade():
+    # MySQL 添加 FULLTEXT（ngram 解析器）索引；SQLite 創建並填充 FTS5 虛擬表
+    from app.utils.fulltext import create_mysql_index, rebuild_sqlite_index
+    
+    connection = op.get_bind()
+    for spec in _specs():
+        if connection.dialect.name == 'mysql':
+            create_mysql_index(connection, spec)
+        elif connection.dialect.name == 'sqlite':
+            rebuild_sqlite_index(connection, spec)
+
+
+def downgrade():
+    from app.utils.fulltext import drop_mysql_index, drop_sqlite_index
+    
+    connection = op.get_bind()
+    for spec in _specs():
+        if connection.dialect.name == 'mysql':
+            drop_mysql_index(connection, spec)
+        elif connection.dialect.name == 'sqlite':
+            drop_sqlite_index(connection, spec)
@@ -0,0 +1,63 @@
+"""Add edit_records.edit_summary for the list projection
+
+Revision ID: c9e1a7b4d5f6
+Revises: b8d0f6a3c4e5
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e1a7b4d5f6'
+down_revision = 'b8d0f6a3c4e5'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+edit_records = sa.table(
+    'edit_records',
+    sa.column('edit_id', sa.Integer),
+    sa.column('edit_content', sa.Text),
+    sa.column('edit_summary', sa.String(255))
+)
+
+
+def upgrade():
+    from app.utils.audit_payload import decode, summarize
+
+    columns = [column['name'] for column in sa.inspect(op.get_bind()).get_columns('edit_records')]
+    if 'edit_summary' not in columns:
+        with op.batch_alter_table('edit_records', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('edit_summary', sa.String(length=255), nullable=True))
+
+    # 按 edit_id 分批為已有記錄生成摘要
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(edit_records.c.edit_id, edit_records.c.edit_content)
+            .where(edit_records.c.edit_id > last_id)
+            .order_by(edit_records.c.edit_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for edit_id, content in rows:
+            try:
+                summary = summarize(decode(content))
+            except ValueError:
+                # 不是 JSON 的舊內容沒有摘要
+                continue
+            if summary:
+                connection.execute(
+                    edit_records.update().where(edit_records.c.edit_id == edit_id).values(edit_summary=summary)
+                )
+        last_id = rows[-1].edit_id
+
+
+def downgrade():
+    with op.batch_alter_table('edit_records', schema=None) as batch_op:
+        batch_op.drop_column('edit_summary')
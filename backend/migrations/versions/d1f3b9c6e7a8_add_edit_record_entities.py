@@ -0,0 +1,90 @@
+"""Add edit_record_entities for per-entity audit history
+
+Revision ID: d1f3b9c6e7a8
+Revises: c9e1a7b4d5f6
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd1f3b9c6e7a8'
+down_revision = 'c9e1a7b4d5f6'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+edit_records = sa.table(
+    'edit_records',
+    sa.column('edit_id', sa.Integer),
+    sa.column('edit_module', sa.Integer),
+    sa.column('edit_content', sa.Text),
+    sa.column('edit_date', sa.DateTime)
+)
+
+edit_record_entities = sa.table(
+    'edit_record_entities',
+    sa.column('edit_id', sa.Integer),
+    sa.column('entity_id', sa.Integer),
+    sa.column('edit_module', sa.Integer),
+    sa.column('edit_date', sa.DateTime)
+)
+
+
+def upgrade():
+    from sqlalchemy import inspect
+    from app.utils.audit_payload import decode, entity_ids
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'edit_record_entities' not in inspector.get_table_names():
+        op.create_table('edit_record_entities',
+            sa.Column('edit_id', sa.Integer(), nullable=False),
+            sa.Column('entity_id', sa.Integer(), nullable=False),
+            sa.Column('edit_module', sa.Integer(), nullable=False),
+            sa.Column('edit_date', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['edit_id'], ['edit_records.edit_id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('edit_id', 'entity_id')
+        )
+        op.create_index('ix_edit_record_entity_history', 'edit_record_entities',
+                        ['edit_module', 'entity_id', 'edit_date'], unique=False)
+
+    # 按 edit_id 分批從已有記錄的內容中提取操作對象（創建操作的內容中沒有對象ID，無法回填）
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(edit_records.c.edit_id, edit_records.c.edit_module,
+                      edit_records.c.edit_content, edit_records.c.edit_date)
+            .where(edit_records.c.edit_id > last_id)
+            .order_by(edit_records.c.edit_id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        done = set(connection.execute(
+            sa.select(edit_record_entities.c.edit_id).distinct()
+            .where(edit_record_entities.c.edit_id.in_([row.edit_id for row in rows]))
+        ).scalars())
+        values = []
+        for edit_id, edit_module, content, edit_date in rows:
+            if edit_id in done:
+                continue
+            try:
+                ids = entity_ids(edit_module, decode(content))
+            except ValueError:
+                # 不是 JSON 的舊內容沒有操作對象
+                continue
+            values.extend({'edit_id': edit_id, 'entity_id': entity_id, 'edit_module': edit_module,
+                           'edit_date': edit_date} for entity_id in ids)
+        if values:
+            connection.execute(edit_record_entities.insert(), values)
+        last_id = rows[-1].edit_id
+
+
+def downgrade():
+    op.drop_index('ix_edit_record_entity_history', table_name='edit_record_entities')
+    op.drop_table('edit_record_entities')
@@ -0,0 +1,48 @@
+"""Add image_tasks table for background image processing
+
+Revision ID: d4e8b2a61f07
+Revises: c3f1a9d27e54
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e8b2a61f07'
+down_revision = 'c3f1a9d27e54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from sqlalchemy import inspect
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    # 已存在的上傳在請求內同步處理過，沒有記錄即視為處理完成
+    if 'image_tasks' not in inspector.get_table_names():
+        op.create_table('image_tasks',
+            sa.Column('image_task_id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('file_path', sa.String(length=500), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('width', sa.Integer(), nullable=True),
+            sa.Column('height', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('image_task_id'),
+            sa.UniqueConstraint('file_path')
+        )
+
+        with op.batch_alter_table('image_tasks', schema=None) as batch_op:
+            batch_op.create_index('ix_image_tasks_status', ['status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('image_tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_image_tasks_status')
+
+    op.drop_table('image_tasks')
@@ -0,0 +1,31 @@
+"""Add edit_records.journal_id for write-behind replay dedupe
+
+Revision ID: e2a4c8d0f1b3
+Revises: d1f3b9c6e7a8
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a4c8d0f1b3'
+down_revision = 'd1f3b9c6e7a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = [column['name'] for column in sa.inspect(op.get_bind()).get_columns('edit_records')]
+    if 'journal_id' in columns:
+        return
+    with op.batch_alter_table('edit_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('journal_id', sa.String(length=32), nullable=True))
+        batch_op.create_index(batch_op.f('ix_edit_records_journal_id'), ['journal_id'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('edit_records', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_edit_records_journal_id'))
+        batch_op.drop_column('journal_id')
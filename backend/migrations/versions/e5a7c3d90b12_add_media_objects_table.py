@@ -0,0 +1,50 @@
+"""Add media_objects table for content-addressed uploads
+
+Revision ID: e5a7c3d90b12
+Revises: d4e8b2a61f07
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c3d90b12'
+down_revision = 'd4e8b2a61f07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from sqlalchemy import inspect
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    # 已存在的 uuid 命名文件不在記錄中，刪除時仍按引用計數判斷
+    if 'media_objects' not in inspector.get_table_names():
+        op.create_table('media_objects',
+            sa.Column('object_id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('sha256', sa.String(length=64), nullable=False),
+            sa.Column('file_path', sa.String(length=500), nullable=False),
+            sa.Column('file_type', sa.String(length=50), nullable=False),
+            sa.Column('size', sa.Integer(), nullable=False),
+            sa.Column('upload_count', sa.Integer(), nullable=False),
+            sa.Column('store_ms', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('last_uploaded_at', sa.DateTime(), nullable=False),
+            sa.Column('released_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('object_id'),
+            sa.UniqueConstraint('file_path')
+        )
+
+        with op.batch_alter_table('media_objects', schema=None) as batch_op:
+            batch_op.create_index('ix_media_objects_sha256', ['sha256'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('media_objects', schema=None) as batch_op:
+        batch_op.drop_index('ix_media_objects_sha256')
+
+    op.drop_table('media_objects')
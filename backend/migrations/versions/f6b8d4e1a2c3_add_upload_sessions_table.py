@@ -0,0 +1,49 @@
+"""Add upload_sessions table for chunked resumable uploads
+
+Revision ID: f6b8d4e1a2c3
+Revises: e5a7c3d90b12
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b8d4e1a2c3'
+down_revision = 'e5a7c3d90b12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from sqlalchemy import inspect
+
+    connection = op.get_bind()
+    inspector = inspect(connection)
+
+    if 'upload_sessions' not in inspector.get_table_names():
+        op.create_table('upload_sessions',
+            sa.Column('upload_id', sa.String(length=32), nullable=False),
+            sa.Column('upload_type', sa.String(length=50), nullable=False),
+            sa.Column('filename', sa.String(length=255), nullable=False),
+            sa.Column('total_size', sa.Integer(), nullable=False),
+            sa.Column('received_size', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('sha256', sa.String(length=64), nullable=True),
+            sa.Column('file_path', sa.String(length=500), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('upload_id')
+        )
+
+        with op.batch_alter_table('upload_sessions', schema=None) as batch_op:
+            batch_op.create_index('ix_upload_sessions_expires_at', ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('upload_sessions', schema=None) as batch_op:
+        batch_op.drop_index('ix_upload_sessions_expires_at')
+
+    op.drop_table('upload_sessions')
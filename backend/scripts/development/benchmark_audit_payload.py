@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+審計記錄內容存儲大小基準測試
+
+比較原來的 JSON 存儲與緊湊編碼（app.utils.audit_payload）在典型審計內容上的存儲大小和
+編解碼耗時，並校驗解碼結果與原內容一致
+
+使用方法:
+    python scripts/development/benchmark_audit_payload.py
+    python scripts/development/benchmark_audit_payload.py --desc-chars 50000 --repeat 20
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from pathlib import Path
+
+# 添加項目根目錄到路徑
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.audit_payload import decode, encode
+
+
+def build_description(chars, seed):
+    """構造指定長度的中英文混合描述"""
+    rng = random.Random(seed)
+    words = ['deep', 'learning', 'segmentation', 'graph', 'network', 'robust', 'model', 'dataset',
+             '研究', '方法', '實驗', '結果', '圖像', '分析', '提出', '模型']
+    parts, length = [], 0
+    while length < chars:
+        word = rng.choice(words) + (' ' if rng.random() > 0.1 else '\n')
+        parts.append(word)
+        length += len(word)
+    return ''.join(parts)[:chars]
+
+
+def edit_description(text, edits, seed):
+    """在描述中做少量修改"""
+    rng = random.Random(seed)
+    words = text.split(' ')
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = 'edited'
+    return ' '.join(words)
+
+
+def update_content(entity, field, old, new, extra=None):
+    """與各服務 update_* 中構造的審計內容結構一致"""
+    changes = {field: {'old': old, 'new': new}}
+    changes.update(extra or {})
+    return {
+        f'{entity}_id': 42,
+        f'{entity}_name': '張三',
+        'changes': changes,
+        'changed_fields': list(changes),
+        'change_count': len(changes),
+        'operation_details': {
+            'before_update': {k: v['old'] for k, v in changes.items()},
+            'after_update': {k: v['new'] for k, v in changes.items()}
+        }
+    }
+
+
+def build_payloads(desc_chars):
+    old_desc = build_description(desc_chars, 1)
+    new_desc = edit_description(old_desc, 5, 2)
+    return {
+        f'member desc edit ({desc_chars} chars)': update_content('member', 'mem_desc_zh', old_desc, new_desc),
+        'paper title + desc edit': update_content(
+            'paper', 'paper_desc_en', build_description(3000, 3), edit_description(build_description(3000, 3), 2, 4),
+            {'paper_title_en': {'old': 'A Study', 'new': 'A Revised Study'}}
+        ),
+        'member create (form_data)': {
+            'mem_name_zh': '張三', 'mem_name_en': 'San Zhang', 'mem_email': 'san@example.edu', 'mem_type': 1,
+            'mem_desc_zh': build_description(desc_chars // 5, 5), 'mem_desc_en': build_description(desc_chars // 5, 6)
+        },
+        'small update': update_content('news', 'news_type', 0, 1),
+        'login': {'admin_id': 1, 'ip': '127.0.0.1', 'timestamp': '2024-01-01T00:00:00+00:00'},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='審計記錄內容存儲大小基準測試')
+    parser.add_argument('--desc-chars', type=int, default=50000, help='長描述字段的字符數')
+    parser.add_argument('--repeat', type=int, default=10, help='重複次數（取最短耗時）')
+    args = parser.parse_args()
+
+    print(f'{"payload":<34} {"json":>10} {"encoded":>10} {"ratio":>7} {"encode":>10} {"decode":>10}')
+    total_before = total_after = 0
+    for name, content in build_payloads(args.desc_chars).items():
+        legacy = json.dumps(content, ensure_ascii=False)
+        stored = encode(content)
+        assert decode(stored) == content, f'{name}: 解碼結果不一致'
+
+        before, after = len(legacy.encode('utf-8')), len(stored.encode('utf-8'))
+        total_before += before
+        total_after += after
+        encode_ms = min(timeit.repeat(lambda: encode(content), number=1, repeat=args.repeat)) * 1000
+        decode_ms = min(timeit.repeat(lambda: decode(stored), number=1, repeat=args.repeat)) * 1000
+        print(f'{name:<34} {before / 1024:8.1f}Ki {after / 1024:8.1f}Ki {before / after:6.1f}x '
+              f'{encode_ms:8.2f}ms {decode_ms:8.2f}ms')
+    print(f'{"total":<34} {total_before / 1024:8.1f}Ki {total_after / 1024:8.1f}Ki {total_before / total_after:6.1f}x')
+
+
+if __name__ == '__main__':
+    main()
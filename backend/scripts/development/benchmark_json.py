@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+JSON 序列化微基準測試
+
+比較 Flask 默認實現、標準庫實現（StdJSONProvider）與 orjson 實現（OrjsonProvider）
+在成員、論文及審計記錄列表響應上的編碼耗時，並校驗兩種實現輸出內容一致
+
+使用方法:
+    python scripts/development/benchmark_json.py
+    python scripts/development/benchmark_json.py --rows 1000 --repeat 20
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+# 添加項目根目錄到路徑
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.utils.helpers import success_response
+from app.utils.json_provider import StdJSONProvider, OrjsonProvider, orjson
+
+
+def build_members(rows):
+    """構造與 Member.to_dict() 結構一致的成員列表（all=true 響應）"""
+    return [{
+        'mem_id': i,
+        'mem_avatar_path': f'/media/avatars/{i:04d}.jpg',
+        'mem_name_zh': f'成員{i}',
+        'mem_name_en': f'Member {i}',
+        'mem_desc_zh': '研究方向為機器學習與計算機視覺，發表多篇頂會論文。' * 8,
+        'mem_desc_en': 'Works on machine learning and computer vision. ' * 8,
+        'mem_email': f'member{i}@example.edu',
+        'mem_type': i % 3,
+        'job_type': i % 5,
+        'student_type': i % 3,
+        'student_grade': i % 6,
+        'graduation_year': 2020 + i % 6,
+        'alumni_identity': None,
+        'destination_zh': '某科技公司',
+        'destination_en': 'Some Tech Company',
+        'research_group_id': i % 4 + 1,
+        'lab_id': 1,
+        'enable': 1,
+        'research_group': {
+            'research_group_id': i % 4 + 1,
+            'research_group_name_zh': f'課題組{i % 4}',
+            'research_group_name_en': f'Group {i % 4}'
+        }
+    } for i in range(rows)]
+
+
+def build_papers(rows):
+    """構造與 Paper.to_dict() 結構一致的論文列表，含實驗室作者"""
+    start = date(2015, 1, 1)
+    return [{
+        'paper_id': i,
+        'research_group_id': i % 4 + 1,
+        'lab_id': 1,
+        'paper_date': (start + timedelta(days=i)).isoformat(),
+        'paper_title_zh': f'基於深度學習的圖像分割方法研究（{i}）',
+        'paper_title_en': f'A Study of Deep Learning Based Image Segmentation ({i})',
+        'paper_desc_zh': '本文提出了一種新的方法。' * 20,
+        'paper_desc_en': 'This paper proposes a novel method. ' * 20,
+        'paper_type': i % 4,
+        'paper_venue': 'CVPR',
+        'paper_accept': 1,
+        'paper_file_path': f'/media/papers/{i}.pdf',
+        'paper_url': f'https://example.org/papers/{i}',
+        'preview_img': None,
+        'all_authors_zh': '張三, 李四, 王五',
+        'all_authors_en': 'San Zhang, Si Li, Wu Wang',
+        'enable': 1,
+        'authors': [{
+            'paper_id': i,
+            'mem_id': j,
+            'author_order': j,
+            'is_corresponding': int(j == 1),
+            'member': {'mem_id': j, 'mem_name_zh': f'成員{j}', 'mem_name_en': f'Member {j}'}
+        } for j in range(1, 4)]
+    } for i in range(rows)]
+
+
+def build_audit_records(rows):
+    """構造審計記錄列表，包含未預先格式化的 datetime 和 Decimal"""
+    start = datetime(2024, 1, 1, 8, 30)
+    return [{
+        'edit_id': i,
+        'admin_id': 1,
+        'edit_type': 'UPDATE',
+        'edit_module': i % 10,
+        'edit_date': start + timedelta(minutes=i),
+        'edit_content': {'paper_id': i, 'paper_title_zh': '更新後的標題', 'score': Decimal('4.50')}
+    } for i in range(rows)]
+
+
+def bench(provider, payload, repeat):
+    """返回單次編碼的最短耗時（毫秒）及輸出大小（字節）"""
+    encode = lambda: provider.response(payload).get_data()
+    best = min(timeit.repeat(encode, number=1, repeat=repeat))
+    return best * 1000, len(encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON 序列化微基準測試')
+    parser.add_argument('--rows', type=int, default=500, help='每個列表的行數')
+    parser.add_argument('--repeat', type=int, default=30, help='重複次數（取最短耗時）')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = [('flask-default', DefaultJSONProvider(app)), ('std', StdJSONProvider(app))]
+    if orjson is not None:
+        providers.append(('orjson', OrjsonProvider(app)))
+    else:
+        print('orjson 未安裝，僅測試標準庫實現')
+
+    payloads = {
+        'members(all=true)': success_response({'items': build_members(args.rows), 'total': args.rows, 'all': True}),
+        'papers(all=true)': success_response({'items': build_papers(args.rows), 'total': args.rows, 'all': True}),
+        'edit-records': success_response({'items': build_audit_records(args.rows), 'total': args.rows}),
+    }
+
+    with app.app_context():
+        for name, payload in payloads.items():
+            # 校驗 std 與 orjson 輸出內容一致
+            outputs = [json.loads(p.response(payload).get_data()) for label, p in providers if label != 'flask-default']
+            assert all(output == outputs[0] for output in outputs), f'{name}: 輸出不一致'
+
+            print(f'\n{name} ({args.rows} 行)')
+            baseline = None
+            for label, provider in providers:
+                elapsed, size = bench(provider, payload, args.repeat)
+                baseline = baseline or elapsed
+                print(f'  {label:<14} {elapsed:8.2f} ms  {size / 1024:8.1f} KiB  x{baseline / elapsed:5.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+站內搜索倒排索引延遲基準測試
+
+按 Zipf 分佈生成詞彙的文檔構建 app.utils.search_index.InvertedIndex，報告構建耗時、
+典型查詢的 p50 / p95 延遲及單篇文檔替換的平均延遲
+
+使用方法:
+    python scripts/development/benchmark_search_index.py
+    python scripts/development/benchmark_search_index.py --documents 200000 --repeat 50
+"""
+
+import argparse
+import random
+import sys
+import time
+from itertools import accumulate
+from pathlib import Path
+
+# 添加項目根目錄到路徑
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.utils.fulltext import parse_terms
+from app.utils.search_index import Document, InvertedIndex
+
+QUERIES = [
+    ('w1234', '低頻詞'),
+    (chr(0x4e00 + 10) + chr(0x4e00 + 11), '中文二元組'),
+    ('learn', '英文前綴'),
+    ('w0 w1', '高頻詞交集（命中近九成文檔）'),
+    ('w2', '前綴展開多個高頻詞'),
+]
+
+
+def build_documents(count, seed=42):
+    """按 Zipf 分佈生成中英文混合的文檔"""
+    rng = random.Random(seed)
+    words = [f'w{i}' for i in range(20_000)] + ['learning', 'network', 'robot', 'segmentation']
+    chars = [chr(0x4e00 + i) for i in range(3_000)]
+    word_weights = list(accumulate(1 / (rank + 1) for rank in range(len(words))))
+    char_weights = list(accumulate(1 / (rank + 1) for rank in range(len(chars))))
+    modules = ['member', 'paper', 'news', 'project', 'research_group', 'resource']
+
+    def make(i):
+        title_zh = ''.join(rng.choices(chars, cum_weights=char_weights, k=10))
+        title_en = ' '.join(rng.choices(words, cum_weights=word_weights, k=8))
+        body = ' '.join(rng.choices(words, cum_weights=word_weights, k=30)) + ' ' + \
+            ''.join(rng.choices(chars, cum_weights=char_weights, k=40))
+        return Document(modules[i % len(modules)], i, title_zh, title_en,
+                        [(title_zh, 3.0), (title_en, 3.0), (body, 1.0)])
+
+    return [make(i) for i in range(count)]
+
+
+def latencies(func, repeat):
+    """返回 (p50, p95) 毫秒"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[max(int(len(timings) * 0.95) - 1, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='站內搜索倒排索引延遲基準測試')
+    parser.add_argument('--documents', type=int, default=100_000, help='文檔數')
+    parser.add_argument('--repeat', type=int, default=30, help='每個查詢的重複次數')
+    parser.add_argument('--updates', type=int, default=1000, help='增量更新的文檔數')
+    args = parser.parse_args()
+
+    documents = build_documents(args.documents)
+    index = InvertedIndex()
+    started = time.perf_counter()
+    index.add_many(documents)
+    print(f'構建 {len(index)} 篇文檔的索引用時 {time.perf_counter() - started:.1f}s')
+
+    print(f'{"query":<12} {"matched":>8} {"p50":>10} {"p95":>10}  說明')
+    for q, label in QUERIES:
+        terms = parse_terms(q)
+        _, counts = index.search(terms, limit=20)
+        p50, p95 = latencies(lambda: index.search(terms, limit=20), args.repeat)
+        print(f'{q!r:<12} {sum(counts.values()):>8} {p50:8.2f}ms {p95:8.2f}ms  {label}')
+
+    updates = documents[:args.updates]
+    started = time.perf_counter()
+    for document in updates:
+        index.add(document)
+    print(f'單篇文檔替換平均 {(time.perf_counter() - started) * 1000 / max(len(updates), 1):.3f}ms')
+
+
+if __name__ == '__main__':
+    main()
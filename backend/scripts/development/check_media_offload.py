@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+媒體文件代理發送（MEDIA_OFFLOAD）檢查
+
+直接請求後端時檢查響應是否只帶 X-Accel-Redirect / X-Sendfile 頭而沒有文件內容；
+經前端代理請求時檢查代理是否按轉發頭返回了完整文件及分段內容
+
+使用方法:
+    # 後端（MEDIA_OFFLOAD=x-accel）
+    python scripts/development/check_media_offload.py http://localhost:8000 /api/media/serve/paper/202401/xxx.pdf --backend
+    # 前端 nginx
+    python scripts/development/check_media_offload.py http://localhost:3000 /api/media/serve/paper/202401/xxx.pdf
+"""
+
+import argparse
+import sys
+import urllib.error
+import urllib.request
+
+OFFLOAD_HEADERS = ('X-Accel-Redirect', 'X-Sendfile')
+
+
+def fetch(url, headers=None):
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def check_backend(url):
+    """後端應返回空響應體及轉發頭"""
+    status, headers, body = fetch(url)
+    offload = {name: headers[name] for name in OFFLOAD_HEADERS if headers.get(name)}
+    print(f'status={status} body={len(body)} bytes offload={offload}')
+    print(f'Content-Type: {headers.get("Content-Type")}')
+    print(f'Cache-Control: {headers.get("Cache-Control")}')
+    return status == 200 and len(offload) == 1 and not body
+
+
+def check_proxy(url):
+    """代理應去掉轉發頭，返回文件內容並支持 Range"""
+    status, headers, body = fetch(url)
+    leaked = [name for name in OFFLOAD_HEADERS if headers.get(name)]
+    print(f'status={status} body={len(body)} bytes leaked_headers={leaked}')
+    print(f'Cache-Control: {headers.get("Cache-Control")}')
+
+    range_status, range_headers, range_body = fetch(url, {'Range': 'bytes=0-99'})
+    print(f'range status={range_status} body={len(range_body)} bytes '
+          f'Content-Range={range_headers.get("Content-Range")}')
+    return status == 200 and bool(body) and not leaked and range_status == 206 and range_body == body[:100]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='媒體文件代理發送檢查')
+    parser.add_argument('base_url', help='服務地址，如 http://localhost:8000')
+    parser.add_argument('path', help='媒體文件 URL 路徑，如 /api/media/serve/paper/202401/xxx.pdf')
+    parser.add_argument('--backend', action='store_true', help='直接請求後端，檢查轉發頭')
+    args = parser.parse_args()
+
+    url = args.base_url.rstrip('/') + args.path
+    ok = check_backend(url) if args.backend else check_proxy(url)
+    print('OK' if ok else 'FAILED')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
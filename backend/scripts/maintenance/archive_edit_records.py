@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+歸檔過期的審計記錄
+
+把早於保留期（AUDIT_RETENTION_DAYS）的 edit_records 按日期分區移到 AUDIT_ARCHIVE_DIR，
+可由 cron 等每天執行；中斷後重新執行會從剩餘的記錄繼續，不重複歸檔。
+
+使用方法:
+    python scripts/maintenance/archive_edit_records.py [--retention-days 365]
+        [--batch-size 1000] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_app
+from app.utils import audit_archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description='歸檔過期的審計記錄')
+    parser.add_argument('--retention-days', type=int, default=None, help='保留天數，默認 AUDIT_RETENTION_DAYS')
+    parser.add_argument('--batch-size', type=int, default=None, help='每批處理的記錄數')
+    parser.add_argument('--dry-run', action='store_true', help='只統計待歸檔的記錄')
+    args = parser.parse_args()
+
+    app = create_app(os.environ.get('FLASK_CONFIG', 'production'))
+    with app.app_context():
+        report = audit_archive.archive(args.retention_days, args.batch_size, dry_run=args.dry_run)
+        stats = audit_archive.stats()
+    if report['cutoff'] is None:
+        print('保留天數不大於 0，未歸檔')
+        return
+    if args.dry_run:
+        print(f'{report["cutoff"]} 之前的記錄 {report["archived"]} 條待歸檔')
+        return
+    print(f'歸檔 {report["cutoff"]} 之前的記錄 {report["archived"]} 條（{report["partitions"]} 個分區，'
+          f'跳過已歸檔 {report["skipped"]} 條），用時 {report["elapsed_seconds"]} 秒')
+    print(f'歸檔共 {stats["partitions"]} 個分區、{stats["records"]} 條記錄、{stats["bytes"]} 字節')
+
+
+if __name__ == '__main__':
+    main()
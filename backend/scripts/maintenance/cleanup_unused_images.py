@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+清理未使用的描述圖片
+
+分批刪除上傳後一直未被任何描述字段使用的圖片記錄及文件，可由 cron 等定時執行；
+中斷後重新執行會從剩餘的記錄繼續。
+
+使用方法:
+    python scripts/maintenance/cleanup_unused_images.py [--older-than-hours 24]
+        [--batch-size 500] [--workers 8]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_app
+from app.services.image_upload_service import ImageUploadService, CLEANUP_BATCH_SIZE, CLEANUP_WORKERS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='清理未使用的描述圖片')
+    parser.add_argument('--older-than-hours', type=int, default=24, help='清理多少小時前上傳的未使用圖片')
+    parser.add_argument('--batch-size', type=int, default=CLEANUP_BATCH_SIZE, help='每批處理的記錄數')
+    parser.add_argument('--workers', type=int, default=CLEANUP_WORKERS, help='刪除文件的線程數')
+    args = parser.parse_args()
+
+    app = create_app(os.environ.get('FLASK_CONFIG', 'production'))
+    with app.app_context():
+        result = ImageUploadService().cleanup_unused_images(args.older_than_hours, args.batch_size, args.workers)
+    print(f'刪除 {result["deleted_count"]} 條記錄、{result["removed_files"]} 個文件，'
+          f'文件刪除失敗 {len(result["failed_files"])} 個')
+
+
+if __name__ == '__main__':
+    main()
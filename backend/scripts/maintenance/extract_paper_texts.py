@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+提取論文 PDF 的文本
+
+論文文件變更時會自動提取文本；本腳本用於升級後為已有論文補充提取，
+以及處理工作進程退出時遺留的 pending 記錄。文件內容未變的論文不會重新解析。
+
+使用方法:
+    python scripts/maintenance/extract_paper_texts.py [--include-failed]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_app
+from app.utils.pdf_text import extract_missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description='提取論文 PDF 的文本')
+    parser.add_argument('--include-failed', action='store_true', help='同時重試提取失敗的論文')
+    args = parser.parse_args()
+
+    app = create_app(os.environ.get('FLASK_CONFIG', 'production'))
+    with app.app_context():
+        count = extract_missing(include_failed=args.include_failed)
+    print(f'處理了 {count} 篇論文')
+
+
+if __name__ == '__main__':
+    main()
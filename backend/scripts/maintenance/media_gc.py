@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+媒體文件與數據庫引用的對賬
+
+報告沒有被任何記錄引用的孤兒文件，以及引用了不存在文件的記錄（見 app.utils.media_gc）。
+默認只報告；delete 刪除孤兒文件及其衍生圖，quarantine 把孤兒文件移到 _quarantine/<時間>/ 下。
+只被軟刪除記錄引用的文件默認保留，--purge-soft-deleted 時一併處理。
+
+使用方法:
+    python scripts/maintenance/media_gc.py [--mode dry-run|delete|quarantine]
+        [--min-age-minutes 60] [--purge-soft-deleted] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_app
+from app.utils.media_gc import MODES, collect_garbage
+
+
+def main():
+    parser = argparse.ArgumentParser(description='媒體文件與數據庫引用的對賬')
+    parser.add_argument('--mode', choices=MODES, default='dry-run', help='處理孤兒文件的方式')
+    parser.add_argument('--min-age-minutes', type=int, default=60, help='不處理修改時間在此時長內的文件')
+    parser.add_argument('--purge-soft-deleted', action='store_true', help='只被軟刪除記錄引用的文件作為孤兒處理')
+    parser.add_argument('--json', action='store_true', help='輸出完整的 JSON 報告')
+    args = parser.parse_args()
+
+    app = create_app(os.environ.get('FLASK_CONFIG', 'production'))
+    with app.app_context():
+        report = collect_garbage(args.mode, args.min_age_minutes, args.purge_soft_deleted)
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2, default=str))
+        return
+    for path in report['orphaned']['paths']:
+        print(f'孤兒文件: {path}')
+    for reference in report['dangling']['references']:
+        print(f'文件不存在: {reference["path"]} ({reference["table"]}.{reference["column"]} = {reference["id"]})')
+    print(f'掃描 {report["scanned_files"]} 個文件（{report["scan_seconds"]} 秒），'
+          f'引用路徑 {report["referenced_paths"]} 個，跳過近期文件 {report["skipped_recent"]} 個')
+    print(f'孤兒文件 {report["orphaned"]["count"]} 個（{report["orphaned"]["bytes"]} 字節），'
+          f'只被軟刪除記錄引用 {report["soft_deleted"]["count"]} 個，缺失文件的引用 {report["dangling"]["count"]} 個')
+    if args.mode != 'dry-run':
+        print(f'{args.mode}: 處理 {report["removed"]} 個，失敗 {len(report["failed"])} 個')
+    print(f'耗時 {report["elapsed_seconds"]} 秒')
+
+
+if __name__ == '__main__':
+    main()
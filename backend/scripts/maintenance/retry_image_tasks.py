@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+重新處理遺留的上傳圖片任務
+
+工作進程在後台處理完成前退出（重啟、崩潰）時，ImageTask 會停留在 pending 狀態，
+原始文件仍在 _pending 目錄下。本腳本在當前進程內同步處理這些任務。
+
+使用方法:
+    python scripts/maintenance/retry_image_tasks.py [--older-than-minutes 10]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app import create_app
+from app.utils.image_pipeline import retry_pending
+
+
+def main():
+    parser = argparse.ArgumentParser(description='重新處理遺留的上傳圖片任務')
+    parser.add_argument('--older-than-minutes', type=int, default=10,
+                        help='只處理創建時間早於此時長的任務（默認 10 分鐘）')
+    args = parser.parse_args()
+
+    app = create_app(os.environ.get('FLASK_CONFIG', 'production'))
+    with app.app_context():
+        count = retry_pending(args.older_than_minutes)
+    print(f'處理了 {count} 個遺留任務')
+
+
+if __name__ == '__main__':
+    main()
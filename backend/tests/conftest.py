@@ -51,6 +51,44 @@ def db_session(app):
         yield db.session
         db.session.rollback()
 
+@pytest.fixture
+def query_counter(app):
+    """統計代碼塊內執行的 SQL 語句數量"""
+    from contextlib import contextmanager
+    from sqlalchemy import event
+    from app import db
+    
+    @contextmanager
+    def _count():
+        statements = []
+        
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', _before_cursor_execute)
+    
+    return _count
+
+@pytest.fixture
+def seeded_news(app):
+    """寫入帶長正文的新聞數據"""
+    from datetime import date
+    from app import db
+    from app.models import News
+    
+    for i in range(3):
+        db.session.add(News(
+            news_type=0, news_title_zh=f'新聞{i}', news_title_en=f'News {i}',
+            news_content_zh='正文' * 5000, news_content_en='body' * 5000,
+            news_date=date(2024, 6, 1 + i), enable=1
+        ))
+    db.session.commit()
+
 # 測試配置
 pytest_plugins = [
     'tests.fixtures.user_fixtures',
@@ -71,4 +109,4 @@ def pytest_configure(config):
     )
     config.addinivalue_line(
         "markers", "service: 標記服務層測試"
-    )
\ No newline at end of file
+    )
@@ -253,4 +253,351 @@ class TestAuditService:
             'project': 6
         }
         
-        assert audit_service.MODULE_MAPPING == expected_mapping
\ No newline at end of file
+        assert audit_service.MODULE_MAPPING == expected_mapping
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_audit_records_cursor_pagination(self, app, audit_service):
+        """測試獲取審計記錄 - 同一時間戳的記錄按 edit_id 穩定翻頁"""
+        from datetime import datetime
+        from app import db
+        from app.models import Admin, EditRecord
+        
+        # Arrange
+        admin = Admin(admin_name='auditor', admin_pass='x', is_super=0, enable=1)
+        db.session.add(admin)
+        db.session.flush()
+        same_time = datetime(2024, 5, 1, 12, 0, 0)
+        for i in range(7):
+            db.session.add(EditRecord(admin_id=admin.admin_id, edit_type='UPDATE', edit_module=3,
+                                      edit_date=same_time if i < 4 else datetime(2024, 5, 2, i)))
+        db.session.commit()
+        expected = [r.edit_id for r in EditRecord.query.order_by(EditRecord.edit_date.desc(), EditRecord.edit_id.desc())]
+        
+        # Act
+        collected = []
+        cursor = ''
+        while True:
+            with app.test_request_context(f'/api/edit-records?cursor={cursor}'):
+                result = audit_service.get_audit_records({'edit_module': 3}, page=1, per_page=3)
+            collected.extend(item['edit_id'] for item in result['items'])
+            if not result['has_next']:
+                break
+            cursor = result['next_cursor']
+        
+        # Assert
+        assert collected == expected
+    
+    @pytest.fixture
+    def write_behind(self, app, tmp_path):
+        """開啟審計記錄寫後緩衝，不啟動後台線程，由測試調用 flush"""
+        from app.utils import audit_journal
+        from app.models import Admin
+        from app import db
+        app.config.update(AUDIT_WRITE_BEHIND=True, AUDIT_JOURNAL_DIR=str(tmp_path), AUDIT_FLUSH_INTERVAL=0,
+                          AUDIT_FLUSH_BATCH_SIZE=2)
+        admin = Admin(admin_name='auditor', admin_pass='x', is_super=0, enable=1)
+        db.session.add(admin)
+        db.session.commit()
+        yield admin.admin_id
+        audit_journal.flush()
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_write_behind_journals_committed_records(self, app, audit_service, write_behind, tmp_path):
+        """測試審計寫後緩衝 - 提交的記錄寫入日誌後批量插入，回滾的記錄不寫入"""
+        # Arrange
+        from app import db
+        from app.models import EditRecord
+        from app.utils import audit_journal
+        
+        # Act
+        for i in range(3):
+            audit_service.log_operation('member', 'UPDATE', {'mem_id': i}, admin_id=write_behind)
+            db.session.commit()
+        audit_service.log_operation('member', 'DELETE', {'mem_id': 9}, admin_id=write_behind)
+        db.session.rollback()
+        journaled = EditRecord.query.count()
+        before = audit_journal.metrics()
+        flushed = audit_journal.flush()
+        after = audit_journal.metrics()
+        
+        # Assert
+        assert journaled == 0
+        assert before['backlog_records'] == 3
+        assert before['flush_lag_seconds'] >= 0
+        assert flushed == 3
+        assert after['backlog_records'] == 0
+        assert [record.get_content()['mem_id'] for record in EditRecord.query.order_by(EditRecord.edit_id)] == [0, 1, 2]
+        assert not list(tmp_path.glob('segment-*.jsonl'))
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_write_behind_replays_orphaned_journal(self, app, write_behind, tmp_path):
+        """測試審計寫後緩衝 - 重放崩潰遺留的日誌段，跳過已寫入的記錄、寫了一半的行和無法插入的記錄"""
+        # Arrange
+        import json
+        from datetime import datetime
+        from app import db
+        from app.models import EditRecord
+        from app.utils import audit_journal
+        written = datetime(2024, 5, 1, 12, 0, 0, 123456)
+        db.session.add(EditRecord(admin_id=write_behind, edit_type='UPDATE', edit_module=3, edit_date=written))
+        db.session.commit()
+        rows = [
+            {'admin_id': write_behind, 'edit_type': 'UPDATE', 'edit_module': 3, 'edit_content': None,
+             'edit_date': written.isoformat()},
+            {'admin_id': write_behind, 'edit_type': 'CREATE', 'edit_module': 4, 'edit_content': '{"paper_id": 1}',
+             'edit_date': '2024-05-01T12:00:01'},
+            {'admin_id': None, 'edit_type': 'LOGIN', 'edit_module': 0, 'edit_content': None,
+             'edit_date': '2024-05-01T12:00:02'},
+        ]
+        segment = tmp_path / 'segment-99999-1-1.jsonl'
+        segment.write_text(''.join(json.dumps(row) + '\n' for row in rows) + '{"admin_id": 1, "edit', encoding='utf-8')
+        
+        # Act
+        recovered = audit_journal.recover()
+        
+        # Assert
+        assert recovered == 1
+        assert EditRecord.query.count() == 2
+        assert EditRecord.query.filter_by(edit_module=4).one().get_content() == {'paper_id': 1}
+        assert not segment.exists()
+        assert len((tmp_path / audit_journal.REJECTED_FILE).read_text(encoding='utf-8').splitlines()) == 1
+        assert app.test_client().get('/api/edit-records/journal').status_code == 401
+    
+    @pytest.fixture
+    def second_precision_dates(self, app):
+        """模擬 MySQL DATETIME：插入 edit_records 的時間只保存到秒"""
+        from sqlalchemy import text
+        from app import db
+        db.session.execute(text(
+            'CREATE TRIGGER truncate_edit_date AFTER INSERT ON edit_records BEGIN '
+            'UPDATE edit_records SET edit_date = substr(NEW.edit_date, 1, 19) WHERE edit_id = NEW.edit_id; END'
+        ))
+        db.session.commit()
+        yield
+        db.session.execute(text('DROP TRIGGER IF EXISTS truncate_edit_date'))
+        db.session.commit()
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_write_behind_replay_dedupes_by_journal_id(self, app, write_behind, second_precision_dates, tmp_path):
+        """測試審計寫後緩衝 - 數據庫時間只保存到秒時，重放寫了一部分的日誌段不重複插入，同一秒內的記錄不誤判為重複"""
+        # Arrange
+        import json
+        from app.models import EditRecord
+        from app.utils import audit_journal
+        rows = [audit_journal.make_row(write_behind, 'UPDATE', 3, json.dumps({'mem_id': i})) for i in range(3)]
+        segment = tmp_path / 'segment-99999-1-1.jsonl'
+        segment.write_text(''.join(json.dumps(row) + '\n' for row in rows), encoding='utf-8')
+        audit_journal._insert_batch(str(tmp_path), rows[:1], dedupe=False)
+    
+        # Act
+        recovered = audit_journal.recover()
+    
+        # Assert
+        assert recovered == 2
+        assert [record.get_content()['mem_id'] for record in EditRecord.query.order_by(EditRecord.edit_id)] == [0, 1, 2]
+        assert all(record.edit_date.microsecond == 0 for record in EditRecord.query)
+        assert not segment.exists()
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_audit_content_stored_compact(self, app, audit_service):
+        """測試審計內容緊湊存儲 - 長文本存為差異並壓縮，解碼與原內容一致，兼容舊記錄"""
+        # Arrange
+        import json
+        from app import db
+        from app.models import Admin, EditRecord
+        from app.utils import audit_payload
+        admin = Admin(admin_name='auditor', admin_pass='x', is_super=0, enable=1)
+        db.session.add(admin)
+        db.session.commit()
+        old_desc = ' '.join(f'word{i % 97}' for i in range(8000))
+        new_desc = old_desc.replace('word13 word14', 'edited text', 3)
+        changes = {'mem_desc_zh': {'old': old_desc, 'new': new_desc}, 'mem_type': {'old': 0, 'new': 1}}
+        content = {
+            'member_id': 1, 'changes': changes, 'changed_fields': list(changes), 'change_count': 2,
+            'operation_details': {'before_update': {k: v['old'] for k, v in changes.items()},
+                                  'after_update': {k: v['new'] for k, v in changes.items()}}
+        }
+        legacy = EditRecord(admin_id=admin.admin_id, edit_type='UPDATE', edit_module=3,
+                            edit_content=json.dumps(content, ensure_ascii=False))
+        db.session.add(legacy)
+        
+        # Act
+        audit_service.log_operation('member', 'UPDATE', content, admin_id=admin.admin_id)
+        audit_service.log_operation('admin', 'LOGIN', {'admin_id': admin.admin_id}, admin_id=admin.admin_id)
+        db.session.commit()
+        db.session.expire_all()
+        compact, login = EditRecord.query.filter(EditRecord.edit_id != legacy.edit_id).order_by(EditRecord.edit_id)
+        
+        # Assert
+        assert compact.edit_content.startswith(audit_payload.COMPRESSED_PREFIX)
+        assert len(compact.edit_content) * 20 < len(legacy.edit_content)
+        assert compact.get_content() == content
+        assert legacy.get_content() == content
+        assert login.edit_content == json.dumps({'admin_id': admin.admin_id})
+        assert audit_payload.apply_delta(new_desc, audit_payload.make_delta(new_desc, old_desc)) == old_desc
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_audit_records_summary_projection(self, app, audit_service, query_counter):
+        """測試審計記錄列表 - 返回摘要投影，100 條記錄兩條查詢且不解碼內容，詳情返回完整內容"""
+        # Arrange
+        from app import db
+        from app.models import Admin
+        admin = Admin(admin_name='auditor', admin_pass='x', is_super=0, enable=1)
+        db.session.add(admin)
+        db.session.commit()
+        for i in range(100):
+            audit_service.log_operation('member', 'UPDATE', {
+                'member_id': i, 'member_name': f'成員 {i}', 'changes': {'mem_email': {'old': 'a', 'new': 'b'}},
+                'changed_fields': ['mem_email'], 'change_count': 1
+            }, admin_id=admin.admin_id)
+        db.session.commit()
+        db.session.expire_all()
+        
+        # Act
+        with patch('app.utils.audit_payload.decode') as mock_decode, query_counter() as statements:
+            result = audit_service.get_audit_records({'edit_module': 3}, page=1, per_page=100)
+        detail = audit_service.get_audit_record(result['items'][0]['edit_id'])
+        
+        # Assert
+        assert len(statements) == 2
+        mock_decode.assert_not_called()
+        assert result['total'] == 100
+        first = result['items'][0]
+        assert set(first) == {'edit_id', 'admin_id', 'admin_name', 'edit_type', 'edit_module', 'edit_date',
+                              'edit_summary'}
+        assert first['admin_name'] == 'auditor'
+        assert first['edit_summary'] == '成員 99 · #99 · changed: mem_email'
+        assert first['edit_date'].endswith('+00:00')
+        assert detail['edit_content']['member_id'] == 99
+        assert detail['edit_summary'] == first['edit_summary']
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_archived_records_queried_with_hot_table(self, app, audit_service, tmp_path):
+        """測試審計記錄歸檔 - 過期記錄移到分區文件，列表、游標分頁和詳情透明合併，中斷後重新歸檔不重複"""
+        # Arrange
+        from datetime import datetime, timedelta
+        from app import db
+        from app.models import Admin, EditRecord
+        from app.utils import audit_archive
+        app.config['AUDIT_ARCHIVE_DIR'] = str(tmp_path)
+        admin = Admin(admin_name='auditor', admin_pass='x', is_super=0, enable=1)
+        db.session.add(admin)
+        db.session.flush()
+        now = datetime.utcnow()
+        for i in range(9):
+            # 前 6 條過期（分佈在兩天），後 3 條在保留期內
+            edit_date = now - timedelta(days=400 + i // 3, minutes=i) if i < 6 else now - timedelta(minutes=i)
+            record = EditRecord(admin_id=admin.admin_id, edit_type='UPDATE', edit_module=3 if i % 2 else 4,
+                                edit_date=edit_date)
+            record.set_content({'member_id': i, 'member_name': f'成員 {i}'})
+            db.session.add(record)
+        db.session.commit()
+        dates = {record.edit_id: record.edit_date for record in EditRecord.query}
+        archived_id = min(dates)
+        
+        # Act
+        report = audit_archive.archive(retention_days=30, batch_size=4)
+        segment = next(tmp_path.rglob('*' + audit_archive.SEGMENT_SUFFIX))
+        with open(segment, 'ab') as file:
+            file.write(b'\x1f\x8b partial member')  # 模擬追加時中斷
+        late = EditRecord(admin_id=admin.admin_id, edit_type='DELETE', edit_module=3,
+                          edit_date=now - timedelta(days=400, minutes=30))
+        db.session.add(late)
+        db.session.commit()
+        dates[late.edit_id] = late.edit_date
+        rerun = audit_archive.archive(retention_days=30)
+        expected = sorted(dates, key=lambda edit_id: (dates[edit_id], edit_id), reverse=True)
+        pages = [audit_service.get_audit_records({}, page=page, per_page=4) for page in (1, 2, 3)]
+        collected, cursor = [], ''
+        while True:
+            with app.test_request_context(f'/api/edit-records?cursor={cursor}'):
+                result = audit_service.get_audit_records({}, page=1, per_page=4)
+            collected.extend(item['edit_id'] for item in result['items'])
+            if not result['has_next']:
+                break
+            cursor = result['next_cursor']
+        with app.test_request_context(f'/api/edit-records?cursor={result["prev_cursor"]}'):
+            previous = audit_service.get_audit_records({}, page=1, per_page=4)
+        module_total = audit_service.get_audit_records({'edit_module': 3}, page=1, per_page=2)['total']
+        detail = audit_service.get_audit_record(archived_id)
+        
+        # Assert
+        assert report['archived'] == 6 and report['partitions'] == 2 and report['batches'] == 2
+        assert rerun['archived'] == 1
+        assert EditRecord.query.count() == 3
+        assert [item['edit_id'] for page in pages for item in page['items']] == expected
+        assert pages[0]['total'] == 10 and pages[2]['has_next'] is False
+        assert pages[1]['items'][0]['admin_name'] == 'auditor'
+        assert collected == expected
+        assert [item['edit_id'] for item in previous['items']] == expected[4:8]
+        assert module_total == 5
+        assert detail['archived'] is True
+        assert detail['edit_content'] == {'member_id': 0, 'member_name': '成員 0'}
+        assert detail['admin']['admin_name'] == 'auditor'
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_entity_history_from_indexed_references(self, app, audit_service, write_behind, query_counter):
+        """測試對象操作歷史 - 直接寫入、寫後緩衝及創建操作的返回對象都記錄對象引用，歷史含字段級差異"""
+        # Arrange
+        from app import db
+        audit_service.execute_with_audit(lambda: {'admin_id': 42, 'admin_name': 'editor'}, 'CREATE',
+                                         {'admin_name': 'editor'}, admin_id=write_behind)
+        audit_service.log_operation('admin', 'UPDATE', {'admin_id': 43, 'changes': {}}, admin_id=write_behind)
+        db.session.commit()
+        from app.utils import audit_journal
+        audit_journal.flush()
+        app.config['AUDIT_WRITE_BEHIND'] = False
+        audit_service.log_operation('admin', 'UPDATE', {
+            'admin_id': 42, 'changes': {'enable': {'old': 1, 'new': 0}}
+        }, admin_id=write_behind)
+        audit_service.log_operation('member', 'BATCH_DELETE', {'member_ids': [42, 7]}, admin_id=write_behind)
+        db.session.commit()
+        
+        # Act
+        with query_counter() as statements:
+            history = audit_service.get_entity_history('admins', 42, page=1, per_page=10)
+        member_history = audit_service.get_entity_history('members', 7, page=1, per_page=10)
+        endpoint, arguments = app.url_map.bind('localhost').match('/api/members/7/history')
+        
+        # Assert
+        assert len(statements) == 2
+        assert [(item['edit_type'], item['changes']) for item in history['items']] == [
+            ('UPDATE', [{'field': 'enable', 'old': 1, 'new': 0}]),
+            ('CREATE', [{'field': 'admin_name', 'old': None, 'new': 'editor'}])
+        ]
+        assert history['items'][0]['admin_name'] == 'auditor'
+        assert [item['edit_type'] for item in member_history['items']] == ['BATCH_DELETE']
+        assert endpoint == 'edit_record.get_entity_history' and arguments == {'entity': 'members', 'entity_id': 7}
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_write_behind_entities_with_second_precision_dates(self, app, audit_service, write_behind,
+                                                              second_precision_dates, tmp_path):
+        """測試審計寫後緩衝 - 數據庫時間只保存到秒時，同一秒內的記錄都寫入操作對象引用"""
+        # Arrange
+        from app import db
+        from app.utils import audit_journal
+        errors = audit_journal.metrics()['flush_errors']
+        
+        # Act
+        for value in range(3):
+            audit_service.log_operation('admin', 'UPDATE', {
+                'admin_id': write_behind, 'changes': {'enable': {'old': value, 'new': value + 1}}
+            }, admin_id=write_behind)
+            db.session.commit()
+        flushed = audit_journal.flush()
+        history = audit_service.get_entity_history('admins', write_behind, page=1, per_page=10)
+        
+        # Assert
+        assert flushed == 3
+        assert audit_journal.metrics()['flush_errors'] == errors
+        assert [item['changes'][0]['new'] for item in history['items']] == [3, 2, 1]
+        assert not list(tmp_path.glob('segment-*.jsonl'))
@@ -0,0 +1,73 @@
+"""
+HTTP 緩存測試用例
+測試公開列表接口的弱 ETag、條件請求及緩存相關響應頭
+"""
+
+import pytest
+from app.models.news import News
+
+
+class TestHttpCache:
+    """公開 GET 接口 HTTP 緩存測試"""
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_news_list_conditional_get(self, app, seeded_news, query_counter):
+        """測試新聞列表接口 - 弱 ETag 命中時返回 304，不查詢新聞數據"""
+        # Arrange
+        client = app.test_client()
+        first = client.get('/api/news?per_page=2&page=1')
+        etag = first.headers['ETag']
+        
+        # Act
+        with query_counter() as statements:
+            not_modified = client.get('/api/news?page=1&per_page=2', headers={'If-None-Match': etag})
+        other_query = client.get('/api/news?per_page=3', headers={'If-None-Match': etag})
+        
+        # Assert
+        assert first.status_code == 200
+        assert etag.startswith('W/"')
+        assert first.headers['Cache-Control'] == 'public, max-age=0, s-maxage=60'
+        assert first.headers['Surrogate-Key'] == 'news'
+        assert 'Authorization' in first.headers['Vary']
+        assert not_modified.status_code == 304
+        assert not_modified.data == b''
+        assert len(statements) == 1
+        assert other_query.status_code == 200
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_news_list_etag_changes_after_update(self, app, seeded_news):
+        """測試新聞列表接口 - 數據變更或刪除後 ETag 失效"""
+        # Arrange
+        from app import db
+        client = app.test_client()
+        etag = client.get('/api/news').headers['ETag']
+        
+        # Act
+        news = News.query.first()
+        news.news_title_zh = '已修改'
+        db.session.commit()
+        after_update = client.get('/api/news', headers={'If-None-Match': etag})
+        
+        db.session.delete(news)
+        db.session.commit()
+        after_delete = client.get('/api/news', headers={'If-None-Match': after_update.headers['ETag']})
+        
+        # Assert
+        assert after_update.status_code == 200
+        assert after_update.headers['ETag'] != etag
+        assert after_delete.status_code == 200
+        assert after_delete.headers['ETag'] != after_update.headers['ETag']
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_news_list_skips_http_cache_for_admin(self, app, seeded_news):
+        """測試新聞列表接口 - 帶令牌的請求不參與 HTTP 緩存"""
+        # Act
+        response = app.test_client().get('/api/news', headers={'Authorization': 'Bearer invalid'})
+        
+        # Assert
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers
+        assert 'Surrogate-Key' not in response.headers
@@ -0,0 +1,171 @@
+"""
+ImageUploadService 測試用例
+測試描述字段圖片上傳管理相關的服務層邏輯
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from app.services.image_upload_service import ImageUploadService
+from app.models import UploadedImage, Lab, MediaObject
+
+
+class TestImageUploadService:
+    """圖片上傳管理服務層測試"""
+    
+    @pytest.fixture
+    def image_upload_service(self, app, tmp_path):
+        """創建圖片上傳管理服務實例，使用臨時上傳目錄"""
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        return ImageUploadService()
+    
+    @pytest.fixture
+    def stored_image(self, app, tmp_path):
+        """在描述圖片目錄中寫入文件並創建上傳記錄"""
+        from app import db
+        
+        def _create(name, is_used=False, hours_ago=48):
+            file_path = f'/media/description_image/{name[:2]}/{name}.png'
+            path = tmp_path / file_path[len('/media/'):]
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(name.encode())
+            image = UploadedImage(
+                filename=f'{name}.png', file_path=file_path, file_url=f'/api/media/serve{file_path}',
+                file_size=len(name), mime_type='image/png', is_used=is_used,
+                created_at=datetime.utcnow() - timedelta(hours=hours_ago)
+            )
+            db.session.add(image)
+            db.session.add(MediaObject(file_path=file_path, sha256=name.ljust(64, '0'), file_type='description_image',
+                                       size=len(name), upload_count=1, store_ms=0,
+                                       created_at=image.created_at, last_uploaded_at=image.created_at))
+            db.session.commit()
+            return path
+        return _create
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_cleanup_unused_images_in_batches(self, app, image_upload_service, stored_image):
+        """測試清理未使用圖片 - 分批刪除記錄和文件，保留已使用、近期及仍被其他字段引用的文件"""
+        # Arrange
+        from app import db
+        unused = [stored_image(f'de{i:02d}') for i in range(5)]
+        used = stored_image('used', is_used=True)
+        recent = stored_image('recent', hours_ago=1)
+        shared = stored_image('shared')
+        db.session.add(Lab(lab_zh='實驗室', lab_en='Lab', lab_logo_path='/media/description_image/sh/shared.png'))
+        db.session.commit()
+        
+        # Act
+        result = image_upload_service.cleanup_unused_images(24, batch_size=2, workers=2)
+        
+        # Assert
+        assert result['deleted_count'] == 6
+        assert result['removed_files'] == 5
+        assert result['failed_files'] == []
+        assert not any(path.exists() for path in unused)
+        assert used.exists() and recent.exists() and shared.exists()
+        assert {image.filename for image in UploadedImage.query.all()} == {'used.png', 'recent.png'}
+        released = {obj.file_path.rsplit('/', 1)[1] for obj in MediaObject.query.filter(
+            MediaObject.released_at.isnot(None))}
+        assert released == {f'de{i:02d}.png' for i in range(5)}
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_cleanup_unused_images_resumes_after_interruption(self, app, image_upload_service, stored_image):
+        """測試清理未使用圖片 - 中途失敗時已提交的批次保留結果，重新執行處理剩餘記錄"""
+        # Arrange
+        from unittest.mock import patch
+        from app import db
+        paths = [stored_image(f'de{i:02d}') for i in range(4)]
+        calls = []
+        
+        def _interrupted(session, file_paths, **kwargs):
+            calls.append(file_paths)
+            if len(calls) == 2:
+                raise RuntimeError('interrupted')
+            return set()
+        
+        # Act
+        with patch('app.services.image_upload_service.referenced_paths', side_effect=_interrupted):
+            with pytest.raises(RuntimeError):
+                image_upload_service.cleanup_unused_images(24, batch_size=2)
+        db.session.rollback()
+        remaining = UploadedImage.query.count()
+        result = image_upload_service.cleanup_unused_images(24, batch_size=2)
+        
+        # Assert
+        assert remaining == 2
+        assert result['deleted_count'] == 2
+        assert not any(path.exists() for path in paths)
+        assert UploadedImage.query.count() == 0
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_mark_images_as_used_diffs_field_references(self, app, image_upload_service, stored_image):
+        """測試同步圖片使用狀態 - 新引用的標記為已使用，移除的標記為未使用，隨調用方事務回滾"""
+        # Arrange
+        from app import db
+        for name in ('aa01', 'aa02', 'aa03'):
+            stored_image(name)
+        first = '![a](/api/media/serve/description_image/aa/aa01.png?w=800) <img src="/media/description_image/aa/aa02.png">'
+        second = '![c](/api/media/serve/description_image/aa/aa03.png) ![a](/media/description_image/aa/aa01.png)'
+        
+        def _states():
+            return {image.filename: (image.is_used, image.entity_id, image.field_name)
+                    for image in UploadedImage.query.order_by(UploadedImage.filename)}
+        
+        # Act & Assert - 首次保存
+        image_upload_service.mark_images_as_used(first, 'member', 1, 'mem_desc_zh')
+        db.session.commit()
+        assert _states() == {'aa01.png': (True, 1, 'mem_desc_zh'), 'aa02.png': (True, 1, 'mem_desc_zh'),
+                             'aa03.png': (False, None, None)}
+        
+        # Act & Assert - 替換圖片後回滾
+        image_upload_service.mark_images_as_used(second, 'member', 1, 'mem_desc_zh')
+        db.session.rollback()
+        assert _states()['aa02.png'] == (True, 1, 'mem_desc_zh')
+        
+        # Act & Assert - 替換圖片
+        image_upload_service.mark_images_as_used(second, 'member', 1, 'mem_desc_zh')
+        db.session.commit()
+        assert _states() == {'aa01.png': (True, 1, 'mem_desc_zh'), 'aa02.png': (False, 1, 'mem_desc_zh'),
+                             'aa03.png': (True, 1, 'mem_desc_zh')}
+        
+        # Act & Assert - 其他字段的圖片不受影響，清空內容時全部標記為未使用
+        image_upload_service.mark_images_as_used('', 'member', 1, 'mem_desc_en')
+        image_upload_service.mark_images_as_used(None, 'member', 1, 'mem_desc_zh')
+        db.session.commit()
+        assert not any(is_used for is_used, _, _ in _states().values())
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_mark_images_as_used_keeps_image_shared_by_other_field(self, app, image_upload_service, stored_image):
+        """測試同步圖片使用狀態 - 從一個語言的描述中移除、另一個語言仍插入的圖片保持已使用，不被清理"""
+        # Arrange
+        from app import db
+        from app.models import Member
+        path = stored_image('sh01')
+        content = '![a](/api/media/serve/description_image/sh/sh01.png)'
+        member = Member(mem_name_zh='成員', mem_email='shared@example.com', mem_type=0)
+        db.session.add(member)
+        db.session.flush()
+        for field in ('mem_desc_zh', 'mem_desc_en'):
+            setattr(member, field, content)
+            image_upload_service.mark_images_as_used(content, 'member', member.mem_id, field)
+        db.session.commit()
+        
+        # Act
+        member.mem_desc_en = ''
+        image_upload_service.mark_images_as_used('', 'member', member.mem_id, 'mem_desc_en')
+        db.session.commit()
+        kept = UploadedImage.query.one()
+        state = (kept.is_used, kept.field_name)
+        cleaned = image_upload_service.cleanup_unused_images(24)
+        member.mem_desc_zh = '沒有圖片'
+        image_upload_service.mark_images_as_used(member.mem_desc_zh, 'member', member.mem_id, 'mem_desc_zh')
+        db.session.commit()
+        
+        # Assert
+        assert state == (True, 'mem_desc_zh')
+        assert cleaned['deleted_count'] == 0
+        assert path.exists()
+        assert UploadedImage.query.one().is_used is False
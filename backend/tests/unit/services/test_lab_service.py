@@ -55,6 +55,30 @@ class TestLabService:
             assert result == mock_lab_data
             mock_query.filter_by.assert_called_once_with(enable=1)
     
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_lab_info_srcset(self, app, lab_service):
+        """測試獲取實驗室信息 - 圖片字段附帶 srcset，外部鏈接和空值為 None"""
+        # Arrange
+        from app import db
+        db.session.add(Lab(lab_zh='測試實驗室', enable=1,
+                           lab_logo_path='/media/lab_logo/202401/0123456789abcdef0123456789abcdef.png',
+                           carousel_img_1='https://cdn.example.com/banner.jpg'))
+        db.session.commit()
+
+        # Act
+        result = lab_service.get_lab_info()
+
+        # Assert
+        url = '/api/media/serve/lab_logo/202401/0123456789abcdef0123456789abcdef.png'
+        assert result['lab_logo_path_srcset'] == {
+            'src': url,
+            'srcset': ', '.join(f'{url}?w={width}&fmt=webp {width}w'
+                                for width in app.config['MEDIA_SRCSET_WIDTHS'])
+        }
+        assert result['carousel_img_1_srcset'] is None
+        assert result['carousel_img_2_srcset'] is None
+
     @pytest.mark.unit
     @pytest.mark.service
     def test_get_lab_info_not_found(self, lab_service):
@@ -102,4 +102,617 @@ class TestMediaService:
             with pytest.raises(NotFoundError) as exc_info:
                 media_service.serve_file(file_path)
             
-            assert '文件不存在' in str(exc_info.value)
\ No newline at end of file
+            assert '文件不存在' in str(exc_info.value)
+    
+    @pytest.fixture
+    def media_files(self, app, tmp_path):
+        """在臨時上傳目錄中寫入 uuid 命名的 PDF 和固定命名的圖片"""
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        (tmp_path / 'paper' / '202401').mkdir(parents=True)
+        (tmp_path / 'lab_logo').mkdir()
+        pdf = tmp_path / 'paper' / '202401' / '0123456789abcdef0123456789abcdef.pdf'
+        pdf.write_bytes(b'%PDF-1.4\n' + bytes(range(256)) * 40)
+        logo = tmp_path / 'lab_logo' / 'logo.png'
+        logo.write_bytes(b'\x89PNG fake')
+        return {
+            'pdf': '/api/media/serve/paper/202401/0123456789abcdef0123456789abcdef.pdf',
+            'pdf_bytes': pdf.read_bytes(),
+            'logo': '/api/media/serve/lab_logo/logo.png'
+        }
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_serve_file_immutable_cache_headers(self, app, media_files):
+        """測試文件服務 - uuid 命名的文件長期緩存，其他文件每次重新驗證"""
+        # Arrange
+        client = app.test_client()
+        
+        # Act
+        pdf = client.get(media_files['pdf'])
+        logo = client.get(media_files['logo'])
+        
+        # Assert
+        assert pdf.status_code == 200
+        assert pdf.data == media_files['pdf_bytes']
+        assert pdf.headers['Accept-Ranges'] == 'bytes'
+        assert pdf.headers['ETag'] and pdf.headers['Last-Modified']
+        assert pdf.cache_control.immutable
+        assert pdf.cache_control.public
+        assert pdf.cache_control.max_age == app.config['MEDIA_CACHE_MAX_AGE']
+        
+        assert logo.status_code == 200
+        assert not logo.cache_control.immutable
+        assert logo.cache_control.no_cache
+        assert logo.headers['ETag']
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_serve_file_conditional_requests(self, app, media_files):
+        """測試文件服務 - If-None-Match / If-Modified-Since 命中時返回 304"""
+        # Arrange
+        client = app.test_client()
+        first = client.get(media_files['pdf'])
+        
+        # Act
+        by_etag = client.get(media_files['pdf'], headers={'If-None-Match': first.headers['ETag']})
+        by_date = client.get(media_files['pdf'], headers={'If-Modified-Since': first.headers['Last-Modified']})
+        stale = client.get(media_files['pdf'], headers={'If-None-Match': '"other"'})
+        
+        # Assert
+        assert by_etag.status_code == 304
+        assert by_etag.data == b''
+        assert by_date.status_code == 304
+        assert stale.status_code == 200
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_serve_file_range_requests(self, app, media_files):
+        """測試文件服務 - 分段請求返回 206，If-Range 不匹配時返回完整文件，越界返回 416"""
+        # Arrange
+        client = app.test_client()
+        data = media_files['pdf_bytes']
+        etag = client.head(media_files['pdf']).headers['ETag']
+        
+        # Act
+        head = client.get(media_files['pdf'], headers={'Range': 'bytes=0-99'})
+        tail = client.get(media_files['pdf'], headers={'Range': 'bytes=-100'})
+        if_range = client.get(media_files['pdf'], headers={'Range': 'bytes=0-99', 'If-Range': etag})
+        if_range_stale = client.get(media_files['pdf'], headers={'Range': 'bytes=0-99', 'If-Range': '"other"'})
+        out_of_range = client.get(media_files['pdf'], headers={'Range': f'bytes={len(data) + 10}-'})
+        
+        # Assert
+        assert head.status_code == 206
+        assert head.data == data[:100]
+        assert head.headers['Content-Range'] == f'bytes 0-99/{len(data)}'
+        assert head.cache_control.immutable
+        assert tail.status_code == 206
+        assert tail.data == data[-100:]
+        assert if_range.status_code == 206
+        assert if_range_stale.status_code == 200
+        assert if_range_stale.data == data
+        assert out_of_range.status_code == 416
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_serve_file_rejects_invalid_paths(self, app, media_files):
+        """測試文件服務 - 路徑穿越和不存在的文件不返回內容"""
+        # Arrange
+        client = app.test_client()
+        
+        # Act
+        traversal = client.get('/api/media/serve/paper/../../etc/passwd')
+        missing = client.get('/api/media/serve/paper/202401/missing.pdf')
+        
+        # Assert
+        assert traversal.status_code != 200
+        assert missing.status_code == 404
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_serve_file_x_accel_redirect(self, app, media_files):
+        """測試文件服務 - x-accel 模式只返回 X-Accel-Redirect 頭和緩存策略，不發送文件內容"""
+        # Arrange
+        app.config['MEDIA_OFFLOAD'] = 'x-accel'
+        app.config['MEDIA_ACCEL_PREFIX'] = '/protected-media/'
+        client = app.test_client()
+        
+        # Act
+        pdf = client.get(media_files['pdf'], headers={'Range': 'bytes=0-99'})
+        logo = client.get(media_files['logo'])
+        
+        # Assert
+        assert pdf.status_code == 200
+        assert pdf.data == b''
+        assert pdf.headers['X-Accel-Redirect'] == \
+            '/protected-media/paper/202401/0123456789abcdef0123456789abcdef.pdf'
+        assert pdf.mimetype == 'application/pdf'
+        assert 'X-Sendfile' not in pdf.headers
+        assert pdf.cache_control.immutable
+        assert pdf.cache_control.max_age == app.config['MEDIA_CACHE_MAX_AGE']
+        assert logo.headers['X-Accel-Redirect'] == '/protected-media/lab_logo/logo.png'
+        assert logo.cache_control.no_cache
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_serve_file_x_sendfile(self, app, media_files, tmp_path):
+        """測試文件服務 - x-sendfile 模式返回文件的絕對路徑"""
+        # Arrange
+        app.config['MEDIA_OFFLOAD'] = 'x-sendfile'
+        client = app.test_client()
+        
+        # Act
+        response = client.get(media_files['pdf'])
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.data == b''
+        assert response.headers['X-Sendfile'] == \
+            str(tmp_path / 'paper' / '202401' / '0123456789abcdef0123456789abcdef.pdf')
+        assert 'X-Accel-Redirect' not in response.headers
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('offload', ['x-accel', 'x-sendfile'])
+    def test_serve_file_offload_validates_path(self, app, media_files, offload):
+        """測試文件服務 - 交給代理發送前仍校驗路徑，不存在的文件不輸出轉發頭"""
+        # Arrange
+        app.config['MEDIA_OFFLOAD'] = offload
+        client = app.test_client()
+        
+        # Act
+        missing = client.get('/api/media/serve/paper/202401/missing.pdf')
+        traversal = client.get('/api/media/serve/paper/../../etc/passwd')
+        
+        # Assert
+        assert missing.status_code == 404
+        for response in (missing, traversal):
+            assert 'X-Accel-Redirect' not in response.headers
+            assert 'X-Sendfile' not in response.headers
+    
+    @pytest.fixture
+    def media_image(self, app, tmp_path):
+        """在臨時上傳目錄中寫入 uuid 命名的 1600x1000 JPEG"""
+        from PIL import Image
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        directory = tmp_path / 'member_avatar' / '202401'
+        directory.mkdir(parents=True)
+        source = directory / 'fedcba9876543210fedcba9876543210.jpg'
+        Image.new('RGB', (1600, 1000), (200, 30, 30)).save(source, 'JPEG')
+        return {
+            'url': '/api/media/serve/member_avatar/202401/fedcba9876543210fedcba9876543210.jpg',
+            'source': source,
+            'derivatives': directory / '_derivatives' / source.name
+        }
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('query, mimetype, size', [
+        ('w=480', 'image/jpeg', (480, 300)),
+        ('w=480&fmt=webp', 'image/webp', (480, 300)),
+        ('h=256&fmt=jpeg', 'image/jpeg', (410, 256)),
+        ('w=256&h=256&fit=cover&fmt=webp', 'image/webp', (256, 256)),
+        ('w=1920', 'image/jpeg', (1600, 1000)),  # 不放大原圖
+    ])
+    def test_serve_image_derivative(self, app, media_image, query, mimetype, size):
+        """測試文件服務 - 按 w / h / fit / fmt 返回縮放後的衍生圖"""
+        # Arrange
+        import io
+        from PIL import Image
+        client = app.test_client()
+        
+        # Act
+        response = client.get(f"{media_image['url']}?{query}")
+        
+        # Assert
+        assert response.status_code == 200
+        assert response.mimetype == mimetype
+        assert Image.open(io.BytesIO(response.data)).size == size
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == app.config['MEDIA_CACHE_MAX_AGE']
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_serve_image_derivative_cached_on_disk(self, app, media_image):
+        """測試文件服務 - 衍生圖只生成一次，原圖更新後重新生成"""
+        # Arrange
+        import os
+        from app.utils import image_derivatives
+        client = app.test_client()
+        url = f"{media_image['url']}?w=256&fmt=webp"
+        
+        # Act
+        with patch.object(image_derivatives, 'render_derivative', wraps=image_derivatives.render_derivative) as render:
+            first = client.get(url)
+            second = client.get(url)
+            renders_before_update = render.call_count
+            newer = os.stat(media_image['source']).st_mtime + 10
+            os.utime(media_image['source'], (newer, newer))
+            client.get(url)
+        
+        # Assert
+        assert first.data == second.data
+        assert renders_before_update == 1
+        assert render.call_count == 2
+        assert sorted(path.name for path in media_image['derivatives'].iterdir()) == ['w256-h0-contain.webp']
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('query', ['w=500', 'w=abc', 'w=256&fit=fill', 'w=256&fit=cover', 'w=256&fmt=gif', 'fmt=webp'])
+    def test_serve_image_derivative_rejects_invalid_params(self, app, media_image, query):
+        """測試文件服務 - 不在允許範圍內的參數返回 400 且不生成文件"""
+        # Arrange
+        client = app.test_client()
+        
+        # Act
+        response = client.get(f"{media_image['url']}?{query}")
+        
+        # Assert
+        assert response.status_code == 400
+        assert response.get_json()['code'] == 2000
+        assert not media_image['derivatives'].exists()
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_serve_derivative_non_image_and_offload(self, app, media_files, media_image):
+        """測試文件服務 - 非圖片不接受尺寸參數；x-accel 模式轉發到衍生圖路徑"""
+        # Arrange
+        client = app.test_client()
+        
+        # Act
+        pdf = client.get(f"{media_files['pdf']}?w=256")
+        app.config['MEDIA_OFFLOAD'] = 'x-accel'
+        offloaded = client.get(f"{media_image['url']}?w=128&fmt=webp")
+        
+        # Assert
+        assert pdf.status_code == 400
+        assert offloaded.status_code == 200
+        assert offloaded.data == b''
+        assert offloaded.headers['X-Accel-Redirect'] == '/protected-media/member_avatar/202401/_derivatives/' \
+            'fedcba9876543210fedcba9876543210.jpg/w128-h0-contain.webp'
+        assert offloaded.mimetype == 'image/webp'
+        assert (media_image['derivatives'] / 'w128-h0-contain.webp').exists()
+    
+    @pytest.fixture
+    def image_upload(self, app, tmp_path):
+        """臨時上傳目錄及 2400x1200 PNG 上傳文件的構造函數"""
+        import io
+        from PIL import Image
+        from werkzeug.datastructures import FileStorage
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        
+        def make(truncate=False):
+            buffer = io.BytesIO()
+            Image.linear_gradient('L').resize((2400, 1200)).convert('RGB').save(buffer, 'PNG')
+            data = buffer.getvalue()
+            if truncate:
+                data = data[:len(data) // 2]
+            return FileStorage(stream=io.BytesIO(data), filename='photo.png', content_type='image/png')
+        return make
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_upload_image_processed_in_background(self, app, media_service, image_upload, tmp_path):
+        """測試圖片上傳 - 原始文件先寫入 _pending，進程池處理完成後替換並記錄狀態"""
+        # Arrange
+        from PIL import Image
+        from app.utils import image_pipeline
+        app.config['IMAGE_PROCESS_WORKERS'] = 1
+        client = app.test_client()
+        
+        # Act
+        with patch.object(media_service.audit_service, 'log_operation'):
+            result = media_service.upload_file(image_upload(), 'member_avatar')
+        relative = result['path'][len('/media/'):]
+        url = f'/api/media/serve/{relative}'
+        final_path = tmp_path / relative
+        pending_file = tmp_path / image_pipeline.pending_path(relative)
+        served_while_pending = client.get(url)
+        assert image_pipeline.drain(timeout=60)
+        status = media_service.get_processing_status(relative)
+        
+        # Assert
+        assert result['processing_status'] == 'pending'
+        assert served_while_pending.status_code == 200
+        assert served_while_pending.cache_control.no_cache
+        assert not served_while_pending.cache_control.immutable
+        assert status['status'] == 'ready'
+        assert (status['width'], status['height']) == (1920, 960)
+        assert Image.open(final_path).size == (1920, 960)
+        assert not pending_file.exists()
+        assert client.get(url).cache_control.immutable
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_upload_image_background_failure_recorded(self, app, media_service, image_upload):
+        """測試圖片上傳 - 文件頭有效但內容損壞時記錄 failed 狀態"""
+        # Arrange
+        from app.utils import image_pipeline
+        app.config['IMAGE_PROCESS_WORKERS'] = 1
+        
+        # Act
+        with patch.object(media_service.audit_service, 'log_operation'):
+            result = media_service.upload_file(image_upload(truncate=True), 'member_avatar')
+        assert image_pipeline.drain(timeout=60)
+        status = media_service.get_processing_status(result['path'][len('/media/'):])
+        
+        # Assert
+        assert status['status'] == 'failed'
+        assert status['error']
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('workers', [0, 1])
+    def test_save_image_wait_processes_in_request(self, app, image_upload, tmp_path, workers):
+        """測試圖片上傳 - 要求等待或未配置進程池時在請求內完成處理，不寫入處理記錄"""
+        # Arrange
+        from PIL import Image
+        from app.models import ImageTask
+        from app.utils.file_handler import save_file
+        app.config['IMAGE_PROCESS_WORKERS'] = workers
+        
+        # Act
+        with app.test_request_context('/api/media/upload?wait=1', method='POST'):
+            file_path = save_file(image_upload(), 'member_avatar')
+        
+        # Assert
+        assert Image.open(tmp_path / file_path[len('/media/'):]).size == (1920, 960)
+        assert ImageTask.query.count() == 0
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_save_image_rejects_non_image(self, app, image_upload, tmp_path):
+        """測試圖片上傳 - 無法識別的圖片在請求內拒絕，不寫入文件"""
+        # Arrange
+        import io
+        from werkzeug.datastructures import FileStorage
+        from app.utils.file_handler import save_file
+        image_upload()
+        app.config['IMAGE_PROCESS_WORKERS'] = 1
+        fake = FileStorage(stream=io.BytesIO(b'not an image'), filename='photo.png')
+        
+        # Act & Assert
+        with pytest.raises(ValueError):
+            save_file(fake, 'member_avatar')
+        assert not [path for path in tmp_path.rglob('*') if path.is_file()]
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_retry_pending_image_tasks(self, app, image_upload, tmp_path):
+        """測試圖片上傳 - 工作進程退出後遺留的 pending 任務可以重新處理"""
+        # Arrange
+        from datetime import datetime, timedelta
+        from app import db
+        from app.models import ImageTask
+        from app.utils.image_pipeline import pending_path, retry_pending
+        image_upload()
+        source = tmp_path / pending_path('member_avatar/202401/0123456789abcdef0123456789abcdef.png')
+        source.parent.mkdir(parents=True)
+        image_upload().save(str(source))
+        db.session.add_all([
+            ImageTask(file_path='/media/member_avatar/202401/0123456789abcdef0123456789abcdef.png',
+                      created_at=datetime.utcnow() - timedelta(hours=1)),
+            ImageTask(file_path='/media/member_avatar/202401/missing.png',
+                      created_at=datetime.utcnow() - timedelta(hours=1)),
+            ImageTask(file_path='/media/member_avatar/202401/recent.png'),
+        ])
+        db.session.commit()
+        
+        # Act
+        count = retry_pending(older_than_minutes=10)
+        
+        # Assert
+        statuses = {task.file_path.rsplit('/', 1)[1]: task.status for task in ImageTask.query.all()}
+        assert count == 2
+        assert statuses == {'0123456789abcdef0123456789abcdef.png': 'ready', 'missing.png': 'failed',
+                            'recent.png': 'pending'}
+        assert (tmp_path / 'member_avatar' / '202401' / '0123456789abcdef0123456789abcdef.png').exists()
+        assert not source.exists()
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_rolled_back_image_upload_not_treated_as_stored(self, app, image_upload, tmp_path):
+        """測試圖片上傳 - 回滾的上傳刪除 _pending 原始文件；沒有處理任務的遺留原始文件不算作已存儲"""
+        # Arrange
+        import shutil
+        from app import db
+        from app.models import ImageTask
+        from app.utils import image_pipeline
+        from app.utils.file_handler import save_file
+        image_upload()
+        app.config['IMAGE_PROCESS_WORKERS'] = 1
+        
+        # Act - 上傳後事務回滾
+        file_path = save_file(image_upload(), 'image')
+        relative = file_path[len('/media/'):]
+        pending_file = tmp_path / image_pipeline.pending_path(relative)
+        uploaded = pending_file.exists()
+        db.session.rollback()
+        
+        # Assert
+        assert uploaded
+        assert not pending_file.exists()
+        assert ImageTask.query.count() == 0
+        
+        # Act - 崩潰遺留的原始文件沒有處理任務，相同內容重新上傳時重新安排處理
+        save_file(image_upload(), 'image')
+        shutil.copy(pending_file, tmp_path / 'leftover.png')
+        db.session.rollback()
+        shutil.move(tmp_path / 'leftover.png', pending_file)
+        again = save_file(image_upload(), 'image')
+        db.session.commit()
+        assert image_pipeline.drain(timeout=60)
+        
+        # Assert
+        assert again == file_path
+        assert ImageTask.query.filter_by(file_path=file_path).one().status == 'ready'
+        assert (tmp_path / relative).exists()
+        assert not pending_file.exists()
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_upload_same_content_deduplicated(self, app, media_service, image_upload, tmp_path):
+        """測試內容尋址存儲 - 相同內容重複上傳返回同一路徑，只寫入一個文件"""
+        # Arrange
+        import hashlib
+        
+        # Act
+        with patch.object(media_service.audit_service, 'log_operation'):
+            first = media_service.upload_file(image_upload(), 'image')
+            second = media_service.upload_file(image_upload(), 'image')
+        stats = media_service.get_storage_stats()
+        
+        # Assert
+        digest = hashlib.sha256(image_upload().stream.read()).hexdigest()
+        assert first['path'] == second['path'] == f'/media/image/{digest[:2]}/{digest}.png'
+        assert [path.name for path in tmp_path.rglob('*') if path.is_file()] == [f'{digest}.png']
+        assert stats['objects'] == 1
+        assert stats['uploads'] == 2
+        assert stats['dedup_hits'] == 1
+        assert stats['bytes_saved'] == stats['stored_bytes'] == len(image_upload().stream.read())
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_delete_file_unlinks_after_last_reference(self, app, image_upload, tmp_path):
+        """測試內容尋址存儲 - 文件在最後一個引用移除並提交後才刪除，回滾不刪除"""
+        # Arrange
+        from app import db
+        from app.models import Lab, MediaObject
+        from app.utils.file_handler import save_file, delete_file
+        file_path = save_file(image_upload(), 'image')
+        stored = tmp_path / file_path[len('/media/'):]
+        lab = Lab(lab_zh='實驗室', lab_en='Lab', lab_logo_path=file_path, carousel_img_1=file_path)
+        db.session.add(lab)
+        db.session.commit()
+        
+        # Act & Assert - 仍被輪播圖引用
+        lab.lab_logo_path = None
+        delete_file(file_path)
+        db.session.commit()
+        assert stored.exists()
+        
+        # Act & Assert - 事務回滾
+        lab.carousel_img_1 = None
+        delete_file(file_path)
+        db.session.rollback()
+        assert stored.exists()
+        
+        # Act & Assert - 最後一個引用
+        lab.carousel_img_1 = None
+        delete_file(file_path)
+        db.session.commit()
+        assert not stored.exists()
+        assert MediaObject.query.filter_by(file_path=file_path).one().released_at is not None
+        assert app.test_client().get('/api/media/stats').status_code == 401
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_release_keeps_file_reused_by_concurrent_upload(self, app, image_upload, tmp_path):
+        """測試內容尋址存儲 - 釋放最後一個引用時，近期命中去重的文件保留，過了保留時長才刪除"""
+        # Arrange
+        import os
+        from app import db
+        from app.models import Lab, MediaObject
+        from app.utils.file_handler import save_file, delete_file
+        from app.utils.media_store import unlink_stored
+        app.config['MEDIA_RELEASE_GRACE_SECONDS'] = 600
+        file_path = save_file(image_upload(), 'image')
+        stored = tmp_path / file_path[len('/media/'):]
+        lab = Lab(lab_zh='實驗室', lab_en='Lab', lab_logo_path=file_path)
+        db.session.add(lab)
+        db.session.commit()
+        os.utime(stored, (0, 0))
+        
+        # Act - 另一個上傳命中去重，其實體尚未提交時最後一個引用被移除
+        assert save_file(image_upload(), 'image') == file_path
+        lab.lab_logo_path = None
+        delete_file(file_path)
+        db.session.commit()
+        
+        # Assert
+        assert stored.exists()
+        assert MediaObject.query.filter_by(file_path=file_path).one().released_at is None
+        assert unlink_stored(file_path) is False
+        assert stored.exists()
+        
+        # Act & Assert - 過了保留時長
+        os.utime(stored, (0, 0))
+        assert unlink_stored(file_path) is True
+        assert not stored.exists()
+        assert [path.name for path in stored.parent.iterdir()] == []
+    
+    @pytest.fixture
+    def media_tree(self, app, tmp_path):
+        """媒體目錄：被引用、孤兒、只被軟刪除記錄引用的文件及應跳過的目錄"""
+        import os
+        from app import db
+        from app.models import Lab, Member, Resource
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        files = {
+            'lab_logo/logo.png': b'logo',
+            'image/orphan.png': b'orphan-data',
+            'image/_derivatives/orphan.png/w200.webp': b'derivative',
+            'member_avatar/old.png': b'old',
+            '_pending/processing.png': b'pending',
+            '_uploads/abc.part': b'part',
+            'image/.tmp-upload': b'temp',
+        }
+        for relative_path, data in files.items():
+            path = tmp_path / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            os.utime(path, (0, 0))
+        lab = Lab(lab_zh='實驗室', lab_en='Lab', lab_logo_path='/media/lab_logo/logo.png',
+                  carousel_img_1='/media/lab_carousel/missing.png')
+        member = Member(mem_name_zh='舊成員', mem_name_en='Old', mem_email='old@example.com', mem_type=0,
+                        mem_avatar_path='/media/member_avatar/old.png', enable=0)
+        resource = Resource(resource_name_zh='鏈接', resource_name_en='Link', resource_type=0,
+                            resource_image='https://example.com/logo.png')
+        db.session.add_all([lab, member, resource])
+        db.session.commit()
+        return tmp_path
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_media_gc_reports_orphans_and_dangling_references(self, app, media_tree):
+        """測試媒體對賬 - 報告孤兒文件和缺失文件的引用，跳過處理中的目錄、臨時文件和近期文件"""
+        # Arrange
+        from app.utils.media_gc import collect_garbage
+        (media_tree / 'image' / 'recent.png').write_bytes(b'recent')
+        
+        # Act
+        report = collect_garbage()
+        
+        # Assert
+        assert report['scanned_files'] == 3
+        assert report['skipped_recent'] == 1
+        assert report['orphaned']['paths'] == ['image/orphan.png']
+        assert report['orphaned']['bytes'] == len(b'orphan-data')
+        assert report['soft_deleted']['paths'] == ['member_avatar/old.png']
+        assert report['dangling']['count'] == 1
+        assert report['dangling']['references'][0]['path'] == '/media/lab_carousel/missing.png'
+        assert report['dangling']['references'][0]['column'] == 'carousel_img_1'
+        assert report['removed'] == 0
+        assert (media_tree / 'image' / 'orphan.png').exists()
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_media_gc_quarantine_and_delete(self, app, media_tree):
+        """測試媒體對賬 - quarantine 保留相對路徑移走孤兒文件，delete 連同衍生圖刪除，不處理被引用的文件"""
+        # Arrange
+        from app.utils.media_gc import collect_garbage, QUARANTINE_DIR
+        
+        # Act
+        quarantined = collect_garbage('quarantine')
+        purged = collect_garbage('delete', purge_soft_deleted=True)
+        
+        # Assert
+        assert quarantined['removed'] == 1
+        assert [path.read_bytes() for path in (media_tree / QUARANTINE_DIR).rglob('orphan.png')] == [b'orphan-data']
+        assert not (media_tree / 'image' / '_derivatives' / 'orphan.png').exists()
+        assert purged['orphaned']['paths'] == ['member_avatar/old.png']
+        assert purged['removed'] == 1
+        assert not (media_tree / 'member_avatar' / 'old.png').exists()
+        assert (media_tree / 'lab_logo' / 'logo.png').exists()
+        assert (media_tree / '_pending' / 'processing.png').exists()
+        with pytest.raises(ValueError):
+            collect_garbage('purge')
@@ -326,4 +326,162 @@ class TestMemberService:
         
         # Act & Assert
         with pytest.raises(ValidationError):
-            member_service._validate_member_data(invalid_data, is_create=True)
\ No newline at end of file
+            member_service._validate_member_data(invalid_data, is_create=True)
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('admin_request', [False, True])
+    def test_get_members_list_query_budget(self, app, member_service, query_counter, admin_request):
+        """測試獲取成員列表 - 課題組批量加載，SQL 語句數量不隨行數增長"""
+        from app import db
+        from app.models import Lab, ResearchGroup
+        
+        # Arrange
+        lab = Lab(lab_zh='測試實驗室', lab_en='Test Lab', enable=1)
+        db.session.add(lab)
+        db.session.flush()
+        
+        groups = [
+            ResearchGroup(lab_id=lab.lab_id, research_group_name_zh=f'課題組{i}', enable=1)
+            for i in range(5)
+        ]
+        db.session.add_all(groups)
+        db.session.flush()
+        
+        for i in range(50):
+            db.session.add(Member(
+                mem_name_zh=f'成員{i}', mem_name_en=f'Member {i}',
+                mem_email=f'member{i}@example.com', mem_type=1,
+                research_group_id=groups[i % 5].research_group_id,
+                lab_id=lab.lab_id, enable=1
+            ))
+        db.session.commit()
+        db.session.expunge_all()
+        
+        # Act
+        # 公開請求走列投影路徑，管理員請求走 ORM 預加載路徑
+        with app.test_request_context('/api/members?per_page=100'), \
+             patch('app.utils.projection.is_admin_request', return_value=admin_request):
+            with query_counter() as statements:
+                result = member_service.get_members_list({})
+        
+        # Assert - COUNT + 帶 JOIN 的列表查詢
+        assert result['total'] == 50
+        assert all(item['research_group'] for item in result['items'])
+        assert len(statements) <= 2, statements
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_members_list_cursor_pagination_admin(self, app, member_service, query_counter):
+        """測試獲取成員列表 - 管理員請求走 ORM 預加載路徑時游標分頁不重不漏，課題組隨列表查詢 JOIN 取回"""
+        from datetime import datetime
+        from app import db
+        from app.models import Lab, ResearchGroup
+        
+        # Arrange
+        lab = Lab(lab_zh='測試實驗室', lab_en='Test Lab', enable=1)
+        db.session.add(lab)
+        db.session.flush()
+        group = ResearchGroup(lab_id=lab.lab_id, research_group_name_zh='課題組', enable=1)
+        db.session.add(group)
+        db.session.flush()
+        for i in range(12):
+            db.session.add(Member(
+                mem_name_zh=f'成員{i}', mem_email=f'member{i}@example.com', mem_type=1,
+                research_group_id=group.research_group_id, lab_id=lab.lab_id, enable=1,
+                created_at=datetime(2024, 1, 1 + i // 4)
+            ))
+        db.session.commit()
+        expected = [member.mem_id for member in Member.query.order_by(Member.created_at.desc(), Member.mem_id.desc())]
+        db.session.expunge_all()
+        
+        # Act
+        pages, budgets = [], []
+        cursor = ''
+        with patch('app.utils.projection.is_admin_request', return_value=True):
+            while True:
+                with app.test_request_context(f'/api/members?cursor={cursor}&per_page=5'):
+                    with query_counter() as statements:
+                        result = member_service.get_members_list({})
+                pages.append(result['items'])
+                budgets.append(statements)
+                if not result['has_next']:
+                    break
+                cursor = result['next_cursor']
+        
+        # Assert - 每頁一條帶 JOIN 的列表查詢，不執行 COUNT
+        assert [item['mem_id'] for items in pages for item in items] == expected
+        assert all(item['research_group']['research_group_name_zh'] == '課題組' for items in pages for item in items)
+        assert all(len(statements) == 1 for statements in budgets), budgets
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('order', ['desc', 'asc'])
+    def test_get_members_list_cursor_pagination_null_created_at(self, app, member_service, order):
+        """測試獲取成員列表 - created_at 為空的成員在游標分頁中不被跳過，順序與 OFFSET 分頁一致"""
+        from datetime import datetime
+        from sqlalchemy import update
+        from app import db
+        
+        # Arrange - 直接更新為空值，繞過 created_at 的默認值
+        for i in range(7):
+            db.session.add(Member(
+                mem_name_zh=f'成員{i}', mem_email=f'member{i}@example.com', mem_type=1, enable=1,
+                created_at=datetime(2024, 1, 1 + i)
+            ))
+        db.session.flush()
+        db.session.execute(update(Member).where(Member.mem_id % 2 == 0).values(created_at=None))
+        db.session.commit()
+        db.session.expire_all()
+        undated = {member.mem_id for member in Member.query.filter(Member.created_at.is_(None))}
+        assert len(undated) == 3
+        with app.test_request_context(f'/api/members?all=true&order={order}'):
+            expected = [item['mem_id'] for item in member_service.get_members_list({'order': order})['items']]
+        
+        # Act
+        mem_ids = []
+        cursor = ''
+        while True:
+            with app.test_request_context(f'/api/members?cursor={cursor}&per_page=2&order={order}'):
+                result = member_service.get_members_list({'order': order})
+            mem_ids.extend(item['mem_id'] for item in result['items'])
+            if not result['has_next']:
+                break
+            cursor = result['next_cursor']
+        
+        # Assert - 空值成員排在最早的位置，組內按主鍵排序
+        assert len(mem_ids) == 7
+        assert [mem_id for mem_id in mem_ids if mem_id not in undated] == \
+            [mem_id for mem_id in expected if mem_id not in undated]
+        null_block = mem_ids[-3:] if order == 'desc' else mem_ids[:3]
+        assert null_block == sorted(undated, reverse=order == 'desc')
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_members_list_projection_matches_to_dict(self, app, member_service):
+        """測試獲取成員列表 - 列投影結果與 to_dict 一致"""
+        from app import db
+        from app.models import Lab, ResearchGroup
+        
+        # Arrange
+        lab = Lab(lab_zh='測試實驗室', enable=1)
+        db.session.add(lab)
+        db.session.flush()
+        group = ResearchGroup(lab_id=lab.lab_id, research_group_name_zh='課題組', research_group_name_en='Group', enable=1)
+        db.session.add(group)
+        db.session.flush()
+        db.session.add_all([
+            Member(mem_name_zh='有組成員', mem_email='a@example.com', mem_type=1, mem_desc_zh='簡介',
+                   research_group_id=group.research_group_id, lab_id=lab.lab_id, enable=1),
+            Member(mem_name_zh='無組校友', mem_email='b@example.com', mem_type=2, enable=1)
+        ])
+        db.session.commit()
+        
+        # Act
+        with app.test_request_context('/api/members?fields=*'):
+            result = member_service.get_members_list({})
+        
+        # Assert
+        assert result['total'] == 2
+        for item in result['items']:
+            assert item == Member.query.get(item['mem_id']).to_dict()
@@ -122,4 +122,391 @@ class TestPaperService:
             result = paper_service.get_paper_detail(paper_id)
             
             # Assert
-            assert result == mock_paper_data
\ No newline at end of file
+            assert result == mock_paper_data
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('admin_request', [False, True])
+    def test_get_papers_list_query_budget(self, app, paper_service, query_counter, admin_request):
+        """測試獲取論文列表 - 作者及成員批量加載，SQL 語句數量不隨行數增長"""
+        from datetime import date
+        from app import db
+        from app.models import Member, PaperAuthor
+        
+        # Arrange
+        members = [
+            Member(mem_name_zh=f'作者{i}', mem_name_en=f'Author {i}',
+                   mem_email=f'author{i}@example.com', mem_type=1, enable=1)
+            for i in range(10)
+        ]
+        db.session.add_all(members)
+        db.session.flush()
+        
+        for i in range(30):
+            paper = Paper(paper_title_zh=f'論文{i}', paper_date=date(2024, 1, 1 + i % 28), enable=1)
+            db.session.add(paper)
+            db.session.flush()
+            for order in range(5):
+                db.session.add(PaperAuthor(
+                    paper_id=paper.paper_id,
+                    mem_id=members[(i + order) % 10].mem_id,
+                    author_order=order + 1
+                ))
+        db.session.commit()
+        db.session.expunge_all()
+        
+        # Act
+        # 公開請求走列投影路徑，管理員請求走 ORM 預加載路徑
+        with app.test_request_context('/api/papers?per_page=100'), \
+             patch('app.utils.projection.is_admin_request', return_value=admin_request):
+            with query_counter() as statements:
+                result = paper_service.get_papers_list({})
+        
+        # Assert - COUNT + 論文列表 + 作者（含成員）批量查詢
+        assert result['total'] == 30
+        assert all(len(item['authors']) == 5 for item in result['items'])
+        assert all('member' in author for item in result['items'] for author in item['authors'])
+        assert len(statements) <= 3, statements
+    
+    @pytest.fixture
+    def seeded_papers(self, app):
+        """寫入日期有重複的論文數據"""
+        from datetime import date
+        from app import db
+        
+        for i in range(25):
+            db.session.add(Paper(paper_title_zh=f'論文{i}', paper_date=date(2024, 1, 1 + i // 3), enable=1))
+        db.session.commit()
+        
+        papers = Paper.query.order_by(Paper.paper_date.desc(), Paper.paper_id.desc()).all()
+        return [paper.paper_id for paper in papers]
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('fields', ['paper_title_zh', '*'])
+    def test_get_papers_list_cursor_pagination(self, app, paper_service, seeded_papers, query_counter, fields):
+        """測試獲取論文列表 - 游標分頁前後翻頁不重不漏，且默認不執行 COUNT"""
+        # Act - 向後翻頁
+        collected = []
+        cursors = []
+        cursor = ''
+        while True:
+            with app.test_request_context(f'/api/papers?cursor={cursor}&per_page=10&fields={fields}'):
+                with query_counter() as statements:
+                    result = paper_service.get_papers_list({})
+            assert not any('count(' in statement.lower() for statement in statements)
+            assert 'total' not in result
+            collected.extend(item['paper_id'] for item in result['items'])
+            cursors.append(result['prev_cursor'])
+            if not result['has_next']:
+                break
+            cursor = result['next_cursor']
+        
+        # Assert
+        assert collected == seeded_papers
+        
+        # Act - 從最後一頁向前翻頁
+        with app.test_request_context(f'/api/papers?cursor={cursors[-1]}&per_page=10&fields={fields}'):
+            result = paper_service.get_papers_list({})
+        
+        # Assert
+        assert [item['paper_id'] for item in result['items']] == seeded_papers[10:20]
+        assert result['has_prev'] is True
+        assert result['has_next'] is True
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_papers_list_cursor_with_total(self, app, paper_service, seeded_papers):
+        """測試獲取論文列表 - with_total=true 時返回總數"""
+        # Act
+        with app.test_request_context('/api/papers?cursor=&per_page=10&with_total=true'):
+            result = paper_service.get_papers_list({})
+        
+        # Assert
+        assert result['total'] == 25
+        assert result['has_prev'] is False
+        assert result['prev_cursor'] is None
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_papers_list_invalid_cursor(self, app, paper_service, seeded_papers):
+        """測試獲取論文列表 - 無效游標拋出校驗異常"""
+        # Act & Assert
+        with app.test_request_context('/api/papers?cursor=not-a-cursor'):
+            with pytest.raises(ValidationError):
+                paper_service.get_papers_list({})
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_papers_list_cursor_pagination_admin(self, app, paper_service, query_counter):
+        """測試獲取論文列表 - 管理員請求走 ORM 預加載路徑時游標分頁不重不漏，作者批量加載"""
+        from datetime import date
+        from app import db
+        from app.models import Member, PaperAuthor
+        
+        # Arrange
+        members = [Member(mem_name_zh=f'作者{i}', mem_email=f'author{i}@example.com', mem_type=1, enable=1)
+                   for i in range(3)]
+        db.session.add_all(members)
+        db.session.flush()
+        for i in range(12):
+            paper = Paper(paper_title_zh=f'論文{i}', paper_date=date(2024, 1, 1 + i // 4), enable=1)
+            db.session.add(paper)
+            db.session.flush()
+            for order, member in enumerate(members):
+                db.session.add(PaperAuthor(paper_id=paper.paper_id, mem_id=member.mem_id, author_order=order + 1))
+        db.session.commit()
+        expected = [paper.paper_id for paper in Paper.query.order_by(Paper.paper_date.desc(), Paper.paper_id.desc())]
+        author_ids = [member.mem_id for member in members]
+        db.session.expunge_all()
+        
+        # Act
+        pages, budgets = [], []
+        cursor = ''
+        with patch('app.utils.projection.is_admin_request', return_value=True):
+            while True:
+                with app.test_request_context(f'/api/papers?cursor={cursor}&per_page=5'):
+                    with query_counter() as statements:
+                        result = paper_service.get_papers_list({})
+                pages.append(result['items'])
+                budgets.append(statements)
+                if not result['has_next']:
+                    break
+                cursor = result['next_cursor']
+        
+        # Assert - 每頁只有論文列表 + 作者（含成員）批量查詢，不執行 COUNT
+        assert [item['paper_id'] for items in pages for item in items] == expected
+        assert all([author['member']['mem_id'] for author in item['authors']] == author_ids
+                   for items in pages for item in items)
+        assert all(len(statements) <= 2 for statements in budgets), budgets
+        assert not any('count(' in statement.lower() for statements in budgets for statement in statements)
+    
+    @pytest.fixture
+    def searchable_papers(self, app):
+        """寫入中英文標題的論文數據"""
+        from datetime import date
+        from app import db
+        
+        papers = [
+            Paper(paper_title_zh='強化學習在機器人控制中的應用', paper_title_en='Reinforcement Learning for Robot Control',
+                  paper_venue='ICRA', paper_date=date(2024, 3, 1), enable=1),
+            Paper(paper_title_zh='基於深度學習的圖像分割', paper_title_en='Deep Learning Based Image Segmentation',
+                  paper_venue='CVPR', paper_date=date(2024, 1, 1), enable=1),
+            Paper(paper_title_zh='圖神經網絡綜述', paper_title_en='A Survey of Graph Neural Networks',
+                  paper_venue='TPAMI', paper_date=date(2024, 2, 1), enable=1),
+        ]
+        db.session.add_all(papers)
+        db.session.commit()
+        return {paper.paper_venue: paper.paper_id for paper in papers}
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('q, expected', [
+        ('深度學習', ['CVPR']),
+        ('學習', ['ICRA', 'CVPR']),
+        ('learn', ['ICRA', 'CVPR']),
+        ('圖像 segmentation', ['CVPR']),
+        ('tpami', ['TPAMI']),
+        ('量子', []),
+    ])
+    def test_get_papers_list_fulltext_search(self, app, paper_service, searchable_papers, q, expected):
+        """測試獲取論文列表 - 全文檢索支持中文二元組和英文前綴匹配"""
+        # Act
+        with app.test_request_context(f'/api/papers?q={q}&sort_by=paper_date'):
+            result = paper_service.get_papers_list({'q': q, 'sort_by': 'paper_date'})
+        
+        # Assert
+        assert [item['paper_id'] for item in result['items']] == [searchable_papers[venue] for venue in expected]
+        assert result['total'] == len(expected)
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_papers_list_search_relevance_and_highlight(self, app, paper_service, searchable_papers):
+        """測試獲取論文列表 - 搜索默認按相關度排序並返回轉義後的高亮片段"""
+        # Arrange
+        from app import db
+        paper = db.session.get(Paper, searchable_papers['TPAMI'])
+        paper.paper_title_en = 'Graph <Neural> Networks: graph learning on graph data'
+        db.session.commit()
+        
+        # Act
+        with app.test_request_context('/api/papers?q=graph'):
+            result = paper_service.get_papers_list({'q': 'graph'})
+        
+        # Assert
+        assert [item['paper_id'] for item in result['items']] == [searchable_papers['TPAMI']]
+        assert result['items'][0]['highlight'] == {
+            'paper_title_en': '<mark>Graph</mark> &lt;Neural&gt; Networks: <mark>graph</mark> learning on <mark>graph</mark> data'
+        }
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_papers_list_search_index_follows_writes(self, app, paper_service, searchable_papers):
+        """測試獲取論文列表 - 更新和刪除後全文索引同步"""
+        # Arrange
+        from app import db
+        paper = db.session.get(Paper, searchable_papers['CVPR'])
+        paper.paper_title_en = 'Medical Image Registration'
+        db.session.delete(db.session.get(Paper, searchable_papers['ICRA']))
+        db.session.commit()
+        
+        # Act
+        with app.test_request_context('/api/papers'):
+            learning = paper_service.get_papers_list({'q': 'learning'})
+            registration = paper_service.get_papers_list({'q': 'registration'})
+        
+        # Assert
+        assert learning['items'] == []
+        assert [item['paper_id'] for item in registration['items']] == [searchable_papers['CVPR']]
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_create_and_update_paper_with_chunked_upload(self, app, paper_service, tmp_path):
+        """測試論文文件 - 按 upload_id 關聯分塊上傳完成的文件，替換後釋放舊文件"""
+        # Arrange
+        import io
+        from app import db
+        from app.models import Lab, UploadSession
+        from app.services.upload_service import UploadService
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        db.session.add(Lab(lab_zh='實驗室', lab_en='Lab', enable=1))
+        db.session.commit()
+        upload_service = UploadService()
+        
+        def upload(data):
+            upload_id = upload_service.create_upload('paper.pdf', len(data))['upload_id']
+            upload_service.upload_chunk(upload_id, io.BytesIO(data), 0)
+            return upload_id, upload_service.complete_upload(upload_id)['file_path']
+        
+        # Act
+        with patch.object(paper_service.audit_service, 'log_operation'), \
+             patch.object(upload_service.audit_service, 'log_operation'):
+            first_id, first_path = upload(b'%PDF-1.4 first')
+            paper = paper_service.create_paper({
+                'paper_title_zh': '分塊上傳論文', 'paper_date': '2024-01-15', 'paper_file_upload_id': first_id
+            })
+            second_id, second_path = upload(b'%PDF-1.4 second')
+            updated = paper_service.update_paper(paper['paper_id'], {'paper_file_upload_id': second_id})
+        
+        # Assert
+        assert paper['paper_file_path'] == first_path
+        assert updated['paper_file_path'] == second_path
+        assert UploadSession.query.count() == 0
+        assert not (tmp_path / first_path[len('/media/'):]).exists()
+        assert (tmp_path / second_path[len('/media/'):]).exists()
+        with pytest.raises(NotFoundError):
+            paper_service.update_paper(paper['paper_id'], {'paper_file_upload_id': first_id})
+    
+    @pytest.fixture
+    def pdf_upload(self, app, tmp_path):
+        """臨時上傳目錄及包含指定文本的 PDF 上傳文件的構造函數"""
+        import io
+        from werkzeug.datastructures import FileStorage
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        
+        def make(body):
+            stream = f'BT /F1 12 Tf 72 720 Td ({body}) Tj ET'.encode()
+            objects = [
+                b'<< /Type /Catalog /Pages 2 0 R >>',
+                b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+                b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                b'/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>',
+                b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+                b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream),
+            ]
+            data, offsets = b'%PDF-1.4\n', []
+            for number, obj in enumerate(objects, 1):
+                offsets.append(len(data))
+                data += b'%d 0 obj\n%s\nendobj\n' % (number, obj)
+            xref = len(data)
+            data += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+            data += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+            data += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+            return FileStorage(stream=io.BytesIO(data), filename='paper.pdf', content_type='application/pdf')
+        return make
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_papers_list_search_matches_pdf_text(self, app, paper_service, searchable_papers, pdf_upload):
+        """測試獲取論文列表 - 搜索同時匹配 PDF 正文，標題命中排在正文命中之前"""
+        # Arrange
+        from app import db
+        from app.utils.file_handler import save_file
+        body_only = db.session.get(Paper, searchable_papers['ICRA'])
+        body_only.paper_file_path = save_file(pdf_upload('We study graph attention for manipulation.'), 'document')
+        db.session.commit()
+        
+        # Act
+        with app.test_request_context('/api/papers?q=graph'):
+            graph = paper_service.get_papers_list({'q': 'graph'})
+        with app.test_request_context('/api/papers?q=attention'):
+            attention = paper_service.get_papers_list({'q': 'attention'})
+        
+        # Assert
+        assert body_only.text_record.status == 'ready'
+        assert body_only.text_record.page_count == 1
+        assert [item['paper_id'] for item in graph['items']] == [searchable_papers['TPAMI'], searchable_papers['ICRA']]
+        assert [item['paper_id'] for item in attention['items']] == [searchable_papers['ICRA']]
+        assert attention['items'][0]['highlight'] == {
+            'paper_text': 'We study graph <mark>attention</mark> for manipulation.'
+        }
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_pdf_text_extracted_only_when_hash_changes(self, app, searchable_papers, pdf_upload, tmp_path):
+        """測試論文文本提取 - 文件路徑變更但內容相同時不重新解析，內容變更或刪除文件時同步更新"""
+        # Arrange
+        import shutil
+        from app import db
+        from app.models import PaperText
+        from app.utils import pdf_text
+        from app.utils.file_handler import save_file
+        paper = db.session.get(Paper, searchable_papers['CVPR'])
+        paper.paper_file_path = save_file(pdf_upload('first version'), 'document')
+        db.session.commit()
+        legacy = tmp_path / 'paper' / '0123456789abcdef0123456789abcdef.pdf'
+        legacy.parent.mkdir()
+        shutil.copy(tmp_path / paper.paper_file_path[len('/media/'):], legacy)
+        
+        # Act
+        with patch.object(pdf_text, 'PdfReader', wraps=pdf_text.PdfReader) as reader:
+            paper.paper_title_en = 'Renamed'
+            db.session.commit()
+            paper.paper_file_path = '/media/paper/0123456789abcdef0123456789abcdef.pdf'
+            db.session.commit()
+            unchanged_calls = reader.call_count
+            paper.paper_file_path = save_file(pdf_upload('second version'), 'document')
+            db.session.commit()
+        record = db.session.get(PaperText, paper.paper_id)
+        text_after_change = record.paper_text
+        paper.paper_file_path = None
+        db.session.commit()
+        
+        # Assert
+        assert unchanged_calls == 0
+        assert reader.call_count == 1
+        assert text_after_change == 'second version'
+        assert db.session.get(PaperText, paper.paper_id) is None
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_pdf_text_extracted_in_background(self, app, searchable_papers, pdf_upload):
+        """測試論文文本提取 - 配置進程池時在事務提交後後台提取"""
+        # Arrange
+        from app import db
+        from app.utils import pdf_text
+        from app.utils.file_handler import save_file
+        app.config['IMAGE_PROCESS_WORKERS'] = 1
+        paper = db.session.get(Paper, searchable_papers['TPAMI'])
+        paper.paper_file_path = save_file(pdf_upload('background extraction'), 'document')
+        
+        # Act
+        db.session.commit()
+        status_after_commit = paper.text_record.status
+        assert pdf_text.drain(timeout=60)
+        db.session.expire_all()
+        
+        # Assert
+        assert status_after_commit == 'pending'
+        assert paper.text_record.status == 'ready'
+        assert paper.text_record.paper_text == 'background extraction'
@@ -105,4 +105,78 @@ class TestResearchGroupService:
             
             # Act & Assert  
             with pytest.raises(Exception):  # Should raise BusinessLogicError
-                research_group_service.delete_research_group(group_id)
\ No newline at end of file
+                research_group_service.delete_research_group(group_id)
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_research_groups_list_batched_counts(self, app, research_group_service, query_counter):
+        """測試獲取課題組列表 - 組長和統計數據批量查詢"""
+        from datetime import date
+        from app import db
+        from app.models import Lab, Member, Paper
+        
+        # Arrange
+        lab = Lab(lab_zh='測試實驗室', enable=1)
+        db.session.add(lab)
+        db.session.flush()
+        
+        groups = []
+        for i in range(8):
+            leader = Member(mem_name_zh=f'組長{i}', mem_email=f'leader{i}@example.com', mem_type=0, enable=1)
+            db.session.add(leader)
+            db.session.flush()
+            group = ResearchGroup(lab_id=lab.lab_id, research_group_name_zh=f'課題組{i}', mem_id=leader.mem_id, enable=1)
+            db.session.add(group)
+            db.session.flush()
+            leader.research_group_id = group.research_group_id
+            groups.append(group)
+        
+        for i in range(3):
+            db.session.add(Member(mem_name_zh=f'學生{i}', mem_email=f's{i}@example.com', mem_type=1,
+                                  research_group_id=groups[0].research_group_id, enable=1))
+            db.session.add(Paper(paper_title_zh=f'論文{i}', paper_date=date(2024, 1, 1),
+                                 research_group_id=groups[0].research_group_id, enable=1))
+        db.session.add(Paper(paper_title_zh='已刪除論文', paper_date=date(2024, 1, 1),
+                             research_group_id=groups[0].research_group_id, enable=0))
+        db.session.commit()
+        group_ids = [group.research_group_id for group in groups]
+        db.session.expunge_all()
+        
+        # Act
+        with app.test_request_context('/api/research-groups?per_page=100'):
+            with query_counter() as statements:
+                result = research_group_service.get_research_groups_list({'include_counts': True})
+        
+        # Assert - COUNT + 課題組 + 組長 + 成員數 + 論文數
+        assert len(statements) <= 5, statements
+        items = {item['research_group_id']: item for item in result['items']}
+        first = items[group_ids[0]]
+        assert first['member_count'] == 4  # 組長 + 3 名學生
+        assert first['paper_count'] == 3
+        assert first['leader']['mem_name_zh'] == '組長0'
+        assert first['leader']['research_group']['research_group_id'] == group_ids[0]
+        assert items[group_ids[1]]['paper_count'] == 0
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_get_research_group_detail_without_counts(self, app, research_group_service):
+        """測試獲取課題組詳情 - 默認不附加統計字段，停用的組長不返回"""
+        from app import db
+        from app.models import Lab, Member
+        
+        # Arrange
+        lab = Lab(lab_zh='測試實驗室', enable=1)
+        leader = Member(mem_name_zh='組長', mem_email='leader@example.com', mem_type=0, enable=0)
+        db.session.add_all([lab, leader])
+        db.session.flush()
+        group = ResearchGroup(lab_id=lab.lab_id, research_group_name_zh='課題組', mem_id=leader.mem_id, enable=1)
+        db.session.add(group)
+        db.session.commit()
+        
+        # Act
+        result = research_group_service.get_research_group_detail(group.research_group_id)
+        
+        # Assert
+        assert result['leader'] is None
+        assert 'member_count' not in result
+        assert 'paper_count' not in result
@@ -0,0 +1,114 @@
+"""
+響應緩存測試用例
+測試公開列表接口的服務端響應緩存及多進程共享的 SQLite 後端
+"""
+
+import pytest
+from unittest.mock import patch
+from app.services.news_service import NewsService
+
+
+class TestResponseCache:
+    """服務端響應緩存測試"""
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_news_list_response_cache_invalidated_by_write(self, app, seeded_news, query_counter):
+        """測試新聞列表接口 - 響應緩存命中時不訪問數據庫，經審計的寫操作後失效"""
+        # Arrange
+        app.config['RESPONSE_CACHE_BACKEND'] = 'memory'
+        news_service = NewsService()
+        client = app.test_client()
+        first = client.get('/api/news')
+        
+        # Act
+        with query_counter() as statements:
+            second = client.get('/api/news')
+            not_modified = client.get('/api/news', headers={'If-None-Match': second.headers['ETag']})
+        
+        with patch.object(news_service.audit_service, 'log_operation'):
+            news_service.create_news({
+                'news_type': 0, 'news_title_zh': '新增', 'news_content_zh': '內容',
+                'news_date': '2024-07-01'
+            })
+        after_write = client.get('/api/news')
+        
+        # Assert
+        assert first.headers['X-Cache'] == 'MISS'
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.data == first.data
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert not_modified.status_code == 304
+        assert statements == []
+        assert after_write.headers['X-Cache'] == 'MISS'
+        assert after_write.get_json()['data']['items'][0]['news_title_zh'] == '新增'
+        stats = app.extensions['response_cache'].stats()
+        assert (stats['hits'], stats['misses']) == (2, 2)
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_news_list_response_cache_disabled_for_blueprint(self, app, seeded_news):
+        """測試新聞列表接口 - 按藍圖關閉響應緩存"""
+        # Arrange
+        app.config['RESPONSE_CACHE_BACKEND'] = 'memory'
+        app.config['RESPONSE_CACHE_DISABLED_BLUEPRINTS'] = {'news'}
+        client = app.test_client()
+        
+        # Act
+        client.get('/api/news')
+        response = client.get('/api/news')
+        
+        # Assert
+        assert 'X-Cache' not in response.headers
+        assert 'ETag' in response.headers
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_shared_response_cache_invalidation_across_processes(self, tmp_path):
+        """測試共享響應緩存 - 一個實例的失效對同一文件上的其他實例生效"""
+        # Arrange
+        from app.utils.response_cache import CachedResponse, ResponseCache, SharedLocalBackend
+        path = str(tmp_path / 'cache.sqlite3')
+        worker_a = ResponseCache(SharedLocalBackend(path), ttl=60)
+        worker_b = ResponseCache(SharedLocalBackend(path), ttl=60)
+        key = worker_a.make_key('/api/news', '', ('news',))
+        worker_a.set(key, CachedResponse(b'{}', 'abc', 'application/json'))
+        
+        # Act
+        shared_hit = worker_b.get(worker_b.make_key('/api/news', '', ('news',)))
+        worker_b.invalidate('news')
+        after_invalidate = worker_a.get(worker_a.make_key('/api/news', '', ('news',)))
+        
+        # Assert
+        assert shared_hit == CachedResponse(b'{}', 'abc', 'application/json')
+        assert after_invalidate is None
+    
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_shared_backend_prunes_at_interval_across_threads(self, tmp_path):
+        """測試共享響應緩存 - 多線程併發寫入時按寫入次數準確觸發清理"""
+        # Arrange
+        from concurrent.futures import ThreadPoolExecutor
+        from app.utils.response_cache import CachedResponse, SharedLocalBackend
+        backend = SharedLocalBackend(str(tmp_path / 'cache.sqlite3'), max_entries=16)
+        prunes = []
+        original_prune = backend._prune
+        
+        def _prune(conn):
+            prunes.append(1)
+            original_prune(conn)
+        
+        backend._prune = _prune
+        threads, writes = 8, SharedLocalBackend.PRUNE_INTERVAL
+        
+        def _write(worker):
+            for i in range(writes):
+                backend.set(f'{worker}-{i}', CachedResponse(b'{}', 'abc', 'application/json'), ttl=60)
+        
+        # Act
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(_write, range(threads)))
+        
+        # Assert
+        assert len(prunes) == threads
+        assert backend.size() == 16
@@ -0,0 +1,183 @@
+"""
+SearchService 測試用例
+測試站內統一搜索的服務層邏輯及倒排索引
+"""
+
+import pytest
+from datetime import date
+from unittest.mock import patch
+from app.services.search_service import SearchService
+from app.services.news_service import NewsService
+from app.services.base_service import ValidationError
+from app.models import Member, Paper, News, Project, ResearchGroup, Resource
+
+
+class TestSearchService:
+    """站內搜索服務層測試"""
+
+    @pytest.fixture
+    def search_service(self, app):
+        """創建搜索服務實例"""
+        with app.app_context():
+            return SearchService()
+
+    @pytest.fixture
+    def site_data(self, app):
+        """寫入各模組的可檢索數據"""
+        from app import db
+
+        group = ResearchGroup(lab_id=1, research_group_name_zh='視覺計算組', research_group_name_en='Visual Computing Group',
+                              research_group_desc_zh='研究深度學習與圖像理解', enable=1)
+        db.session.add(group)
+        db.session.flush()
+
+        rows = {
+            'group': group,
+            'member': Member(mem_name_zh='張深度', mem_name_en='Deep Zhang', mem_email='zhang@example.edu',
+                             mem_type=0, research_group_id=group.research_group_id, enable=1),
+            'paper': Paper(paper_title_zh='基於深度學習的圖像分割', paper_title_en='Deep Learning Based Image Segmentation',
+                           paper_venue='CVPR', paper_date=date(2024, 1, 1), enable=1),
+            'news': News(news_type=0, news_title_zh='實驗室深度學習論文獲獎', news_title_en='Deep learning paper wins award',
+                         news_content_zh='恭喜團隊', news_date=date(2024, 2, 1), enable=1),
+            'project': Project(project_name_zh='機器人控制平台', project_name_en='Robot Control Platform',
+                               project_desc_zh='強化學習驅動的機器人控制', enable=1),
+            'resource': Resource(resource_name_zh='GPU 計算集群', resource_name_en='GPU Cluster',
+                                 resource_description_zh='用於深度學習模型訓練'),
+            'disabled': News(news_type=0, news_title_zh='已刪除的深度學習新聞', news_date=date(2024, 3, 1), enable=0),
+        }
+        db.session.add_all(rows.values())
+        db.session.commit()
+        return rows
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_search_returns_typed_ranked_results(self, app, search_service, site_data):
+        """測試跨模組搜索 - 一次返回各類型結果，按相關度排序並附帶計數"""
+        # Act
+        result = search_service.search('深度學習')
+
+        # Assert
+        types = [item['type'] for item in result['items']]
+        assert sorted(types) == ['news', 'paper', 'research_group', 'resource']
+        assert types[0] in ('paper', 'news')  # 標題命中的結果排在正文命中之前
+        assert result['counts'] == {'paper': 1, 'news': 1, 'research_group': 1, 'resource': 1}
+        assert result['total'] == 4
+        scores = [item['score'] for item in result['items']]
+        assert scores == sorted(scores, reverse=True)
+
+        paper = next(item for item in result['items'] if item['type'] == 'paper')
+        assert paper['id'] == site_data['paper'].paper_id
+        assert paper['highlight']['title_zh'] == '基於<mark>深度學習</mark>的圖像分割'
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('q, expected', [
+        ('deep', ['member', 'news', 'paper']),
+        ('robot 控制', ['project']),
+        ('gpu', ['resource']),
+        ('視覺', ['research_group']),
+        ('量子', []),
+    ])
+    def test_search_matching(self, app, search_service, site_data, q, expected):
+        """測試跨模組搜索 - 中文二元組與英文前綴匹配，停用的數據不出現"""
+        # Act
+        result = search_service.search(q)
+
+        # Assert
+        assert sorted(item['type'] for item in result['items']) == expected
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_search_types_filter_keeps_counts(self, app, search_service, site_data):
+        """測試跨模組搜索 - 按類型篩選結果，各類型計數不受篩選影響"""
+        # Act
+        result = search_service.search('deep', types='paper,news', limit=1)
+
+        # Assert
+        assert len(result['items']) == 1
+        assert result['items'][0]['type'] in ('paper', 'news')
+        assert result['total'] == 2
+        assert result['counts'] == {'member': 1, 'paper': 1, 'news': 1}
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    @pytest.mark.parametrize('q, types', [('', None), ('  ', None), ('deep', 'paper,alumni')])
+    def test_search_validation_error(self, app, search_service, q, types):
+        """測試跨模組搜索 - 關鍵字為空或類型無效"""
+        # Act & Assert
+        with pytest.raises(ValidationError):
+            search_service.search(q, types=types)
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_search_index_follows_service_writes(self, app, search_service, site_data):
+        """測試跨模組搜索 - 索引建立後，提交的寫入增量更新索引，回滾的寫入不生效"""
+        # Arrange
+        from app import db
+        news_service = NewsService()
+        assert search_service.search('量子')['total'] == 0
+
+        # Act
+        with patch.object(news_service.audit_service, 'log_operation'):
+            created = news_service.create_news({
+                'news_type': 0, 'news_title_zh': '量子計算講座', 'news_content_zh': '內容', 'news_date': '2024-07-01'
+            })
+        after_create = search_service.search('量子')
+
+        db.session.add(News(news_type=0, news_title_zh='量子未提交', news_date=date(2024, 7, 2), enable=1))
+        db.session.flush()
+        db.session.rollback()
+        after_rollback = search_service.search('量子')
+
+        with patch.object(news_service.audit_service, 'log_operation'):
+            news_service.delete_news(created['news_id'])
+        after_delete = search_service.search('量子')
+
+        # Assert
+        assert [(item['type'], item['id']) for item in after_create['items']] == [('news', created['news_id'])]
+        assert after_rollback['total'] == 1
+        assert after_delete['total'] == 0
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_search_index_refreshes_other_worker_writes(self, app, search_service, site_data):
+        """測試跨模組搜索 - 到達刷新間隔時重新載入被其他進程修改的模組"""
+        # Arrange
+        from app import db
+        from app.utils.search_index import get_search_index
+        search_service.search('deep')
+        site = get_search_index()
+        site.refresh_interval = 0
+
+        # Act：繞過會話事件直接寫入，模擬其他工作進程的寫入
+        db.session.execute(Project.__table__.insert().values(
+            project_name_zh='量子通信', enable=1, is_end=0, updated_at=date(2030, 1, 1)
+        ))
+        db.session.commit()
+        result = search_service.search('量子')
+
+        # Assert
+        assert [item['type'] for item in result['items']] == ['project']
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_search_route(self, app, site_data):
+        """測試站內搜索接口 - 返回統一響應格式，參數錯誤返回 400"""
+        # Arrange
+        client = app.test_client()
+
+        # Act
+        response = client.get('/api/search?q=gpu')
+        bad_request = client.get('/api/search?q=')
+
+        # Assert
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['code'] == 0
+        assert data['data']['items'][0]['type'] == 'resource'
+        assert data['data']['items'][0]['highlight'] == {
+            'title_zh': '<mark>GPU</mark> 計算集群',
+            'title_en': '<mark>GPU</mark> Cluster'
+        }
+        assert bad_request.status_code == 400
+        assert bad_request.get_json()['code'] == 2000
@@ -0,0 +1,139 @@
+"""
+UploadService 測試用例
+測試分塊斷點續傳上傳相關的服務層邏輯
+"""
+
+import hashlib
+import io
+import pytest
+from unittest.mock import patch
+from werkzeug.exceptions import ClientDisconnected
+from app.services.upload_service import UploadService
+from app.services.base_service import ValidationError, NotFoundError, BusinessLogicError
+from app.models import UploadSession
+from app.utils import resumable_upload
+
+
+class DroppedStream:
+    """讀完 data 後模擬連接中斷"""
+
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read(self, size=-1):
+        chunk = self._stream.read(size)
+        if not chunk:
+            raise ClientDisconnected()
+        return chunk
+
+
+class TestUploadService:
+    """分塊上傳服務層測試"""
+
+    @pytest.fixture
+    def upload_service(self, app, tmp_path):
+        """創建分塊上傳服務實例，使用臨時上傳目錄"""
+        app.config['UPLOAD_FOLDER'] = str(tmp_path)
+        return UploadService()
+
+    @pytest.fixture
+    def pdf_data(self):
+        """3 MB 的 PDF 內容"""
+        return b'%PDF-1.4\n' + bytes(range(256)) * (3 * 4096)
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_chunked_upload_resumes_after_dropped_connection(self, upload_service, pdf_data, tmp_path):
+        """測試分塊上傳 - 連接中斷後保留已寫入部分，按 offset 續傳後完成"""
+        # Arrange
+        upload = upload_service.create_upload('paper.pdf', len(pdf_data), 'paper')
+        upload_id = upload['upload_id']
+
+        # Act
+        upload_service.upload_chunk(upload_id, io.BytesIO(pdf_data[:1000000]), 0)
+        with pytest.raises(ValidationError):
+            upload_service.upload_chunk(upload_id, DroppedStream(pdf_data[1000000:1500000]), 1000000)
+        offset = upload_service.get_upload(upload_id)['offset']
+        upload_service.upload_chunk(upload_id, io.BytesIO(pdf_data[offset:]), offset)
+        with patch.object(upload_service.audit_service, 'log_operation'):
+            result = upload_service.complete_upload(upload_id)
+
+        # Assert
+        digest = hashlib.sha256(pdf_data).hexdigest()
+        assert offset == 1500000
+        assert result['status'] == 'completed'
+        assert result['sha256'] == digest
+        assert result['file_path'] == f'/media/document/{digest[:2]}/{digest}.pdf'
+        assert (tmp_path / 'document' / digest[:2] / f'{digest}.pdf').read_bytes() == pdf_data
+        assert not (tmp_path / resumable_upload.UPLOADS_DIR / f'{upload_id}.part').exists()
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_chunked_upload_rehashes_in_other_worker(self, upload_service, pdf_data):
+        """測試分塊上傳 - 分塊落在沒有哈希狀態的工作進程時從已接收部分重新計算"""
+        # Arrange
+        upload_id = upload_service.create_upload('paper.pdf', len(pdf_data))['upload_id']
+        upload_service.upload_chunk(upload_id, io.BytesIO(pdf_data[:2000000]), 0)
+        resumable_upload._hashers.clear()
+
+        # Act
+        upload_service.upload_chunk(upload_id, io.BytesIO(pdf_data[2000000:]), 2000000)
+        resumable_upload._hashers.clear()
+        with patch.object(upload_service.audit_service, 'log_operation'):
+            result = upload_service.complete_upload(upload_id)
+
+        # Assert
+        assert result['sha256'] == hashlib.sha256(pdf_data).hexdigest()
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_chunked_upload_rejects_wrong_offset_and_oversize(self, upload_service, pdf_data):
+        """測試分塊上傳 - 偏移不一致拒絕寫入，超過聲明大小時保留已寫入部分"""
+        # Arrange
+        upload_id = upload_service.create_upload('paper.pdf', 2 * 1024 * 1024)['upload_id']
+
+        # Act & Assert
+        with pytest.raises(BusinessLogicError):
+            upload_service.upload_chunk(upload_id, io.BytesIO(pdf_data), 100)
+        with pytest.raises(ValidationError):
+            upload_service.upload_chunk(upload_id, io.BytesIO(pdf_data), 0)
+        assert upload_service.get_upload(upload_id)['offset'] == 2 * 1024 * 1024
+        with pytest.raises(ValidationError):
+            upload_service.create_upload('paper.pdf', 51 * 1024 * 1024)
+        with pytest.raises(ValidationError):
+            upload_service.create_upload('paper.exe', 1024)
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_complete_requires_all_chunks(self, upload_service, pdf_data):
+        """測試分塊上傳 - 未接收完所有分塊時不能完成"""
+        # Arrange
+        upload_id = upload_service.create_upload('paper.pdf', len(pdf_data))['upload_id']
+        upload_service.upload_chunk(upload_id, io.BytesIO(pdf_data[:1024]), 0)
+
+        # Act & Assert
+        with pytest.raises(ValidationError):
+            upload_service.complete_upload(upload_id)
+
+    @pytest.mark.unit
+    @pytest.mark.service
+    def test_abort_and_expired_uploads_are_discarded(self, app, upload_service, pdf_data, tmp_path):
+        """測試分塊上傳 - 取消和過期的上傳刪除記錄及已接收部分"""
+        # Arrange
+        from datetime import datetime, timedelta
+        from app import db
+        aborted = upload_service.create_upload('paper.pdf', len(pdf_data))['upload_id']
+        expired = upload_service.create_upload('paper.pdf', len(pdf_data))['upload_id']
+        db.session.get(UploadSession, expired).expires_at = datetime.utcnow() - timedelta(minutes=1)
+        db.session.commit()
+
+        # Act
+        upload_service.abort_upload(aborted)
+        purged = upload_service.purge_expired()
+
+        # Assert
+        assert purged == 1
+        assert UploadSession.query.count() == 0
+        assert not list((tmp_path / resumable_upload.UPLOADS_DIR).iterdir())
+        with pytest.raises(NotFoundError):
+            upload_service.get_upload(aborted)
@@ -20,6 +20,7 @@ import type {
   Admin,
   AdminQueryParams,
   EditRecord,
+  EditRecordSummary,
   EditRecordQueryParams,
   LoginResponse
 } from '@/types/api';
@@ -250,6 +251,20 @@ export const memberApi = {
   }
 };
 
+// 公開列表卡片顯示的字段，長描述只取服務端截取的摘要（*_excerpt）
+export const PAPER_CARD_FIELDS = [
+  'paper_date', 'paper_title_zh', 'paper_title_en', 'paper_desc_zh_excerpt', 'paper_desc_en_excerpt',
+  'paper_type', 'paper_venue', 'paper_accept', 'paper_file_path', 'paper_url', 'preview_img',
+  'all_authors_zh', 'all_authors_en', 'authors'
+].join(',');
+export const NEWS_CARD_FIELDS = [
+  'news_type', 'news_title_zh', 'news_title_en', 'news_content_zh_excerpt', 'news_content_en_excerpt', 'news_date'
+].join(',');
+export const PROJECT_CARD_FIELDS = [
+  'project_url', 'project_name_zh', 'project_name_en', 'project_desc_zh_excerpt', 'project_desc_en_excerpt',
+  'project_date_start', 'is_end'
+].join(',');
+
 /**
  * 論文相關 API
  */
@@ -516,7 +531,7 @@ export const adminApi = {
  */
 export const editRecordApi = {
   // 獲取編輯記錄列表
-  getEditRecords(params?: EditRecordQueryParams): Promise<ApiResponse<PaginatedResponse<EditRecord>>> {
+  getEditRecords(params?: EditRecordQueryParams): Promise<ApiResponse<PaginatedResponse<EditRecordSummary>>> {
     return api.get('/edit-records', { params });
   },
   
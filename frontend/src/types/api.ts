@@ -17,6 +17,7 @@ export interface ApiError {
 export interface PaginatedResponse<T = unknown> {
   items: T[];
   total: number;
+  total_cached?: boolean; // total 是否來自總數緩存
   page?: number;
   per_page?: number;
   pages?: number;
@@ -97,6 +98,8 @@ export interface Paper {
   paper_title_en?: string;
   paper_desc_zh?: string;
   paper_desc_en?: string;
+  paper_desc_zh_excerpt?: string; // 列表摘要（fields 指定時返回）
+  paper_desc_en_excerpt?: string;
   paper_type: number; // 0=會議, 1=期刊, 2=專利, 3=書籍, 4=其他
   paper_venue?: string;
   paper_accept: number; // 0=投稿中, 1=已接收
@@ -126,6 +129,8 @@ export interface News {
   news_title_en?: string; // 新聞標題英文
   news_content_zh: string;
   news_content_en?: string;
+  news_content_zh_excerpt?: string; // 列表摘要（fields 指定時返回）
+  news_content_en_excerpt?: string;
   news_date: string;
   enable: number;
   created_at: string;
@@ -139,6 +144,8 @@ export interface Project {
   project_name_en?: string;
   project_desc_zh?: string;
   project_desc_en?: string;
+  project_desc_zh_excerpt?: string; // 列表摘要（fields 指定時返回）
+  project_desc_en_excerpt?: string;
   project_date_start?: string;
   is_end: number; // 0=進行中, 1=已完成
   enable: number;
@@ -186,6 +193,7 @@ export interface BaseQueryParams {
   page?: number;
   per_page?: number;
   all?: string; // 新增：設為 'true' 時獲取所有數據
+  fields?: string; // 返回字段（逗號分隔，'*' 為全部；未登錄時默認省略長描述字段，*_excerpt 為摘要）
 }
 
 // 管理員查詢參數
@@ -239,7 +247,18 @@ export interface ResourceQueryParams extends BaseQueryParams {
   order?: string;
 }
 
-// 操作日誌信息
+// 操作日誌列表項（摘要投影，不含 edit_content）
+export interface EditRecordSummary {
+  edit_id: number;
+  admin_id: number;
+  admin_name: string | null;
+  edit_type: string;
+  edit_module: number;
+  edit_date: string;
+  edit_summary: string | null;
+}
+
+// 操作日誌詳情
 export interface EditRecord {
   edit_id: number;
   admin_id: number;
@@ -247,6 +266,7 @@ export interface EditRecord {
   edit_module: number;
   edit_date: string;
   edit_content?: Record<string, unknown>; // 改為對象類型
+  edit_summary: string | null;
   admin: {
     admin_id: number;
     admin_name: string;